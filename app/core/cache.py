@@ -6,25 +6,33 @@ Cache Strategy:
 1. AI Analysis Results - Cache complete analysis by company+industry+challenge (30 days)
 2. AI Stage Results - Cache individual pipeline stages (7 days)
 3. PDF Generation - Cache PDFs by content hash (90 days)
-4. Dashboard Stats - Cache computed stats (5 minutes)
+4. Dashboard Stats - Cache computed stats (5 minutes) and intelligence snapshots (refreshed on schedule)
 5. Perplexity Queries - Cache all queries aggressively (14 days)
 
-Uses Supabase for persistent storage + in-memory for speed
+Uses Supabase for persistent storage + bounded memory/Redis tiers for speed
+(one TieredCache namespace per cache, see app/core/tiered_cache.py)
 """
 
+import asyncio
 import json
 import hashlib
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 from app.core.supabase import supabase_service
+from app.core.challenge_index import challenge_index, challenge_scope
+from app.core.hit_counter import cache_hit_counter
+from app.core.tiered_cache import PersistentTier, TieredCache
 from app.core.constants import (
     CACHE_TTL_ANALYSIS,
     CACHE_TTL_STAGE,
     CACHE_TTL_PDF,
     CACHE_TTL_STATS,
     CACHE_TTL_PERPLEXITY,
-    CACHE_MAX_PDFS_IN_MEMORY,
+    CHALLENGE_INDEX_STAGES,
+    DASHBOARD_INTELLIGENCE_SNAPSHOT_TTL_SECONDS,
+    PDF_RENDERER_VERSION,
+    PDF_STORAGE_BUCKET,
     MAX_CHALLENGE_SNIPPET_LENGTH,
     MAX_CHALLENGE_DB_LENGTH,
     HASH_LENGTH_SHORT
@@ -32,17 +40,12 @@ from app.core.constants import (
 
 logger = logging.getLogger(__name__)
 
-# In-memory caches (fast but ephemeral)
-_analysis_cache: Dict[str, Dict[str, Any]] = {}
-_stage_cache: Dict[str, Dict[str, Any]] = {}
-_pdf_cache: Dict[str, bytes] = {}
-_stats_cache: Dict[str, Any] = {}
-
 # Cache tables
 ANALYSIS_CACHE_TABLE = "analysis_cache"
 STAGE_CACHE_TABLE = "stage_cache"
 PDF_CACHE_TABLE = "pdf_cache"
 STATS_CACHE_TABLE = "stats_cache"
+PERPLEXITY_CACHE_TABLE = "perplexity_cache"
 
 # TTLs (in hours) - imported from constants
 TTL_ANALYSIS = CACHE_TTL_ANALYSIS  # 30 days for complete analysis
@@ -109,16 +112,111 @@ def generate_content_hash(content: Any) -> str:
     return hashlib.sha256(str(content).encode()).hexdigest()[:HASH_LENGTH_SHORT]
 
 
-def generate_pdf_cache_key(report_json: Dict[str, Any]) -> str:
-    """Generate cache key for PDF based on report content"""
-    content_hash = generate_content_hash(report_json)
-    return f"pdf:{content_hash}"
+def normalize_research_query(query: str) -> str:
+    """Normalize a research query so trivially different phrasings share a cache entry"""
+    return " ".join(query.lower().split())
+
+
+def generate_perplexity_cache_key(query: str, max_tokens: int, temperature: float) -> str:
+    """Generate cache key for a Perplexity query (normalized text + generation settings)"""
+    key_string = f"{normalize_research_query(query)}|{max_tokens}|{temperature:.2f}"
+    key_hash = hashlib.sha256(key_string.encode()).hexdigest()[:HASH_LENGTH_SHORT]
+
+    return f"perplexity:{key_hash}"
+
+
+def generate_pdf_cache_key(
+    report_json: Dict[str, Any],
+    submission_data: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Generate cache key for PDF based on everything that ends up in the document
+
+    Key includes: report content + submission fields rendered in the PDF + renderer version,
+    so the same inputs always map to the same artifact (and ETag)
+    """
+    content_hash = generate_content_hash({
+        "report": report_json,
+        "submission": submission_data or {}
+    })
+    return f"pdf:v{PDF_RENDERER_VERSION}:{content_hash}"
+
+
+# ============================================================================
+# TIMESTAMPS
+# ============================================================================
+
+def _parse_utc(value: str) -> datetime:
+    """Supabase timestamp (with or without offset) as naive UTC"""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _epoch(value: str) -> float:
+    return _parse_utc(value).replace(tzinfo=timezone.utc).timestamp()
 
 
 # ============================================================================
 # ANALYSIS RESULT CACHING (MOST IMPORTANT - SAVES $15-25 PER HIT)
 # ============================================================================
 
+class _AnalysisCacheTable(PersistentTier):
+    """analysis_cache rows; every read slides the TTL window via last_accessed_at"""
+
+    async def load(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        cutoff_time = (datetime.utcnow() - timedelta(hours=TTL_ANALYSIS)).isoformat()
+
+        result = supabase_service.table(ANALYSIS_CACHE_TABLE)\
+            .select("*")\
+            .eq("cache_key", key)\
+            .gte("last_accessed_at", cutoff_time)\
+            .limit(1)\
+            .execute()
+
+        if not result.data:
+            return None
+
+        record = result.data[0]
+
+        # Hit stats and the sliding TTL are written in bulk by the hit counter
+        cache_hit_counter.record(ANALYSIS_CACHE_TABLE, key)
+
+        logger.info(f"[CACHE] 🎯 Database analysis hit: {key}")
+        return {
+            "analysis": json.loads(record["analysis_json"]),
+            "cost_saved": record["cost_saved"],
+            "cached_at": record["created_at"]
+        }, None
+
+    async def store(self, key: str, value: Any, ttl_seconds: float, metadata: Dict[str, Any]) -> bool:
+        record = {
+            "cache_key": key,
+            "company": metadata["company"].lower().strip(),
+            "industry": metadata["industry"].lower().strip(),
+            "challenge_snippet": (metadata.get("challenge") or "")[:MAX_CHALLENGE_DB_LENGTH],
+            "content_hash": generate_content_hash(value["analysis"]),
+            "analysis_json": json.dumps(value["analysis"], ensure_ascii=False),
+            "cost_saved": value["cost_saved"],  # Track how much we save per hit
+            "processing_time_seconds": metadata.get("processing_time"),
+            "created_at": value["cached_at"],
+            "last_accessed_at": value["cached_at"],
+            "hit_count": 0
+        }
+
+        result = supabase_service.table(ANALYSIS_CACHE_TABLE).insert(record).execute()
+        return bool(result.data)
+
+
+analysis_cache = TieredCache(
+    "analysis",
+    ttl_seconds=TTL_ANALYSIS * 3600,
+    persistence=_AnalysisCacheTable(),
+    redis=True
+)
+
+
 async def cache_analysis_result(
     company: str,
     industry: str,
@@ -135,34 +233,27 @@ async def cache_analysis_result(
     """
     try:
         cache_key = generate_analysis_cache_key(company, industry, challenge, website)
-        content_hash = generate_content_hash(analysis_result)
 
-        # Store in Supabase
-        record = {
-            "cache_key": cache_key,
-            "company": company.lower().strip(),
-            "industry": industry.lower().strip(),
-            "challenge_snippet": (challenge or "")[:MAX_CHALLENGE_DB_LENGTH],
-            "content_hash": content_hash,
-            "analysis_json": json.dumps(analysis_result, ensure_ascii=False),
-            "cost_saved": cost,  # Track how much we save per hit
-            "processing_time_seconds": processing_time,
-            "created_at": datetime.utcnow().isoformat(),
-            "last_accessed_at": datetime.utcnow().isoformat(),
-            "hit_count": 0
-        }
-
-        result = supabase_service.table(ANALYSIS_CACHE_TABLE).insert(record).execute()
-
-        if result.data:
-            # Store in memory for fast access
-            _analysis_cache[cache_key] = {
+        stored = await analysis_cache.set(
+            cache_key,
+            {
                 "analysis": analysis_result,
                 "cost_saved": cost,
-                "cached_at": datetime.utcnow()
+                "cached_at": datetime.utcnow().isoformat()
+            },
+            metadata={
+                "company": company,
+                "industry": industry,
+                "challenge": challenge,
+                "processing_time": processing_time
             }
+        )
 
+        if stored:
             logger.info(f"[CACHE] ✅ Cached analysis: {cache_key} (saves ${cost:.2f} per hit)")
+            if challenge:
+                # Reworded challenges for the same company can reuse this analysis
+                await challenge_index.add("analysis", challenge_scope(company, industry, website), challenge, cache_key)
             return True
 
         return False
@@ -185,82 +276,119 @@ async def get_cached_analysis(
     """
     Retrieve cached analysis if available
 
+    Falls back to the analysis of a near-duplicate challenge (same company,
+    industry and website) when the exact key misses.
+
     Returns analysis + metadata about cache hit
     """
     try:
         cache_key = generate_analysis_cache_key(company, industry, challenge, website)
 
-        # Check in-memory cache first (fastest)
-        if cache_key in _analysis_cache:
-            cached = _analysis_cache[cache_key]
-            age = (datetime.utcnow() - cached["cached_at"]).total_seconds() / 3600
-
-            if age < TTL_ANALYSIS:
-                logger.info(f"[CACHE] 🎯 In-memory analysis hit: {cache_key} (saves ${cached['cost_saved']:.2f})")
-                return {
-                    "analysis": cached["analysis"],
-                    "cache_hit": True,
-                    "cache_age_hours": age,
-                    "cost_saved": cached["cost_saved"]
-                }
-
-        # Check database
-        cutoff_time = (datetime.utcnow() - timedelta(hours=TTL_ANALYSIS)).isoformat()
+        cached = await analysis_cache.get(cache_key)
+        near_match = None
+        if cached is None and challenge:
+            near_match = challenge_index.find(
+                "analysis", challenge_scope(company, industry, website), challenge, exclude=cache_key
+            )
+            if near_match is not None:
+                cached = await analysis_cache.get(near_match.cache_key)
+                if cached is None:
+                    challenge_index.discard("analysis", near_match.cache_key)
+
+        if cached is None:
+            logger.info(f"[CACHE] ❌ Analysis cache miss: {cache_key}")
+            return None
+
+        age = (datetime.utcnow() - _parse_utc(cached["cached_at"])).total_seconds() / 3600
+
+        result = {
+            "analysis": cached["analysis"],
+            "cache_hit": True,
+            "cache_age_hours": age,
+            "cost_saved": cached["cost_saved"]
+        }
+        if near_match is not None:
+            result["near_match"] = {"cache_key": near_match.cache_key, "similarity": round(near_match.similarity, 3)}
+            logger.info(
+                f"[CACHE] 🎯 Analysis near-duplicate hit: {cache_key} -> {near_match.cache_key} "
+                f"(similarity {near_match.similarity:.2f}, saves ${cached['cost_saved']:.2f})"
+            )
+        else:
+            logger.info(f"[CACHE] 🎯 Analysis hit: {cache_key} (saves ${cached['cost_saved']:.2f}, age: {age:.1f}h)")
+        return result
 
-        result = supabase_service.table(ANALYSIS_CACHE_TABLE)\
+    except Exception as e:
+        # Catch-all for unexpected issues (tier errors are already treated as misses)
+        logger.exception(f"[CACHE] Error retrieving analysis cache: {str(e)}")
+        return None
+
+
+# ============================================================================
+# PIPELINE STAGE CACHING (SAVES INDIVIDUAL AI CALLS)
+# ============================================================================
+
+class _StageCacheTable(PersistentTier):
+    """stage_cache rows; every read slides the TTL window via last_accessed_at"""
+
+    async def load(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        cutoff_time = (datetime.utcnow() - timedelta(hours=TTL_STAGE)).isoformat()
+
+        result = supabase_service.table(STAGE_CACHE_TABLE)\
             .select("*")\
-            .eq("cache_key", cache_key)\
+            .eq("cache_key", key)\
             .gte("last_accessed_at", cutoff_time)\
             .limit(1)\
             .execute()
 
-        if result.data and len(result.data) > 0:
-            record = result.data[0]
-
-            # Update hit stats
-            supabase_service.table(ANALYSIS_CACHE_TABLE)\
-                .update({
-                    "last_accessed_at": datetime.utcnow().isoformat(),
-                    "hit_count": record["hit_count"] + 1
-                })\
-                .eq("cache_key", cache_key)\
-                .execute()
-
-            # Parse and cache in memory
-            analysis = json.loads(record["analysis_json"])
-            _analysis_cache[cache_key] = {
-                "analysis": analysis,
-                "cost_saved": record["cost_saved"],
-                "cached_at": datetime.fromisoformat(record["created_at"])
-            }
+        if not result.data:
+            return None
 
-            age = (datetime.utcnow() - datetime.fromisoformat(record["created_at"])).total_seconds() / 3600
+        record = result.data[0]
 
-            logger.info(f"[CACHE] 🎯 Database analysis hit: {cache_key} (saves ${record['cost_saved']:.2f}, age: {age:.1f}h, hits: {record['hit_count']})")
+        # Hit stats and the sliding TTL are written in bulk by the hit counter
+        cache_hit_counter.record(STAGE_CACHE_TABLE, key)
 
-            return {
-                "analysis": analysis,
-                "cache_hit": True,
-                "cache_age_hours": age,
-                "cost_saved": record["cost_saved"],
-                "hit_count": record["hit_count"] + 1
-            }
+        logger.info(f"[CACHE] 🎯 Database stage hit: {record['stage_name']} (saves ${record['cost_saved']:.2f})")
+        return json.loads(record["result_json"]), None
 
-        logger.info(f"[CACHE] ❌ Analysis cache miss: {cache_key}")
-        return None
+    async def store(self, key: str, value: Any, ttl_seconds: float, metadata: Dict[str, Any]) -> bool:
+        record = {
+            "cache_key": key,
+            "stage_name": metadata["stage_name"],
+            "company": metadata["company"].lower().strip(),
+            "industry": metadata["industry"].lower().strip(),
+            "input_hash": metadata["input_hash"],
+            "result_json": json.dumps(value, ensure_ascii=False),
+            "cost_saved": metadata["cost"],
+            "created_at": datetime.utcnow().isoformat(),
+            "last_accessed_at": datetime.utcnow().isoformat(),
+            "hit_count": 0
+        }
 
-    except json.JSONDecodeError as e:
-        logger.error(f"[CACHE] ❌ JSON deserialization failed for analysis cache: {str(e)}", exc_info=True)
-        return None
-    except Exception as e:
-        # Catch-all for database errors or unexpected issues
-        logger.exception(f"[CACHE] Error retrieving analysis cache: {str(e)}")
-        return None
+        result = supabase_service.table(STAGE_CACHE_TABLE).insert(record).execute()
+        return bool(result.data)
 
 
-# ============================================================================
-# PIPELINE STAGE CACHING (SAVES INDIVIDUAL AI CALLS)
-# ============================================================================
+stage_cache = TieredCache(
+    "stage",
+    ttl_seconds=TTL_STAGE * 3600,
+    persistence=_StageCacheTable(),
+    redis=True
+)
+
+
+def _stage_challenge_scope(
+    stage_name: str,
+    company: str,
+    industry: str,
+    input_data: Dict[str, Any]
+) -> Optional[Tuple[str, str]]:
+    """(scope, challenge) for stages reusable across reworded challenges, None otherwise"""
+    if stage_name not in CHALLENGE_INDEX_STAGES or not input_data.get("challenge"):
+        return None
+    rest = {k: v for k, v in input_data.items() if k != "challenge"}
+    return challenge_scope(stage_name, company, industry, generate_content_hash(rest)), input_data["challenge"]
+
 
 async def cache_stage_result(
     stage_name: str,
@@ -275,27 +403,23 @@ async def cache_stage_result(
         input_hash = generate_content_hash(input_data)
         cache_key = generate_stage_cache_key(stage_name, company, industry, input_hash)
 
-        record = {
-            "cache_key": cache_key,
-            "stage_name": stage_name,
-            "company": company.lower().strip(),
-            "industry": industry.lower().strip(),
-            "input_hash": input_hash,
-            "result_json": json.dumps(stage_result, ensure_ascii=False),
-            "cost_saved": cost,
-            "created_at": datetime.utcnow().isoformat(),
-            "last_accessed_at": datetime.utcnow().isoformat(),
-            "hit_count": 0
-        }
-
-        result = supabase_service.table(STAGE_CACHE_TABLE).insert(record).execute()
-
-        if result.data:
-            _stage_cache[cache_key] = {
-                "result": stage_result,
-                "cached_at": datetime.utcnow()
+        stored = await stage_cache.set(
+            cache_key,
+            stage_result,
+            metadata={
+                "stage_name": stage_name,
+                "company": company,
+                "industry": industry,
+                "input_hash": input_hash,
+                "cost": cost
             }
+        )
+
+        if stored:
             logger.info(f"[CACHE] ✅ Cached stage '{stage_name}': {cache_key} (saves ${cost:.2f})")
+            near_duplicate = _stage_challenge_scope(stage_name, company, industry, input_data)
+            if near_duplicate:
+                await challenge_index.add(stage_name, near_duplicate[0], near_duplicate[1], cache_key)
             return True
 
         return False
@@ -320,54 +444,121 @@ async def get_cached_stage_result(
         input_hash = generate_content_hash(input_data)
         cache_key = generate_stage_cache_key(stage_name, company, industry, input_hash)
 
-        # Check in-memory
-        if cache_key in _stage_cache:
-            cached = _stage_cache[cache_key]
-            age = (datetime.utcnow() - cached["cached_at"]).total_seconds() / 3600
+        stage_result = await stage_cache.get(cache_key)
+        if stage_result is not None:
+            logger.info(f"[CACHE] 🎯 Stage hit: {stage_name}")
+            return stage_result
 
-            if age < TTL_STAGE:
-                logger.info(f"[CACHE] 🎯 In-memory stage hit: {stage_name}")
-                return cached["result"]
+        near_duplicate = _stage_challenge_scope(stage_name, company, industry, input_data)
+        if near_duplicate:
+            match = challenge_index.find(stage_name, near_duplicate[0], near_duplicate[1], exclude=cache_key)
+            if match is not None:
+                stage_result = await stage_cache.get(match.cache_key)
+                if stage_result is None:
+                    challenge_index.discard(stage_name, match.cache_key)
+                else:
+                    logger.info(f"[CACHE] 🎯 Stage near-duplicate hit: {stage_name} (similarity {match.similarity:.2f})")
+        return stage_result
 
-        # Check database
-        cutoff_time = (datetime.utcnow() - timedelta(hours=TTL_STAGE)).isoformat()
+    except Exception as e:
+        # Catch-all for unexpected issues (tier errors are already treated as misses)
+        logger.exception(f"[CACHE] Error retrieving stage cache: {str(e)}")
+        return None
 
-        result = supabase_service.table(STAGE_CACHE_TABLE)\
-            .select("*")\
-            .eq("cache_key", cache_key)\
-            .gte("last_accessed_at", cutoff_time)\
+
+async def delete_cached_stage_result(
+    stage_name: str,
+    company: str,
+    industry: str,
+    input_data: Dict[str, Any]
+) -> None:
+    """
+    Drop a stage result from every tier
+
+    Raises:
+        Exception: If the database delete fails
+    """
+    input_hash = generate_content_hash(input_data)
+    cache_key = generate_stage_cache_key(stage_name, company, industry, input_hash)
+
+    await stage_cache.delete(cache_key)
+    supabase_service.table(STAGE_CACHE_TABLE)\
+        .delete()\
+        .eq("cache_key", cache_key)\
+        .execute()
+
+
+# ============================================================================
+# PERPLEXITY QUERY CACHING (SAVES REPEATED WEB RESEARCH)
+# ============================================================================
+
+class _PerplexityCacheTable(PersistentTier):
+    """perplexity_cache rows; TTL counts from creation so research does not go stale"""
+
+    async def load(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        cutoff_time = (datetime.utcnow() - timedelta(hours=TTL_PERPLEXITY)).isoformat()
+
+        result = supabase_service.table(PERPLEXITY_CACHE_TABLE)\
+            .select("result_text, created_at")\
+            .eq("cache_key", key)\
+            .gte("created_at", cutoff_time)\
             .limit(1)\
             .execute()
 
-        if result.data and len(result.data) > 0:
-            record = result.data[0]
-
-            # Update stats
-            supabase_service.table(STAGE_CACHE_TABLE)\
-                .update({
-                    "last_accessed_at": datetime.utcnow().isoformat(),
-                    "hit_count": record["hit_count"] + 1
-                })\
-                .eq("cache_key", cache_key)\
-                .execute()
-
-            stage_result = json.loads(record["result_json"])
-            _stage_cache[cache_key] = {
-                "result": stage_result,
-                "cached_at": datetime.utcnow()
-            }
+        if not result.data:
+            return None
 
-            logger.info(f"[CACHE] 🎯 Database stage hit: {stage_name} (saves ${record['cost_saved']:.2f})")
-            return stage_result
+        record = result.data[0]
+        cache_hit_counter.record(PERPLEXITY_CACHE_TABLE, key)
 
-        return None
+        return record["result_text"], _epoch(record["created_at"]) + TTL_PERPLEXITY * 3600
+
+    async def store(self, key: str, value: Any, ttl_seconds: float, metadata: Dict[str, Any]) -> bool:
+        record = {
+            "cache_key": key,
+            "query": normalize_research_query(metadata["query"])[:MAX_CHALLENGE_DB_LENGTH],
+            "result_text": value,
+            "created_at": datetime.utcnow().isoformat(),
+            "last_accessed_at": datetime.utcnow().isoformat(),
+            "hit_count": 0
+        }
+
+        supabase_service.table(PERPLEXITY_CACHE_TABLE).upsert(record, on_conflict="cache_key").execute()
+        return True
+
+
+perplexity_cache = TieredCache(
+    "perplexity",
+    ttl_seconds=TTL_PERPLEXITY * 3600,
+    persistence=_PerplexityCacheTable(),
+    redis=True
+)
+
+
+async def cache_perplexity_result(cache_key: str, query: str, result: str) -> bool:
+    """Cache a Perplexity research answer under its normalized query key"""
+    try:
+        await perplexity_cache.set(cache_key, result, metadata={"query": query})
+        logger.info(f"[CACHE] ✅ Cached Perplexity query: {cache_key}")
+        return True
 
-    except json.JSONDecodeError as e:
-        logger.error(f"[CACHE] ❌ JSON deserialization failed for stage cache: {str(e)}", exc_info=True)
-        return None
     except Exception as e:
         # Catch-all for database errors or unexpected issues
-        logger.exception(f"[CACHE] Error retrieving stage cache: {str(e)}")
+        logger.exception(f"[CACHE] Failed to cache Perplexity query: {str(e)}")
+        return False
+
+
+async def get_cached_perplexity_result(cache_key: str) -> Optional[str]:
+    """Retrieve cached Perplexity research answer if available"""
+    try:
+        result = await perplexity_cache.get(cache_key)
+        if result is not None:
+            logger.info(f"[CACHE] 🎯 Perplexity hit: {cache_key}")
+        return result
+
+    except Exception as e:
+        # Catch-all for unexpected issues (tier errors are already treated as misses)
+        logger.exception(f"[CACHE] Error retrieving Perplexity cache: {str(e)}")
         return None
 
 
@@ -375,93 +566,145 @@ async def get_cached_stage_result(
 # PDF CACHING (SAVES COMPUTATION TIME)
 # ============================================================================
 
-async def cache_pdf(
-    report_json: Dict[str, Any],
-    pdf_bytes: bytes,
-    submission_id: int
-) -> bool:
-    """Cache generated PDF"""
-    try:
-        cache_key = generate_pdf_cache_key(report_json)
+def _pdf_storage_path(cache_key: str) -> str:
+    return f"{cache_key.replace(':', '/')}.pdf"
+
+
+class _PdfArtifactStorage(PersistentTier):
+    """PDF binaries in Supabase Storage, metadata rows in pdf_cache"""
 
-        # Note: Storing large binary data in Supabase can be expensive
-        # Consider using Supabase Storage instead for production
-        # For now, we'll cache metadata and reference file system
+    async def load(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        try:
+            pdf_bytes = await asyncio.to_thread(
+                supabase_service.storage.from_(PDF_STORAGE_BUCKET).download,
+                _pdf_storage_path(key)
+            )
+        except Exception as e:
+            # Missing object or storage unavailable - both mean "render it"
+            logger.debug(f"[CACHE] PDF not in storage: {key} ({str(e)})")
+            return None
+
+        if not pdf_bytes:
+            return None
+
+        # Keeps the artifact alive for clear_expired_cache (written in bulk by the hit counter)
+        cache_hit_counter.record(PDF_CACHE_TABLE, key)
+
+        logger.info(f"[CACHE] 🎯 Storage PDF hit: {key}")
+        return pdf_bytes, None
+
+    async def store(self, key: str, value: Any, ttl_seconds: float, metadata: Dict[str, Any]) -> bool:
+        # Binary goes to Storage (off the event loop - PDFs are hundreds of KB)
+        await asyncio.to_thread(
+            supabase_service.storage.from_(PDF_STORAGE_BUCKET).upload,
+            _pdf_storage_path(key),
+            value,
+            {"content-type": "application/pdf", "upsert": "true"}
+        )
 
         record = {
-            "cache_key": cache_key,
-            "submission_id": submission_id,
-            "content_hash": generate_content_hash(pdf_bytes),
-            "file_size_bytes": len(pdf_bytes),
+            "cache_key": key,
+            "submission_id": metadata["submission_id"],
+            "content_hash": generate_content_hash(value),
+            "file_size_bytes": len(value),
             "created_at": datetime.utcnow().isoformat(),
             "last_accessed_at": datetime.utcnow().isoformat(),
             "hit_count": 0
         }
 
-        result = supabase_service.table(PDF_CACHE_TABLE).insert(record).execute()
+        result = supabase_service.table(PDF_CACHE_TABLE).upsert(record, on_conflict="cache_key").execute()
+        return bool(result.data)
+
+
+# Memory tier bounded by CACHE_MAX_PDF_BYTES_IN_MEMORY (see CACHE_MEMORY_LIMITS)
+pdf_cache = TieredCache(
+    "pdf",
+    ttl_seconds=TTL_PDF * 3600,
+    persistence=_PdfArtifactStorage()
+)
+
 
-        if result.data:
-            # Store in memory (limited size - only recent PDFs)
-            if len(_pdf_cache) < CACHE_MAX_PDFS_IN_MEMORY:  # Keep max N PDFs in memory (~100-250MB)
-                _pdf_cache[cache_key] = pdf_bytes
+async def cache_pdf(
+    report_json: Dict[str, Any],
+    pdf_bytes: bytes,
+    submission_id: int,
+    submission_data: Optional[Dict[str, Any]] = None
+) -> bool:
+    """Cache generated PDF (memory + Supabase Storage, metadata in pdf_cache)"""
+    try:
+        cache_key = generate_pdf_cache_key(report_json, submission_data)
 
+        if await pdf_cache.set(cache_key, pdf_bytes, metadata={"submission_id": submission_id}):
             logger.info(f"[CACHE] ✅ Cached PDF: {cache_key} ({len(pdf_bytes)/1024:.1f}KB)")
             return True
 
         return False
 
     except Exception as e:
-        # Catch-all for database errors or unexpected issues
+        # Catch-all for storage/database errors or unexpected issues
         logger.exception(f"[CACHE] Failed to cache PDF: {str(e)}")
         return False
 
 
-async def get_cached_pdf(report_json: Dict[str, Any]) -> Optional[bytes]:
-    """Retrieve cached PDF if available"""
-    try:
-        cache_key = generate_pdf_cache_key(report_json)
+async def get_cached_pdf(
+    report_json: Dict[str, Any],
+    submission_data: Optional[Dict[str, Any]] = None
+) -> Optional[bytes]:
+    """Retrieve cached PDF if available (memory first, then Supabase Storage)"""
+    return await pdf_cache.get(generate_pdf_cache_key(report_json, submission_data))
 
-        # Check in-memory
-        if cache_key in _pdf_cache:
-            logger.info(f"[CACHE] 🎯 In-memory PDF hit: {cache_key}")
-            return _pdf_cache[cache_key]
 
-        # For production: retrieve from Supabase Storage or file system
-        # For now, we rely on in-memory cache
+# ============================================================================
+# DASHBOARD STATS CACHING (SHORT TTL, HIGH FREQUENCY)
+# ============================================================================
 
-        return None
+DASHBOARD_STATS_KEY = "dashboard:stats:latest"
 
-    except Exception as e:
-        # Catch-all for database errors or unexpected issues
-        logger.exception(f"[CACHE] Error retrieving PDF cache: {str(e)}")
-        return None
 
+class _StatsCacheTable(PersistentTier):
+    """stats_cache rows with an absolute expires_at"""
 
-# ============================================================================
-# DASHBOARD STATS CACHING (SHORT TTL, HIGH FREQUENCY)
-# ============================================================================
+    async def load(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        result = supabase_service.table(STATS_CACHE_TABLE)\
+            .select("*")\
+            .eq("cache_key", key)\
+            .gte("expires_at", datetime.utcnow().isoformat())\
+            .limit(1)\
+            .execute()
 
-async def cache_dashboard_stats(stats: Dict[str, Any]) -> bool:
-    """Cache dashboard statistics (short TTL - 5 minutes)"""
-    try:
-        cache_key = "dashboard:stats:latest"
+        if not result.data:
+            return None
 
+        record = result.data[0]
+        return json.loads(record["stats_json"]), _epoch(record["expires_at"])
+
+    async def store(self, key: str, value: Any, ttl_seconds: float, metadata: Dict[str, Any]) -> bool:
         record = {
-            "cache_key": cache_key,
-            "stats_json": json.dumps(stats, ensure_ascii=False),
+            "cache_key": key,
+            "stats_json": json.dumps(value, ensure_ascii=False),
             "created_at": datetime.utcnow().isoformat(),
-            "expires_at": (datetime.utcnow() + timedelta(hours=TTL_STATS)).isoformat()
+            "expires_at": (datetime.utcnow() + timedelta(seconds=ttl_seconds)).isoformat()
         }
 
         # Upsert (update if exists, insert if not)
         supabase_service.table(STATS_CACHE_TABLE)\
             .upsert(record, on_conflict="cache_key")\
             .execute()
+        return True
+
+
+stats_cache = TieredCache(
+    "stats",
+    ttl_seconds=TTL_STATS * 3600,
+    persistence=_StatsCacheTable(),
+    redis=True
+)
 
-        _stats_cache[cache_key] = {
-            "stats": stats,
-            "cached_at": datetime.utcnow()
-        }
+
+async def cache_dashboard_stats(stats: Dict[str, Any]) -> bool:
+    """Cache dashboard statistics (short TTL - 5 minutes)"""
+    try:
+        await stats_cache.set(DASHBOARD_STATS_KEY, stats)
 
         logger.info(f"[CACHE] ✅ Cached dashboard stats (TTL: {TTL_STATS*60:.0f}min)")
         return True
@@ -478,45 +721,46 @@ async def cache_dashboard_stats(stats: Dict[str, Any]) -> bool:
 async def get_cached_dashboard_stats() -> Optional[Dict[str, Any]]:
     """Retrieve cached dashboard stats if fresh"""
     try:
-        cache_key = "dashboard:stats:latest"
+        stats = await stats_cache.get(DASHBOARD_STATS_KEY)
+        if stats is not None:
+            logger.info(f"[CACHE] 🎯 Dashboard stats hit")
+        return stats
 
-        # Check in-memory first
-        if cache_key in _stats_cache:
-            cached = _stats_cache[cache_key]
-            age_seconds = (datetime.utcnow() - cached["cached_at"]).total_seconds()
+    except Exception as e:
+        # Catch-all for unexpected issues (tier errors are already treated as misses)
+        logger.exception(f"[CACHE] Error retrieving stats cache: {str(e)}")
+        return None
 
-            if age_seconds < TTL_STATS * 3600:
-                logger.info(f"[CACHE] 🎯 In-memory stats hit (age: {age_seconds:.0f}s)")
-                return cached["stats"]
 
-        # Check database
-        result = supabase_service.table(STATS_CACHE_TABLE)\
-            .select("*")\
-            .eq("cache_key", cache_key)\
-            .gte("expires_at", datetime.utcnow().isoformat())\
-            .limit(1)\
-            .execute()
+def dashboard_intelligence_key(days: int) -> str:
+    return f"dashboard:intelligence:{days}d"
 
-        if result.data and len(result.data) > 0:
-            record = result.data[0]
-            stats = json.loads(record["stats_json"])
 
-            _stats_cache[cache_key] = {
-                "stats": stats,
-                "cached_at": datetime.utcnow()
-            }
+async def cache_dashboard_intelligence(days: int, intelligence: Dict[str, Any]) -> bool:
+    """Store the dashboard intelligence snapshot for a period (replaces the previous one)"""
+    try:
+        await stats_cache.set(
+            dashboard_intelligence_key(days),
+            intelligence,
+            ttl_seconds=DASHBOARD_INTELLIGENCE_SNAPSHOT_TTL_SECONDS
+        )
+        logger.info(f"[CACHE] ✅ Cached dashboard intelligence snapshot ({days}d)")
+        return True
 
-            logger.info(f"[CACHE] 🎯 Database stats hit")
-            return stats
+    except Exception as e:
+        # Catch-all for database errors or unexpected issues
+        logger.exception(f"[CACHE] Failed to cache dashboard intelligence: {str(e)}")
+        return False
 
-        return None
 
-    except json.JSONDecodeError as e:
-        logger.error(f"[CACHE] ❌ JSON deserialization failed for stats cache: {str(e)}", exc_info=True)
-        return None
+async def get_cached_dashboard_intelligence(days: int) -> Optional[Dict[str, Any]]:
+    """Latest dashboard intelligence snapshot for a period, or None"""
+    try:
+        return await stats_cache.get(dashboard_intelligence_key(days))
+
     except Exception as e:
-        # Catch-all for database errors or unexpected issues
-        logger.exception(f"[CACHE] Error retrieving stats cache: {str(e)}")
+        # Catch-all for unexpected issues (tier errors are already treated as misses)
+        logger.exception(f"[CACHE] Error retrieving dashboard intelligence: {str(e)}")
         return None
 
 
@@ -529,30 +773,40 @@ async def get_cache_statistics() -> Dict[str, Any]:
     try:
         stats = {}
 
-        # Analysis cache stats
+        # Analysis cache stats (hit_count plus hits not yet flushed by the hit counter)
         analysis_result = supabase_service.table(ANALYSIS_CACHE_TABLE)\
-            .select("cost_saved, hit_count", count="exact")\
+            .select("cache_key, cost_saved, hit_count", count="exact")\
             .execute()
 
         if analysis_result.data:
-            total_cost_saved = sum(r.get("cost_saved", 0) * r.get("hit_count", 0) for r in analysis_result.data)
+            pending = cache_hit_counter.pending(ANALYSIS_CACHE_TABLE)
+            total_cost_saved = sum(
+                r.get("cost_saved", 0) * (r.get("hit_count", 0) + pending.get(r.get("cache_key"), 0))
+                for r in analysis_result.data
+            )
             stats["analysis_cache"] = {
                 "total_records": len(analysis_result.data),
                 "total_cost_saved": round(total_cost_saved, 2),
-                "in_memory_size": len(_analysis_cache)
+                "pending_hits": sum(pending.values()),
+                "in_memory_size": len(analysis_cache)
             }
 
         # Stage cache stats
         stage_result = supabase_service.table(STAGE_CACHE_TABLE)\
-            .select("cost_saved, hit_count", count="exact")\
+            .select("cache_key, cost_saved, hit_count", count="exact")\
             .execute()
 
         if stage_result.data:
-            total_stage_saved = sum(r.get("cost_saved", 0) * r.get("hit_count", 0) for r in stage_result.data)
+            pending = cache_hit_counter.pending(STAGE_CACHE_TABLE)
+            total_stage_saved = sum(
+                r.get("cost_saved", 0) * (r.get("hit_count", 0) + pending.get(r.get("cache_key"), 0))
+                for r in stage_result.data
+            )
             stats["stage_cache"] = {
                 "total_records": len(stage_result.data),
                 "total_cost_saved": round(total_stage_saved, 2),
-                "in_memory_size": len(_stage_cache)
+                "pending_hits": sum(pending.values()),
+                "in_memory_size": len(stage_cache)
             }
 
         # PDF cache stats
@@ -565,9 +819,12 @@ async def get_cache_statistics() -> Dict[str, Any]:
             stats["pdf_cache"] = {
                 "total_records": len(pdf_result.data),
                 "total_size_mb": round(total_pdf_size / 1024 / 1024, 2),
-                "in_memory_size": len(_pdf_cache)
+                "in_memory_size": len(pdf_cache),
+                "in_memory_mb": round(pdf_cache.memory.bytes / 1024 / 1024, 2)
             }
 
+        stats["hit_counter"] = cache_hit_counter.get_stats()
+
         # Overall savings
         stats["total_cost_saved"] = round(
             stats.get("analysis_cache", {}).get("total_cost_saved", 0) +
@@ -611,6 +868,10 @@ async def clear_expired_cache() -> Dict[str, int]:
             .lt("last_accessed_at", cutoff_pdf)\
             .execute()
         cleared["pdfs"] = len(pdf_result.data) if pdf_result.data else 0
+        if pdf_result.data:
+            supabase_service.storage.from_(PDF_STORAGE_BUCKET).remove(
+                [_pdf_storage_path(r["cache_key"]) for r in pdf_result.data]
+            )
 
         # Clear expired stats cache
         stats_result = supabase_service.table(STATS_CACHE_TABLE)\
@@ -619,6 +880,14 @@ async def clear_expired_cache() -> Dict[str, int]:
             .execute()
         cleared["stats"] = len(stats_result.data) if stats_result.data else 0
 
+        # Clear expired Perplexity cache
+        cutoff_perplexity = (datetime.utcnow() - timedelta(hours=TTL_PERPLEXITY)).isoformat()
+        perplexity_result = supabase_service.table(PERPLEXITY_CACHE_TABLE)\
+            .delete()\
+            .lt("created_at", cutoff_perplexity)\
+            .execute()
+        cleared["perplexity"] = len(perplexity_result.data) if perplexity_result.data else 0
+
         logger.info(f"[CACHE] 🧹 Cleared expired cache: {cleared}")
         return cleared
 
@@ -0,0 +1,245 @@
+"""
+Challenge Index - Near-duplicate matching of business challenges
+MinHash signatures over word shingles with LSH banding, partitioned by scope
+(company/industry/website), so reworded challenges can reuse cached analyses
+and stage-1 extractions. In memory, persisted to Supabase (challenge_index).
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import re
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from app.core.constants import (
+    CHALLENGE_INDEX_LOAD_LIMIT,
+    CHALLENGE_INDEX_MAX_ENTRIES,
+    CHALLENGE_LSH_BANDS,
+    CHALLENGE_MINHASH_PERMUTATIONS,
+    CHALLENGE_SIMILARITY_THRESHOLD
+)
+from app.core.supabase import supabase_service
+
+logger = logging.getLogger(__name__)
+
+CHALLENGE_INDEX_TABLE = "challenge_index"
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MINHASH_SEED = 1_000_003  # Fixed so signatures persisted by one process match in another
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_challenge(text: str) -> List[str]:
+    """Lowercased, accent-free word tokens ("Expansão" and "expansao" are the same word)"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return [token for token in _TOKEN_RE.findall(stripped.lower()) if len(token) > 1]
+
+
+def shingles(text: str) -> FrozenSet[str]:
+    """Word unigrams (robust to reordering) plus bigrams (keep some phrasing)"""
+    tokens = normalize_challenge(text)
+    grams = set(tokens)
+    grams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return frozenset(grams)
+
+
+def _stable_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+
+
+class MinHasher:
+    """Signatures whose per-position agreement estimates Jaccard similarity"""
+
+    def __init__(self, permutations: int = CHALLENGE_MINHASH_PERMUTATIONS, seed: int = _MINHASH_SEED):
+        rng = random.Random(seed)
+        self.permutations = permutations
+        self._coefficients = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(permutations)
+        ]
+
+    def signature(self, grams: FrozenSet[str]) -> Tuple[int, ...]:
+        if not grams:
+            return tuple([_MERSENNE_PRIME] * self.permutations)
+        hashes = [_stable_hash(gram) for gram in grams]
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in self._coefficients
+        )
+
+
+def estimate_similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+@dataclass
+class ChallengeMatch:
+    """A near-duplicate entry found in the index"""
+    cache_key: str
+    similarity: float
+
+
+@dataclass
+class _IndexEntry:
+    kind: str
+    scope: str
+    signature: Tuple[int, ...]
+
+
+class ChallengeIndex:
+    """
+    Near-duplicate challenge lookup for cache reuse
+
+    Entries are (kind, scope, challenge) -> cache_key, where kind is "analysis"
+    or a stage name and scope holds everything else the cache key depends on.
+    Only entries with the same kind and scope are compared. Candidates come
+    from LSH buckets (bands of the signature) and are accepted when the
+    estimated similarity reaches the threshold. Oldest entries are evicted
+    beyond max_entries.
+
+    Example:
+        match = challenge_index.find("analysis", scope, "Aumentar receita no Brasil")
+        if match:
+            cached = await analysis_cache.get(match.cache_key)
+    """
+
+    def __init__(
+        self,
+        threshold: float = CHALLENGE_SIMILARITY_THRESHOLD,
+        permutations: int = CHALLENGE_MINHASH_PERMUTATIONS,
+        bands: int = CHALLENGE_LSH_BANDS,
+        max_entries: int = CHALLENGE_INDEX_MAX_ENTRIES,
+        persist: bool = True
+    ):
+        if permutations % bands:
+            raise ValueError("permutations must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = permutations // bands
+        self.max_entries = max_entries
+        self.persist = persist
+        self.hasher = MinHasher(permutations)
+        self._entries: "OrderedDict[Tuple[str, str], _IndexEntry]" = OrderedDict()  # (kind, cache_key)
+        self._buckets: Dict[Tuple, Set[str]] = {}
+        self.stats = {"lookups": 0, "matches": 0, "candidates": 0, "persist_errors": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _band_keys(self, kind: str, scope: str, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            yield (kind, scope, band, hash(chunk))
+
+    def _insert(self, kind: str, scope: str, cache_key: str, signature: Tuple[int, ...]) -> None:
+        self._remove(kind, cache_key)
+        self._entries[(kind, cache_key)] = _IndexEntry(kind, scope, signature)
+        for band_key in self._band_keys(kind, scope, signature):
+            self._buckets.setdefault(band_key, set()).add(cache_key)
+
+        while len(self._entries) > self.max_entries:
+            (old_kind, old_key), _ = next(iter(self._entries.items()))
+            self._remove(old_kind, old_key)
+
+    def _remove(self, kind: str, cache_key: str) -> None:
+        entry = self._entries.pop((kind, cache_key), None)
+        if entry is None:
+            return
+        for band_key in self._band_keys(kind, entry.scope, entry.signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(cache_key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    async def add(self, kind: str, scope: str, challenge: str, cache_key: str) -> None:
+        """Index a cached result under its challenge (and persist it)"""
+        signature = self.hasher.signature(shingles(challenge))
+        self._insert(kind, scope, cache_key, signature)
+
+        if not self.persist:
+            return
+        try:
+            await asyncio.to_thread(_store_entry, kind, scope, cache_key, signature)
+        except Exception as e:
+            # The in-memory entry still serves this process
+            self.stats["persist_errors"] += 1
+            logger.warning(f"[CACHE] Failed to persist challenge index entry {cache_key}: {e}")
+
+    def find(self, kind: str, scope: str, challenge: str, exclude: Optional[str] = None) -> Optional[ChallengeMatch]:
+        """Most similar indexed challenge with the same kind and scope, if it reaches the threshold"""
+        self.stats["lookups"] += 1
+        signature = self.hasher.signature(shingles(challenge))
+
+        candidates: Set[str] = set()
+        for band_key in self._band_keys(kind, scope, signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        candidates.discard(exclude)
+        self.stats["candidates"] += len(candidates)
+
+        best: Optional[ChallengeMatch] = None
+        for cache_key in candidates:
+            similarity = estimate_similarity(signature, self._entries[(kind, cache_key)].signature)
+            if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                best = ChallengeMatch(cache_key, similarity)
+
+        if best is not None:
+            self.stats["matches"] += 1
+        return best
+
+    def discard(self, kind: str, cache_key: str) -> None:
+        """Forget an entry whose cached result is gone"""
+        self._remove(kind, cache_key)
+
+    async def load(self, limit: int = CHALLENGE_INDEX_LOAD_LIMIT) -> int:
+        """Fill the index with the most recent persisted entries"""
+        rows = await asyncio.to_thread(_load_entries, limit)
+        for row in reversed(rows):  # Oldest first so the newest are evicted last
+            self._insert(row["kind"], row["scope"], row["cache_key"], tuple(row["signature"]))
+        return len(rows)
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, "entries": len(self._entries), "threshold": self.threshold}
+
+
+def _store_entry(kind: str, scope: str, cache_key: str, signature: Tuple[int, ...]) -> None:
+    supabase_service.table(CHALLENGE_INDEX_TABLE).upsert(
+        {"kind": kind, "scope": scope, "cache_key": cache_key, "signature": list(signature)},
+        on_conflict="kind,cache_key"
+    ).execute()
+
+
+def _load_entries(limit: int) -> List[Dict]:
+    result = supabase_service.table(CHALLENGE_INDEX_TABLE)\
+        .select("kind, scope, cache_key, signature")\
+        .order("created_at", desc=True)\
+        .limit(limit)\
+        .execute()
+    return result.data or []
+
+
+def challenge_scope(*parts) -> str:
+    """Scope string from the non-challenge parts of a cache key"""
+    key_string = "|".join(str(part or "").lower().strip() for part in parts)
+    return hashlib.sha256(key_string.encode()).hexdigest()[:32]
+
+
+# Global challenge index instance (analysis and stage caches)
+challenge_index = ChallengeIndex()
+
+
+async def init_challenge_index(threshold: float = CHALLENGE_SIMILARITY_THRESHOLD) -> None:
+    """Apply the configured threshold and load persisted entries"""
+    challenge_index.threshold = threshold
+    try:
+        loaded = await challenge_index.load()
+        logger.info(f"[CACHE] Challenge index loaded {loaded} entries (threshold {threshold:.2f})")
+    except Exception as e:
+        # Index starts empty and fills as analyses are cached
+        logger.warning(f"[CACHE] Failed to load challenge index: {e}")
@@ -5,17 +5,30 @@ Prevents cascading failures by failing fast when external services are down
 
 import time
 import logging
+import weakref
 from enum import Enum
 from typing import Callable, Any, Optional
 from datetime import datetime, timedelta
 from functools import wraps
 from dataclasses import dataclass, field
 
+from app.core.circuit_breaker_store import (
+    OUTCOME_FAILURE,
+    OUTCOME_RELEASE,
+    OUTCOME_SUCCESS,
+    BreakerSettings,
+    BreakerSnapshot,
+    BreakerStore,
+    RedisBreakerStore
+)
 from app.core.exceptions import ExternalServiceError, CircuitBreakerOpenError
 from app.core.constants import (
     CIRCUIT_BREAKER_FAILURE_THRESHOLD_DEFAULT,
     CIRCUIT_BREAKER_FAILURE_THRESHOLD_APIFY,
     CIRCUIT_BREAKER_FAILURE_THRESHOLD_SUPABASE,
+    CIRCUIT_BREAKER_FAILURE_WINDOW,
+    CIRCUIT_BREAKER_PROBE_TTL,
+    CIRCUIT_BREAKER_STATE_CACHE_SECONDS,
     CIRCUIT_BREAKER_SUCCESS_THRESHOLD,
     CIRCUIT_BREAKER_TIMEOUT_DEFAULT,
     CIRCUIT_BREAKER_TIMEOUT_APIFY,
@@ -24,8 +37,14 @@ from app.core.constants import (
 
 logger = logging.getLogger(__name__)
 
+# Shared state store for async calls (None = each process keeps its own state)
+_shared_store: Optional[BreakerStore] = None
+
+# Live breakers by name, for health monitoring
+_breakers: "weakref.WeakValueDictionary[str, CircuitBreaker]" = weakref.WeakValueDictionary()
 
-class CircuitState(Enum):
+
+class CircuitState(str, Enum):
     """Circuit breaker states"""
     CLOSED = "closed"       # Normal operation
     OPEN = "open"          # Failing, rejecting requests
@@ -61,6 +80,13 @@ class CircuitBreaker:
     - OPEN: Circuit tripped, calls fail fast without hitting service
     - HALF_OPEN: Testing if service recovered, limited calls pass through
 
+    With a shared store configured (init_circuit_breakers), async calls use
+    state shared by every process: one process discovering an outage opens
+    the circuit everywhere and only one probe runs cluster-wide. The last
+    state seen is cached locally - an open circuit rejects without a Redis
+    read until it is due a probe, a closed one is re-read at most every
+    CIRCUIT_BREAKER_STATE_CACHE_SECONDS. Sync calls keep per-process state.
+
     Example:
         breaker = CircuitBreaker(
             name="OpenRouter API",
@@ -95,6 +121,13 @@ class CircuitBreaker:
         self._last_failure_time: Optional[float] = None
         self._stats = CircuitBreakerStats()
 
+        # Last shared state seen (shared mode only)
+        self._shared: Optional[BreakerSnapshot] = None
+        self._shared_at = 0.0
+        self._open_until = 0.0  # Monotonic deadline of an open shared circuit
+
+        _breakers[name] = self
+
         logger.info(
             f"[CIRCUIT BREAKER] Initialized for '{name}' "
             f"(threshold: {failure_threshold}, timeout: {timeout}s)"
@@ -103,6 +136,11 @@ class CircuitBreaker:
     @property
     def state(self) -> CircuitState:
         """Get current circuit state"""
+        if self._shared is not None:
+            if self._shared.state == CircuitState.OPEN and time.monotonic() >= self._open_until:
+                return CircuitState.HALF_OPEN
+            return CircuitState(self._shared.state)
+
         # Check if we should transition from OPEN to HALF_OPEN
         if (
             self._state == CircuitState.OPEN
@@ -127,19 +165,9 @@ class CircuitBreaker:
         Raises:
             CircuitBreakerOpenError: If circuit is open
         """
-        current_state = self.state
-
         # Reject if circuit is OPEN
-        if current_state == CircuitState.OPEN:
-            self._stats.rejected_calls += 1
-            logger.warning(
-                f"[CIRCUIT BREAKER] '{self.name}' is OPEN, rejecting call "
-                f"(rejections: {self._stats.rejected_calls})"
-            )
-            raise CircuitBreakerOpenError(
-                f"Circuit breaker '{self.name}' is OPEN. Service unavailable.",
-                service_name=self.name
-            )
+        if self.state == CircuitState.OPEN:
+            self._reject()
 
         # Try the call
         self._stats.total_calls += 1
@@ -167,29 +195,17 @@ class CircuitBreaker:
         Raises:
             CircuitBreakerOpenError: If circuit is open
         """
-        current_state = self.state
-
-        # Reject if circuit is OPEN
-        if current_state == CircuitState.OPEN:
-            self._stats.rejected_calls += 1
-            logger.warning(
-                f"[CIRCUIT BREAKER] '{self.name}' is OPEN, rejecting call "
-                f"(rejections: {self._stats.rejected_calls})"
-            )
-            raise CircuitBreakerOpenError(
-                f"Circuit breaker '{self.name}' is OPEN. Service unavailable.",
-                service_name=self.name
-            )
+        probe = await self.before_call()
 
         # Try the call
         self._stats.total_calls += 1
         try:
             result = await func(*args, **kwargs)
-            self._on_success()
+            await self.record_success(probe)
             return result
 
         except self.config.expected_exceptions as e:
-            self._on_failure()
+            await self.record_failure(probe)
             raise
 
         except Exception as e:
@@ -198,8 +214,116 @@ class CircuitBreaker:
                 f"[CIRCUIT BREAKER] '{self.name}' unexpected error: {e}",
                 exc_info=True
             )
+            if probe:
+                await self._record_shared(OUTCOME_RELEASE, probe)
             raise
 
+    def _reject(self):
+        self._stats.rejected_calls += 1
+        logger.warning(
+            f"[CIRCUIT BREAKER] '{self.name}' is OPEN, rejecting call "
+            f"(rejections: {self._stats.rejected_calls})"
+        )
+        raise CircuitBreakerOpenError(
+            f"Circuit breaker '{self.name}' is OPEN. Service unavailable.",
+            service_name=self.name
+        )
+
+    def _settings(self) -> BreakerSettings:
+        return BreakerSettings(
+            failure_threshold=self.config.failure_threshold,
+            success_threshold=self.config.success_threshold,
+            failure_window=CIRCUIT_BREAKER_FAILURE_WINDOW,
+            timeout=self.config.timeout,
+            probe_ttl=CIRCUIT_BREAKER_PROBE_TTL
+        )
+
+    def _apply(self, snapshot: BreakerSnapshot):
+        """Cache the shared state and mirror it for health reporting"""
+        previous = self._shared.state if self._shared else CircuitState.CLOSED
+        now = time.monotonic()
+        self._shared, self._shared_at = snapshot, now
+        self._open_until = now + snapshot.open_for
+        self._failure_count = snapshot.failures
+        if snapshot.state != previous:
+            logger.info(f"[CIRCUIT BREAKER] '{self.name}' is {snapshot.state} (shared state)")
+
+    async def before_call(self) -> bool:
+        """
+        Admit or reject a call (async path)
+
+        Returns:
+            True if this call is the half-open probe (report it via record_*)
+
+        Raises:
+            CircuitBreakerOpenError: If circuit is open
+        """
+        store = _shared_store
+        if store is None:
+            if self.state == CircuitState.OPEN:
+                self._reject()
+            return False
+
+        # Answer from the cached shared state while it is conclusive
+        now = time.monotonic()
+        if self._shared is not None:
+            if self._shared.state == CircuitState.OPEN and now < self._open_until:
+                self._reject()
+            if (
+                self._shared.state == CircuitState.CLOSED
+                and now - self._shared_at < CIRCUIT_BREAKER_STATE_CACHE_SECONDS
+            ):
+                return False
+
+        try:
+            snapshot = await store.acquire(self.name, self._settings())
+        except Exception as e:
+            # Redis trouble must not take the provider down with it - use local state
+            logger.warning(f"[CIRCUIT BREAKER] '{self.name}' shared state unavailable: {e}")
+            if self.state == CircuitState.OPEN:
+                self._reject()
+            return False
+
+        self._apply(snapshot)
+        if snapshot.probe:
+            logger.info(f"[CIRCUIT BREAKER] '{self.name}' probing (half-open)")
+            return True
+        if snapshot.state != CircuitState.CLOSED:
+            self._reject()
+        return False
+
+    async def record_success(self, probe: bool = False):
+        """Report a successful call (async path)"""
+        if _shared_store is None:
+            self._on_success()
+            return
+
+        self._count_success()
+        # A success only changes shared state for a probe or after recent failures
+        if probe or (self._shared is not None and (
+            self._shared.failures > 0 or self._shared.state != CircuitState.CLOSED
+        )):
+            await self._record_shared(OUTCOME_SUCCESS, probe)
+
+    async def record_failure(self, probe: bool = False):
+        """Report a failed call (async path)"""
+        if _shared_store is None:
+            self._on_failure()
+            return
+
+        self._count_failure()
+        await self._record_shared(OUTCOME_FAILURE, probe)
+
+    async def _record_shared(self, outcome: str, probe: bool):
+        try:
+            self._apply(await _shared_store.record(self.name, outcome, probe, self._settings()))
+        except Exception as e:
+            logger.warning(f"[CIRCUIT BREAKER] '{self.name}' failed to record {outcome}: {e}")
+            # Keep local state moving so this process still stops paying timeouts
+            self._shared = None
+            if outcome == OUTCOME_FAILURE:
+                self._trip_local()
+
     def protect(self, func: Callable) -> Callable:
         """
         Decorator to protect a function with circuit breaker (works with sync and async)
@@ -224,11 +348,18 @@ class CircuitBreaker:
         else:
             return sync_wrapper
 
-    def _on_success(self):
-        """Handle successful call"""
+    def _count_success(self):
         self._stats.successful_calls += 1
         self._stats.last_success_time = datetime.utcnow()
 
+    def _count_failure(self):
+        self._stats.failed_calls += 1
+        self._stats.last_failure_time = datetime.utcnow()
+
+    def _on_success(self):
+        """Handle successful call"""
+        self._count_success()
+
         if self._state == CircuitState.HALF_OPEN:
             self._success_count += 1
             logger.info(
@@ -251,8 +382,11 @@ class CircuitBreaker:
 
     def _on_failure(self):
         """Handle failed call"""
-        self._stats.failed_calls += 1
-        self._stats.last_failure_time = datetime.utcnow()
+        self._count_failure()
+        self._trip_local()
+
+    def _trip_local(self):
+        """Count a failure toward the per-process state"""
         self._failure_count += 1
         self._last_failure_time = time.time()
 
@@ -284,6 +418,13 @@ class CircuitBreaker:
         self._failure_count = 0
         self._success_count = 0
         self._last_failure_time = None
+        self._shared = None
+
+    async def reset_shared(self):
+        """Reset the breaker in every process (shared mode) and locally"""
+        if _shared_store is not None:
+            await _shared_store.reset(self.name)
+        self.reset()
 
     def get_health_status(self) -> dict:
         """
@@ -371,13 +512,31 @@ supabase_breaker = CircuitBreaker(
 
 
 def get_all_circuit_breakers() -> list[CircuitBreaker]:
-    """Get all registered circuit breakers for monitoring"""
-    return [
-        openrouter_breaker,
-        apify_breaker,
-        perplexity_breaker,
-        supabase_breaker,
-    ]
+    """Get all registered circuit breakers for monitoring (service and enrichment source breakers)"""
+    return list(_breakers.values())
+
+
+def configure_circuit_breakers(store: Optional[BreakerStore]) -> None:
+    """Attach (or detach) the shared state store used by async calls"""
+    global _shared_store
+    _shared_store = store
+    for breaker in get_all_circuit_breakers():
+        breaker._shared = None
+
+
+def init_circuit_breakers(redis_enabled: bool = True) -> None:
+    """Share breaker state through Redis when enabled and Redis is configured"""
+    if not redis_enabled:
+        configure_circuit_breakers(None)
+        return
+
+    try:
+        from app.core.security.rate_limiter import get_async_redis_client
+        configure_circuit_breakers(RedisBreakerStore(get_async_redis_client()))
+        logger.info("[CIRCUIT BREAKER] Shared Redis state enabled")
+    except ValueError as e:
+        configure_circuit_breakers(None)
+        logger.warning(f"[CIRCUIT BREAKER] Redis not configured, breaker state stays in-process: {e}")
 
 
 def get_circuit_breaker_health() -> dict:
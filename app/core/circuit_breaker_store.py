@@ -0,0 +1,233 @@
+"""
+Circuit Breaker Store - Breaker state shared by every API and worker process
+Async Redis store (one atomic script per transition) and in-memory store for tests
+"""
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict
+
+from app.core.constants import CIRCUIT_BREAKER_KEY_PREFIX
+
+# Outcomes reported after a call
+OUTCOME_SUCCESS = "success"
+OUTCOME_FAILURE = "failure"
+OUTCOME_RELEASE = "release"  # Probe finished without a verdict (unexpected error)
+
+# Breaker hashes are refreshed on every recorded outcome; idle ones disappear
+STATE_KEY_TTL_SECONDS = 86400
+
+
+@dataclass
+class BreakerSnapshot:
+    """Shared breaker state as seen by one caller"""
+    state: str  # "closed" | "open" | "half_open"
+    failures: int = 0
+    open_for: float = 0.0  # Seconds until an open circuit admits a probe
+    probe: bool = False  # This caller holds the half-open probe token
+
+
+@dataclass
+class BreakerSettings:
+    """Thresholds applied by the store when recording outcomes"""
+    failure_threshold: int
+    success_threshold: int
+    failure_window: float
+    timeout: float
+    probe_ttl: float
+
+
+class BreakerStore(ABC):
+    """
+    Storage interface used by CircuitBreaker in shared mode
+
+    A circuit opens after failure_threshold failures within failure_window.
+    Once timeout has passed it is half-open: exactly one caller at a time gets
+    the probe token. success_threshold probe successes close it, a failure
+    reopens it. A probe token that is never reported expires after probe_ttl.
+    """
+
+    @abstractmethod
+    async def acquire(self, name: str, settings: BreakerSettings) -> BreakerSnapshot:
+        """Current state; moves open->half_open when due and hands out the probe token"""
+
+    @abstractmethod
+    async def record(self, name: str, outcome: str, probe: bool, settings: BreakerSettings) -> BreakerSnapshot:
+        """Apply the outcome of a call and return the resulting state"""
+
+    @abstractmethod
+    async def reset(self, name: str) -> None:
+        """Force the breaker closed"""
+
+
+class RedisBreakerStore(BreakerStore):
+    """Breaker state in a Redis hash per breaker; transitions are Lua scripts on server time"""
+
+    ACQUIRE_SCRIPT = """
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local s = redis.call('HMGET', KEYS[1], 'state', 'failures', 'open_until', 'probe_until')
+    local state = s[1] or 'closed'
+    local open_until = tonumber(s[3]) or 0
+    local probe = 0
+    if state == 'open' and now >= open_until then
+        state = 'half_open'
+        redis.call('HSET', KEYS[1], 'state', state, 'successes', 0)
+    end
+    if state == 'half_open' and (tonumber(s[4]) or 0) <= now then
+        redis.call('HSET', KEYS[1], 'probe_until', tostring(now + tonumber(ARGV[1])))
+        probe = 1
+    end
+    return {state, tonumber(s[2]) or 0, tostring(math.max(open_until - now, 0)), probe}
+    """
+
+    RECORD_SCRIPT = """
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local s = redis.call('HMGET', KEYS[1], 'state', 'failures', 'window_start', 'open_until', 'successes')
+    local state = s[1] or 'closed'
+    local failures = tonumber(s[2]) or 0
+    local window_start = tonumber(s[3]) or 0
+    local open_until = tonumber(s[4]) or 0
+    local successes = tonumber(s[5]) or 0
+    local outcome, probe = ARGV[1], ARGV[2] == '1'
+    local failure_threshold, success_threshold = tonumber(ARGV[3]), tonumber(ARGV[4])
+    local window, timeout = tonumber(ARGV[5]), tonumber(ARGV[6])
+
+    if outcome == 'failure' then
+        if state == 'half_open' then
+            state, open_until, successes = 'open', now + timeout, 0
+            redis.call('HSET', KEYS[1], 'state', state, 'open_until', tostring(open_until),
+                'successes', 0, 'probe_until', 0)
+        elseif state == 'closed' then
+            if now - window_start > window then
+                failures, window_start = 0, now
+            end
+            failures = failures + 1
+            if failures >= failure_threshold then
+                state, open_until = 'open', now + timeout
+            end
+            redis.call('HSET', KEYS[1], 'state', state, 'failures', failures,
+                'window_start', tostring(window_start), 'open_until', tostring(open_until))
+        end
+    elseif state == 'half_open' and probe then
+        if outcome == 'success' then
+            successes = successes + 1
+            if successes >= success_threshold then
+                state, failures, successes = 'closed', 0, 0
+            end
+        end
+        redis.call('HSET', KEYS[1], 'state', state, 'failures', failures,
+            'successes', successes, 'probe_until', 0)
+    elseif outcome == 'success' and state == 'closed' and failures > 0 then
+        failures = 0
+        redis.call('HSET', KEYS[1], 'failures', 0)
+    end
+
+    redis.call('EXPIRE', KEYS[1], ARGV[7])
+    return {state, failures, tostring(math.max(open_until - now, 0)), 0}
+    """
+
+    def __init__(self, redis_client, prefix: str = CIRCUIT_BREAKER_KEY_PREFIX):
+        self.redis = redis_client
+        self.prefix = prefix
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}:{name}"
+
+    @staticmethod
+    def _snapshot(reply) -> BreakerSnapshot:
+        state, failures, open_for, probe = reply
+        return BreakerSnapshot(
+            state=state,
+            failures=int(failures),
+            open_for=float(open_for),
+            probe=bool(int(probe))
+        )
+
+    async def acquire(self, name: str, settings: BreakerSettings) -> BreakerSnapshot:
+        reply = await self.redis.eval(
+            self.ACQUIRE_SCRIPT,
+            keys=[self._key(name)],
+            args=[str(settings.probe_ttl)]
+        )
+        return self._snapshot(reply)
+
+    async def record(self, name: str, outcome: str, probe: bool, settings: BreakerSettings) -> BreakerSnapshot:
+        reply = await self.redis.eval(
+            self.RECORD_SCRIPT,
+            keys=[self._key(name)],
+            args=[
+                outcome,
+                "1" if probe else "0",
+                str(settings.failure_threshold),
+                str(settings.success_threshold),
+                str(settings.failure_window),
+                str(settings.timeout),
+                str(STATE_KEY_TTL_SECONDS)
+            ]
+        )
+        return self._snapshot(reply)
+
+    async def reset(self, name: str) -> None:
+        await self.redis.delete(self._key(name))
+
+
+class InMemoryBreakerStore(BreakerStore):
+    """Same transitions in process memory - for tests (two breakers sharing one store act as two processes)"""
+
+    def __init__(self):
+        self._states: Dict[str, Dict[str, float]] = {}
+
+    def _state(self, name: str) -> Dict:
+        return self._states.setdefault(name, {
+            "state": "closed", "failures": 0, "window_start": 0.0,
+            "open_until": 0.0, "probe_until": 0.0, "successes": 0
+        })
+
+    @staticmethod
+    def _snapshot(s: Dict, now: float, probe: bool = False) -> BreakerSnapshot:
+        return BreakerSnapshot(
+            state=s["state"],
+            failures=s["failures"],
+            open_for=max(s["open_until"] - now, 0.0),
+            probe=probe
+        )
+
+    async def acquire(self, name: str, settings: BreakerSettings) -> BreakerSnapshot:
+        now = time.time()
+        s = self._state(name)
+        if s["state"] == "open" and now >= s["open_until"]:
+            s["state"], s["successes"] = "half_open", 0
+        probe = s["state"] == "half_open" and s["probe_until"] <= now
+        if probe:
+            s["probe_until"] = now + settings.probe_ttl
+        return self._snapshot(s, now, probe)
+
+    async def record(self, name: str, outcome: str, probe: bool, settings: BreakerSettings) -> BreakerSnapshot:
+        now = time.time()
+        s = self._state(name)
+
+        if outcome == OUTCOME_FAILURE:
+            if s["state"] == "half_open":
+                s.update(state="open", open_until=now + settings.timeout, successes=0, probe_until=0.0)
+            elif s["state"] == "closed":
+                if now - s["window_start"] > settings.failure_window:
+                    s.update(failures=0, window_start=now)
+                s["failures"] += 1
+                if s["failures"] >= settings.failure_threshold:
+                    s.update(state="open", open_until=now + settings.timeout)
+        elif s["state"] == "half_open" and probe:
+            if outcome == OUTCOME_SUCCESS:
+                s["successes"] += 1
+                if s["successes"] >= settings.success_threshold:
+                    s.update(state="closed", failures=0, successes=0)
+            s["probe_until"] = 0.0
+        elif outcome == OUTCOME_SUCCESS and s["state"] == "closed":
+            s["failures"] = 0
+
+        return self._snapshot(s, now)
+
+    async def reset(self, name: str) -> None:
+        self._states.pop(name, None)
@@ -66,6 +66,10 @@ class Settings(BaseSettings):
     clearbit_api_key: str = Field(default="", description="Clearbit API key for company enrichment ($0.10/call)")
     google_places_api_key: str = Field(default="", description="Google Places API key for location data ($0.02/call)")
     proxycurl_api_key: str = Field(default="", description="Proxycurl API key for LinkedIn data ($0.03/call)")
+    tech_fingerprints_file: str = Field(
+        default="",
+        description="Optional JSON file of extra/overriding technology fingerprints (merged over the bundled set)"
+    )
 
     # ============================================================================
     # CACHING & RATE LIMITING (UPSTASH REDIS)
@@ -92,6 +96,64 @@ class Settings(BaseSettings):
     cache_ttl_reports: int = Field(default=1800, description="Reports cache TTL (30 minutes)")
     cache_ttl_enrichment: int = Field(default=86400, description="Enrichment cache TTL (24 hours)")
 
+    # ============================================================================
+    # OUTBOUND HTTP
+    # ============================================================================
+    http2_enabled: bool = Field(
+        default=True,
+        description="Negotiate HTTP/2 on pooled outbound clients (requires the h2 package)"
+    )
+
+    # ============================================================================
+    # PROGRESS EVENTS
+    # ============================================================================
+    progress_redis_enabled: bool = Field(
+        default=True,
+        description="Fan analysis progress events out across processes via Redis streams"
+    )
+
+    # ============================================================================
+    # CIRCUIT BREAKERS
+    # ============================================================================
+    circuit_breaker_redis_enabled: bool = Field(
+        default=True,
+        description="Share circuit breaker state across processes via Redis"
+    )
+
+    # ============================================================================
+    # CACHING
+    # ============================================================================
+    cache_redis_enabled: bool = Field(
+        default=True,
+        description="Add the shared Redis tier to cache namespaces that use it and coordinate identical cache fills (single-flight leases) across processes"
+    )
+    challenge_similarity_threshold: float = Field(
+        default=0.8,
+        ge=0.0,
+        le=1.0,
+        description="Estimated Jaccard similarity at which a reworded challenge reuses a cached analysis or extraction"
+    )
+
+    # ============================================================================
+    # DASHBOARD INTELLIGENCE & ANALYTICS
+    # ============================================================================
+    dashboard_intelligence_schedule_enabled: bool = Field(
+        default=True,
+        description="Regenerate the admin dashboard intelligence snapshot on a schedule (API and worker processes)"
+    )
+    enrichment_rollup_schedule_enabled: bool = Field(
+        default=True,
+        description="Roll up progressive enrichment analytics incrementally on a schedule (API and worker processes)"
+    )
+
+    # ============================================================================
+    # CPU OFFLOAD
+    # ============================================================================
+    offload_workers: int = Field(
+        default=2,
+        description="Warm worker processes for CPU-heavy parsing/rendering (0 runs everything inline)"
+    )
+
     # ============================================================================
     # MONITORING & ERROR TRACKING
     # ============================================================================
@@ -54,6 +54,19 @@ STAGE5_MAX_TOKENS = 6000  # Risk quantification and prioritization
 # Stage 6: Executive Polish
 STAGE6_MAX_TOKENS = 10000  # Final polish for executive readability
 
+# Prompt context budgets (input tokens of JSON embedded in each stage prompt)
+PROMPT_CHARS_PER_TOKEN = 3.5  # Conservative estimate for pt-BR text and JSON punctuation
+STAGE1_CONTEXT_TOKENS_PER_SOURCE = 4000  # Apify and Perplexity data, each
+STAGE2_CONTEXT_TOKENS_GAPS = 400  # Data gaps list
+STAGE2_CONTEXT_TOKENS_DATA = 800  # Extracted data (was a 2000-char slice)
+STAGE3_CONTEXT_TOKENS = 1500  # Extracted data (was a 3000-char slice)
+STAGE4_CONTEXT_TOKENS_COMPETITORS = 1500  # Extracted competitors
+STAGE4_CONTEXT_TOKENS_POSITIONING = 800  # Positioning from stage 3
+STAGE5_CONTEXT_TOKENS_RECOMMENDATIONS = 1500  # Recommendations from stage 3
+STAGE5_CONTEXT_TOKENS_SWOT = 800  # SWOT from stage 3
+STAGE5_CONTEXT_TOKENS_SCENARIOS = 800  # Scenarios from stage 3
+STAGE6_CONTEXT_TOKENS = 10000  # Whole analysis, sent lossless; larger ones skip polish (matches STAGE6_MAX_TOKENS output)
+
 # Dashboard Intelligence
 DASHBOARD_MAX_TOKENS_SUMMARY = 500  # Quick summaries
 DASHBOARD_MAX_TOKENS_TRENDS = 1000  # Trend analysis
@@ -95,6 +108,12 @@ CIRCUIT_BREAKER_TIMEOUT_DEFAULT = 60  # 1 minute - standard recovery time
 CIRCUIT_BREAKER_TIMEOUT_APIFY = 120  # 2 minutes - longer timeout for scraping operations
 CIRCUIT_BREAKER_TIMEOUT_SUPABASE = 30  # 30 seconds - database usually recovers quickly
 
+# Cluster-shared breaker state (Redis, see app/core/circuit_breaker_store.py)
+CIRCUIT_BREAKER_FAILURE_WINDOW = 60  # Seconds in which failure_threshold failures open the circuit
+CIRCUIT_BREAKER_STATE_CACHE_SECONDS = 1.0  # Closed state trusted locally before re-reading Redis
+CIRCUIT_BREAKER_PROBE_TTL = 30  # Seconds a half-open probe token is held (crashed probe frees it)
+CIRCUIT_BREAKER_KEY_PREFIX = "circuit"  # Redis hash per breaker
+
 
 # ============================================================================
 # CACHE TTL CONFIGURATION (Time-To-Live in hours)
@@ -108,7 +127,46 @@ CACHE_TTL_STATS = 1/12  # 5 minutes (0.083 hours) - dashboard stats cache
 CACHE_TTL_PERPLEXITY = 24 * 14  # 14 days (336 hours) - Perplexity research cache
 
 # Cache size limits
-CACHE_MAX_PDFS_IN_MEMORY = 50  # Maximum number of PDFs to keep in memory (~100-250MB)
+CACHE_MAX_PDF_BYTES_IN_MEMORY = 100 * 1024 * 1024  # 100MB of rendered PDFs kept in memory
+
+# Tiered cache (app/core/tiered_cache.py) - in-memory tier budget per namespace: (entries, bytes)
+CACHE_MEMORY_LIMITS = {
+    "analysis": (500, 64 * 1024 * 1024),
+    "stage": (2_000, 32 * 1024 * 1024),
+    "pdf": (500, CACHE_MAX_PDF_BYTES_IN_MEMORY),
+    "stats": (16, 1024 * 1024),
+    "perplexity": (500, 16 * 1024 * 1024),
+    "institutional_memory": (2_000, 32 * 1024 * 1024),
+    "enrichment": (5_000, 64 * 1024 * 1024),
+    "enrichment_hot": (5_000, 32 * 1024 * 1024),
+    "chat_context": (500, 16 * 1024 * 1024),
+}
+CACHE_DEFAULT_MEMORY_LIMIT = (1_000, 16 * 1024 * 1024)  # Namespaces not listed above
+CACHE_WINDOW_FRACTION = 0.01  # Share of entries in the admission window (W-TinyLFU)
+CACHE_REDIS_KEY_PREFIX = "cache"  # Redis keys: cache:<namespace>:<key>
+
+# Cache hit accounting (app/core/hit_counter.py)
+CACHE_HIT_FLUSH_INTERVAL_SECONDS = 30  # Hit deltas are written in bulk at most this often
+CACHE_HIT_MAX_PENDING_KEYS = 5_000  # Flush early once this many rows have unwritten hits
+
+# Near-duplicate challenge matching (app/core/challenge_index.py)
+CHALLENGE_SIMILARITY_THRESHOLD = 0.8  # Estimated Jaccard of challenge shingles needed to reuse a cached result
+CHALLENGE_MINHASH_PERMUTATIONS = 64  # Signature length
+CHALLENGE_LSH_BANDS = 16  # Bands of 4 rows: pairs at the threshold become candidates with >99.9% probability
+CHALLENGE_INDEX_MAX_ENTRIES = 20_000  # Entries kept in memory (oldest evicted)
+CHALLENGE_INDEX_LOAD_LIMIT = 20_000  # Most recent persisted entries loaded at startup
+CHALLENGE_INDEX_STAGES = ("extraction",)  # Stage results reusable across reworded challenges (the rest depend on them)
+
+# Single-flight cache fills (app/core/single_flight.py)
+SINGLE_FLIGHT_KEY_PREFIX = "flight"  # Redis lease keys: flight:<cache key>
+SINGLE_FLIGHT_LEASE_SECONDS = 30  # Lease lifetime; the leader renews it every third of this
+SINGLE_FLIGHT_POLL_INTERVAL = 1.0  # Seconds between lease checks while following another process
+SINGLE_FLIGHT_ANALYSIS_WAIT_SECONDS = 600  # Followers of a full analysis stop waiting and run it themselves
+SINGLE_FLIGHT_STAGE_WAIT_SECONDS = 180  # Same for a single pipeline stage
+
+# PDF artifacts
+PDF_RENDERER_VERSION = "1"  # Bump when pdf_generator output changes (invalidates stored PDFs)
+PDF_STORAGE_BUCKET = "pdf-artifacts"  # Supabase Storage bucket holding rendered PDFs
 
 
 # ============================================================================
@@ -132,6 +190,18 @@ COST_ESTIMATE_STAGE6 = 0.01  # ~$0.01 per Stage 6 call (polish)
 HTTP_TIMEOUT_APIFY = 120  # 120 second timeout for web scraping operations
 HTTP_TIMEOUT_PERPLEXITY = 120.0  # 120 second timeout for Perplexity research
 
+# Shared connection pools (one pool per upstream service, see app/core/http_client.py)
+HTTP_POOL_MAX_CONNECTIONS = 20  # Max open connections per service pool
+HTTP_POOL_MAX_KEEPALIVE = 10  # Idle keep-alive connections retained per service pool
+HTTP_POOL_KEEPALIVE_EXPIRY = 60.0  # Seconds an idle connection is kept before closing
+HTTP_POOL_CONNECT_TIMEOUT = 10.0  # Connect timeout (read timeouts are set per request)
+
+# Per-service overrides for max connections (services not listed use the default)
+HTTP_POOL_SERVICE_LIMITS = {
+    "openrouter": 50,  # LLM calls: pipeline stages, chat, editor, dashboard, Perplexity
+    "web": 30,  # Arbitrary company websites scraped during enrichment
+}
+
 
 # ============================================================================
 # APPLICATION LIFECYCLE
@@ -209,3 +279,154 @@ HASH_LENGTH_SHORT = 16  # Short hash for cache keys (16 hex chars = 64 bits)
 
 # Research timeframes
 PERPLEXITY_COMPANY_INTEL_DAYS = 90  # Days of company intelligence to fetch (last 3 months)
+
+# Query engine
+PERPLEXITY_MAX_CONCURRENT_QUERIES = 4  # Upper bound on simultaneous Perplexity calls per process
+
+
+# ============================================================================
+# TASK QUEUE CONFIGURATION
+# ============================================================================
+
+TASK_QUEUE_LEASE_SECONDS = 60  # Visibility timeout; renewed while the task runs
+TASK_QUEUE_BLOCK_TIMEOUT = 5  # Seconds a worker blocks waiting for new work
+TASK_QUEUE_RECLAIM_INTERVAL = 30  # Seconds between scans for leases of dead workers
+TASK_QUEUE_IDLE_POLL_INTERVAL = 0.5  # Fallback poll interval when blocking pop is unavailable
+
+
+# ============================================================================
+# PROGRESS EVENT BUS
+# ============================================================================
+
+PROGRESS_STREAM_TIMEOUT = 180  # Seconds an SSE progress stream stays open (3 minutes)
+PROGRESS_RETENTION_SECONDS = 3600  # Events kept for Last-Event-ID resume (1 hour)
+PROGRESS_MAX_EVENTS_PER_CHANNEL = 200  # Bounded history per submission
+PROGRESS_REDIS_BLOCK_SECONDS = 5  # Max duration of one blocking XREAD
+PROGRESS_IDLE_POLL_INTERVAL = 0.5  # Fallback poll interval when blocking XREAD is unavailable
+
+
+# ============================================================================
+# PROGRESSIVE ENRICHMENT SESSIONS
+# ============================================================================
+
+PROGRESSIVE_SESSION_TTL_SECONDS = 3600  # Shared session snapshots kept for status/stream requests (1 hour)
+PROGRESSIVE_STREAM_TIMEOUT = 30  # Seconds an enrichment SSE stream waits for all three layers
+
+
+# ============================================================================
+# PAGE SNAPSHOTS (website-derived enrichment)
+# ============================================================================
+
+PAGE_SNAPSHOT_MAX_BYTES = 2 * 1024 * 1024  # Homepage bytes read before truncating (2MB)
+PAGE_SNAPSHOT_TTL_SECONDS = 120  # Snapshot reused by every source of one enrichment session
+PAGE_SNAPSHOT_MAX_ENTRIES = 32  # Parsed documents kept in memory (LRU)
+
+
+# ============================================================================
+# CPU OFFLOAD EXECUTOR
+# ============================================================================
+
+OFFLOAD_INLINE_MAX_SIZE = 50_000  # Work estimate (chars / DP cells) below which calls run inline
+OFFLOAD_LATENCY_SAMPLES = 500  # Recent pooled-call latencies kept for metrics
+OFFLOAD_WARM_MODULES = (  # Imported by every worker process at startup
+    "bs4",
+    "app.services.enrichment.page_snapshot",
+    "app.core.security.prompt_sanitizer",
+    "app.services.markdown_parser",
+    "app.services.pdf_generator",
+)
+
+
+# ============================================================================
+# ADMIN SUBMISSIONS LISTING
+# ============================================================================
+
+SUBMISSIONS_PAGE_SIZE_DEFAULT = 50  # Rows per dashboard page
+SUBMISSIONS_PAGE_SIZE_MAX = 200  # Upper bound for the ?limit= parameter
+SUBMISSION_LIST_SYNC_INTERVAL = 5  # Seconds between incremental refreshes of the listing cache
+SUBMISSION_LIST_SYNC_OVERLAP = 5  # Seconds re-read behind the watermark (late commits)
+SUBMISSION_LIST_SYNC_BATCH = 500  # Rows per refresh query
+SUBMISSION_LIST_FULL_RESYNC_SECONDS = 3600  # Full reload interval (drops deleted rows)
+
+
+# ============================================================================
+# RATE LIMITING
+# ============================================================================
+
+RATE_LIMIT_KEY_PREFIX = "ratelimit:sw"  # Redis sorted sets of the sliding-window log
+RATE_LIMIT_SHADOW_MAX_KEYS = 10_000  # Over-limit clients remembered in-process (LRU)
+RATE_LIMIT_MEMORY_MAX_KEYS = 10_000  # Keys tracked by the in-process backend before sweeping
+RATE_LIMIT_ENDPOINT_LIMITS = {  # "METHOD /path-prefix": (max requests, window seconds) per client IP
+    "POST /api/auth/login": (10, 60),
+    "POST /api/form/enrich": (30, 60),
+    "POST /api/enrichment/progressive/start": (30, 60),
+}
+
+
+# ============================================================================
+# AI CHAT
+# ============================================================================
+
+CHAT_MAX_TOKENS = 2000  # Answer length
+CHAT_REPORT_CONTEXT_TOKENS = 6000  # Compact report JSON embedded in the system prompt
+CHAT_CONTEXT_CACHE_TTL_SECONDS = 24 * 3600  # System prompt cached per report version
+CHAT_HISTORY_TOKEN_BUDGET = 3000  # Recent turns sent verbatim; older ones are folded into the summary
+CHAT_MESSAGE_OVERHEAD_TOKENS = 4  # Role/formatting tokens per message
+CHAT_SUMMARY_MAX_TOKENS = 500  # Rolling summary of folded turns
+CHAT_HISTORY_PAGE_SIZE_DEFAULT = 50  # Messages per /chat/history page
+CHAT_HISTORY_PAGE_SIZE_MAX = 200  # Upper bound for the ?limit= parameter
+CHAT_CONTEXT_MAX_MESSAGES = 200  # Newest unsummarized messages loaded for the model context
+
+
+# ============================================================================
+# DASHBOARD INTELLIGENCE SNAPSHOTS
+# ============================================================================
+
+DASHBOARD_INTELLIGENCE_DAYS = (7,)  # Periods (days) refreshed on schedule; others only on explicit refresh
+DASHBOARD_INTELLIGENCE_REFRESH_SECONDS = 3600  # Scheduled regeneration interval
+DASHBOARD_INTELLIGENCE_SNAPSHOT_TTL_SECONDS = 26 * 3600  # A snapshot outlives a missed refresh, not a dead scheduler
+DASHBOARD_INTELLIGENCE_MAX_SUBMISSIONS = 200  # Newest period rows reviewed for challenges and risk
+DASHBOARD_INTELLIGENCE_REFRESH_WAIT_SECONDS = 180  # Wait on another process's refresh before running our own
+
+
+# ============================================================================
+# ENRICHMENT ANALYTICS ROLLUPS
+# ============================================================================
+
+ENRICHMENT_ROLLUP_INTERVAL_SECONDS = 600  # Incremental rollup job cadence (closed days lag by at most this)
+ENRICHMENT_ROLLUP_OVERLAP_SECONDS = 300  # Re-scan window behind the watermark for rows committed late
+ENRICHMENT_ROLLUP_BACKFILL_CHUNK_DAYS = 7  # Days recomputed per backfill statement
+
+
+# ============================================================================
+# ENRICHMENT COST TRACKING
+# ============================================================================
+
+# Ring-buffer retention per bucket width (older buckets are overwritten in place)
+COST_MINUTE_BUCKETS = 120  # 2 hours of per-minute counters per source
+COST_HOUR_BUCKETS = 72  # 3 days of hourly counters per source
+COST_DAY_BUCKETS = 90  # 90 days of daily counters per source and per user
+COST_MAX_TRACKED_USERS = 2000  # ~5 KB of day buckets each; least recently active beyond this are evicted (already flushed)
+COST_FLUSH_INTERVAL_SECONDS = 60  # Hourly deltas written to enrichment_cost_buckets this often
+COST_MAX_PENDING_ROWS = 2000  # Flush early once this many (hour, source/user) rows are unwritten
+
+
+# ============================================================================
+# ENRICHMENT AUDIT LOG
+# ============================================================================
+
+AUDIT_QUEUE_MAX_ROWS = 5000  # Source calls buffered for enrichment_audit_log before the overflow policy applies
+AUDIT_BATCH_SIZE = 200  # Rows per bulk insert; a full batch triggers an early flush
+AUDIT_FLUSH_INTERVAL_SECONDS = 5  # Partial batches are written at least this often
+AUDIT_OVERFLOW_POLICY = "drop_oldest"  # "drop_oldest", "drop_newest" or "block" (wait for space, then drop)
+AUDIT_BLOCK_TIMEOUT_SECONDS = 0.5  # Longest a source call waits for queue space under "block"
+AUDIT_RETRY_BACKOFF_SECONDS = 1  # Wait before retrying after a failed flush; doubles per consecutive failure
+AUDIT_RETRY_BACKOFF_MAX_SECONDS = 60  # Cap for the failed-flush backoff
+
+
+# ============================================================================
+# REPOSITORY BULK OPERATIONS
+# ============================================================================
+
+REPOSITORY_UPSERT_CHUNK_SIZE = 500  # Rows per bulk upsert statement
+REPOSITORY_IN_CHUNK_SIZE = 200  # IDs per `in` filter (keeps the request URL short)
@@ -2,7 +2,8 @@
 Database module for Supabase connection and operations
 """
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+import base64
 import logging
 from app.core.supabase import supabase_service, supabase_anon
 
@@ -11,6 +12,12 @@ logger = logging.getLogger(__name__)
 # Table name
 TABLE_NAME = "submissions"
 
+# Projection of submissions for list views - no report bodies (migrations/013)
+LIST_VIEW_NAME = "submissions_list"
+
+# Trigger-maintained daily counters for dashboard intelligence (migrations/017)
+DAILY_STATS_TABLE = "dashboard_daily_stats"
+
 
 async def init_db():
     """
@@ -133,6 +140,129 @@ async def get_all_submissions() -> List[Dict[str, Any]]:
         return []
 
 
+def encode_submission_cursor(row: Dict[str, Any]) -> str:
+    """Opaque keyset cursor pointing just after row in (created_at DESC, id DESC) order"""
+    raw = f"{row['created_at']}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_submission_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decode a cursor from encode_submission_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.rsplit("|", 1)
+        datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        return created_at, int(row_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+async def list_submissions(
+    limit: int,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    industry: Optional[str] = None,
+    quality_tier: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    One page of submissions for list views, newest first
+
+    Reads the submissions_list projection (no report bodies) with keyset
+    pagination on (created_at, id), so page N costs the same as page 1.
+    Filters are applied in the database (status/industry/quality tier indexes).
+
+    Args:
+        limit: Maximum rows to return
+        cursor: encode_submission_cursor() of the last row of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = supabase_service.table(LIST_VIEW_NAME).select("*")
+
+    if status:
+        query = query.eq("status", status)
+    if industry:
+        query = query.eq("industry", industry)
+    if quality_tier:
+        query = query.eq("quality_tier", quality_tier)
+    if cursor:
+        created_at, row_id = decode_submission_cursor(cursor)
+        query = query.or_(
+            f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{row_id})'
+        )
+
+    try:
+        response = query.order("created_at", desc=True).order("id", desc=True).limit(limit).execute()
+        return response.data if response.data else []
+    except Exception as e:
+        logger.error(f"[ERROR] Failed to list submissions: {str(e)}")
+        raise
+
+
+async def get_submissions_updated_since(
+    updated_at: Optional[str],
+    after_id: int = 0,
+    limit: int = 500,
+) -> List[Dict[str, Any]]:
+    """
+    Projected submissions changed after the (updated_at, id) watermark, oldest change first
+
+    Args:
+        updated_at: Watermark timestamp (None = from the beginning)
+        after_id: Watermark id, breaks ties between rows with the same updated_at
+        limit: Maximum rows to return (continue from the last row for more)
+    """
+    query = supabase_service.table(LIST_VIEW_NAME).select("*")
+
+    if updated_at:
+        query = query.or_(
+            f'updated_at.gt."{updated_at}",and(updated_at.eq."{updated_at}",id.gt.{after_id})'
+        )
+
+    try:
+        response = query.order("updated_at").order("id").limit(limit).execute()
+        return response.data if response.data else []
+    except Exception as e:
+        logger.error(f"[ERROR] Failed to get submissions updated since {updated_at}: {str(e)}")
+        raise
+
+
+async def list_submissions_created_since(created_at: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    Projected submissions created at or after created_at, newest first
+
+    Raises:
+        Exception: Database errors (callers decide whether a partial view is acceptable)
+    """
+    response = supabase_service.table(LIST_VIEW_NAME)\
+        .select("id, company, industry, challenge, status, error_message, quality_tier, sources_succeeded, created_at")\
+        .gte("created_at", created_at)\
+        .order("created_at", desc=True)\
+        .limit(limit)\
+        .execute()
+    return response.data if response.data else []
+
+
+async def get_dashboard_daily_stats(since_day: str) -> List[Dict[str, Any]]:
+    """
+    Daily per-industry dashboard counters from since_day (ISO date) onwards
+
+    Raises:
+        Exception: Database errors
+    """
+    response = supabase_service.table(DAILY_STATS_TABLE)\
+        .select("*")\
+        .gte("day", since_day)\
+        .execute()
+    return response.data if response.data else []
+
+
 async def update_submission_status(
     submission_id: int,
     status: str,
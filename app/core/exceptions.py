@@ -364,6 +364,17 @@ class DuplicateEntry(DatabaseError):
         self.status_code = 409  # Conflict
 
 
+# ============================================================================
+# TASK QUEUE EXCEPTIONS
+# ============================================================================
+
+class TaskQueueError(AppException):
+    """Background task queue operation failed"""
+
+    def __init__(self, message: str):
+        super().__init__(message, status_code=500)
+
+
 # ============================================================================
 # CONFIGURATION EXCEPTIONS
 # ============================================================================
@@ -0,0 +1,170 @@
+"""
+Cache Hit Counter - Hit accounting off the cache read path
+Aggregates hits per (table, cache_key) in memory and writes the deltas in bulk,
+one apply_cache_hits call per table per flush (migrations/014_cache_hit_counters.sql).
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.core.constants import CACHE_HIT_FLUSH_INTERVAL_SECONDS, CACHE_HIT_MAX_PENDING_KEYS
+from app.core.supabase import supabase_service
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingHits:
+    hits: int
+    last_accessed_at: str  # ISO timestamp of the latest hit
+
+
+class CacheHitCounter:
+    """
+    Buffered hit_count / last_accessed_at updates for the cache tables
+
+    record() is synchronous and only touches memory. A background task flushes
+    every flush_interval seconds (or sooner once max_pending_keys rows have
+    unwritten hits). Deltas from a failed flush are merged back for the next
+    one. pending() exposes unwritten deltas so statistics stay current.
+
+    Example:
+        cache_hit_counter.record("analysis_cache", cache_key)
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = CACHE_HIT_FLUSH_INTERVAL_SECONDS,
+        max_pending_keys: int = CACHE_HIT_MAX_PENDING_KEYS
+    ):
+        self.flush_interval = flush_interval
+        self.max_pending_keys = max_pending_keys
+        self._pending: Dict[str, Dict[str, _PendingHits]] = {}
+        self._pending_keys = 0
+        self._flusher: Optional[asyncio.Task] = None
+        self._flusher_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._closing = False
+        self.stats = {"recorded": 0, "flushes": 0, "rows_flushed": 0, "flush_errors": 0, "dropped": 0}
+
+    def record(self, table: str, cache_key: str, hits: int = 1) -> None:
+        """Count a cache hit (written to the database on the next flush)"""
+        now = datetime.now(timezone.utc).isoformat()
+        rows = self._pending.setdefault(table, {})
+        pending = rows.get(cache_key)
+        if pending is None:
+            rows[cache_key] = _PendingHits(hits, now)
+            self._pending_keys += 1
+        else:
+            pending.hits += hits
+            pending.last_accessed_at = now
+        self.stats["recorded"] += hits
+        self._ensure_flusher()
+
+    def _ensure_flusher(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop (scripts, sync tests) - hits wait for an explicit flush()
+            return
+
+        if self._flusher is None or self._flusher.done() or self._flusher_loop is not loop:
+            self._wakeup = asyncio.Event()
+            self._flusher = asyncio.create_task(self._flush_loop(self._wakeup))
+            self._flusher_loop = loop
+        if self._pending_keys >= self.max_pending_keys:
+            self._wakeup.set()
+
+    async def _flush_loop(self, wakeup: asyncio.Event) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+            await self.flush()
+
+    def pending(self, table: str) -> Dict[str, int]:
+        """Unwritten hit deltas for a table, by cache_key"""
+        return {key: pending.hits for key, pending in self._pending.get(table, {}).items()}
+
+    async def flush(self) -> int:
+        """
+        Write all pending deltas (one bulk call per table)
+
+        Returns:
+            Number of rows written
+        """
+        batch, self._pending, self._pending_keys = self._pending, {}, 0
+        flushed = 0
+
+        for table, rows in batch.items():
+            payload = [
+                {"cache_key": key, "hits": pending.hits, "last_accessed_at": pending.last_accessed_at}
+                for key, pending in rows.items()
+            ]
+            try:
+                await asyncio.to_thread(_apply_cache_hits, table, payload)
+                flushed += len(payload)
+            except Exception as e:
+                # Keep the deltas for the next flush unless the backlog is already full
+                self.stats["flush_errors"] += 1
+                logger.warning(f"[CACHE] Failed to flush {len(payload)} hit counters for {table}: {e}")
+                self._merge_back(table, rows)
+
+        if flushed:
+            self.stats["flushes"] += 1
+            self.stats["rows_flushed"] += flushed
+            logger.debug(f"[CACHE] Flushed hit counters for {flushed} cache rows")
+        return flushed
+
+    def _merge_back(self, table: str, rows: Dict[str, _PendingHits]) -> None:
+        current = self._pending.setdefault(table, {})
+        for key, pending in rows.items():
+            newer = current.get(key)
+            if newer is not None:
+                newer.hits += pending.hits
+            elif self._pending_keys < self.max_pending_keys:
+                current[key] = pending
+                self._pending_keys += 1
+            else:
+                self.stats["dropped"] += pending.hits
+
+    async def aclose(self) -> None:
+        """Stop the background flusher and write what is left (call on shutdown)"""
+        if (
+            self._flusher is not None
+            and not self._flusher.done()
+            and self._flusher_loop is asyncio.get_running_loop()
+        ):
+            # Let an in-progress flush finish instead of cancelling it mid-write
+            self._closing = True
+            self._wakeup.set()
+            await self._flusher
+        self._flusher = None
+        self._closing = False
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Flush counters plus unwritten hits"""
+        return {
+            **self.stats,
+            "pending_rows": self._pending_keys,
+            "pending_hits": sum(p.hits for rows in self._pending.values() for p in rows.values())
+        }
+
+
+def _apply_cache_hits(table: str, payload: List[Dict[str, Any]]) -> None:
+    supabase_service.rpc("apply_cache_hits", {"p_table": table, "p_hits": payload}).execute()
+
+
+# Global cache hit counter instance
+cache_hit_counter = CacheHitCounter()
+
+
+async def close_cache_hit_counter() -> None:
+    """Flush buffered cache hits (call on shutdown)"""
+    await cache_hit_counter.aclose()
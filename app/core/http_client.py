@@ -0,0 +1,171 @@
+"""
+Shared HTTP Client Registry for Outbound Integrations
+Keeps one pooled httpx.AsyncClient per upstream service so TLS handshakes and
+TCP connections are reused across LLM calls, research queries and enrichment sources
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from app.core.constants import (
+    HTTP_POOL_MAX_CONNECTIONS,
+    HTTP_POOL_MAX_KEEPALIVE,
+    HTTP_POOL_KEEPALIVE_EXPIRY,
+    HTTP_POOL_CONNECT_TIMEOUT,
+    HTTP_POOL_SERVICE_LIMITS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    """Check whether the optional h2 package is installed"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+@dataclass
+class HTTPPoolConfig:
+    """Connection pool settings for a service client"""
+    max_connections: int = HTTP_POOL_MAX_CONNECTIONS
+    max_keepalive_connections: int = HTTP_POOL_MAX_KEEPALIVE
+    keepalive_expiry: float = HTTP_POOL_KEEPALIVE_EXPIRY
+    connect_timeout: float = HTTP_POOL_CONNECT_TIMEOUT
+    http2: bool = False
+    service_limits: Dict[str, int] = field(default_factory=lambda: dict(HTTP_POOL_SERVICE_LIMITS))
+
+
+class HTTPClientRegistry:
+    """
+    Registry of long-lived, pooled async HTTP clients keyed by service name
+
+    Each service (e.g. "openrouter", "clearbit", "web") gets its own connection
+    pool, so connection limits apply per upstream host. Read timeouts, headers
+    and redirect behaviour are passed per request by the callers.
+
+    Clients are bound to the event loop they were created on. If a client is
+    requested from a different loop (tests, scripts calling asyncio.run twice),
+    a fresh client is created for that loop.
+
+    Example:
+        client = get_http_client("openrouter")
+        response = await client.post(url, json=payload, timeout=120.0)
+    """
+
+    def __init__(self, config: Optional[HTTPPoolConfig] = None):
+        self.config = config or HTTPPoolConfig()
+        self._clients: Dict[str, Tuple[httpx.AsyncClient, Optional[asyncio.AbstractEventLoop]]] = {}
+        self._created_count = 0
+
+    def configure(self, config: HTTPPoolConfig) -> None:
+        """Replace pool configuration (applies to clients created afterwards)"""
+        if config.http2 and not _http2_available():
+            logger.warning("[HTTP] h2 package not installed, falling back to HTTP/1.1")
+            config.http2 = False
+        self.config = config
+
+    def _build_client(self, service: str) -> httpx.AsyncClient:
+        max_connections = self.config.service_limits.get(service, self.config.max_connections)
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(self.config.max_keepalive_connections, max_connections),
+            keepalive_expiry=self.config.keepalive_expiry,
+        )
+        timeout = httpx.Timeout(None, connect=self.config.connect_timeout)
+
+        self._created_count += 1
+        logger.info(
+            f"[HTTP] Creating pooled client '{service}' "
+            f"(max_connections={max_connections}, http2={self.config.http2})"
+        )
+        return httpx.AsyncClient(limits=limits, timeout=timeout, http2=self.config.http2)
+
+    def get_client(self, service: str = "default") -> httpx.AsyncClient:
+        """
+        Get (or lazily create) the pooled client for a service
+
+        Args:
+            service: Logical upstream name, used as the pool key
+
+        Returns:
+            Shared httpx.AsyncClient - never close it from calling code
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        entry = self._clients.get(service)
+        if entry is not None:
+            client, client_loop = entry
+            if not client.is_closed and (client_loop is None or client_loop is loop):
+                return client
+
+        client = self._build_client(service)
+        self._clients[service] = (client, loop)
+        return client
+
+    async def aclose(self) -> None:
+        """Close every pooled client owned by the current event loop"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        for service, (client, client_loop) in list(self._clients.items()):
+            if client_loop is not None and client_loop is not loop:
+                # Pool belongs to a loop that is gone or elsewhere, just drop it
+                self._clients.pop(service, None)
+                continue
+            try:
+                await client.aclose()
+                logger.info(f"[HTTP] Closed pooled client '{service}'")
+            except Exception as e:
+                logger.warning(f"[HTTP] Error closing client '{service}': {e}")
+            self._clients.pop(service, None)
+
+    def get_stats(self) -> Dict[str, object]:
+        """Get registry statistics for monitoring"""
+        return {
+            "active_clients": sorted(
+                service for service, (client, _) in self._clients.items() if not client.is_closed
+            ),
+            "clients_created": self._created_count,
+            "http2": self.config.http2,
+            "max_connections_default": self.config.max_connections,
+            "service_limits": dict(self.config.service_limits),
+        }
+
+
+# Global registry instance
+http_clients = HTTPClientRegistry()
+
+
+def get_http_client(service: str = "default") -> httpx.AsyncClient:
+    """Get the shared pooled client for a service (see HTTPClientRegistry)"""
+    return http_clients.get_client(service)
+
+
+def init_http_clients(http2: bool = False, warm_services: Tuple[str, ...] = ("openrouter",)) -> None:
+    """
+    Configure the shared registry at application startup
+
+    Args:
+        http2: Negotiate HTTP/2 where the upstream supports it
+        warm_services: Services whose clients are created eagerly
+    """
+    http_clients.configure(HTTPPoolConfig(http2=http2))
+    for service in warm_services:
+        http_clients.get_client(service)
+
+
+async def close_http_clients() -> None:
+    """Close all pooled clients (call on shutdown)"""
+    await http_clients.aclose()
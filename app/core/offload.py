@@ -0,0 +1,196 @@
+"""
+CPU Offload Executor - Keep CPU-heavy parsing and rendering off the event loop
+Warm process pool with size-based routing (small inputs run inline) and
+queue-depth / latency metrics.
+"""
+
+import asyncio
+import functools
+import importlib
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, TypeVar
+
+from app.core.constants import (
+    OFFLOAD_INLINE_MAX_SIZE,
+    OFFLOAD_LATENCY_SAMPLES,
+    OFFLOAD_WARM_MODULES
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _warm_worker(modules: Iterable[str]) -> None:
+    """Process initializer: import heavy modules once per worker"""
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception as e:  # pragma: no cover - best effort
+            logger.warning(f"[OFFLOAD] Worker {os.getpid()} failed to import {module}: {e}")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def estimate_size(args: tuple, kwargs: Dict[str, Any]) -> int:
+    """Default work estimate: total length of sized arguments (str, bytes, list, dict)"""
+    size = 0
+    for value in (*args, *kwargs.values()):
+        if isinstance(value, (str, bytes, bytearray, list, tuple, dict)):
+            size += len(value)
+    return size
+
+
+def _percentile(samples: Deque[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class OffloadExecutor:
+    """
+    Managed process pool for CPU-bound functions
+
+    Functions (and their arguments/results) must be picklable, i.e. defined at
+    module level. Calls whose size estimate is below inline_threshold - or any
+    call while the pool is not started - run inline, since pickling and IPC
+    would cost more than the work itself.
+
+    Example:
+        report, warnings = await offload(parse_markdown_to_report, markdown_text)
+        distance = await offload(calculate_edit_distance, a, b, size=len(a) * len(b))
+    """
+
+    def __init__(self, inline_threshold: int = OFFLOAD_INLINE_MAX_SIZE):
+        self.inline_threshold = inline_threshold
+        self.workers = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._restart_lock = asyncio.Lock()
+        self._in_flight = 0
+        self._latencies: Deque[float] = deque(maxlen=OFFLOAD_LATENCY_SAMPLES)
+        self._stats = {"inline": 0, "pooled": 0, "fallback": 0, "errors": 0, "max_in_flight": 0}
+
+    @property
+    def started(self) -> bool:
+        return self._pool is not None
+
+    async def start(self, workers: int, warm_modules: Iterable[str] = OFFLOAD_WARM_MODULES) -> None:
+        """Create the pool and wait until every worker process is up and warmed"""
+        if self._pool is not None or workers <= 0:
+            return
+
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+            initargs=(tuple(warm_modules),)
+        )
+        self.workers = workers
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        pids = await asyncio.gather(*(loop.run_in_executor(self._pool, _ping) for _ in range(workers)))
+        logger.info(
+            f"[OFFLOAD] {workers} worker processes warm in {(time.perf_counter() - start) * 1000:.0f}ms "
+            f"(pids: {sorted(set(pids))})"
+        )
+
+    async def shutdown(self) -> None:
+        """Stop worker processes (waits for running calls)"""
+        pool, self._pool = self._pool, None
+        self.workers = 0
+        if pool is not None:
+            await asyncio.get_running_loop().run_in_executor(None, functools.partial(pool.shutdown, wait=True))
+
+    async def run(self, fn: Callable[..., T], *args, size: Optional[int] = None, **kwargs) -> T:
+        """
+        Run fn(*args, **kwargs) inline or in a worker process depending on size
+
+        Args:
+            size: Work estimate; defaults to the total length of sized arguments
+        """
+        if size is None:
+            size = estimate_size(args, kwargs)
+
+        pool = self._pool
+        if pool is None or size < self.inline_threshold:
+            self._stats["inline"] += 1
+            return fn(*args, **kwargs)
+
+        call = functools.partial(fn, *args, **kwargs)
+        self._in_flight += 1
+        self._stats["max_in_flight"] = max(self._stats["max_in_flight"], self._in_flight)
+        start = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(pool, call)
+            self._stats["pooled"] += 1
+            return result
+        except BrokenProcessPool:
+            # A worker died (OOM, segfault in a C extension); run this call on a thread
+            self._stats["fallback"] += 1
+            await self._restart(pool)
+            return await asyncio.to_thread(call)
+        except Exception:
+            self._stats["errors"] += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._latencies.append((time.perf_counter() - start) * 1000)
+
+    async def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """Replace the broken pool, unless another call (or shutdown) already did"""
+        async with self._restart_lock:
+            if self._pool is not broken:
+                return
+            logger.error("[OFFLOAD] Process pool broken, restarting it")
+            workers = self.workers
+            self._pool = None
+            broken.shutdown(wait=False, cancel_futures=True)
+            try:
+                await self.start(workers)
+            except Exception as e:
+                logger.error(f"[OFFLOAD] Failed to restart process pool, running inline: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Routing counters, queue depth and pooled-call latency"""
+        return {
+            **self._stats,
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            "queue_depth": max(0, self._in_flight - self.workers),
+            "latency_p50_ms": round(_percentile(self._latencies, 50), 2),
+            "latency_p95_ms": round(_percentile(self._latencies, 95), 2),
+        }
+
+
+# Global offload executor instance
+offload_executor = OffloadExecutor()
+
+
+async def offload(fn: Callable[..., T], *args, size: Optional[int] = None, **kwargs) -> T:
+    """Run a CPU-bound function without blocking the event loop (see OffloadExecutor)"""
+    return await offload_executor.run(fn, *args, size=size, **kwargs)
+
+
+def get_offload_stats() -> Dict[str, Any]:
+    """Metrics of the global offload executor"""
+    return offload_executor.get_stats()
+
+
+async def init_offload_executor(workers: int) -> None:
+    """Start and warm the worker processes (call at startup)"""
+    await offload_executor.start(workers)
+
+
+async def close_offload_executor() -> None:
+    """Stop the worker processes (call on shutdown)"""
+    await offload_executor.shutdown()
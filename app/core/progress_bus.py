@@ -0,0 +1,329 @@
+"""
+Progress Event Bus - Push-based progress events for SSE streams
+In-process subscribers are woken instantly; an optional Redis streams transport
+fans events out across API and worker processes. Events are retained for a bounded
+window so clients can resume with Last-Event-ID.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from app.core.constants import (
+    PROGRESS_RETENTION_SECONDS,
+    PROGRESS_MAX_EVENTS_PER_CHANNEL,
+    PROGRESS_REDIS_BLOCK_SECONDS,
+    PROGRESS_IDLE_POLL_INTERVAL,
+    PROGRESS_STREAM_TIMEOUT
+)
+from app.core.task_queue_backends import is_unsupported_command_error
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProgressEvent:
+    """One progress event; ids use the Redis stream id format '<ms>-<seq>'"""
+    id: str
+    data: Dict[str, Any]
+
+    def to_sse(self) -> str:
+        """Format as a Server-Sent Events frame"""
+        return f"id: {self.id}\ndata: {json.dumps(self.data)}\n\n"
+
+
+_STREAM_ID = re.compile(r"\d+(-\d+)?")
+
+
+def _stream_id(event_id: Optional[str]) -> str:
+    """Stream id to read after; missing or malformed ids (e.g. a bad Last-Event-ID) read from the start"""
+    if event_id and _STREAM_ID.fullmatch(event_id):
+        return event_id
+    return "0-0"
+
+
+def _id_key(event_id: Optional[str]) -> Tuple[int, int]:
+    """Sortable form of an event id (invalid or missing ids sort first)"""
+    try:
+        ms, seq = (event_id or "0-0").split("-", 1)
+        return int(ms), int(seq)
+    except ValueError:
+        return 0, 0
+
+
+class RedisStreamTransport:
+    """
+    Redis streams transport (one capped, expiring stream per channel)
+
+    Uses a blocking XREAD when the server accepts it and short polling otherwise.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        prefix: str = "progress",
+        max_events: int = PROGRESS_MAX_EVENTS_PER_CHANNEL,
+        retention_seconds: int = PROGRESS_RETENTION_SECONDS
+    ):
+        self.redis = redis_client
+        self.prefix = prefix
+        self.max_events = max_events
+        self.retention_seconds = retention_seconds
+        self._blocking_supported = True
+
+    def _key(self, channel: str) -> str:
+        return f"{self.prefix}:{channel}"
+
+    async def append(self, channel: str, event: ProgressEvent) -> None:
+        pipe = self.redis.pipeline()
+        pipe.xadd(self._key(channel), event.id, {"data": json.dumps(event.data)}, maxlen=self.max_events)
+        pipe.expire(self._key(channel), self.retention_seconds)
+        await pipe.exec()
+
+    @staticmethod
+    def _parse(response) -> List[ProgressEvent]:
+        """Parse an XREAD reply: [[key, [[id, [field, value, ...]], ...]]]"""
+        events = []
+        for _, entries in response or []:
+            for event_id, fields in entries:
+                values = dict(zip(fields[::2], fields[1::2]))
+                events.append(ProgressEvent(id=event_id, data=json.loads(values.get("data", "{}"))))
+        return events
+
+    async def read_after(self, channel: str, last_id: Optional[str]) -> List[ProgressEvent]:
+        response = await self.redis.xread({self._key(channel): _stream_id(last_id)})
+        return self._parse(response)
+
+    async def wait(self, channel: str, last_id: Optional[str], timeout: float) -> List[ProgressEvent]:
+        """Block until events newer than last_id exist (or timeout) and return them"""
+        if self._blocking_supported:
+            block_ms = int(min(timeout, PROGRESS_REDIS_BLOCK_SECONDS) * 1000)
+            try:
+                response = await self.redis.execute(
+                    ["XREAD", "BLOCK", str(max(block_ms, 1)), "STREAMS", self._key(channel), _stream_id(last_id)]
+                )
+                return self._parse(response)
+            except Exception as e:
+                if is_unsupported_command_error(e):
+                    self._blocking_supported = False
+                    logger.warning(f"[PROGRESS] Blocking XREAD unavailable, falling back to polling: {e}")
+                else:
+                    # Transient: poll this time, keep blocking for the next wait
+                    logger.warning(f"[PROGRESS] Blocking XREAD failed, polling once: {e}")
+
+        await asyncio.sleep(min(timeout, PROGRESS_IDLE_POLL_INTERVAL))
+        return await self.read_after(channel, last_id)
+
+
+class ProgressBus:
+    """
+    Publish/subscribe bus for progress events keyed by channel
+
+    Example:
+        progress_bus.publish("analysis:42", {"stage": "ai_analysis", "progress": 60})
+
+        async for event in progress_bus.subscribe("analysis:42", last_event_id=None):
+            yield event.to_sse()
+    """
+
+    def __init__(
+        self,
+        transport: Optional[RedisStreamTransport] = None,
+        max_events: int = PROGRESS_MAX_EVENTS_PER_CHANNEL,
+        retention_seconds: float = PROGRESS_RETENTION_SECONDS
+    ):
+        self.transport = transport
+        self.max_events = max_events
+        self.retention_seconds = retention_seconds
+
+        # Channels published from this process: bounded history + last update time
+        self._channels: Dict[str, Deque[ProgressEvent]] = {}
+        self._updated_at: Dict[str, float] = {}
+        # Wakeup signal per channel, replaced after every publish
+        self._signals: Dict[str, asyncio.Event] = {}
+
+        self._last_ms = 0
+        self._seq = 0
+        self._outbox: Optional[asyncio.Queue] = None
+        self._sender: Optional[asyncio.Task] = None
+
+    def configure(self, transport: Optional[RedisStreamTransport]) -> None:
+        """Attach (or detach) the cross-process transport"""
+        self.transport = transport
+
+    def _next_id(self) -> str:
+        """Monotonic '<ms>-<seq>' id (valid as an explicit Redis stream id)"""
+        now_ms = int(time.time() * 1000)
+        if now_ms > self._last_ms:
+            self._last_ms, self._seq = now_ms, 0
+        else:
+            self._seq += 1
+        return f"{self._last_ms}-{self._seq}"
+
+    def _evict_expired(self) -> None:
+        cutoff = time.monotonic() - self.retention_seconds
+        for channel in [c for c, updated in self._updated_at.items() if updated < cutoff]:
+            self._channels.pop(channel, None)
+            self._updated_at.pop(channel, None)
+
+    def _wake(self, channel: str) -> None:
+        signal = self._signals.pop(channel, None)
+        if signal is not None:
+            signal.set()
+
+    def publish(self, channel: str, data: Dict[str, Any]) -> ProgressEvent:
+        """
+        Publish an event (call from the event loop thread)
+
+        Local subscribers are woken immediately; the Redis append happens in a
+        background sender that preserves publish order.
+        """
+        self._evict_expired()
+
+        event = ProgressEvent(id=self._next_id(), data=data)
+        history = self._channels.setdefault(channel, deque(maxlen=self.max_events))
+        history.append(event)
+        self._updated_at[channel] = time.monotonic()
+        self._wake(channel)
+
+        if self.transport is not None:
+            self._enqueue_remote(channel, event)
+
+        return event
+
+    def _enqueue_remote(self, channel: str, event: ProgressEvent) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("[PROGRESS] No running event loop, event not sent to Redis")
+            return
+
+        if self._outbox is None or self._sender is None or self._sender.done():
+            self._outbox = asyncio.Queue()
+            self._sender = asyncio.create_task(self._send_loop(self._outbox))
+        self._outbox.put_nowait((channel, event))
+
+    async def _send_loop(self, outbox: asyncio.Queue) -> None:
+        while True:
+            channel, event = await outbox.get()
+            try:
+                await self.transport.append(channel, event)
+            except Exception as e:
+                logger.warning(f"[PROGRESS] Failed to publish event to Redis: {e}")
+            finally:
+                outbox.task_done()
+
+    def history(self, channel: str) -> List[Dict[str, Any]]:
+        """Locally retained event payloads for a channel"""
+        return [event.data for event in self._channels.get(channel, ())]
+
+    def clear(self, channel: str) -> None:
+        """Drop local history for a channel"""
+        self._channels.pop(channel, None)
+        self._updated_at.pop(channel, None)
+
+    def _local_after(self, channel: str, last_id: Optional[str]) -> List[ProgressEvent]:
+        cursor = _id_key(last_id)
+        return [event for event in self._channels.get(channel, ()) if _id_key(event.id) > cursor]
+
+    async def _wait(self, channel: str, last_id: Optional[str], timeout: float) -> List[ProgressEvent]:
+        """Wait for a local wakeup or (for remote publishers) new events in Redis"""
+        signal = self._signals.setdefault(channel, asyncio.Event())
+        local = asyncio.ensure_future(signal.wait())
+        waiters = {local}
+
+        remote = None
+        if self.transport is not None and channel not in self._channels:
+            remote = asyncio.ensure_future(self.transport.wait(channel, last_id, timeout))
+            waiters.add(remote)
+
+        try:
+            done, _ = await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+        if remote is not None and remote in done and not remote.cancelled() and remote.exception() is None:
+            return remote.result()
+        return []
+
+    async def subscribe(
+        self,
+        channel: str,
+        last_event_id: Optional[str] = None,
+        timeout: float = PROGRESS_STREAM_TIMEOUT
+    ) -> AsyncIterator[ProgressEvent]:
+        """
+        Yield retained events after last_event_id, then new events as they arrive
+
+        Stops after `timeout` seconds; the caller decides when a stream is complete.
+        """
+        deadline = time.monotonic() + timeout
+        cursor = last_event_id
+
+        while True:
+            events = self._local_after(channel, cursor)
+            if not events and self.transport is not None and channel not in self._channels:
+                try:
+                    events = await self.transport.read_after(channel, cursor)
+                except Exception as e:
+                    logger.warning(f"[PROGRESS] Failed to read events from Redis: {e}")
+
+            for event in events:
+                cursor = event.id
+                yield event
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+
+            if not events:
+                for event in await self._wait(channel, cursor, remaining):
+                    if _id_key(event.id) > _id_key(cursor):
+                        cursor = event.id
+                        yield event
+
+    async def aclose(self) -> None:
+        """Flush pending Redis appends and stop the sender"""
+        if self._outbox is not None and self._sender is not None and not self._sender.done():
+            try:
+                await asyncio.wait_for(self._outbox.join(), timeout=5)
+            except asyncio.TimeoutError:
+                logger.warning("[PROGRESS] Timed out flushing progress events to Redis")
+            self._sender.cancel()
+        self._outbox = None
+        self._sender = None
+
+
+# Global progress bus instance
+progress_bus = ProgressBus()
+
+
+def get_progress_bus() -> ProgressBus:
+    """Get global progress bus instance"""
+    return progress_bus
+
+
+def init_progress_bus(redis_enabled: bool = True) -> None:
+    """Attach the Redis streams transport when enabled and Redis is configured"""
+    if not redis_enabled:
+        progress_bus.configure(None)
+        return
+
+    try:
+        from app.core.security.rate_limiter import get_async_redis_client
+        progress_bus.configure(RedisStreamTransport(get_async_redis_client()))
+        logger.info("[PROGRESS] Redis streams transport enabled")
+    except ValueError as e:
+        progress_bus.configure(None)
+        logger.warning(f"[PROGRESS] Redis not configured, progress events stay in-process: {e}")
+
+
+async def close_progress_bus() -> None:
+    """Flush pending events (call on shutdown)"""
+    await progress_bus.aclose()
@@ -17,6 +17,8 @@ import logging
 from typing import Dict, Any, Optional, Union, List
 from bs4 import BeautifulSoup
 
+from app.core.offload import offload
+
 logger = logging.getLogger(__name__)
 
 # Maximum safe lengths for different data types
@@ -420,6 +422,28 @@ def sanitize_for_prompt(
     return text
 
 
+async def sanitize_for_prompt_async(
+    text: str,
+    max_length: int = MAX_TEXT_LENGTH,
+    remove_urls_flag: bool = True,
+    strict_mode: bool = True
+) -> str:
+    """
+    sanitize_for_prompt() for async callers
+
+    Large inputs are sanitized in the CPU offload pool so HTML parsing does
+    not block the event loop.
+    """
+    return await offload(
+        sanitize_for_prompt,
+        text,
+        max_length,
+        remove_urls_flag,
+        strict_mode,
+        size=len(text or "")
+    )
+
+
 def sanitize_dict_recursive(
     data: Dict[str, Any],
     max_length: int = MAX_TEXT_LENGTH
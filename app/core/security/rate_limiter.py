@@ -1,15 +1,34 @@
 """
-Rate limiting using Upstash Redis with TTL-based tracking.
+Rate limiting using Upstash Redis with an atomic sliding-window log.
+
+Each check is one Lua script round trip on the async client (trim the window,
+count, record) so concurrent requests cannot race past the limit. Clients known
+to be over their limit are rejected in-process until their next slot frees,
+without touching Redis.
 """
+import logging
+import math
 import os
-from datetime import datetime, timedelta
-from typing import Optional
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
 from fastapi import HTTPException, status
 from upstash_redis import Redis
+from upstash_redis.asyncio import Redis as AsyncRedis
 from dotenv import load_dotenv
 
+from app.core.constants import (
+    RATE_LIMIT_KEY_PREFIX,
+    RATE_LIMIT_MEMORY_MAX_KEYS,
+    RATE_LIMIT_SHADOW_MAX_KEYS
+)
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Redis configuration
 UPSTASH_REDIS_URL = os.getenv("UPSTASH_REDIS_URL")
 UPSTASH_REDIS_TOKEN = os.getenv("UPSTASH_REDIS_TOKEN")
@@ -18,6 +37,7 @@ RATE_LIMIT_WINDOW_HOURS = 24
 
 # Initialize Redis client
 redis_client: Optional[Redis] = None
+async_redis_client: Optional[AsyncRedis] = None
 
 def get_redis_client() -> Redis:
     """
@@ -44,57 +64,293 @@ def get_redis_client() -> Redis:
 
     return redis_client
 
-async def check_rate_limit(ip_address: str) -> bool:
+
+def get_async_redis_client() -> AsyncRedis:
+    """
+    Get or create the asyncio Redis client (does not block the event loop).
+
+    Returns:
+        Async Redis client
+
+    Raises:
+        ValueError: If Redis credentials are missing
+    """
+    global async_redis_client
+
+    if async_redis_client is None:
+        if not UPSTASH_REDIS_URL or not UPSTASH_REDIS_TOKEN:
+            raise ValueError(
+                "UPSTASH_REDIS_URL and UPSTASH_REDIS_TOKEN environment variables are required"
+            )
+
+        async_redis_client = AsyncRedis(
+            url=UPSTASH_REDIS_URL,
+            token=UPSTASH_REDIS_TOKEN
+        )
+
+    return async_redis_client
+
+
+# Trims the window, counts and (unless ARGV[3] is empty) records the request in
+# one atomic step. Server time keeps workers with skewed clocks consistent.
+# Returns {allowed, count, ms until the oldest counted request leaves the window}
+SLIDING_WINDOW_SCRIPT = """
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+local allowed = 0
+if ARGV[3] ~= '' and count < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    count = count + 1
+    allowed = 1
+end
+local reset = 0
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+if oldest[2] then
+    reset = tonumber(oldest[2]) + window - now
+end
+return {allowed, count, reset}
+"""
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of one rate limit check"""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # Seconds until the oldest counted request leaves the window
+
+    @property
+    def retry_after(self) -> int:
+        """Whole seconds to wait before retrying (0 if allowed)"""
+        return 0 if self.allowed else max(1, math.ceil(self.reset_after))
+
+    def headers(self) -> Dict[str, str]:
+        """X-RateLimit-* response headers (plus Retry-After when rejected)"""
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after))
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+class RedisRateLimitBackend:
+    """Sliding-window log in a Redis sorted set, one EVAL per check"""
+
+    def __init__(self, redis: AsyncRedis):
+        self.redis = redis
+
+    async def hit(self, key: str, limit: int, window_seconds: float, consume: bool = True) -> Tuple[bool, int, float]:
+        allowed, count, reset_ms = await self.redis.eval(
+            SLIDING_WINDOW_SCRIPT,
+            keys=[key],
+            args=[str(int(window_seconds * 1000)), str(limit), uuid.uuid4().hex if consume else ""]
+        )
+        return bool(int(allowed)), int(count), int(reset_ms) / 1000
+
+    async def reset(self, key: str) -> None:
+        await self.redis.delete(key)
+
+
+class MemoryRateLimitBackend:
+    """Same sliding-window log in process memory (Redis not configured, tests)"""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MEMORY_MAX_KEYS):
+        self.max_keys = max_keys
+        self._hits: Dict[str, Deque[float]] = {}
+
+    async def hit(self, key: str, limit: int, window_seconds: float, consume: bool = True) -> Tuple[bool, int, float]:
+        now = time.monotonic()
+        hits = self._hits.get(key)
+        if hits is None:
+            if len(self._hits) >= self.max_keys:
+                self._sweep(now, window_seconds)
+            hits = self._hits[key] = deque()
+
+        while hits and hits[0] <= now - window_seconds:
+            hits.popleft()
+        allowed = consume and len(hits) < limit
+        if allowed:
+            hits.append(now)
+
+        reset_after = hits[0] + window_seconds - now if hits else 0.0
+        if not hits:
+            del self._hits[key]
+        return allowed, len(hits), reset_after
+
+    async def reset(self, key: str) -> None:
+        self._hits.pop(key, None)
+
+    def _sweep(self, now: float, window_seconds: float) -> None:
+        """Drop keys whose newest request left the window"""
+        for key in [k for k, hits in self._hits.items() if not hits or hits[-1] <= now - window_seconds]:
+            del self._hits[key]
+
+
+class SlidingWindowRateLimiter:
     """
-    Check if IP address has exceeded rate limit.
+    Rate limiting engine shared by routes and middleware
+
+    The backend answers each check in one atomic round trip. A local shadow
+    remembers, per key, when a client that used up its limit gets its next
+    slot; until then it is rejected in-process. Requests only ever add to the
+    window, so a local rejection is never wrong (except right after an admin
+    reset on another worker). Fails open if the backend is unreachable.
+
+    Example:
+        result = await rate_limiter.hit(f"login:{client_ip}", 10, 60)
+        if not result.allowed:
+            raise HTTPException(429, headers=result.headers())
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        prefix: str = RATE_LIMIT_KEY_PREFIX,
+        shadow_max_keys: int = RATE_LIMIT_SHADOW_MAX_KEYS
+    ):
+        self._backend = backend
+        self.prefix = prefix
+        self.shadow_max_keys = shadow_max_keys
+        self._blocked_until: "OrderedDict[str, float]" = OrderedDict()  # key -> monotonic time of next free slot
+        self.stats = {
+            "checks": 0,
+            "rejected": 0,
+            "local_rejections": 0,
+            "backend_calls": 0,
+            "backend_errors": 0
+        }
+
+    def configure(self, backend) -> None:
+        """Replace the backend (None re-resolves Redis on the next check)"""
+        self._backend = backend
+        self._blocked_until.clear()
+
+    def _get_backend(self):
+        if self._backend is None:
+            try:
+                self._backend = RedisRateLimitBackend(get_async_redis_client())
+            except ValueError as e:
+                logger.warning(f"[RATE LIMIT] Redis not configured, limiting per process: {e}")
+                self._backend = MemoryRateLimitBackend()
+        return self._backend
+
+    def _shadow_wait(self, key: str) -> Optional[float]:
+        """Seconds until the key's next free slot if it is known to be over its limit"""
+        blocked_until = self._blocked_until.get(key)
+        if blocked_until is None:
+            return None
+        wait = blocked_until - time.monotonic()
+        if wait <= 0:
+            del self._blocked_until[key]
+            return None
+        return wait
+
+    def _block(self, key: str, seconds: float) -> None:
+        self._blocked_until[key] = time.monotonic() + seconds
+        self._blocked_until.move_to_end(key)
+        while len(self._blocked_until) > self.shadow_max_keys:
+            self._blocked_until.popitem(last=False)
+
+    async def hit(self, key: str, limit: int, window_seconds: float) -> RateLimitResult:
+        """Count one request for key; allowed if fewer than limit were counted in the last window_seconds"""
+        self.stats["checks"] += 1
+
+        wait = self._shadow_wait(key)
+        if wait is not None:
+            self.stats["local_rejections"] += 1
+            self.stats["rejected"] += 1
+            return RateLimitResult(allowed=False, limit=limit, remaining=0, reset_after=wait)
+
+        try:
+            allowed, count, reset_after = await self._get_backend().hit(
+                f"{self.prefix}:{key}", limit, window_seconds
+            )
+        except Exception as e:
+            # Fail open (allow request) to prevent Redis issues from blocking service
+            self.stats["backend_errors"] += 1
+            logger.warning(f"[RATE LIMIT] Check failed for {key}: {e}. Allowing request (fail-open mode).")
+            return RateLimitResult(allowed=True, limit=limit, remaining=limit, reset_after=0.0)
+
+        self.stats["backend_calls"] += 1
+        if count >= limit:
+            # No slot frees before the oldest counted request leaves the window
+            self._block(key, reset_after)
+        if not allowed:
+            self.stats["rejected"] += 1
+        return RateLimitResult(
+            allowed=allowed,
+            limit=limit,
+            remaining=max(0, limit - count),
+            reset_after=reset_after
+        )
+
+    async def peek(self, key: str, limit: int, window_seconds: float) -> RateLimitResult:
+        """Current usage of key without counting a request"""
+        _, count, reset_after = await self._get_backend().hit(
+            f"{self.prefix}:{key}", limit, window_seconds, consume=False
+        )
+        return RateLimitResult(
+            allowed=count < limit,
+            limit=limit,
+            remaining=max(0, limit - count),
+            reset_after=reset_after
+        )
+
+    async def reset(self, key: str) -> None:
+        """Forget all requests counted for key"""
+        self._blocked_until.pop(key, None)
+        await self._get_backend().reset(f"{self.prefix}:{key}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Check counters plus clients currently rejected locally"""
+        return {**self.stats, "shadow_keys": len(self._blocked_until)}
+
+
+# Global rate limiter instance
+rate_limiter = SlidingWindowRateLimiter()
+
+
+async def check_rate_limit(
+    ip_address: Optional[str] = None,
+    key: Optional[str] = None,
+    max_requests: int = MAX_SUBMISSIONS_PER_IP,
+    window_seconds: int = RATE_LIMIT_WINDOW_HOURS * 3600
+) -> bool:
+    """
+    Check if IP address (or key) has exceeded rate limit.
 
     Args:
         ip_address: Client IP address
+        key: Limit key, used instead of the IP address (e.g. "enrichment:submit:<ip>")
+        max_requests: Requests allowed per window (default: form submissions per IP)
+        window_seconds: Sliding window length (default: 24 hours)
 
     Returns:
-        True if within rate limit, False if exceeded
+        True if within rate limit (also when Redis is unavailable, fail-open)
 
     Raises:
         HTTPException: If rate limit is exceeded
     """
-    try:
-        redis = get_redis_client()
-        key = f"ratelimit:{ip_address}"
-
-        # Get current count
-        current_count = redis.get(key)
-
-        if current_count is None:
-            # First submission from this IP
-            redis.set(key, 1, ex=RATE_LIMIT_WINDOW_HOURS * 3600)  # TTL in seconds
-            return True
-
-        # Convert to integer
-        count = int(current_count)
-
-        if count >= MAX_SUBMISSIONS_PER_IP:
-            # Rate limit exceeded
-            ttl = redis.ttl(key)
-            hours_remaining = ttl // 3600 if ttl > 0 else 0
-            minutes_remaining = (ttl % 3600) // 60 if ttl > 0 else 0
-
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Rate limit exceeded. You can submit {MAX_SUBMISSIONS_PER_IP} forms per {RATE_LIMIT_WINDOW_HOURS} hours. "
-                       f"Try again in {hours_remaining}h {minutes_remaining}m."
-            )
-
-        # Increment count
-        redis.incr(key)
+    result = await rate_limiter.hit(key or ip_address, max_requests, window_seconds)
+    if result.allowed:
         return True
 
-    except HTTPException:
-        # Re-raise HTTP exceptions
-        raise
-    except Exception as e:
-        # Log error but fail open (allow request) to prevent Redis issues from blocking service
-        print(f"Rate limit check failed: {str(e)}. Allowing request (fail-open mode).")
-        return True
+    hours_remaining, minutes_remaining = divmod(result.retry_after // 60, 60)
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=f"Rate limit exceeded. You can submit {max_requests} forms per {window_seconds // 3600} hours. "
+               f"Try again in {hours_remaining}h {minutes_remaining}m.",
+        headers=result.headers()
+    )
 
 async def reset_rate_limit(ip_address: str) -> bool:
     """
@@ -107,12 +363,10 @@ async def reset_rate_limit(ip_address: str) -> bool:
         True if reset successful
     """
     try:
-        redis = get_redis_client()
-        key = f"ratelimit:{ip_address}"
-        redis.delete(key)
+        await rate_limiter.reset(ip_address)
         return True
     except Exception as e:
-        print(f"Failed to reset rate limit for {ip_address}: {str(e)}")
+        logger.warning(f"[RATE LIMIT] Failed to reset rate limit for {ip_address}: {e}")
         return False
 
 async def get_rate_limit_status(ip_address: str) -> dict:
@@ -126,24 +380,20 @@ async def get_rate_limit_status(ip_address: str) -> dict:
         Dictionary with rate limit info
     """
     try:
-        redis = get_redis_client()
-        key = f"ratelimit:{ip_address}"
-
-        current_count = redis.get(key)
-        count = int(current_count) if current_count else 0
-
-        ttl = redis.ttl(key) if current_count else 0
-        hours_remaining = ttl // 3600 if ttl > 0 else 0
-        minutes_remaining = (ttl % 3600) // 60 if ttl > 0 else 0
+        result = await rate_limiter.peek(
+            ip_address, MAX_SUBMISSIONS_PER_IP, RATE_LIMIT_WINDOW_HOURS * 3600
+        )
+        count = MAX_SUBMISSIONS_PER_IP - result.remaining
+        reset_seconds = math.ceil(result.reset_after)
 
         return {
             "ip_address": ip_address,
             "submissions_count": count,
             "max_submissions": MAX_SUBMISSIONS_PER_IP,
-            "remaining_submissions": max(0, MAX_SUBMISSIONS_PER_IP - count),
-            "reset_in_hours": hours_remaining,
-            "reset_in_minutes": minutes_remaining,
-            "is_limited": count >= MAX_SUBMISSIONS_PER_IP
+            "remaining_submissions": result.remaining,
+            "reset_in_hours": reset_seconds // 3600,
+            "reset_in_minutes": (reset_seconds % 3600) // 60,
+            "is_limited": not result.allowed
         }
     except Exception as e:
         return {
@@ -0,0 +1,238 @@
+"""
+Single Flight - One computation per cache key across coroutines and processes
+Callers in the same process share the leader's task; other processes wait on a
+Redis lease and read the leader's result from the cache once it is released.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.constants import (
+    SINGLE_FLIGHT_ANALYSIS_WAIT_SECONDS,
+    SINGLE_FLIGHT_KEY_PREFIX,
+    SINGLE_FLIGHT_LEASE_SECONDS,
+    SINGLE_FLIGHT_POLL_INTERVAL
+)
+
+logger = logging.getLogger(__name__)
+
+# Extend the lease only while this process still holds it
+RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Delete the lease only while this process still holds it
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Token used when Redis is unreachable: run locally without a lease
+_NO_LEASE = ""
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent cache fills
+
+    The leader holds a Redis lease (SET NX with a TTL it keeps renewing) while
+    compute() runs; compute() must write its result to the cache before
+    returning. Followers in other processes poll the lease and, once it is
+    gone, read the result with lookup(). A lease that disappears without a
+    cached result (leader failed or died) is taken over by one follower.
+    Followers that wait longer than wait_timeout run compute() themselves.
+    Without Redis only callers in this process are coalesced.
+
+    Example:
+        analysis = await single_flight.run(cache_key, generate_and_cache, read_cached)
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        lease_seconds: float = SINGLE_FLIGHT_LEASE_SECONDS,
+        poll_interval: float = SINGLE_FLIGHT_POLL_INTERVAL,
+        prefix: str = SINGLE_FLIGHT_KEY_PREFIX
+    ):
+        self._redis = redis_client
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.prefix = prefix
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            "led": 0,
+            "coalesced": 0,  # Joined a flight in this process
+            "followed": 0,  # Read another process's result
+            "takeovers": 0,
+            "timeouts": 0,
+            "errors": 0
+        }
+
+    def configure(self, redis_client) -> None:
+        """Attach (or detach with None) the Redis client holding the leases"""
+        self._redis = redis_client
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def run(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        lookup: Callable[[], Awaitable[Optional[Any]]],
+        wait_timeout: float = SINGLE_FLIGHT_ANALYSIS_WAIT_SECONDS
+    ) -> Any:
+        """
+        Result of compute() for key, computed once by whichever caller leads
+
+        Args:
+            key: Cache key of the result
+            compute: Produces the result and stores it in the cache
+            lookup: Reads the cached result (None on miss)
+            wait_timeout: Seconds to follow another process before computing anyway
+
+        Raises:
+            Exception: Whatever compute() raised, for the leader and its in-process joiners
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.create_task(self._fly(key, compute, lookup, wait_timeout))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda t: self._in_flight.pop(key, None) if self._in_flight.get(key) is t else None)
+        return await asyncio.shield(task)
+
+    async def _fly(self, key, compute, lookup, wait_timeout: float) -> Any:
+        if self._redis is None:
+            self.stats["led"] += 1
+            return await compute()
+
+        deadline = time.monotonic() + wait_timeout
+        waited = False
+        while True:
+            token = await self._acquire(key)
+            if token is not None:
+                if waited:
+                    # The lease was freed: either the result just landed or the leader is gone
+                    result = await lookup()
+                    if result is not None:
+                        await self._release(key, token)
+                        self.stats["followed"] += 1
+                        return result
+                    self.stats["takeovers"] += 1
+                    logger.warning(f"[FLIGHT] Taking over {key} (previous leader released without a result)")
+                else:
+                    self.stats["led"] += 1
+                return await self._lead(key, token, compute)
+
+            waited = True
+            result = await self._follow(key, lookup, deadline)
+            if result is not None:
+                self.stats["followed"] += 1
+                return result
+
+            if time.monotonic() >= deadline:
+                self.stats["timeouts"] += 1
+                logger.warning(f"[FLIGHT] Gave up waiting for {key} after {wait_timeout:.0f}s, computing locally")
+                return await compute()
+
+    async def _acquire(self, key: str) -> Optional[str]:
+        """Lease token if this process now leads, None if another process does"""
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self._redis.set(
+                self._key(key), token, nx=True, px=int(self.lease_seconds * 1000)
+            )
+        except Exception as e:
+            # Redis unavailable - duplicate work is better than blocking the analysis
+            self.stats["errors"] += 1
+            logger.warning(f"[FLIGHT] Lease acquire failed for {key}, running without lease: {e}")
+            return _NO_LEASE
+        return token if acquired else None
+
+    async def _lead(self, key: str, token: str, compute) -> Any:
+        heartbeat = asyncio.create_task(self._renew(key, token)) if token else None
+        try:
+            return await compute()
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+                await self._release(key, token)
+
+    async def _renew(self, key: str, token: str) -> None:
+        """Keep the lease alive while compute() runs (a dead leader's lease expires)"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                renewed = await self._redis.eval(
+                    RENEW_SCRIPT,
+                    keys=[self._key(key)],
+                    args=[token, str(int(self.lease_seconds * 1000))]
+                )
+            except Exception as e:
+                # Transient Redis error - retry on the next beat before the lease runs out
+                self.stats["errors"] += 1
+                logger.warning(f"[FLIGHT] Lease renewal failed for {key}: {e}")
+                continue
+            if not int(renewed):
+                logger.warning(f"[FLIGHT] Lost lease for {key}, another process may start it too")
+                return
+
+    async def _release(self, key: str, token: str) -> None:
+        try:
+            await self._redis.eval(RELEASE_SCRIPT, keys=[self._key(key)], args=[token])
+        except Exception as e:
+            # Lease expires on its own; followers just wait a little longer
+            self.stats["errors"] += 1
+            logger.warning(f"[FLIGHT] Lease release failed for {key}: {e}")
+
+    async def _follow(self, key: str, lookup, deadline: float) -> Optional[Any]:
+        """Wait until the leader's lease is gone, then read its result (None if there is none)"""
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                held = await self._redis.get(self._key(key)) is not None
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"[FLIGHT] Lease check failed for {key}: {e}")
+                held = False
+            if not held:
+                return await lookup()
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Flight counters plus current in-process flights"""
+        return {
+            **self.stats,
+            "in_flight": len(self._in_flight),
+            "redis": self._redis is not None
+        }
+
+
+# Global single-flight instance (analysis and stage cache fills)
+single_flight = SingleFlight()
+
+
+def init_single_flight(redis_enabled: bool = True) -> None:
+    """Coordinate cache fills across processes through Redis leases, if enabled and configured"""
+    if not redis_enabled:
+        single_flight.configure(None)
+        return
+
+    try:
+        from app.core.security.rate_limiter import get_async_redis_client
+        single_flight.configure(get_async_redis_client())
+        logger.info("[FLIGHT] Redis leases enabled")
+    except ValueError as e:
+        single_flight.configure(None)
+        logger.warning(f"[FLIGHT] Redis not configured, only in-process callers are coalesced: {e}")
@@ -0,0 +1,188 @@
+"""
+Submission List Cache - Incrementally refreshed replica of the admin listing
+Keeps the projected submissions (no report bodies) in memory and refreshes
+them from an (updated_at, id) watermark instead of reloading the whole table.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.constants import (
+    SUBMISSION_LIST_FULL_RESYNC_SECONDS,
+    SUBMISSION_LIST_SYNC_BATCH,
+    SUBMISSION_LIST_SYNC_INTERVAL,
+    SUBMISSION_LIST_SYNC_OVERLAP
+)
+from app.core.database import decode_submission_cursor, get_submissions_updated_since
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _listing_key(row: Dict[str, Any]) -> Tuple[datetime, int]:
+    """Sort key of the dashboard order (created_at, id), compared as timestamps not strings"""
+    return _parse_timestamp(row["created_at"]), row["id"]
+
+
+def _later_watermark(watermark: Optional[Tuple[str, int]], row: Dict[str, Any]) -> Tuple[str, int]:
+    """The newer of watermark and the row's (updated_at, id)"""
+    if watermark is None or (_parse_timestamp(row["updated_at"]), row["id"]) > (
+        _parse_timestamp(watermark[0]), watermark[1]
+    ):
+        return row["updated_at"], row["id"]
+    return watermark
+
+
+class SubmissionListCache:
+    """
+    In-memory replica of submissions_list for the unfiltered dashboard listing
+
+    Each sync re-reads rows changed since the watermark, minus a small overlap
+    for transactions that committed late, so a refresh with no changes is one
+    indexed query returning nothing. A periodic full reload drops deleted rows.
+
+    Example:
+        rows = await submission_list_cache.page(limit=51, cursor=None)
+    """
+
+    def __init__(
+        self,
+        sync_interval: float = SUBMISSION_LIST_SYNC_INTERVAL,
+        overlap_seconds: float = SUBMISSION_LIST_SYNC_OVERLAP,
+        batch_size: int = SUBMISSION_LIST_SYNC_BATCH,
+        full_resync_seconds: float = SUBMISSION_LIST_FULL_RESYNC_SECONDS
+    ):
+        self.sync_interval = sync_interval
+        self.overlap_seconds = overlap_seconds
+        self.batch_size = batch_size
+        self.full_resync_seconds = full_resync_seconds
+
+        self._rows: Dict[int, Dict[str, Any]] = {}
+        self._ordered: Optional[List[Tuple[Tuple[datetime, int], Dict[str, Any]]]] = None  # Dashboard order, rebuilt after changes
+        self._watermark: Optional[Tuple[str, int]] = None  # (updated_at, id) of the newest change seen
+        self._synced_at: Optional[float] = None
+        self._loaded_at: Optional[float] = None
+        self._sync_lock: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = None
+        self.stats = {"syncs": 0, "full_loads": 0, "rows_fetched": 0, "sync_errors": 0}
+
+    def _lock(self) -> asyncio.Lock:
+        """Single-flight sync lock bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._sync_lock is None or self._sync_lock[0] is not loop:
+            self._sync_lock = (loop, asyncio.Lock())
+        return self._sync_lock[1]
+
+    def _is_fresh(self) -> bool:
+        return self._synced_at is not None and time.monotonic() - self._synced_at < self.sync_interval
+
+    async def sync(self, force: bool = False) -> int:
+        """
+        Bring the replica up to date (at most once per sync_interval unless forced)
+
+        Returns:
+            Number of rows fetched
+        """
+        if not force and self._is_fresh():
+            return 0
+
+        async with self._lock():
+            # Another request may have synced while we waited
+            if not force and self._is_fresh():
+                return 0
+
+            now = time.monotonic()
+            full = self._loaded_at is None or now - self._loaded_at >= self.full_resync_seconds
+
+            # A full reload fills a fresh replica and swaps it in only once complete
+            rows_by_id = {} if full else self._rows
+            watermark = None if full else self._watermark
+
+            since, after_id = self._start_position(watermark)
+            fetched = 0
+            try:
+                while True:
+                    rows = await get_submissions_updated_since(since, after_id, limit=self.batch_size)
+                    for row in rows:
+                        rows_by_id[row["id"]] = row
+                        watermark = _later_watermark(watermark, row)
+                    fetched += len(rows)
+                    if len(rows) < self.batch_size:
+                        break
+                    since, after_id = rows[-1]["updated_at"], rows[-1]["id"]
+            finally:
+                # An interrupted incremental sync still applied valid, newer rows
+                if not full:
+                    self._watermark = watermark
+                    if fetched:
+                        self._ordered = None
+
+            if full:
+                self._rows, self._watermark, self._ordered = rows_by_id, watermark, None
+                self._loaded_at = now
+                self.stats["full_loads"] += 1
+
+            self._synced_at = time.monotonic()
+            self.stats["syncs"] += 1
+            self.stats["rows_fetched"] += fetched
+            return fetched
+
+    def _start_position(self, watermark: Optional[Tuple[str, int]]) -> Tuple[Optional[str], int]:
+        if watermark is None or not self.overlap_seconds:
+            return watermark or (None, 0)
+        since = _parse_timestamp(watermark[0]) - timedelta(seconds=self.overlap_seconds)
+        return since.isoformat(), 0
+
+    def _ordered_rows(self) -> List[Tuple[Tuple[datetime, int], Dict[str, Any]]]:
+        if self._ordered is None:
+            self._ordered = sorted(
+                ((_listing_key(row), row) for row in self._rows.values()),
+                key=lambda item: item[0],
+                reverse=True
+            )
+        return self._ordered
+
+    async def page(self, limit: int, cursor: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        One page in dashboard order (created_at DESC, id DESC), same cursors as list_submissions
+
+        Serves the last good replica if a refresh fails.
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        position = None
+        if cursor:
+            created_at, row_id = decode_submission_cursor(cursor)
+            position = (_parse_timestamp(created_at), row_id)
+
+        try:
+            await self.sync()
+        except Exception as e:
+            self.stats["sync_errors"] += 1
+            if self._synced_at is None:
+                raise
+            logger.warning(f"[SUBMISSIONS] Listing refresh failed, serving cached rows: {e}")
+
+        ordered = self._ordered_rows()
+        start = 0
+        if position is not None:
+            start = next((i for i, (key, _) in enumerate(ordered) if key < position), len(ordered))
+        return [row for _, row in ordered[start:start + limit]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Sync counters plus replica size and watermark"""
+        return {
+            **self.stats,
+            "rows": len(self._rows),
+            "watermark": self._watermark[0] if self._watermark else None
+        }
+
+
+# Global submission listing cache instance
+submission_list_cache = SubmissionListCache()
@@ -1,22 +1,33 @@
 """
 Task Queue System for Background Job Processing
-Provides async task execution with Redis backend
+Provides async task execution over a pluggable backend (async Redis or in-memory)
 """
 
 import json
 import logging
 import asyncio
+import time
+import uuid
 from typing import Callable, Any, Dict, Optional, List
 from datetime import datetime, timedelta
 from enum import Enum
 from dataclasses import dataclass, asdict
-import traceback
 
-from app.core.security.rate_limiter import get_redis_client
+from app.core.security.rate_limiter import get_async_redis_client
 from app.core.exceptions import TaskQueueError
+from app.core.constants import TASK_QUEUE_LEASE_SECONDS
+from app.core.task_queue_backends import (
+    QueueBackend,
+    RedisQueueBackend,
+    BUCKET_COMPLETED,
+    BUCKET_DLQ
+)
 
 logger = logging.getLogger(__name__)
 
+# Score band per priority level; must exceed any epoch timestamp so priority dominates
+PRIORITY_SCORE_BAND = 1e11
+
 
 class TaskStatus(Enum):
     """Task execution status"""
@@ -86,15 +97,16 @@ class Task:
 
 class TaskQueue:
     """
-    Redis-backed task queue for background job processing
+    Task queue for background job processing over a pluggable QueueBackend
 
     Features:
-    - Priority-based task execution
+    - Priority-based task execution (FIFO within a priority)
+    - Batch claim of up to N tasks per round trip
+    - Blocking dequeue (no fixed polling delay)
+    - Visibility-timeout leases, renewed while a task runs and reclaimed if a worker dies
     - Automatic retries with exponential backoff
-    - Task status tracking
     - Dead letter queue for failed tasks
     - Task result storage
-    - Distributed worker support
 
     Example:
         queue = TaskQueue()
@@ -117,26 +129,27 @@ class TaskQueue:
         self,
         redis_client=None,
         queue_prefix: str = "task_queue",
-        result_ttl: int = 3600  # 1 hour
+        result_ttl: int = 3600,  # 1 hour
+        backend: Optional[QueueBackend] = None,
+        lease_seconds: float = TASK_QUEUE_LEASE_SECONDS
     ):
         """
         Initialize task queue
 
         Args:
-            redis_client: Redis client instance
+            redis_client: Async Redis client (used when no backend is given)
             queue_prefix: Prefix for Redis keys
             result_ttl: TTL for task results in seconds
+            backend: Queue backend (defaults to RedisQueueBackend)
+            lease_seconds: Visibility timeout for claimed tasks
         """
-        self.redis = redis_client or get_redis_client()
         self.prefix = queue_prefix
         self.result_ttl = result_ttl
-
-        # Queue keys
-        self.pending_key = f"{self.prefix}:pending"
-        self.running_key = f"{self.prefix}:running"
-        self.completed_key = f"{self.prefix}:completed"
-        self.failed_key = f"{self.prefix}:failed"
-        self.dlq_key = f"{self.prefix}:dlq"  # Dead letter queue
+        self.lease_seconds = lease_seconds
+        self.backend = backend or RedisQueueBackend(
+            redis_client or get_async_redis_client(),
+            prefix=queue_prefix
+        )
 
         # Registered task functions
         self.tasks: Dict[str, Callable] = {}
@@ -169,6 +182,16 @@ class TaskQueue:
             return func
         return decorator
 
+    @staticmethod
+    def _score(priority: TaskPriority) -> float:
+        """Higher priority first; older tasks first within the same priority"""
+        return priority.value * PRIORITY_SCORE_BAND - time.time()
+
+    async def _push(self, task: Task) -> None:
+        """Persist task data and make it claimable"""
+        await self.backend.save_tasks({task.id: json.dumps(task.to_dict())})
+        await self.backend.push(task.id, self._score(task.priority))
+
     async def enqueue(
         self,
         func: Callable,
@@ -198,7 +221,6 @@ class TaskQueue:
         try:
             # Generate task ID
             if task_id is None:
-                import uuid
                 task_id = str(uuid.uuid4())
 
             # Get function name
@@ -219,14 +241,7 @@ class TaskQueue:
                 created_at=datetime.utcnow().isoformat()
             )
 
-            # Store task data
-            task_key = f"{self.prefix}:task:{task_id}"
-            self.redis.set(task_key, json.dumps(task.to_dict()))
-
-            # Add to priority queue
-            # Higher priority = higher score
-            score = priority.value * 1000000 + int(datetime.utcnow().timestamp())
-            self.redis.zadd(self.pending_key, {task_id: score})
+            await self._push(task)
 
             logger.info(
                 f"[TASK QUEUE] Enqueued task: {task_id} ({func_name}) "
@@ -239,56 +254,81 @@ class TaskQueue:
             logger.error(f"[TASK QUEUE] Failed to enqueue task: {e}", exc_info=True)
             raise TaskQueueError(f"Failed to enqueue task: {str(e)}")
 
-    async def dequeue(self, timeout: int = 0) -> Optional[Task]:
+    async def dequeue_batch(self, max_tasks: int = 1, timeout: float = 0) -> List[Task]:
         """
-        Dequeue next task for processing
+        Claim up to max_tasks tasks in one round trip
+
+        Claimed tasks are leased for `lease_seconds`; execute_task renews the
+        lease while the task runs.
 
         Args:
-            timeout: Block timeout in seconds (0 = non-blocking)
+            max_tasks: Maximum number of tasks to claim
+            timeout: Seconds to block waiting for work when the queue is empty (0 = non-blocking)
 
         Returns:
-            Task if available, None otherwise
+            Claimed tasks (possibly empty)
 
         Raises:
             TaskQueueError: If dequeueing fails
         """
         try:
-            # Get highest priority task (highest score)
-            result = self.redis.zpopmax(self.pending_key)
+            claimed = await self.backend.claim(max_tasks, self.lease_seconds)
+            if not claimed and timeout > 0:
+                await self.backend.wait_for_work(timeout)
+                claimed = await self.backend.claim(max_tasks, self.lease_seconds)
 
-            if not result:
-                return None
+            tasks: List[Task] = []
+            for task_id, task_data in claimed:
+                if not task_data:
+                    logger.warning(f"[TASK QUEUE] Task {task_id} data not found")
+                    await self.backend.release(task_id)
+                    continue
 
-            task_id, score = result[0]
+                task = Task.from_dict(json.loads(task_data))
+                task.status = TaskStatus.RUNNING
+                task.started_at = datetime.utcnow().isoformat()
+                tasks.append(task)
 
-            # Load task data
-            task_key = f"{self.prefix}:task:{task_id}"
-            task_data = self.redis.get(task_key)
+            await self.backend.save_tasks({task.id: json.dumps(task.to_dict()) for task in tasks})
 
-            if not task_data:
-                logger.warning(f"[TASK QUEUE] Task {task_id} data not found")
-                return None
+            for task in tasks:
+                logger.info(f"[TASK QUEUE] Dequeued task: {task.id} ({task.name})")
 
-            task = Task.from_dict(json.loads(task_data))
+            return tasks
 
-            # Move to running queue
-            task.status = TaskStatus.RUNNING
-            task.started_at = datetime.utcnow().isoformat()
+        except Exception as e:
+            logger.error(f"[TASK QUEUE] Failed to dequeue task: {e}", exc_info=True)
+            raise TaskQueueError(f"Failed to dequeue task: {str(e)}")
 
-            self.redis.set(task_key, json.dumps(task.to_dict()))
-            self.redis.sadd(self.running_key, task_id)
+    async def dequeue(self, timeout: int = 0) -> Optional[Task]:
+        """
+        Dequeue next task for processing
 
-            logger.info(f"[TASK QUEUE] Dequeued task: {task_id} ({task.name})")
+        Args:
+            timeout: Block timeout in seconds (0 = non-blocking)
 
-            return task
+        Returns:
+            Task if available, None otherwise
 
-        except Exception as e:
-            logger.error(f"[TASK QUEUE] Failed to dequeue task: {e}", exc_info=True)
-            raise TaskQueueError(f"Failed to dequeue task: {str(e)}")
+        Raises:
+            TaskQueueError: If dequeueing fails
+        """
+        tasks = await self.dequeue_batch(max_tasks=1, timeout=timeout)
+        return tasks[0] if tasks else None
+
+    async def _renew_lease_forever(self, task_id: str):
+        """Keep a running task's lease alive until cancelled"""
+        interval = self.lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.backend.renew([task_id], self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"[TASK QUEUE] Failed to renew lease for {task_id}: {e}")
 
     async def execute_task(self, task: Task) -> Any:
         """
-        Execute a task
+        Execute a task, renewing its lease while it runs
 
         Args:
             task: Task to execute
@@ -303,12 +343,16 @@ class TaskQueue:
             raise TaskQueueError(f"Task function '{task.name}' not registered")
 
         func = self.tasks[task.name]
+        renewer = asyncio.create_task(self._renew_lease_forever(task.id))
 
-        # Execute function
-        if asyncio.iscoroutinefunction(func):
-            result = await func(*task.args, **task.kwargs)
-        else:
-            result = func(*task.args, **task.kwargs)
+        try:
+            # Execute function
+            if asyncio.iscoroutinefunction(func):
+                result = await func(*task.args, **task.kwargs)
+            else:
+                result = func(*task.args, **task.kwargs)
+        finally:
+            renewer.cancel()
 
         return result
 
@@ -325,12 +369,11 @@ class TaskQueue:
             task.completed_at = datetime.utcnow().isoformat()
             task.result = result
 
-            task_key = f"{self.prefix}:task:{task.id}"
-            self.redis.set(task_key, json.dumps(task.to_dict()), ex=self.result_ttl)
+            await self.backend.save_tasks({task.id: json.dumps(task.to_dict())}, ttl=self.result_ttl)
 
             # Move from running to completed
-            self.redis.srem(self.running_key, task.id)
-            self.redis.sadd(self.completed_key, task.id)
+            await self.backend.release(task.id)
+            await self.backend.add_to_bucket(BUCKET_COMPLETED, task.id)
 
             logger.info(f"[TASK QUEUE] Task completed: {task.id}")
 
@@ -357,28 +400,26 @@ class TaskQueue:
                     f"(attempt {task.retries}/{task.max_retries})"
                 )
 
-                # Re-enqueue with exponential backoff
+                # Re-enqueue with exponential backoff; the lease covers the wait
+                # so the task is reclaimed if this worker dies meanwhile
                 backoff = 2 ** task.retries  # 2, 4, 8 seconds
+                await self.backend.renew([task.id], backoff + self.lease_seconds)
                 await asyncio.sleep(backoff)
 
-                await self.enqueue(
-                    self.tasks[task.name],
-                    args=task.args,
-                    kwargs=task.kwargs,
-                    priority=task.priority,
-                    max_retries=task.max_retries,
-                    task_id=task.id
-                )
+                await self.backend.release(task.id)
+                await self._push(task)
             else:
                 # Max retries exceeded - move to DLQ
                 task.status = TaskStatus.FAILED
                 task.completed_at = datetime.utcnow().isoformat()
 
-                task_key = f"{self.prefix}:task:{task.id}"
-                self.redis.set(task_key, json.dumps(task.to_dict()), ex=self.result_ttl * 24)  # Keep failed tasks longer
+                await self.backend.save_tasks(
+                    {task.id: json.dumps(task.to_dict())},
+                    ttl=self.result_ttl * 24  # Keep failed tasks longer
+                )
 
-                self.redis.srem(self.running_key, task.id)
-                self.redis.sadd(self.dlq_key, task.id)
+                await self.backend.release(task.id)
+                await self.backend.add_to_bucket(BUCKET_DLQ, task.id)
 
                 logger.error(
                     f"[TASK QUEUE] Task failed permanently: {task.id} - {error}",
@@ -388,6 +429,39 @@ class TaskQueue:
         except Exception as e:
             logger.error(f"[TASK QUEUE] Failed to mark task as failed: {e}")
 
+    async def reclaim_expired(self) -> int:
+        """
+        Return tasks whose lease expired (worker died) to the pending queue
+
+        Returns:
+            Number of reclaimed tasks
+        """
+        reclaimed = 0
+        try:
+            for task_id in await self.backend.expired_leases():
+                # Only the caller that removes the lease requeues the task
+                if not await self.backend.release(task_id):
+                    continue
+
+                task_data = await self.backend.load_task(task_id)
+                if not task_data:
+                    continue
+
+                task = Task.from_dict(json.loads(task_data))
+                task.status = TaskStatus.PENDING
+                await self._push(task)
+                reclaimed += 1
+                logger.warning(f"[TASK QUEUE] Reclaimed task with expired lease: {task_id} ({task.name})")
+
+        except Exception as e:
+            logger.error(f"[TASK QUEUE] Failed to reclaim expired tasks: {e}")
+
+        return reclaimed
+
+    async def _load(self, task_id: str) -> Optional[Task]:
+        task_data = await self.backend.load_task(task_id)
+        return Task.from_dict(json.loads(task_data)) if task_data else None
+
     async def get_task_status(self, task_id: str) -> Optional[TaskStatus]:
         """
         Get task status
@@ -399,14 +473,8 @@ class TaskQueue:
             Task status if found, None otherwise
         """
         try:
-            task_key = f"{self.prefix}:task:{task_id}"
-            task_data = self.redis.get(task_key)
-
-            if not task_data:
-                return None
-
-            task = Task.from_dict(json.loads(task_data))
-            return task.status
+            task = await self._load(task_id)
+            return task.status if task else None
 
         except Exception as e:
             logger.error(f"[TASK QUEUE] Failed to get task status: {e}")
@@ -423,15 +491,9 @@ class TaskQueue:
             Task result if completed, None otherwise
         """
         try:
-            task_key = f"{self.prefix}:task:{task_id}"
-            task_data = self.redis.get(task_key)
-
-            if not task_data:
-                return None
-
-            task = Task.from_dict(json.loads(task_data))
+            task = await self._load(task_id)
 
-            if task.status == TaskStatus.COMPLETED:
+            if task and task.status == TaskStatus.COMPLETED:
                 return task.result
 
             return None
@@ -448,12 +510,7 @@ class TaskQueue:
             Dictionary with queue counts
         """
         try:
-            return {
-                "pending": self.redis.zcard(self.pending_key),
-                "running": self.redis.scard(self.running_key),
-                "completed": self.redis.scard(self.completed_key),
-                "failed": self.redis.scard(self.dlq_key),
-            }
+            return await self.backend.counts()
         except Exception as e:
             logger.error(f"[TASK QUEUE] Failed to get queue stats: {e}")
             return {"pending": 0, "running": 0, "completed": 0, "failed": 0}
@@ -469,22 +526,18 @@ class TaskQueue:
             cutoff = datetime.utcnow() - timedelta(hours=older_than_hours)
 
             # Get all completed task IDs
-            task_ids = self.redis.smembers(self.completed_key)
+            task_ids = await self.backend.bucket_members(BUCKET_COMPLETED)
 
             cleared = 0
             for task_id in task_ids:
-                task_key = f"{self.prefix}:task:{task_id}"
-                task_data = self.redis.get(task_key)
-
-                if task_data:
-                    task = Task.from_dict(json.loads(task_data))
-
-                    if task.completed_at:
-                        completed_at = datetime.fromisoformat(task.completed_at)
-                        if completed_at < cutoff:
-                            self.redis.delete(task_key)
-                            self.redis.srem(self.completed_key, task_id)
-                            cleared += 1
+                task = await self._load(task_id)
+
+                if task and task.completed_at:
+                    completed_at = datetime.fromisoformat(task.completed_at)
+                    if completed_at < cutoff:
+                        await self.backend.delete_task(task_id)
+                        await self.backend.remove_from_bucket(BUCKET_COMPLETED, task_id)
+                        cleared += 1
 
             logger.info(f"[TASK QUEUE] Cleared {cleared} completed tasks")
 
@@ -0,0 +1,290 @@
+"""
+Task Queue Backends - Storage and claiming primitives for TaskQueue
+Async Redis backend (blocking wake-up, atomic batch claim, leases) and in-memory backend for tests
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+from app.core.constants import TASK_QUEUE_IDLE_POLL_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+# Result buckets a finished task can be filed under
+BUCKET_COMPLETED = "completed"
+BUCKET_DLQ = "dlq"
+
+# Error text of servers that reject a command outright (Upstash REST: "ERR Command is not available")
+_UNSUPPORTED_COMMAND_MARKERS = ("unknown command", "not available", "not supported", "unsupported command")
+
+
+def is_unsupported_command_error(error: Exception) -> bool:
+    """True if Redis refused the command itself, not one call of it (timeouts, network errors)"""
+    message = str(error).lower()
+    return any(marker in message for marker in _UNSUPPORTED_COMMAND_MARKERS)
+
+
+class QueueBackend(ABC):
+    """
+    Storage interface used by TaskQueue
+
+    Pending tasks live in a priority set, claimed tasks hold a lease with a
+    deadline. A lease that is not renewed before its deadline is considered
+    abandoned (dead worker) and can be reclaimed.
+    """
+
+    @abstractmethod
+    async def save_tasks(self, tasks: Dict[str, str], ttl: Optional[int] = None) -> None:
+        """Store serialized task data by id"""
+
+    @abstractmethod
+    async def load_task(self, task_id: str) -> Optional[str]:
+        """Load serialized task data"""
+
+    @abstractmethod
+    async def delete_task(self, task_id: str) -> None:
+        """Delete task data"""
+
+    @abstractmethod
+    async def push(self, task_id: str, score: float) -> None:
+        """Add a task id to the pending set (higher score is claimed first) and wake a waiter"""
+
+    @abstractmethod
+    async def claim(self, max_tasks: int, lease_seconds: float) -> List[Tuple[str, Optional[str]]]:
+        """Atomically move up to max_tasks pending ids into leases; returns (id, data) pairs"""
+
+    @abstractmethod
+    async def wait_for_work(self, timeout: float) -> None:
+        """Block until work may be available or timeout elapses"""
+
+    @abstractmethod
+    async def renew(self, task_ids: List[str], lease_seconds: float) -> None:
+        """Extend the leases of running tasks"""
+
+    @abstractmethod
+    async def release(self, task_id: str) -> bool:
+        """Drop a lease; returns True if this call removed it"""
+
+    @abstractmethod
+    async def expired_leases(self) -> List[str]:
+        """Ids whose lease deadline has passed"""
+
+    @abstractmethod
+    async def add_to_bucket(self, bucket: str, task_id: str) -> None:
+        """File a finished task id under a result bucket"""
+
+    @abstractmethod
+    async def bucket_members(self, bucket: str) -> List[str]:
+        """Task ids in a result bucket"""
+
+    @abstractmethod
+    async def remove_from_bucket(self, bucket: str, task_id: str) -> None:
+        """Remove a task id from a result bucket"""
+
+    @abstractmethod
+    async def counts(self) -> Dict[str, int]:
+        """Sizes of pending, running (leased), completed and dlq"""
+
+
+class RedisQueueBackend(QueueBackend):
+    """
+    Upstash Redis backend using the asyncio REST client
+
+    Claiming is one Lua round trip (ZPOPMAX + lease ZADD + task GET) for up to
+    N tasks. Idle workers block on BLPOP of a wake-up list that every enqueue
+    pushes to; if the server rejects blocking commands the backend falls back
+    to short polling.
+    """
+
+    CLAIM_SCRIPT = """
+local popped = redis.call('ZPOPMAX', KEYS[1], ARGV[1])
+local out = {}
+for i = 1, #popped, 2 do
+    local task_id = popped[i]
+    redis.call('ZADD', KEYS[2], ARGV[2], task_id)
+    table.insert(out, task_id)
+    table.insert(out, redis.call('GET', ARGV[3] .. task_id) or '')
+end
+return out
+"""
+
+    # Keep the wake-up list bounded even if nobody is waiting
+    SIGNAL_MAX_LENGTH = 1000
+
+    def __init__(self, redis_client, prefix: str = "task_queue"):
+        self.redis = redis_client
+        self.prefix = prefix
+        self.pending_key = f"{prefix}:pending"
+        self.lease_key = f"{prefix}:leases"
+        self.signal_key = f"{prefix}:signal"
+        self.task_key_prefix = f"{prefix}:task:"
+        self._blocking_supported = True
+
+    def _bucket_key(self, bucket: str) -> str:
+        return f"{self.prefix}:{bucket}"
+
+    async def save_tasks(self, tasks: Dict[str, str], ttl: Optional[int] = None) -> None:
+        if not tasks:
+            return
+        pipe = self.redis.pipeline()
+        for task_id, data in tasks.items():
+            if ttl:
+                pipe.set(f"{self.task_key_prefix}{task_id}", data, ex=ttl)
+            else:
+                pipe.set(f"{self.task_key_prefix}{task_id}", data)
+        await pipe.exec()
+
+    async def load_task(self, task_id: str) -> Optional[str]:
+        return await self.redis.get(f"{self.task_key_prefix}{task_id}")
+
+    async def delete_task(self, task_id: str) -> None:
+        await self.redis.delete(f"{self.task_key_prefix}{task_id}")
+
+    async def push(self, task_id: str, score: float) -> None:
+        pipe = self.redis.pipeline()
+        pipe.zadd(self.pending_key, {task_id: score})
+        pipe.lpush(self.signal_key, task_id)
+        pipe.ltrim(self.signal_key, 0, self.SIGNAL_MAX_LENGTH - 1)
+        await pipe.exec()
+
+    async def claim(self, max_tasks: int, lease_seconds: float) -> List[Tuple[str, Optional[str]]]:
+        deadline = time.time() + lease_seconds
+        flat = await self.redis.eval(
+            self.CLAIM_SCRIPT,
+            keys=[self.pending_key, self.lease_key],
+            args=[str(max_tasks), str(deadline), self.task_key_prefix]
+        )
+        flat = flat or []
+        return [(flat[i], flat[i + 1] or None) for i in range(0, len(flat), 2)]
+
+    async def wait_for_work(self, timeout: float) -> None:
+        if self._blocking_supported:
+            try:
+                await self.redis.execute(["BLPOP", self.signal_key, str(max(1, int(timeout)))])
+                return
+            except Exception as e:
+                if is_unsupported_command_error(e):
+                    self._blocking_supported = False
+                    logger.warning(f"[TASK QUEUE] Blocking pop unavailable, falling back to polling: {e}")
+                else:
+                    # Transient: poll this time, keep blocking for the next wait
+                    logger.warning(f"[TASK QUEUE] Blocking pop failed, polling once: {e}")
+        await asyncio.sleep(min(timeout, TASK_QUEUE_IDLE_POLL_INTERVAL))
+
+    async def renew(self, task_ids: List[str], lease_seconds: float) -> None:
+        if not task_ids:
+            return
+        deadline = time.time() + lease_seconds
+        # XX: never resurrect a lease that was already released or reclaimed
+        await self.redis.zadd(self.lease_key, {task_id: deadline for task_id in task_ids}, xx=True)
+
+    async def release(self, task_id: str) -> bool:
+        return bool(await self.redis.zrem(self.lease_key, task_id))
+
+    async def expired_leases(self) -> List[str]:
+        return await self.redis.zrangebyscore(self.lease_key, "-inf", time.time())
+
+    async def add_to_bucket(self, bucket: str, task_id: str) -> None:
+        await self.redis.sadd(self._bucket_key(bucket), task_id)
+
+    async def bucket_members(self, bucket: str) -> List[str]:
+        return list(await self.redis.smembers(self._bucket_key(bucket)))
+
+    async def remove_from_bucket(self, bucket: str, task_id: str) -> None:
+        await self.redis.srem(self._bucket_key(bucket), task_id)
+
+    async def counts(self) -> Dict[str, int]:
+        pipe = self.redis.pipeline()
+        pipe.zcard(self.pending_key)
+        pipe.zcard(self.lease_key)
+        pipe.scard(self._bucket_key(BUCKET_COMPLETED))
+        pipe.scard(self._bucket_key(BUCKET_DLQ))
+        pending, running, completed, failed = await pipe.exec()
+        return {"pending": pending, "running": running, "completed": completed, "failed": failed}
+
+
+class InMemoryQueueBackend(QueueBackend):
+    """
+    Process-local backend with the same semantics as RedisQueueBackend
+
+    Intended for tests and single-process development.
+    """
+
+    def __init__(self):
+        self.data: Dict[str, str] = {}
+        self.pending: Dict[str, float] = {}
+        self.leases: Dict[str, float] = {}
+        self.buckets: Dict[str, set] = {BUCKET_COMPLETED: set(), BUCKET_DLQ: set()}
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def _event(self) -> asyncio.Event:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        return self._wakeup
+
+    async def save_tasks(self, tasks: Dict[str, str], ttl: Optional[int] = None) -> None:
+        self.data.update(tasks)
+
+    async def load_task(self, task_id: str) -> Optional[str]:
+        return self.data.get(task_id)
+
+    async def delete_task(self, task_id: str) -> None:
+        self.data.pop(task_id, None)
+
+    async def push(self, task_id: str, score: float) -> None:
+        self.pending[task_id] = score
+        self._event().set()
+
+    async def claim(self, max_tasks: int, lease_seconds: float) -> List[Tuple[str, Optional[str]]]:
+        ordered = sorted(self.pending, key=self.pending.get, reverse=True)[:max_tasks]
+        deadline = time.time() + lease_seconds
+        claimed = []
+        for task_id in ordered:
+            del self.pending[task_id]
+            self.leases[task_id] = deadline
+            claimed.append((task_id, self.data.get(task_id)))
+        if not self.pending:
+            self._event().clear()
+        return claimed
+
+    async def wait_for_work(self, timeout: float) -> None:
+        event = self._event()
+        if self.pending:
+            return
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def renew(self, task_ids: List[str], lease_seconds: float) -> None:
+        deadline = time.time() + lease_seconds
+        for task_id in task_ids:
+            if task_id in self.leases:
+                self.leases[task_id] = deadline
+
+    async def release(self, task_id: str) -> bool:
+        return self.leases.pop(task_id, None) is not None
+
+    async def expired_leases(self) -> List[str]:
+        now = time.time()
+        return [task_id for task_id, deadline in self.leases.items() if deadline <= now]
+
+    async def add_to_bucket(self, bucket: str, task_id: str) -> None:
+        self.buckets.setdefault(bucket, set()).add(task_id)
+
+    async def bucket_members(self, bucket: str) -> List[str]:
+        return list(self.buckets.get(bucket, set()))
+
+    async def remove_from_bucket(self, bucket: str, task_id: str) -> None:
+        self.buckets.get(bucket, set()).discard(task_id)
+
+    async def counts(self) -> Dict[str, int]:
+        return {
+            "pending": len(self.pending),
+            "running": len(self.leases),
+            "completed": len(self.buckets[BUCKET_COMPLETED]),
+            "failed": len(self.buckets[BUCKET_DLQ]),
+        }
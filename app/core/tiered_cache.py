@@ -0,0 +1,466 @@
+"""
+Tiered Cache - One cache implementation for every namespace
+Bounded in-memory tier (W-TinyLFU) over an optional Redis tier and a Supabase
+persistence tier, with per-namespace TTLs, stats and stampede protection.
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.constants import (
+    CACHE_DEFAULT_MEMORY_LIMIT,
+    CACHE_MEMORY_LIMITS,
+    CACHE_REDIS_KEY_PREFIX,
+    CACHE_WINDOW_FRACTION
+)
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory cost of a cached value in bytes (serialized length)"""
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+class FrequencySketch:
+    """
+    Approximate access frequency of recently seen keys (TinyLFU)
+
+    Count-min sketch of saturating 4-bit counters; all counters are halved
+    every sample_size increments so old popularity fades.
+    """
+
+    DEPTH = 4
+    MAX_COUNT = 15
+
+    def __init__(self, capacity: int):
+        width = 64
+        while width < capacity * 16:
+            width *= 2
+        self._mask = width - 1
+        self._table = bytearray(width)
+        self._sample_size = max(capacity * 10, 100)
+        self._additions = 0
+
+    def _indexes(self, key: str):
+        h = hash(key)
+        step = (h >> 17) | 1
+        for i in range(self.DEPTH):
+            yield (h + i * step) & self._mask
+
+    def increment(self, key: str) -> None:
+        for index in self._indexes(key):
+            if self._table[index] < self.MAX_COUNT:
+                self._table[index] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._table = bytearray(count >> 1 for count in self._table)
+            self._additions //= 2
+
+    def frequency(self, key: str) -> int:
+        return min(self._table[index] for index in self._indexes(key))
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires_at: float  # time.monotonic() deadline
+
+
+class MemoryTier:
+    """
+    In-process tier bounded by entry count and total bytes
+
+    New entries land in a small LRU window; entries leaving the window only
+    displace the main segment's LRU victim if the sketch has seen them more
+    often, so one-off keys cannot flush the hot set (W-TinyLFU).
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, sizer: Callable[[Any], int] = estimate_size):
+        self.max_entries = max(max_entries, 1)
+        self.max_bytes = max_bytes
+        self.sizer = sizer
+        self._window_max = max(1, int(self.max_entries * CACHE_WINDOW_FRACTION))
+        self._window: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._main: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._sketch = FrequencySketch(self.max_entries)
+        self.bytes = 0
+        self.evictions = 0
+        self.rejections = 0
+
+    def __len__(self) -> int:
+        return len(self._window) + len(self._main)
+
+    def _segment(self, key: str) -> Optional["OrderedDict[str, _Entry]"]:
+        if key in self._window:
+            return self._window
+        if key in self._main:
+            return self._main
+        return None
+
+    def _drop(self, segment: "OrderedDict[str, _Entry]", key: str) -> None:
+        self.bytes -= segment.pop(key).size
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """(found, value); expired entries are removed"""
+        self._sketch.increment(key)
+        segment = self._segment(key)
+        if segment is None:
+            return False, None
+
+        entry = segment[key]
+        if entry.expires_at <= time.monotonic():
+            self._drop(segment, key)
+            return False, None
+
+        segment.move_to_end(key)
+        return True, entry.value
+
+    def remaining_ttl(self, key: str) -> Optional[float]:
+        segment = self._segment(key)
+        if segment is None:
+            return None
+        return max(segment[key].expires_at - time.monotonic(), 0.0)
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> bool:
+        """Store value; False if it is larger than the whole tier or lost admission"""
+        size = self.sizer(value)
+        if size > self.max_bytes:
+            self.rejections += 1
+            return False
+
+        segment = self._segment(key)
+        if segment is not None:
+            self._drop(segment, key)
+        else:
+            self._sketch.increment(key)
+
+        self._window[key] = _Entry(value, size, time.monotonic() + ttl_seconds)
+        self.bytes += size
+        self._evict()
+        return self._segment(key) is not None
+
+    def _over_limit(self) -> bool:
+        return len(self) > self.max_entries or self.bytes > self.max_bytes
+
+    def _evict(self) -> None:
+        candidate = None
+        while len(self._window) > self._window_max:
+            key, entry = self._window.popitem(last=False)
+            self._main[key] = entry
+            candidate = key
+
+        while self._over_limit():
+            victim = next(iter(self._main), None)
+            if victim is None:
+                # Only the window is left (a few entries over the byte budget)
+                self._drop(self._window, next(iter(self._window)))
+                self.evictions += 1
+                continue
+
+            if candidate is not None and victim != candidate:
+                if self._sketch.frequency(candidate) > self._sketch.frequency(victim):
+                    self._drop(self._main, victim)
+                    self.evictions += 1
+                else:
+                    self._drop(self._main, candidate)
+                    self.rejections += 1
+                    candidate = None
+                continue
+
+            self._drop(self._main, victim)
+            self.evictions += 1
+            if victim == candidate:
+                candidate = None
+
+    def delete(self, key: str) -> None:
+        segment = self._segment(key)
+        if segment is not None:
+            self._drop(segment, key)
+
+    def clear(self) -> None:
+        self._window.clear()
+        self._main.clear()
+        self.bytes = 0
+
+
+class PersistentTier(ABC):
+    """
+    Durable tier behind the memory and Redis tiers (a Supabase table per namespace)
+
+    Implementations own their table layout; the cache only asks for values by key.
+    """
+
+    @abstractmethod
+    async def load(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """(value, expires_at as epoch seconds or None for the namespace TTL), or None on a miss"""
+
+    async def store(self, key: str, value: Any, ttl_seconds: float, metadata: Dict[str, Any]) -> bool:
+        """Persist value (metadata carries table columns that are not part of it); True on success"""
+        return True
+
+
+class TieredCache:
+    """
+    Cache namespace: memory -> Redis -> persistent tier -> loader
+
+    Concurrent misses for the same key share one lookup (and one loader call),
+    and hits on a slower tier are promoted to the faster ones with their
+    remaining TTL. Read-side tier errors count as misses; errors from the
+    persistent tier's store() propagate to the writer.
+
+    Example:
+        analysis_cache = TieredCache("analysis", ttl_seconds=30 * 86400, persistence=AnalysisTable())
+        cached = await analysis_cache.get(key)
+        await analysis_cache.set(key, value, metadata={"company": company})
+        value = await analysis_cache.get_or_load(key, compute)
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: float,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        persistence: Optional[PersistentTier] = None,
+        redis: bool = False,
+        sizer: Callable[[Any], int] = estimate_size
+    ):
+        default_entries, default_bytes = CACHE_MEMORY_LIMITS.get(namespace, CACHE_DEFAULT_MEMORY_LIMIT)
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.memory = MemoryTier(max_entries or default_entries, max_bytes or default_bytes, sizer)
+        self.persistence = persistence
+        self.use_redis = redis
+        self._redis = _shared_redis if redis else None  # Namespaces created after init_tiered_caches
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "loads": 0,
+            "coalesced": 0,
+            "sets": 0,
+            "errors": 0
+        }
+        _caches[namespace] = self
+
+    def configure_redis(self, redis_client) -> None:
+        """Attach (or detach with None) the async Redis client of the shared tier"""
+        self._redis = redis_client if self.use_redis else None
+
+    def _redis_key(self, key: str) -> str:
+        return f"{CACHE_REDIS_KEY_PREFIX}:{self.namespace}:{key}"
+
+    def __contains__(self, key: str) -> bool:
+        """True if key is in the memory tier and not expired"""
+        ttl = self.memory.remaining_ttl(key)
+        return bool(ttl)
+
+    def __len__(self) -> int:
+        return len(self.memory)
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Memory tier only, no stats or remote lookups"""
+        found, value = self.memory.get(key)
+        return value if found else None
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Value from the fastest tier that has it, or None"""
+        return await self.get_or_load(key, None)
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Optional[Callable[[], Awaitable[Any]]],
+        ttl_seconds: Optional[float] = None
+    ) -> Optional[Any]:
+        """
+        Value from cache, an identical in-flight lookup, or loader() (cached unless None)
+
+        Raises:
+            Whatever loader raises (nothing is cached then)
+        """
+        found, value = self.memory.get(key)
+        if found:
+            self.stats["memory_hits"] += 1
+            return value
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            value = await asyncio.shield(task)
+            if value is not None or loader is None:
+                return value
+            # Joined a plain lookup that missed; load on our own below
+
+        # Own task so a cancelled caller does not cancel the followers
+        task = asyncio.create_task(self._resolve(key, loader, ttl_seconds))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda t: self._in_flight.pop(key, None) if self._in_flight.get(key) is t else None)
+        return await asyncio.shield(task)
+
+    async def _resolve(
+        self,
+        key: str,
+        loader: Optional[Callable[[], Awaitable[Any]]],
+        ttl_seconds: Optional[float]
+    ) -> Optional[Any]:
+        value = await self._get_remote(key)
+        if value is not None or loader is None:
+            return value
+
+        self.stats["loads"] += 1
+        value = await loader()
+        if value is not None:
+            await self.set(key, value, ttl_seconds)
+        return value
+
+    async def _get_remote(self, key: str) -> Optional[Any]:
+        """Redis then persistent tier; hits are promoted to the faster tiers"""
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(self._redis_key(key))
+                if raw:
+                    payload = json.loads(raw)
+                    remaining = payload["e"] - time.time()
+                    if remaining > 0:
+                        self.stats["redis_hits"] += 1
+                        self.memory.set(key, payload["v"], remaining)
+                        return payload["v"]
+            except Exception as e:
+                # Redis is an optimization; fall through to the next tier
+                self.stats["errors"] += 1
+                logger.debug(f"[CACHE] {self.namespace} Redis get failed: {e}")
+
+        if self.persistence is not None:
+            try:
+                loaded = await self.persistence.load(key)
+            except Exception as e:
+                # A failing table read is a miss; callers decide what to do next
+                self.stats["errors"] += 1
+                logger.warning(f"[CACHE] {self.namespace} persistent tier read failed: {e}")
+                loaded = None
+
+            if loaded is not None:
+                value, expires_at = loaded
+                remaining = self.ttl_seconds if expires_at is None else expires_at - time.time()
+                if remaining > 0:
+                    self.stats["persistent_hits"] += 1
+                    self.memory.set(key, value, remaining)
+                    await self._set_redis(key, value, remaining)
+                    return value
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        persist: bool = True
+    ) -> bool:
+        """
+        Write through every tier (persistent first; nothing is cached if it refuses)
+
+        Returns:
+            False if the persistent tier did not store the value
+        """
+        ttl = ttl_seconds or self.ttl_seconds
+        if persist and self.persistence is not None:
+            if not await self.persistence.store(key, value, ttl, metadata or {}):
+                return False
+
+        self.stats["sets"] += 1
+        self.memory.set(key, value, ttl)
+        await self._set_redis(key, value, ttl)
+        return True
+
+    async def _set_redis(self, key: str, value: Any, ttl_seconds: float) -> None:
+        if self._redis is None:
+            return
+        try:
+            payload = json.dumps({"v": value, "e": time.time() + ttl_seconds}, ensure_ascii=False)
+            await self._redis.set(self._redis_key(key), payload, ex=max(int(ttl_seconds), 1))
+        except Exception as e:
+            # Value stays in memory and the persistent tier
+            self.stats["errors"] += 1
+            logger.debug(f"[CACHE] {self.namespace} Redis set failed: {e}")
+
+    async def delete(self, key: str) -> None:
+        """Drop key from memory and Redis (the persistent tier keeps its own expiry)"""
+        self.memory.delete(key)
+        if self._redis is not None:
+            try:
+                await self._redis.delete(self._redis_key(key))
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.debug(f"[CACHE] {self.namespace} Redis delete failed: {e}")
+
+    def clear_memory(self) -> None:
+        """Empty the memory tier (tests, admin)"""
+        self.memory.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Tier counters plus memory usage and overall hit rate"""
+        hits = self.stats["memory_hits"] + self.stats["redis_hits"] + self.stats["persistent_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self.memory),
+            "bytes": self.memory.bytes,
+            "max_entries": self.memory.max_entries,
+            "max_bytes": self.memory.max_bytes,
+            "evictions": self.memory.evictions,
+            "rejections": self.memory.rejections,
+            "in_flight": len(self._in_flight),
+            "redis": self._redis is not None,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0
+        }
+
+
+# Every namespace created in this process, and the Redis client set by init_tiered_caches
+_caches: Dict[str, TieredCache] = {}
+_shared_redis = None
+
+
+def get_all_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every cache namespace, keyed by namespace"""
+    return {namespace: cache.get_stats() for namespace, cache in _caches.items()}
+
+
+def get_cache_namespaces() -> List[TieredCache]:
+    return list(_caches.values())
+
+
+def init_tiered_caches(redis_enabled: bool = True) -> None:
+    """Attach the shared Redis tier to namespaces that use it, if enabled and configured"""
+    global _shared_redis
+    client = None
+    if redis_enabled:
+        try:
+            from app.core.security.rate_limiter import get_async_redis_client
+            client = get_async_redis_client()
+            logger.info("[CACHE] Redis tier enabled")
+        except ValueError as e:
+            logger.warning(f"[CACHE] Redis not configured, caches stay in-process: {e}")
+
+    _shared_redis = client
+    for cache in _caches.values():
+        cache.configure_redis(client)
@@ -11,6 +11,7 @@ from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from datetime import datetime
+import asyncio
 import logging
 
 # Core configuration
@@ -26,6 +27,19 @@ from app.middleware.security_middleware import (
     get_security_config
 )
 from app.core.circuit_breaker import get_circuit_breaker_health
+from app.core.http_client import init_http_clients, close_http_clients
+from app.core.progress_bus import init_progress_bus, close_progress_bus
+from app.core.hit_counter import close_cache_hit_counter
+from app.services.enrichment.cost_tracker import close_cost_tracker
+from app.services.enrichment.audit_writer import close_audit_writer
+from app.core.circuit_breaker import init_circuit_breakers
+from app.core.tiered_cache import init_tiered_caches
+from app.core.single_flight import init_single_flight
+from app.core.challenge_index import init_challenge_index
+from app.core.offload import init_offload_executor, close_offload_executor, get_offload_stats
+from app.services.enrichment.progressive_session_store import init_progressive_session_store
+from app.services.intelligence.snapshots import run_dashboard_snapshot_schedule
+from app.services.enrichment.rollups import run_enrichment_rollup_schedule
 
 # Import all routers
 from app.routes import analysis, reports, chat, intelligence, admin
@@ -115,6 +129,52 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"[STARTUP] ⚠️  Redis connection failed: {e}")
 
+    # Create shared outbound HTTP connection pools
+    init_http_clients(http2=settings.http2_enabled)
+    logger.info("[STARTUP] ✅ Outbound HTTP connection pools ready")
+
+    # Progress events for SSE streams (Redis streams fan-out across processes)
+    init_progress_bus(redis_enabled=settings.progress_redis_enabled)
+    logger.info("[STARTUP] ✅ Progress event bus ready")
+
+    # Provider circuit breakers shared by API and worker processes
+    init_circuit_breakers(redis_enabled=settings.circuit_breaker_redis_enabled)
+    logger.info("[STARTUP] ✅ Circuit breakers ready")
+
+    # Shared Redis tier for cache namespaces (memory tiers are always on)
+    init_tiered_caches(redis_enabled=settings.cache_redis_enabled)
+    logger.info("[STARTUP] ✅ Cache tiers ready")
+
+    # Identical concurrent analyses/stages run once across API and worker processes
+    init_single_flight(redis_enabled=settings.cache_redis_enabled)
+    logger.info("[STARTUP] ✅ Single-flight leases ready")
+
+    # Near-duplicate challenge matching for analysis/extraction cache reuse
+    await init_challenge_index(threshold=settings.challenge_similarity_threshold)
+    logger.info("[STARTUP] ✅ Challenge similarity index ready")
+
+    # Progressive enrichment sessions shared across workers
+    init_progressive_session_store(redis_enabled=settings.progress_redis_enabled)
+    logger.info("[STARTUP] ✅ Progressive enrichment session store ready")
+
+    # Warm worker processes for CPU-heavy parsing/rendering
+    try:
+        await init_offload_executor(workers=settings.offload_workers)
+        logger.info(f"[STARTUP] ✅ CPU offload pool ready ({settings.offload_workers} workers)")
+    except Exception as e:
+        logger.warning(f"[STARTUP] ⚠️  CPU offload pool unavailable, running inline: {e}")
+
+    # Scheduled jobs (also run by the worker when one is deployed; replicas
+    # skip snapshots another process refreshed recently, rollups are idempotent)
+    schedules = []
+    if settings.dashboard_intelligence_schedule_enabled:
+        schedules.append(asyncio.create_task(run_dashboard_snapshot_schedule()))
+        logger.info("[STARTUP] ✅ Dashboard intelligence snapshot schedule started")
+    if settings.enrichment_rollup_schedule_enabled:
+        # Concurrent runs are serialized by the rollup state row lock
+        schedules.append(asyncio.create_task(run_enrichment_rollup_schedule()))
+        logger.info("[STARTUP] ✅ Enrichment analytics rollup schedule started")
+
     logger.info("[STARTUP] 🚀 Application ready to accept requests")
 
     yield
@@ -124,8 +184,12 @@ async def lifespan(app: FastAPI):
     # ========================================================================
     logger.info("[SHUTDOWN] 🛑 Shutdown signal received, starting graceful shutdown...")
 
+    # Stop scheduled jobs
+    for schedule in schedules:
+        schedule.cancel()
+    await asyncio.gather(*schedules, return_exceptions=True)
+
     # Wait for in-flight requests to complete (30 second timeout)
-    import asyncio
     shutdown_timeout = 30
 
     logger.info(f"[SHUTDOWN] ⏳ Waiting {shutdown_timeout}s for in-flight requests...")
@@ -146,6 +210,43 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"[SHUTDOWN] ❌ Error closing Redis: {e}")
 
+    # Close pooled outbound HTTP clients
+    try:
+        logger.info("[SHUTDOWN] 🌐 Closing outbound HTTP connection pools...")
+        await close_http_clients()
+    except Exception as e:
+        logger.error(f"[SHUTDOWN] ❌ Error closing HTTP clients: {e}")
+
+    # Flush progress events still queued for Redis
+    try:
+        await close_progress_bus()
+    except Exception as e:
+        logger.error(f"[SHUTDOWN] ❌ Error flushing progress events: {e}")
+
+    # Write cache hit counters still buffered in memory
+    try:
+        await close_cache_hit_counter()
+    except Exception as e:
+        logger.error(f"[SHUTDOWN] ❌ Error flushing cache hit counters: {e}")
+
+    # Write enrichment cost buckets still buffered in memory
+    try:
+        await close_cost_tracker()
+    except Exception as e:
+        logger.error(f"[SHUTDOWN] ❌ Error flushing enrichment cost buckets: {e}")
+
+    # Write enrichment audit rows still queued
+    try:
+        await close_audit_writer()
+    except Exception as e:
+        logger.error(f"[SHUTDOWN] ❌ Error flushing enrichment audit log: {e}")
+
+    # Stop CPU offload worker processes
+    try:
+        await close_offload_executor()
+    except Exception as e:
+        logger.error(f"[SHUTDOWN] ❌ Error stopping CPU offload pool: {e}")
+
     logger.info("[SHUTDOWN] ✅ Graceful shutdown complete")
 
 
@@ -624,7 +725,19 @@ async def health_check():
             "error": str(e)
         }
 
-    # Check 5: Security Configuration
+    # Check 5: CPU Offload Pool
+    try:
+        health_status["checks"]["cpu_offload"] = {
+            "status": "healthy",
+            **get_offload_stats()
+        }
+    except Exception as e:
+        health_status["checks"]["cpu_offload"] = {
+            "status": "error",
+            "error": str(e)
+        }
+
+    # Check 6: Security Configuration
     try:
         security_config = get_security_config()
         health_status["checks"]["security"] = {
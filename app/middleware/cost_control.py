@@ -21,16 +21,20 @@ Version: 1.0.0
 """
 
 import logging
+import math
 from typing import Optional
 from datetime import datetime, timedelta
 from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse
 import hashlib
 
+from app.core.security.rate_limiter import rate_limiter
+
 logger = logging.getLogger(__name__)
 
-# In-memory tracking (would use Redis in production)
+# Last rate limit result per user (the limit itself lives in the shared rate limiter)
 _rate_limit_tracker = {}
+# In-memory tracking (would use Redis in production)
 _cost_tracker = {}
 _global_costs = {
     "daily": 0.0,
@@ -128,15 +132,16 @@ class CostControlMiddleware:
         await self._check_global_cost_limit()
 
     async def _check_rate_limit(self, user_id: str):
-        """Check hourly rate limit"""
-        now = datetime.now()
-        hour_key = now.strftime("%Y-%m-%d-%H")
-        key = f"rate:{user_id}:{hour_key}"
-
-        # Get current count
-        count = _rate_limit_tracker.get(key, 0)
+        """Check hourly rate limit (sliding window, shared across workers)"""
+        result = await rate_limiter.hit(
+            f"enrichment:hourly:{user_id}",
+            self.max_enrichments_per_hour,
+            3600
+        )
+        _rate_limit_tracker[user_id] = result
+        count = self.max_enrichments_per_hour - result.remaining
 
-        if count >= self.max_enrichments_per_hour:
+        if not result.allowed:
             logger.warning(
                 f"[CostControl] Rate limit exceeded: {user_id} "
                 f"({count}/{self.max_enrichments_per_hour})"
@@ -145,12 +150,9 @@ class CostControlMiddleware:
                 status_code=429,
                 detail=f"Rate limit exceeded. Maximum {self.max_enrichments_per_hour} "
                        f"enrichments per hour. Try again in "
-                       f"{60 - now.minute} minutes."
+                       f"{math.ceil(result.retry_after / 60)} minutes."
             )
 
-        # Increment counter
-        _rate_limit_tracker[key] = count + 1
-
         # Alert at 80% threshold
         if count >= self.max_enrichments_per_hour * self.alert_threshold:
             logger.warning(
@@ -298,14 +300,14 @@ class CostControlMiddleware:
         Returns:
             Dict with rate limit and cost usage
         """
-        now = datetime.now()
-        today = now.date()
-        hour_key = now.strftime("%Y-%m-%d-%H")
-
-        rate_key = f"rate:{user_id}:{hour_key}"
+        today = datetime.now().date()
         cost_key = f"cost:{user_id}:{today}"
 
-        enrichments_this_hour = _rate_limit_tracker.get(rate_key, 0)
+        # As of the user's last check
+        last_check = _rate_limit_tracker.get(user_id)
+        enrichments_this_hour = (
+            self.max_enrichments_per_hour - last_check.remaining if last_check else 0
+        )
         cost_today = _cost_tracker.get(cost_key, 0.0)
 
         return {
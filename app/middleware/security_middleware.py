@@ -4,16 +4,19 @@ Protects against common web vulnerabilities and DoS attacks
 """
 
 import logging
-from typing import Callable
+from typing import Callable, Dict, Optional, Tuple
 
 from fastapi import Request, Response, HTTPException
+from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
 from app.core.constants import (
+    RATE_LIMIT_ENDPOINT_LIMITS,
     REQUEST_MAX_SIZE_BYTES,
     REQUEST_MAX_SIZE_MB
 )
+from app.core.security.rate_limiter import SlidingWindowRateLimiter, rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -149,28 +152,57 @@ class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
 
 class RateLimitByEndpointMiddleware(BaseHTTPMiddleware):
     """
-    Adds rate limit headers to responses
-    Actual rate limiting is done by Upstash Redis in routes
+    Per-client-IP limits for individual endpoints, on the shared sliding-window
+    rate limiter (see app/core/security/rate_limiter.py)
+    Routes with their own limits (form submission) check them in the handler
 
-    Headers added:
+    Headers added to limited endpoints:
     - X-RateLimit-Limit: Max requests allowed
     - X-RateLimit-Remaining: Remaining requests
-    - X-RateLimit-Reset: Timestamp when limit resets
+    - X-RateLimit-Reset: Seconds until the oldest counted request leaves the window
+    - Retry-After: Seconds to wait (429 responses only)
     """
 
-    def __init__(self, app: ASGIApp):
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: Optional[Dict[str, Tuple[int, int]]] = None,
+        limiter: Optional[SlidingWindowRateLimiter] = None
+    ):
         super().__init__(app)
+        self.limits = RATE_LIMIT_ENDPOINT_LIMITS if limits is None else limits
+        self.limiter = limiter or rate_limiter
+
+    def _match(self, request: Request) -> Optional[Tuple[str, int, int]]:
+        route = f"{request.method} {request.url.path}"
+        for rule, (max_requests, window_seconds) in self.limits.items():
+            if route.startswith(rule):
+                return rule, max_requests, window_seconds
+        return None
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
+        rule = self._match(request)
+        if rule is None:
+            return await call_next(request)
+
+        name, max_requests, window_seconds = rule
+        client_ip = request.client.host if request.client else "unknown"
+        result = await self.limiter.hit(f"endpoint:{name}:{client_ip}", max_requests, window_seconds)
 
-        # Rate limit info can be set by route handlers
-        # We just ensure the headers are present for API clients
-        if "X-RateLimit-Limit" not in response.headers:
-            # Default headers (actual limits enforced in routes)
-            response.headers["X-RateLimit-Limit"] = "100"
-            response.headers["X-RateLimit-Remaining"] = "99"
+        if not result.allowed:
+            logger.warning(
+                f"Rate limit exceeded for {client_ip} on {name}",
+                extra={"client_ip": client_ip, "endpoint": name}
+            )
+            return JSONResponse(
+                status_code=429,
+                content={"detail": f"Rate limit exceeded. Try again in {result.retry_after} seconds."},
+                headers=result.headers()
+            )
 
+        response = await call_next(request)
+        for header, value in result.headers().items():
+            response.headers.setdefault(header, value)
         return response
 
 
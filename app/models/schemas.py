@@ -159,6 +159,30 @@ class Submission(BaseModel):
         from_attributes = True
 
 
+class SubmissionSummary(BaseModel):
+    """Submission row for list views (no report bodies)"""
+    id: int
+    name: str
+    email: str
+    company: str
+    website: Optional[str]
+    industry: str
+    challenge: Optional[str]
+    status: StatusEnum
+    processing_state: Optional[str] = None
+    user_status: Optional[str] = None
+    error_message: Optional[str]
+    edit_count: Optional[int] = None
+    last_edited_at: Optional[str] = None
+    has_report: bool = False
+    quality_tier: Optional[str] = None
+    created_at: str
+    updated_at: str
+
+    class Config:
+        from_attributes = True
+
+
 class SubmissionsListResponse(BaseModel):
     """Response for listing submissions"""
     success: bool
@@ -21,6 +21,7 @@ from .audit_repository import (
     get_audit_repository
 )
 from . import progressive_enrichment_repository
+from . import chat_repository
 
 __all__ = [
     "BaseRepository",
@@ -36,4 +37,5 @@ __all__ = [
     "audit_repository",
     "get_audit_repository",
     "progressive_enrichment_repository",
+    "chat_repository",
 ]
@@ -9,10 +9,13 @@ Version: 1.0.0
 """
 
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
 import json
 
+from postgrest.types import ReturnMethod
+
 from app.repositories.supabase_repository import SupabaseRepository
 from app.core.exceptions import DatabaseError
 
@@ -195,6 +198,38 @@ class AuditRepository(SupabaseRepository):
             # Don't raise - allow enrichment to continue
             return []
 
+    async def insert_call_rows(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Bulk insert audit rows already in table format (used by the audit writer)
+
+        Rows are written in one statement without returning them; values that
+        are not JSON types (e.g. datetimes in response_data) are stringified.
+
+        Args:
+            rows: enrichment_audit_log rows (source_name, source_type, success, called_at, ...)
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            DatabaseError: If the insert fails
+        """
+        if not rows:
+            return 0
+
+        def _insert() -> None:
+            payload = json.loads(json.dumps(rows, default=str))
+            self.client.table(self.table_name).insert(payload, returning=ReturnMethod.minimal).execute()
+
+        try:
+            await asyncio.to_thread(_insert)
+            self._log_operation("bulk_insert", True)
+            return len(rows)
+        except Exception as e:
+            self._log_operation("bulk_insert", False, error=e)
+            # Chained so the audit writer can tell transient failures from rejected rows
+            raise DatabaseError("audit rows insert", str(e)) from e
+
     # ========================================================================
     # QUERY OPERATIONS
     # ========================================================================
@@ -443,48 +478,8 @@ class AuditRepository(SupabaseRepository):
             DatabaseError: If query fails
         """
         try:
-            cutoff = datetime.utcnow() - timedelta(hours=hours)
-
-            response = (
-                self.client.table(self.table_name)
-                .select("*")
-                .eq("source_name", source_name)
-                .gte("created_at", cutoff.isoformat())
-                .execute()
-            )
-
-            logs = response.data if response.data else []
-
-            total_calls = len(logs)
-            successful = sum(1 for log in logs if log.get("success", False))
-            failed = total_calls - successful
-            success_rate = (successful / total_calls * 100) if total_calls > 0 else 0.0
-
-            total_cost = sum(log.get("cost_usd", 0.0) for log in logs)
-
-            durations = [
-                log.get("duration_ms", 0) for log in logs if log.get("duration_ms")
-            ]
-            avg_duration = (
-                sum(durations) / len(durations) if durations else 0
-            )
-
-            cb_trips = sum(
-                1
-                for log in logs
-                if log.get("circuit_breaker_state") in ["open", "half_open"]
-            )
-
-            stats = {
-                "source_name": source_name,
-                "total_calls": total_calls,
-                "successful_calls": successful,
-                "failed_calls": failed,
-                "success_rate": round(success_rate, 2),
-                "total_cost_usd": round(total_cost, 4),
-                "avg_duration_ms": round(avg_duration, 0),
-                "circuit_breaker_trips": cb_trips,
-            }
+            rows = await self._source_statistics_rows(hours, source_name)
+            stats = _summarize_source(rows[0]) if rows else _summarize_source({"source_name": source_name})
 
             logger.debug(
                 f"Retrieved statistics for source {source_name}",
@@ -515,21 +510,9 @@ class AuditRepository(SupabaseRepository):
             DatabaseError: If query fails
         """
         try:
-            # Get all unique source names
-            response = (
-                self.client.table(self.table_name)
-                .select("source_name")
-                .execute()
-            )
-
-            logs = response.data if response.data else []
-            unique_sources = set(log.get("source_name") for log in logs)
-
-            # Get statistics for each source
-            all_stats = []
-            for source_name in unique_sources:
-                stats = await self.get_source_statistics(source_name, hours)
-                all_stats.append(stats)
+            # Aggregated in the database: one row per source, whatever the call volume
+            rows = await self._source_statistics_rows(hours)
+            all_stats = [_summarize_source(row) for row in rows]
 
             # Sort by total calls descending
             all_stats.sort(key=lambda x: x["total_calls"], reverse=True)
@@ -548,6 +531,17 @@ class AuditRepository(SupabaseRepository):
             )
             raise DatabaseError(f"Failed to get all source statistics: {str(e)}")
 
+    async def _source_statistics_rows(
+        self, hours: int, source_name: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Per-source aggregates from enrichment_source_statistics (migrations/021_source_call_statistics.sql)"""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+        params = {"p_since": cutoff.isoformat(), "p_source_name": source_name}
+        response = await asyncio.to_thread(
+            self.client.rpc("enrichment_source_statistics", params).execute
+        )
+        return response.data if response.data else []
+
     async def get_cost_summary(
         self, start_date: datetime, end_date: datetime
     ) -> Dict[str, Any]:
@@ -605,6 +599,24 @@ class AuditRepository(SupabaseRepository):
             raise DatabaseError(f"Failed to get cost summary: {str(e)}")
 
 
+def _summarize_source(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Statistics dictionary from one enrichment_source_statistics row"""
+    total_calls = int(row.get("total_calls") or 0)
+    successful = int(row.get("successful_calls") or 0)
+    success_rate = (successful / total_calls * 100) if total_calls > 0 else 0.0
+
+    return {
+        "source_name": row.get("source_name"),
+        "total_calls": total_calls,
+        "successful_calls": successful,
+        "failed_calls": total_calls - successful,
+        "success_rate": round(success_rate, 2),
+        "total_cost_usd": round(float(row.get("total_cost_usd") or 0.0), 4),
+        "avg_duration_ms": round(float(row.get("avg_duration_ms") or 0), 0),
+        "circuit_breaker_trips": int(row.get("circuit_breaker_trips") or 0),
+    }
+
+
 # Singleton instance for dependency injection
 audit_repository = AuditRepository()
 
@@ -0,0 +1,150 @@
+"""
+Chat Repository - Append-only storage for report chat messages
+
+Chat turns live in chat_messages (one INSERT per turn) with a rolling summary
+per submission in chat_summaries (migrations/016_chat_messages.sql). Chat never
+writes the submissions row.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.constants import CHAT_CONTEXT_MAX_MESSAGES
+from app.core.supabase import supabase_service
+
+logger = logging.getLogger(__name__)
+
+MESSAGES_TABLE = "chat_messages"
+SUMMARIES_TABLE = "chat_summaries"
+MESSAGE_COLUMNS = "id, role, content, model_used, tokens_used, created_at"
+
+
+# ============================================================================
+# WRITES
+# ============================================================================
+
+async def append_chat_messages(submission_id: int, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Append messages (e.g. a user/assistant pair) in one insert
+
+    Args:
+        messages: [{"role", "content", "model_used"?, "tokens_used"?}, ...] in order
+
+    Returns:
+        Stored rows (with ids), in insertion order
+    """
+    rows = [
+        {
+            "submission_id": submission_id,
+            "role": message["role"],
+            "content": message["content"],
+            "model_used": message.get("model_used"),
+            "tokens_used": message.get("tokens_used")
+        }
+        for message in messages
+    ]
+
+    def insert() -> List[Dict[str, Any]]:
+        response = supabase_service.table(MESSAGES_TABLE).insert(rows).execute()
+        return sorted(response.data or [], key=lambda row: row["id"])
+
+    return await asyncio.to_thread(insert)
+
+
+async def save_chat_summary(submission_id: int, summary: str, through_message_id: int) -> None:
+    """Replace the rolling summary of a submission's chat"""
+    def upsert() -> None:
+        supabase_service.table(SUMMARIES_TABLE).upsert(
+            {
+                "submission_id": submission_id,
+                "summary": summary,
+                "through_message_id": through_message_id,
+                "updated_at": datetime.now(timezone.utc).isoformat()
+            },
+            on_conflict="submission_id"
+        ).execute()
+
+    await asyncio.to_thread(upsert)
+
+
+async def delete_chat(submission_id: int) -> None:
+    """Remove a submission's messages and summary (e.g. when its report is reprocessed)"""
+    def delete() -> None:
+        supabase_service.table(SUMMARIES_TABLE).delete().eq("submission_id", submission_id).execute()
+        supabase_service.table(MESSAGES_TABLE).delete().eq("submission_id", submission_id).execute()
+
+    await asyncio.to_thread(delete)
+
+
+# ============================================================================
+# READS
+# ============================================================================
+
+async def list_chat_messages(
+    submission_id: int,
+    limit: int,
+    after_id: Optional[int] = None
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    One page of a submission's messages, oldest first
+
+    Args:
+        limit: Maximum messages to return
+        after_id: Cursor from the previous page (id of its last message)
+
+    Returns:
+        (messages, next cursor or None on the last page)
+    """
+    def select() -> List[Dict[str, Any]]:
+        query = supabase_service.table(MESSAGES_TABLE) \
+            .select(MESSAGE_COLUMNS) \
+            .eq("submission_id", submission_id)
+        if after_id is not None:
+            query = query.gt("id", after_id)
+        # One extra row tells whether another page exists
+        response = query.order("id").limit(limit + 1).execute()
+        return response.data or []
+
+    rows = await asyncio.to_thread(select)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1]["id"]
+    return rows, None
+
+
+async def load_chat_context(
+    submission_id: int,
+    max_messages: int = CHAT_CONTEXT_MAX_MESSAGES
+) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Rolling summary plus the messages after it, for the model context
+
+    Only messages newer than the summary are read (newest max_messages of them),
+    so the cost does not grow with the length of the conversation.
+
+    Returns:
+        (chat_summaries row or None, messages oldest first)
+    """
+    def select_summary() -> Optional[Dict[str, Any]]:
+        response = supabase_service.table(SUMMARIES_TABLE) \
+            .select("summary, through_message_id") \
+            .eq("submission_id", submission_id) \
+            .limit(1) \
+            .execute()
+        return response.data[0] if response.data else None
+
+    summary = await asyncio.to_thread(select_summary)
+    through_id = summary["through_message_id"] if summary else 0
+
+    def select_messages() -> List[Dict[str, Any]]:
+        response = supabase_service.table(MESSAGES_TABLE) \
+            .select(MESSAGE_COLUMNS) \
+            .eq("submission_id", submission_id) \
+            .gt("id", through_id) \
+            .order("id", desc=True) \
+            .limit(max_messages) \
+            .execute()
+        return list(reversed(response.data or []))
+
+    return summary, await asyncio.to_thread(select_messages)
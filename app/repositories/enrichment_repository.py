@@ -10,11 +10,13 @@ Version: 1.0.0
 
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+import asyncio
 import logging
 import json
 
 from app.repositories.supabase_repository import SupabaseRepository
 from app.core.exceptions import DatabaseError, ResourceNotFound
+from app.core.hit_counter import cache_hit_counter
 from app.services.enrichment.models import (
     QuickEnrichmentData,
     DeepEnrichmentData,
@@ -262,8 +264,8 @@ class EnrichmentRepository(SupabaseRepository):
                 )
                 return None
 
-            # Increment cache hit counter
-            await self._increment_cache_hit(record["id"], record["total_cost_usd"])
+            # Counted in memory, written in bulk (cache_hits / cache_savings_usd)
+            cache_hit_counter.record(self.table_name, record["cache_key"])
 
             logger.debug(
                 f"Cache hit for {domain}",
@@ -307,8 +309,8 @@ class EnrichmentRepository(SupabaseRepository):
             if expires_at < datetime.utcnow():
                 return None
 
-            # Increment cache hit counter
-            await self._increment_cache_hit(record["id"], record["total_cost_usd"])
+            # Counted in memory, written in bulk (cache_hits / cache_savings_usd)
+            cache_hit_counter.record(self.table_name, record["cache_key"])
 
             return record
 
@@ -319,44 +321,6 @@ class EnrichmentRepository(SupabaseRepository):
             )
             raise DatabaseError(f"Failed to get enrichment by cache key: {str(e)}")
 
-    async def _increment_cache_hit(
-        self, enrichment_id: int, cost_saved: float
-    ) -> None:
-        """
-        Increment cache hit counter and savings
-
-        Args:
-            enrichment_id: Enrichment record ID
-            cost_saved: Cost saved by cache hit
-        """
-        try:
-            # Use Supabase RPC or raw SQL to increment atomically
-            response = (
-                self.client.table(self.table_name)
-                .update(
-                    {
-                        "cache_hits": self.client.rpc(
-                            "increment", {"table": self.table_name, "id": enrichment_id}
-                        ),
-                        "cache_savings_usd": cost_saved,  # Will be summed in view
-                    }
-                )
-                .eq("id", enrichment_id)
-                .execute()
-            )
-
-            logger.debug(
-                f"Incremented cache hit for enrichment {enrichment_id}",
-                extra={"enrichment_id": enrichment_id, "cost_saved": cost_saved},
-            )
-
-        except Exception as e:
-            # Log but don't fail - cache hit tracking is non-critical
-            logger.warning(
-                f"Failed to increment cache hit: {str(e)}",
-                extra={"enrichment_id": enrichment_id},
-            )
-
     async def clear_expired_cache(self) -> int:
         """
         Delete expired enrichment cache entries
@@ -416,18 +380,21 @@ class EnrichmentRepository(SupabaseRepository):
             DatabaseError: If query fails
         """
         try:
-            # Get total count
-            total = await self.count()
+            # Two queries, run concurrently: counts per tier and type, and the metric columns
+            grouped, all_records = await asyncio.gather(
+                self.count_grouped(["data_quality_tier", "enrichment_type"]),
+                asyncio.to_thread(self._fetch_metric_columns, 10000),  # Adjust if needed
+            )
 
-            # Get cache statistics
-            all_records = await self.get_all(limit=10000)  # Adjust if needed
+            # Every row falls in exactly one tier group (NULL included)
+            total = sum(grouped["data_quality_tier"].values())
 
-            total_hits = sum(r.get("cache_hits", 0) for r in all_records)
+            total_hits = sum(r.get("cache_hits") or 0 for r in all_records)
             total_calls = total + total_hits
             cache_hit_rate = (total_hits / total_calls * 100) if total_calls > 0 else 0.0
 
-            total_cost = sum(r.get("total_cost_usd", 0.0) for r in all_records)
-            total_savings = sum(r.get("cache_savings_usd", 0.0) for r in all_records)
+            total_cost = sum(float(r.get("total_cost_usd") or 0.0) for r in all_records)
+            total_savings = sum(float(r.get("cache_savings_usd") or 0.0) for r in all_records)
 
             # Calculate averages
             completeness_scores = [
@@ -453,14 +420,14 @@ class EnrichmentRepository(SupabaseRepository):
             )
 
             # Count by quality tier
-            by_quality_tier = {}
-            for tier in DataQualityTier:
-                count = await self.count({"data_quality_tier": tier.value})
-                by_quality_tier[tier.value] = count
+            by_quality_tier = {
+                tier.value: grouped["data_quality_tier"].get(tier.value, 0)
+                for tier in DataQualityTier
+            }
 
             # Count by type
-            quick_count = await self.count({"enrichment_type": "quick"})
-            deep_count = await self.count({"enrichment_type": "deep"})
+            quick_count = grouped["enrichment_type"].get("quick", 0)
+            deep_count = grouped["enrichment_type"].get("deep", 0)
 
             stats = {
                 "total_enrichments": total,
@@ -486,6 +453,17 @@ class EnrichmentRepository(SupabaseRepository):
             )
             raise DatabaseError(f"Failed to get enrichment statistics: {str(e)}")
 
+    def _fetch_metric_columns(self, limit: int) -> List[Dict[str, Any]]:
+        """Newest rows, only the columns get_statistics() aggregates (runs in a thread)"""
+        response = (
+            self.client.table(self.table_name)
+            .select("cache_hits, total_cost_usd, cache_savings_usd, completeness_score, confidence_score")
+            .order("created_at", desc=True)
+            .limit(limit)
+            .execute()
+        )
+        return response.data if response.data else []
+
     async def get_recent_enrichments(
         self, limit: int = 20, enrichment_type: Optional[str] = None
     ) -> List[Dict[str, Any]]:
@@ -6,16 +6,18 @@ This module provides database access layer for:
 - Auto-fill suggestions tracking
 - Field validation history
 - Source performance metrics
-- Analytics queries for admin dashboard
+- Analytics queries for admin dashboard (served from daily rollups)
 
 Created: 2025-01-09
 Version: 1.0.0
 """
+import asyncio
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 import logging
 from uuid import UUID
 
+from app.core.constants import ENRICHMENT_ROLLUP_OVERLAP_SECONDS
 from app.core.supabase import supabase_service
 
 logger = logging.getLogger(__name__)
@@ -122,60 +124,166 @@ async def get_session_attribution(session_id: str) -> Dict[str, Any]:
 
 
 # ============================================================================
-# ANALYTICS QUERIES
+# DAILY ROLLUPS (migrations/018_enrichment_rollups.sql)
 # ============================================================================
+# Analytics read per-day aggregates instead of raw rows: closed days come from
+# enrichment_daily_rollups (kept current by refresh_rollups()) summed per key
+# in SQL, today is aggregated live by the same SQL function. Rows per request
+# are bounded by the number of keys, not by session volume or window length.
 
-async def get_overview_analytics(days: int = 30) -> Dict[str, Any]:
-    """Get dashboard overview analytics for last N days"""
-    try:
-        start_date = datetime.now() - timedelta(days=days)
+LAYERS = (1, 2, 3)
 
-        # Get session count
-        session_count_response = supabase_service.table("progressive_enrichment_sessions") \
-            .select("id", count="exact") \
-            .gte("created_at", start_date.isoformat()) \
-            .execute()
 
-        total_sessions = session_count_response.count if hasattr(session_count_response, 'count') else 0
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
 
-        # Get sessions with full data for metrics
-        sessions_response = supabase_service.table("progressive_enrichment_sessions") \
-            .select("*") \
-            .gte("created_at", start_date.isoformat()) \
-            .execute()
 
-        sessions = sessions_response.data if sessions_response.data else []
+def _window_start(days: int) -> date:
+    """First day of a `days`-day window ending today (UTC)"""
+    return _utc_today() - timedelta(days=days - 1)
+
+
+async def get_rollups(dimension: str, days: int) -> List[Dict[str, Any]]:
+    """
+    Rollup rows ({"key", "metrics"}) of one dimension for the last `days` days
+
+    Closed days come summed per key by the database (one row per key, not per
+    day and key), followed by today's live rows; merge_rollups() combines them.
+
+    Args:
+        dimension: "session" (by status), "field", "source" or "platform"
+        days: Window length in UTC days, today included
+
+    Raises:
+        Exception: Database errors
+    """
+    today = _utc_today()
+
+    stored = supabase_service.rpc("sum_enrichment_rollups", {
+        "p_dimension": dimension,
+        "p_since": _window_start(days).isoformat(),
+        "p_before": today.isoformat()
+    }).execute()
+
+    live = supabase_service.rpc("enrichment_rollup_rows", {"p_days": [today.isoformat()]}).execute()
+
+    return (stored.data or []) + [row for row in (live.data or []) if row.get("dimension") == dimension]
+
+
+def merge_metrics(target: Dict[str, Any], metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Add one metrics object into target (keys ending in _min/_max keep the min/max)"""
+    for name, value in (metrics or {}).items():
+        if value is None:
+            target.setdefault(name, None)
+            continue
+        current = target.get(name)
+        if current is None:
+            target[name] = value
+        elif name.endswith("_min"):
+            target[name] = min(current, value)
+        elif name.endswith("_max"):
+            target[name] = max(current, value)
+        else:
+            target[name] = current + value
+    return target
+
+
+def merge_rollups(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Metrics per key, summed over the days of the window"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        merge_metrics(merged.setdefault(row["key"], {}), row.get("metrics"))
+    return merged
+
 
-        # Calculate metrics
-        total_cost = sum(float(s.get("total_cost_usd", 0)) for s in sessions)
-        avg_duration = sum(s.get("total_duration_ms", 0) for s in sessions) / len(sessions) if sessions else 0
+def _total(by_key: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    total: Dict[str, Any] = {}
+    for metrics in by_key.values():
+        merge_metrics(total, metrics)
+    return total
 
-        # Count by status
-        status_counts = {}
-        for session in sessions:
-            status = session.get("status", "unknown")
-            status_counts[status] = status_counts.get(status, 0) + 1
 
-        # Layer completion rates
-        layer1_complete = sum(1 for s in sessions if s.get("layer1_completed_at"))
-        layer2_complete = sum(1 for s in sessions if s.get("layer2_completed_at"))
-        layer3_complete = sum(1 for s in sessions if s.get("layer3_completed_at"))
+def _pct(part: float, whole: float) -> float:
+    return round(100 * part / whole, 1) if whole > 0 else 0
+
+
+def _acceptance_results(by_key: Dict[str, Dict[str, Any]], key_name: str) -> List[Dict[str, Any]]:
+    """Suggestion acceptance per field/source, best acceptance first"""
+    results = []
+    for key, metrics in by_key.items():
+        total = metrics.get("suggestions", 0)
+        confidence_count = metrics.get("confidence_count", 0)
+        results.append({
+            key_name: key,
+            "total_suggestions": total,
+            "accepted_count": metrics.get("accepted", 0),
+            "edited_count": metrics.get("edited", 0),
+            "auto_filled_count": metrics.get("auto_filled", 0),
+            "acceptance_rate_pct": _pct(metrics.get("accepted", 0), total),
+            "edit_rate_pct": _pct(metrics.get("edited", 0), total),
+            "auto_fill_rate_pct": _pct(metrics.get("auto_filled", 0), total),
+            "avg_confidence": round(float(metrics.get("confidence_sum", 0)) / confidence_count, 1) if confidence_count else 0
+        })
+
+    results.sort(key=lambda x: x["acceptance_rate_pct"], reverse=True)
+    return results
+
+
+async def refresh_rollups(overlap_seconds: int = ENRICHMENT_ROLLUP_OVERLAP_SECONDS) -> int:
+    """
+    Re-roll the days with sessions/suggestions/validations changed since the last run
+
+    Returns:
+        Number of days re-rolled
+
+    Raises:
+        Exception: Database errors
+    """
+    # Can take seconds on a busy day; keep it off the event loop
+    response = await asyncio.to_thread(
+        supabase_service.rpc("refresh_enrichment_rollups", {"p_overlap_seconds": overlap_seconds}).execute
+    )
+    return int(response.data or 0)
+
+
+async def rollup_days(days: List[date]) -> int:
+    """
+    Recompute and replace the stored rollups of the given days (backfill)
+
+    Returns:
+        Number of rollup rows written
+
+    Raises:
+        Exception: Database errors
+    """
+    response = await asyncio.to_thread(
+        supabase_service.rpc("rollup_enrichment_days", {"p_days": [day.isoformat() for day in days]}).execute
+    )
+    return int(response.data or 0)
+
+
+# ============================================================================
+# ANALYTICS QUERIES
+# ============================================================================
+
+async def get_overview_analytics(days: int = 30) -> Dict[str, Any]:
+    """Get dashboard overview analytics for last N days"""
+    try:
+        by_status = merge_rollups(await get_rollups("session", days))
+        totals = _total(by_status)
+
+        total_sessions = totals.get("sessions", 0)
+        layer_completion = {f"layer{n}": totals.get(f"layer{n}_completed", 0) for n in LAYERS}
 
         return {
             "period_days": days,
             "total_sessions": total_sessions,
-            "total_cost_usd": round(total_cost, 2),
-            "avg_duration_ms": round(avg_duration, 0),
-            "status_distribution": status_counts,
-            "layer_completion": {
-                "layer1": layer1_complete,
-                "layer2": layer2_complete,
-                "layer3": layer3_complete
-            },
+            "total_cost_usd": round(float(totals.get("cost_usd", 0)), 2),
+            "avg_duration_ms": round(float(totals.get("duration_ms", 0)) / total_sessions, 0) if total_sessions else 0,
+            "status_distribution": {status: metrics.get("sessions", 0) for status, metrics in by_status.items()},
+            "layer_completion": layer_completion,
             "completion_rates": {
-                "layer1_pct": round(100 * layer1_complete / total_sessions, 1) if total_sessions > 0 else 0,
-                "layer2_pct": round(100 * layer2_complete / total_sessions, 1) if total_sessions > 0 else 0,
-                "layer3_pct": round(100 * layer3_complete / total_sessions, 1) if total_sessions > 0 else 0
+                f"{layer}_pct": _pct(count, total_sessions) for layer, count in layer_completion.items()
             }
         }
     except Exception as e:
@@ -186,12 +294,10 @@ async def get_overview_analytics(days: int = 30) -> Dict[str, Any]:
 async def get_cost_analytics(days: int = 30) -> Dict[str, Any]:
     """Get cost trends and breakdown by source"""
     try:
-        start_date = datetime.now() - timedelta(days=days)
-
-        # Get daily cost from source performance table
+        # enrichment_source_performance is already aggregated per day and source
         response = supabase_service.table("enrichment_source_performance") \
-            .select("*") \
-            .gte("date", start_date.date().isoformat()) \
+            .select("date, source_name, total_cost_usd") \
+            .gte("date", _window_start(days).isoformat()) \
             .order("date", desc=False) \
             .execute()
 
@@ -246,36 +352,29 @@ async def get_cost_analytics(days: int = 30) -> Dict[str, Any]:
 async def get_performance_analytics(days: int = 30) -> Dict[str, Any]:
     """Get layer performance metrics"""
     try:
-        start_date = datetime.now() - timedelta(days=days)
-
-        # Get sessions
-        response = supabase_service.table("progressive_enrichment_sessions") \
-            .select("*") \
-            .gte("created_at", start_date.isoformat()) \
-            .execute()
-
-        sessions = response.data if response.data else []
+        totals = _total(merge_rollups(await get_rollups("session", days)))
+        total_sessions = totals.get("sessions", 0)
 
-        # Calculate per-layer metrics
+        # Calculate per-layer metrics (zero durations/costs count as not measured)
         layer_metrics = {}
-        for layer_num in [1, 2, 3]:
+        for layer_num in LAYERS:
             layer_key = f"layer{layer_num}"
-            durations = [s.get(f"{layer_key}_duration_ms") for s in sessions if s.get(f"{layer_key}_duration_ms")]
-            costs = [float(s.get(f"{layer_key}_cost_usd", 0)) for s in sessions if s.get(f"{layer_key}_cost_usd")]
-            completed = [s for s in sessions if s.get(f"{layer_key}_completed_at")]
-
-            layer_metrics[f"layer{layer_num}"] = {
-                "avg_duration_ms": round(sum(durations) / len(durations), 0) if durations else 0,
-                "min_duration_ms": min(durations) if durations else 0,
-                "max_duration_ms": max(durations) if durations else 0,
-                "avg_cost_usd": round(sum(costs) / len(costs), 6) if costs else 0,
-                "completion_count": len(completed),
-                "completion_rate_pct": round(100 * len(completed) / len(sessions), 1) if sessions else 0
+            duration_count = totals.get(f"{layer_key}_duration_count", 0)
+            cost_count = totals.get(f"{layer_key}_cost_count", 0)
+            completed = totals.get(f"{layer_key}_completed", 0)
+
+            layer_metrics[layer_key] = {
+                "avg_duration_ms": round(float(totals.get(f"{layer_key}_duration_ms", 0)) / duration_count, 0) if duration_count else 0,
+                "min_duration_ms": totals.get(f"{layer_key}_duration_ms_min") or 0,
+                "max_duration_ms": totals.get(f"{layer_key}_duration_ms_max") or 0,
+                "avg_cost_usd": round(float(totals.get(f"{layer_key}_cost_usd", 0)) / cost_count, 6) if cost_count else 0,
+                "completion_count": completed,
+                "completion_rate_pct": _pct(completed, total_sessions)
             }
 
         return {
             "period_days": days,
-            "total_sessions": len(sessions),
+            "total_sessions": total_sessions,
             "layer_metrics": layer_metrics
         }
     except Exception as e:
@@ -284,65 +383,16 @@ async def get_performance_analytics(days: int = 30) -> Dict[str, Any]:
 
 
 async def get_field_analytics(days: int = 30) -> Dict[str, Any]:
-    """Get field auto-fill success rates"""
+    """Get field auto-fill success rates (and the same rates per suggestion source)"""
     try:
-        start_date = datetime.now() - timedelta(days=days)
-
-        # Get auto-fill suggestions
-        response = supabase_service.table("auto_fill_suggestions") \
-            .select("*") \
-            .gte("suggested_at", start_date.isoformat()) \
-            .execute()
-
-        suggestions = response.data if response.data else []
-
-        # Aggregate by field
-        field_stats = {}
-        for suggestion in suggestions:
-            field_name = suggestion.get("field_name")
-            if field_name not in field_stats:
-                field_stats[field_name] = {
-                    "total": 0,
-                    "accepted": 0,
-                    "edited": 0,
-                    "auto_filled": 0,
-                    "confidences": []
-                }
-
-            stats = field_stats[field_name]
-            stats["total"] += 1
-            if suggestion.get("was_accepted"):
-                stats["accepted"] += 1
-            if suggestion.get("was_edited"):
-                stats["edited"] += 1
-            if suggestion.get("should_auto_fill"):
-                stats["auto_filled"] += 1
-            if suggestion.get("confidence"):
-                stats["confidences"].append(float(suggestion.get("confidence")))
-
-        # Calculate percentages
-        field_results = []
-        for field_name, stats in field_stats.items():
-            total = stats["total"]
-            field_results.append({
-                "field_name": field_name,
-                "total_suggestions": total,
-                "accepted_count": stats["accepted"],
-                "edited_count": stats["edited"],
-                "auto_filled_count": stats["auto_filled"],
-                "acceptance_rate_pct": round(100 * stats["accepted"] / total, 1) if total > 0 else 0,
-                "edit_rate_pct": round(100 * stats["edited"] / total, 1) if total > 0 else 0,
-                "auto_fill_rate_pct": round(100 * stats["auto_filled"] / total, 1) if total > 0 else 0,
-                "avg_confidence": round(sum(stats["confidences"]) / len(stats["confidences"]), 1) if stats["confidences"] else 0
-            })
-
-        # Sort by acceptance rate
-        field_results.sort(key=lambda x: x["acceptance_rate_pct"], reverse=True)
+        field_results = _acceptance_results(merge_rollups(await get_rollups("field", days)), "field_name")
+        source_results = _acceptance_results(merge_rollups(await get_rollups("source", days)), "source")
 
         return {
             "period_days": days,
             "total_fields": len(field_results),
-            "fields": field_results
+            "fields": field_results,
+            "sources": source_results
         }
     except Exception as e:
         logger.error(f"Failed to get field analytics: {str(e)}", exc_info=True)
@@ -352,46 +402,28 @@ async def get_field_analytics(days: int = 30) -> Dict[str, Any]:
 async def get_cache_analytics(days: int = 30) -> Dict[str, Any]:
     """Get cache hit rates and effectiveness"""
     try:
-        start_date = datetime.now() - timedelta(days=days)
-
-        # Get social media cache stats
-        cache_response = supabase_service.table("social_media_cache") \
-            .select("*") \
-            .gte("validated_at", start_date.isoformat()) \
-            .execute()
-
-        cache_entries = cache_response.data if cache_response.data else []
-
-        # Calculate cache metrics
-        total_entries = len(cache_entries)
-        valid_entries = sum(1 for e in cache_entries if e.get("is_valid"))
+        by_platform = merge_rollups(await get_rollups("platform", days))
+        totals = _total(by_platform)
 
-        # Count by platform
-        platform_stats = {}
-        for entry in cache_entries:
-            platform = entry.get("platform")
-            if platform not in platform_stats:
-                platform_stats[platform] = {"total": 0, "valid": 0}
-            platform_stats[platform]["total"] += 1
-            if entry.get("is_valid"):
-                platform_stats[platform]["valid"] += 1
+        total_entries = totals.get("validations", 0)
+        valid_entries = totals.get("valid", 0)
 
         # Calculate validation success rate by platform
         platform_results = [
             {
                 "platform": platform,
-                "total_validations": stats["total"],
-                "valid_count": stats["valid"],
-                "validation_rate_pct": round(100 * stats["valid"] / stats["total"], 1) if stats["total"] > 0 else 0
+                "total_validations": metrics.get("validations", 0),
+                "valid_count": metrics.get("valid", 0),
+                "validation_rate_pct": _pct(metrics.get("valid", 0), metrics.get("validations", 0))
             }
-            for platform, stats in platform_stats.items()
+            for platform, metrics in by_platform.items()
         ]
 
         return {
             "period_days": days,
             "total_cache_entries": total_entries,
             "valid_entries": valid_entries,
-            "validation_rate_pct": round(100 * valid_entries / total_entries, 1) if total_entries > 0 else 0,
+            "validation_rate_pct": _pct(valid_entries, total_entries),
             "platform_stats": platform_results
         }
     except Exception as e:
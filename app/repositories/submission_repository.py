@@ -5,6 +5,7 @@ Domain-specific repository for managing submission records
 
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+import asyncio
 import logging
 
 from app.repositories.supabase_repository import SupabaseRepository
@@ -269,29 +270,30 @@ class SubmissionRepository(SupabaseRepository):
             DatabaseError: If query fails
         """
         try:
-            # Get total count
-            total = await self.count()
-
-            # Get count by status
-            statuses = ["pending", "processing", "completed", "failed"]
-            by_status = {}
-
-            for status in statuses:
-                count = await self.count({"status": status})
-                by_status[status] = count
-
             # Get submissions from last 7 days
             cutoff = datetime.utcnow() - timedelta(days=7)
             cutoff_str = cutoff.isoformat()
 
-            response = (
+            # Two queries, run concurrently: counts per status and archived flag, and the 7-day count
+            recent_query = (
                 self.client.table(self.table_name)
-                .select("*", count="exact")
+                .select("id", count="exact", head=True)
                 .gte("created_at", cutoff_str)
-                .execute()
             )
+            grouped, response = await asyncio.gather(
+                self.count_grouped(["status", "archived"]),
+                asyncio.to_thread(recent_query.execute),
+            )
+
+            # Every row falls in exactly one status group (NULL included)
+            total = sum(grouped["status"].values())
+
+            # Get count by status
+            statuses = ["pending", "processing", "completed", "failed"]
+            by_status = {status: grouped["status"].get(status, 0) for status in statuses}
 
             last_7_days = response.count if response.count is not None else 0
+            archived = grouped["archived"].get("true", 0)
 
             self._log_operation("get_statistics", True)
 
@@ -299,8 +301,8 @@ class SubmissionRepository(SupabaseRepository):
                 "total": total,
                 "by_status": by_status,
                 "last_7_days": last_7_days,
-                "archived": await self.count({"archived": True}),
-                "active": total - await self.count({"archived": True})
+                "archived": archived,
+                "active": total - archived
             }
 
         except Exception as e:
@@ -3,12 +3,14 @@ Supabase Repository Implementation
 Concrete implementation of repository pattern for Supabase PostgreSQL
 """
 
-from typing import Optional, List, Dict, Any, TypeVar
+from typing import Optional, List, Dict, Any, Iterable, TypeVar
+import asyncio
 import logging
 
 from app.repositories.base import BaseRepository
 from app.core.supabase import get_supabase_client
 from app.core.exceptions import DatabaseError, ResourceNotFound
+from app.core.constants import REPOSITORY_IN_CHUNK_SIZE, REPOSITORY_UPSERT_CHUNK_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -297,6 +299,66 @@ class SupabaseRepository(BaseRepository[T]):
             self._log_operation("count", False, error=e)
             raise DatabaseError(f"Failed to count records in {self.table_name}: {str(e)}")
 
+    async def count_grouped(
+        self,
+        columns: List[str],
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Dict[Optional[str], int]]:
+        """
+        Count records per distinct value of each column, in one query
+
+        Uses the grouped_counts function (migrations/020_grouped_counts.sql).
+
+        Args:
+            columns: Columns to group by
+            filters: Optional equality filters applied to every count
+
+        Returns:
+            {column: {value: count}}; values are in text form ("true"/"false"
+            for booleans) and None stands for NULL
+
+        Raises:
+            DatabaseError: If query fails
+        """
+        try:
+            params = {"p_table": self.table_name, "p_columns": list(columns), "p_filters": filters or {}}
+            response = await asyncio.to_thread(self.client.rpc("grouped_counts", params).execute)
+
+            counts: Dict[str, Dict[Optional[str], int]] = {column: {} for column in columns}
+            for row in response.data or []:
+                counts.setdefault(row["column_name"], {})[row["value"]] = int(row["count"])
+
+            self._log_operation("count_grouped", True)
+
+            return counts
+
+        except Exception as e:
+            self._log_operation("count_grouped", False, error=e)
+            raise DatabaseError(f"grouped count on {self.table_name}", str(e))
+
+    async def count_by(
+        self,
+        column: str,
+        values: Iterable[Any],
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[Any, int]:
+        """
+        Count records for each of several values of one column, in one query
+
+        Args:
+            column: Column to group by
+            values: Values to report (missing ones count 0)
+            filters: Optional equality filters
+
+        Returns:
+            {value: count} keyed by the values passed in
+
+        Raises:
+            DatabaseError: If query fails
+        """
+        counts = (await self.count_grouped([column], filters)).get(column, {})
+        return {value: counts.get(_as_text(value), 0) for value in values}
+
     async def find(self, filters: Dict[str, Any]) -> List[T]:
         """
         Find records matching filters
@@ -360,6 +422,40 @@ class SupabaseRepository(BaseRepository[T]):
             self._log_operation("find_one", False, error=e)
             raise DatabaseError(f"Failed to find record in {self.table_name}: {str(e)}")
 
+    async def get_many(self, ids: Iterable[Any]) -> List[T]:
+        """
+        Get several records by ID with `in` filters (one query per chunk of IDs)
+
+        Args:
+            ids: Record IDs (duplicates are ignored)
+
+        Returns:
+            Found records, in the order of `ids`; missing IDs are skipped
+
+        Raises:
+            DatabaseError: If query fails
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        if not unique_ids:
+            return []
+
+        try:
+            found: Dict[str, T] = {}
+            for start in range(0, len(unique_ids), REPOSITORY_IN_CHUNK_SIZE):
+                chunk = unique_ids[start:start + REPOSITORY_IN_CHUNK_SIZE]
+                query = self.client.table(self.table_name).select("*").in_("id", chunk)
+                response = await asyncio.to_thread(query.execute)
+                for record in response.data or []:
+                    found[str(record["id"])] = record
+
+            self._log_operation("get_many", True)
+
+            return [found[str(id)] for id in unique_ids if str(id) in found]
+
+        except Exception as e:
+            self._log_operation("get_many", False, error=e)
+            raise DatabaseError(f"multi-get on {self.table_name}", str(e))
+
     async def batch_create(self, records: List[Dict[str, Any]]) -> List[T]:
         """
         Create multiple records in a single transaction
@@ -393,34 +489,110 @@ class SupabaseRepository(BaseRepository[T]):
             self._log_operation("batch_create", False, error=e)
             raise DatabaseError(f"Failed to batch create records in {self.table_name}: {str(e)}")
 
+    async def bulk_upsert(
+        self,
+        records: List[Dict[str, Any]],
+        on_conflict: str = "id",
+        chunk_size: int = REPOSITORY_UPSERT_CHUNK_SIZE
+    ) -> List[T]:
+        """
+        Insert or update many records, one upsert statement per chunk
+
+        Records are sent as given (including `id`), with updated_at set. Every
+        record in a chunk should carry the same columns: PostgREST fills a
+        column missing from one record with NULL.
+
+        Args:
+            records: Full rows to write
+            on_conflict: Unique column(s) that identify an existing row
+            chunk_size: Rows per statement
+
+        Returns:
+            Written records
+
+        Raises:
+            DatabaseError: If an upsert fails (earlier chunks stay written)
+        """
+        try:
+            clean_records = [self._add_timestamps(dict(record), is_update=True) for record in records]
+
+            results: List[T] = []
+            for start in range(0, len(clean_records), chunk_size):
+                chunk = clean_records[start:start + chunk_size]
+                query = self.client.table(self.table_name).upsert(chunk, on_conflict=on_conflict)
+                response = await asyncio.to_thread(query.execute)
+                results.extend(response.data or [])
+
+            self._log_operation("bulk_upsert", True)
+
+            return results
+
+        except Exception as e:
+            self._log_operation("bulk_upsert", False, error=e)
+            raise DatabaseError(f"bulk upsert on {self.table_name}", str(e))
+
     async def batch_update(self, updates: List[Dict[str, Any]]) -> List[T]:
         """
         Update multiple records (requires id in each update dict)
 
+        One call to the batch_update_rows function (migrations/022_batch_update_rows.sql):
+        a single UPDATE that sets only the columns each update supplies, like
+        update() does for one record. Several updates of the same id are merged
+        (later values win).
+
         Args:
             updates: List of update data (each must include 'id')
 
         Returns:
-            List of updated records
+            List of updated records, in the order of their first update
 
         Raises:
+            ResourceNotFound: If any record does not exist (nothing is written)
             DatabaseError: If updates fail
         """
         try:
-            results = []
+            if any("id" not in update for update in updates):
+                raise ValueError("Each update must include 'id' field")
+            if not updates:
+                return []
 
+            rows: Dict[str, Dict[str, Any]] = {}
             for update in updates:
-                if "id" not in update:
-                    raise ValueError("Each update must include 'id' field")
-
-                record_id = update.pop("id")
-                result = await self.update(record_id, update)
-                results.append(result)
+                key = str(update["id"])
+                changes = self._sanitize_data({k: v for k, v in update.items() if k != "id"})
+                rows.setdefault(key, {"id": update["id"]}).update(changes)
+            for row in rows.values():
+                self._add_timestamps(row, is_update=True)
+
+            params = {"p_table": self.table_name, "p_rows": list(rows.values())}
+            try:
+                response = await asyncio.to_thread(self.client.rpc("batch_update_rows", params).execute)
+            except Exception as e:
+                if getattr(e, "code", None) == "P0002":
+                    # Raised before anything is committed: the whole batch is rolled back
+                    message = getattr(e, "message", None) or str(e)
+                    raise ResourceNotFound(self.table_name, message.rsplit("no rows with id ", 1)[-1])
+                raise
+
+            updated = {str(record["id"]): record for record in response.data or []}
+            results = [updated[key] for key in rows if key in updated]
 
             self._log_operation("batch_update", True)
 
             return results
 
+        except (ResourceNotFound, DatabaseError) as e:
+            self._log_operation("batch_update", False, error=e)
+            raise
         except Exception as e:
             self._log_operation("batch_update", False, error=e)
-            raise DatabaseError(f"Failed to batch update records in {self.table_name}: {str(e)}")
+            raise DatabaseError(f"batch update on {self.table_name}", str(e))
+
+
+def _as_text(value: Any) -> Optional[str]:
+    """Text form of a column value as returned by grouped_counts"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(getattr(value, "value", value))
@@ -120,6 +120,8 @@ async def get_cache_statistics_endpoint(current_user: dict = RequireAuth):
         print(f"[AUTH] User {current_user['email']} accessing cache statistics")
 
         from app.services.intelligence.memory import get_cache_stats as get_institutional_stats
+        from app.core.tiered_cache import get_all_cache_stats
+        from app.core.single_flight import single_flight
 
         # Get all cache statistics
         enhanced_stats = await get_cache_statistics()
@@ -133,6 +135,8 @@ async def get_cache_statistics_endpoint(current_user: dict = RequireAuth):
             "data": {
                 "enhanced_cache": enhanced_stats,
                 "institutional_memory": institutional_stats,
+                "memory_tiers": get_all_cache_stats(),  # This process: hits per tier, size, evictions
+                "single_flight": single_flight.get_stats(),  # This process: duplicate fills avoided
                 "summary": {
                     "total_cost_saved_usd": total_cost_saved,
                     "total_records": (
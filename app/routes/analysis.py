@@ -8,9 +8,9 @@ This module contains routes for:
 - Regenerating completed analyses (admin)
 - Updating submission status (admin)
 """
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, Response
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
-from typing import AsyncIterator, Dict, List
+from typing import AsyncIterator, Dict, List, Optional
 from datetime import datetime
 import json
 import logging
@@ -39,6 +39,7 @@ from app.core.database import (
     get_submission,
     update_submission_status,
 )
+from app.repositories import chat_repository
 
 # Import auth dependency
 from app.routes.auth import RequireAuth
@@ -51,9 +52,10 @@ from app.utils.background_tasks import (
     normalize_website_url,
     process_analysis_task,
     emit_progress,
-    get_progress_updates,
-    clear_progress,
+    progress_channel,
 )
+from app.core.progress_bus import progress_bus
+from app.core.constants import PROGRESS_STREAM_TIMEOUT
 
 # Initialize router with prefix
 router = APIRouter(prefix="/api")
@@ -300,7 +302,7 @@ async def submit_lead(
     **Connection Details:**
     - **Protocol:** Server-Sent Events (text/event-stream)
     - **Timeout:** 3 minutes (180 seconds)
-    - **Polling Interval:** 1 second
+    - **Delivery:** Pushed as soon as the analysis emits progress (works across API and worker processes)
     - **Auto-close:** When analysis completes or fails
 
     **Event Format:**
@@ -360,8 +362,9 @@ async def submit_lead(
 
     **Notes:**
     - Keep connection alive throughout analysis (2-5 minutes)
-    - Reconnection not supported - start new stream if disconnected
-    - Progress history cleared after successful stream completion
+    - Each event carries an `id`; reconnecting with `Last-Event-ID` resumes after that event
+      (EventSource does this automatically)
+    - Progress history is retained for 1 hour
     - No authentication required (use submission_id as access token)
     """,
     responses={
@@ -369,7 +372,7 @@ async def submit_lead(
             "description": "SSE stream of progress updates",
             "content": {
                 "text/event-stream": {
-                    "example": "data: {\"stage\": \"data_gathering\", \"message\": \"Coletando dados...\", \"progress\": 30, \"timestamp\": \"2025-01-26T10:30:00Z\"}\n\n"
+                    "example": "id: 1737887400000-0\ndata: {\"stage\": \"data_gathering\", \"message\": \"Coletando dados...\", \"progress\": 30, \"timestamp\": \"2025-01-26T10:30:00Z\"}\n\n"
                 }
             }
         },
@@ -382,44 +385,31 @@ async def submit_lead(
             }
         }
     })
-async def stream_analysis_progress(submission_id: int):
+async def stream_analysis_progress(
+    submission_id: int,
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID")
+):
     """SSE endpoint for real-time analysis progress - streams progress updates until completion"""
     async def event_generator() -> AsyncIterator[str]:
-        """Generate SSE events for progress updates"""
-        last_sent_count = 0
-        timeout_seconds = 180  # 3 minutes timeout
-        start_time = asyncio.get_event_loop().time()
-
+        """Generate SSE events for progress updates (pushed by the progress bus, no polling)"""
         try:
-            while True:
-                # Check timeout
-                if asyncio.get_event_loop().time() - start_time > timeout_seconds:
-                    yield f"data: {json.dumps({'stage': 'timeout', 'message': 'Stream timeout', 'progress': 0})}\n\n"
-                    break
-
-                # Get new progress updates
-                all_updates = get_progress_updates(submission_id)
-
-                # Send new updates since last check
-                for update in all_updates[last_sent_count:]:
-                    yield f"data: {json.dumps(update)}\n\n"
-                    last_sent_count += 1
-
-                    # If completed or failed, close stream after sending
-                    if update.get("stage") in ["completed", "failed"]:
-                        yield f"data: {json.dumps({'stage': 'end', 'message': 'Stream closing', 'progress': 100})}\n\n"
-                        # Clear progress after successful stream
-                        await asyncio.sleep(1)  # Give client time to receive final message
-                        clear_progress(submission_id)
-                        return
-
-                # Wait before checking again (polling interval)
-                await asyncio.sleep(1)
+            async for event in progress_bus.subscribe(
+                progress_channel(submission_id),
+                last_event_id=last_event_id,
+                timeout=PROGRESS_STREAM_TIMEOUT
+            ):
+                yield event.to_sse()
+
+                # If completed or failed, close stream after sending
+                if event.data.get("stage") in ["completed", "failed"]:
+                    yield f"data: {json.dumps({'stage': 'end', 'message': 'Stream closing', 'progress': 100})}\n\n"
+                    return
+
+            yield f"data: {json.dumps({'stage': 'timeout', 'message': 'Stream timeout', 'progress': 0})}\n\n"
 
         except asyncio.CancelledError:
-            # Client disconnected - clean up
+            # Client disconnected; events stay retained so the client can resume
             logger.info(f"[SSE] Client disconnected from submission {submission_id} stream")
-            clear_progress(submission_id)
             raise
 
     return StreamingResponse(
@@ -507,6 +497,12 @@ async def reprocess_submission(
             error_message=None,
         )
 
+        # The chat was about the old report
+        try:
+            await chat_repository.delete_chat(submission_id)
+        except Exception as e:
+            logger.warning(f"[WARNING] Failed to clear chat for submission {submission_id}: {e}")
+
         # Trigger new analysis with Apify enrichment
         background_tasks.add_task(process_analysis_task, submission_id)
 
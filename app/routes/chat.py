@@ -5,22 +5,91 @@ Provides endpoints for admins to chat with AI about generated reports,
 get chat history, and access quick prompt suggestions.
 """
 
-from fastapi import APIRouter, HTTPException, Request, Depends
-from datetime import datetime, timezone
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, Depends, Query
+from fastapi.responses import StreamingResponse
+from dataclasses import dataclass
 import json
-from typing import Dict, Any
-
-from app.core.database import (
-    get_submission,
-    update_submission_status,
+from typing import Dict, Any, List, Optional
+
+from app.core.constants import CHAT_HISTORY_PAGE_SIZE_DEFAULT, CHAT_HISTORY_PAGE_SIZE_MAX
+from app.core.database import get_submission
+from app.repositories import chat_repository
+from app.services.ai.chat import (
+    ChatSummary,
+    get_quick_prompts,
+    send_chat_message,
+    stream_chat_message,
+    update_chat_summary
 )
-from app.services.ai.chat import send_chat_message, get_quick_prompts
 from app.routes.auth import RequireAuth
 
 # Initialize router with prefix
 router = APIRouter(prefix="/api/admin")
 
 
+@dataclass
+class _ChatRequest:
+    """Everything a chat turn needs, loaded and validated once"""
+    submission: Dict[str, Any]
+    report_data: Dict[str, Any]
+    data_quality: Optional[Dict[str, Any]]
+    chat_history: List[Dict[str, Any]]  # Stored messages newer than the summary
+    summary: ChatSummary
+    user_message: str
+    model: str
+
+
+async def _load_chat_request(submission_id: int, request: Request) -> _ChatRequest:
+    """Validate the submission and request body (raises HTTPException)"""
+    submission = await get_submission(submission_id)
+    if not submission:
+        raise HTTPException(status_code=404, detail="Submission not found")
+
+    if submission["status"] != "completed":
+        raise HTTPException(status_code=400, detail="Can only chat about completed analyses")
+
+    body = await request.json()
+    user_message = body.get("message", "").strip()
+    if not user_message:
+        raise HTTPException(status_code=400, detail="Message cannot be empty")
+
+    try:
+        report_data = json.loads(submission.get("report_json", "{}"))
+        data_quality = json.loads(submission.get("data_quality_json", "{}")) if submission.get("data_quality_json") else None
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=500, detail="Failed to parse report data")
+
+    summary_row, chat_history = await chat_repository.load_chat_context(submission_id)
+    summary = ChatSummary.from_dict(summary_row)
+    model = body.get("model", "haiku")
+    return _ChatRequest(submission, report_data, data_quality, chat_history, summary, user_message, model)
+
+
+async def _save_chat_turn(submission_id: int, chat: _ChatRequest, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Append the exchange (one insert)"""
+    stored = await chat_repository.append_chat_messages(submission_id, [
+        {"role": "user", "content": chat.user_message},
+        {
+            "role": "assistant",
+            "content": result["message"],
+            "model_used": result.get("model_used"),
+            "tokens_used": result.get("tokens_used")
+        }
+    ])
+    return stored
+
+
+async def _fold_chat_summary(submission_id: int, chat: _ChatRequest, stored: List[Dict[str, Any]]) -> None:
+    """Fold old turns into the summary if due (background task: may call the LLM)"""
+    try:
+        summary = await update_chat_summary(chat.chat_history + stored, chat.summary)
+        if summary != chat.summary:
+            await chat_repository.save_chat_summary(submission_id, summary.text, summary.through_id)
+    except Exception as e:
+        # Non-critical: the turns are saved, the summary is retried on a later message
+        print(f"[WARNING] Failed to update chat summary for submission {submission_id}: {e}")
+
+
 @router.post("/submissions/{submission_id}/chat",
     summary="Chat with AI about Report",
     description="""
@@ -67,13 +136,14 @@ router = APIRouter(prefix="/api/admin")
       "model_used": "claude-3-5-haiku-20241022",
       "tokens_used": 542,
       "timestamp": "2025-01-26T10:35:00Z",
-      "chat_history": [...]
+      "chat_history": [...]  // The user/assistant messages of this turn
     }
     ```
 
     **Chat History:**
-    - Automatically persisted in database
-    - Included in all subsequent requests for context
+    - Automatically persisted in database (append-only, the submission row is not touched)
+    - Recent turns are included in subsequent requests (bounded token budget)
+    - Older turns are folded into a rolling summary
     - Viewable via `/chat/history` endpoint
     - Cleared when submission is reprocessed
 
@@ -144,83 +214,31 @@ router = APIRouter(prefix="/api/admin")
 async def chat_with_report(
     submission_id: int,
     request: Request,
+    background_tasks: BackgroundTasks,
     current_user: dict = RequireAuth,
 ):
     """Chat with AI about report - context-aware chat with persistent history"""
     try:
         print(f"[AUTH] User {current_user['email']} chatting about submission {submission_id}")
 
-        # Get submission
-        submission = await get_submission(submission_id)
-        if not submission:
-            raise HTTPException(status_code=404, detail="Submission not found")
-
-        if submission["status"] != "completed":
-            raise HTTPException(status_code=400, detail="Can only chat about completed analyses")
-
-        # Parse request body
-        body = await request.json()
-        user_message = body.get("message", "").strip()
-        model_pref = body.get("model", "haiku")
-
-        if not user_message:
-            raise HTTPException(status_code=400, detail="Message cannot be empty")
-
-        # Select model
-        model_map = {
-            "haiku": "claude-3-5-haiku-20241022",
-            "sonnet": "claude-3-5-sonnet-20241022"
-        }
-        model = model_map.get(model_pref, "claude-3-5-haiku-20241022")
-
-        # Parse report and data quality
-        try:
-            report_data = json.loads(submission.get("report_json", "{}"))
-            data_quality = json.loads(submission.get("data_quality_json", "{}")) if submission.get("data_quality_json") else None
-        except:
-            raise HTTPException(status_code=500, detail="Failed to parse report data")
-
-        # Get existing chat history
-        chat_history = []
-        try:
-            if submission.get("chat_history"):
-                stored_history = json.loads(submission["chat_history"])
-                # Extract just role and content for API
-                chat_history = [{"role": msg["role"], "content": msg["content"]} for msg in stored_history]
-        except:
-            chat_history = []
+        chat = await _load_chat_request(submission_id, request)
 
         # Send message to AI
         result = await send_chat_message(
-            submission_data=submission,
-            report_data=report_data,
-            data_quality=data_quality,
-            chat_history=chat_history,
-            user_message=user_message,
-            model=model
+            submission_data=chat.submission,
+            report_data=chat.report_data,
+            data_quality=chat.data_quality,
+            chat_history=chat.chat_history,
+            user_message=chat.user_message,
+            model=chat.model,
+            summary=chat.summary
         )
 
         if not result.get("success", False):
             raise HTTPException(status_code=500, detail=result.get("error", "AI chat failed"))
 
-        # Build updated chat history
-        new_history = chat_history + [
-            {"role": "user", "content": user_message},
-            {"role": "assistant", "content": result["message"]}
-        ]
-
-        # Store chat history in database
-        await update_submission_status(
-            submission_id=submission_id,
-            status=submission["status"],  # Keep existing status
-            report_json=submission.get("report_json"),  # Keep existing report
-            data_quality_json=submission.get("data_quality_json"),  # Keep existing quality
-            processing_metadata=json.dumps({
-                **(json.loads(submission.get("processing_metadata", "{}")) if submission.get("processing_metadata") else {}),
-                "chat_history": new_history,  # Update chat history
-                "last_chat_at": datetime.now(timezone.utc).isoformat()
-            }),
-        )
+        new_messages = await _save_chat_turn(submission_id, chat, result)
+        background_tasks.add_task(_fold_chat_summary, submission_id, chat, new_messages)
 
         print(f"[OK] Chat message processed for submission {submission_id}")
 
@@ -230,7 +248,7 @@ async def chat_with_report(
             "model_used": result["model_used"],
             "tokens_used": result["tokens_used"],
             "timestamp": result["timestamp"],
-            "chat_history": new_history
+            "chat_history": new_messages  # This exchange; full history via /chat/history
         }
 
     except HTTPException:
@@ -243,38 +261,101 @@ async def chat_with_report(
         }
 
 
+@router.post("/submissions/{submission_id}/chat/stream",
+    summary="Chat with AI about Report (streaming)",
+    description="""
+    Same as `POST /submissions/{submission_id}/chat`, streamed as Server-Sent Events.
+
+    **Events:**
+    - `delta`: `{"content": "..."}` - next piece of the answer
+    - `done`: final message, model, tokens and timestamp (sent after the turn is saved;
+      the history summary is updated afterwards)
+    - `error`: `{"error": "..."}` - nothing is saved
+
+    The request body is the same as the non-streaming endpoint. Use `fetch()` and
+    read the response body stream (EventSource cannot send POST requests).
+    """)
+async def stream_chat_with_report(
+    submission_id: int,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    current_user: dict = RequireAuth,
+):
+    """Streaming chat about a report (SSE)"""
+    print(f"[AUTH] User {current_user['email']} streaming chat about submission {submission_id}")
+
+    chat = await _load_chat_request(submission_id, request)
+
+    async def event_stream():
+        async for event in stream_chat_message(
+            submission_data=chat.submission,
+            report_data=chat.report_data,
+            data_quality=chat.data_quality,
+            chat_history=chat.chat_history,
+            user_message=chat.user_message,
+            model=chat.model,
+            summary=chat.summary
+        ):
+            kind = event.pop("type")
+            if kind == "delta":
+                yield f"event: delta\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+                continue
+            if kind == "error":
+                yield f"event: error\ndata: {json.dumps({'error': event.get('error')}, ensure_ascii=False)}\n\n"
+                return
+
+            try:
+                stored = await _save_chat_turn(submission_id, chat, event)
+            except Exception as e:
+                print(f"[ERROR] Failed to save streamed chat turn for submission {submission_id}: {e}")
+                yield f"event: error\ndata: {json.dumps({'error': 'Failed to save chat history'})}\n\n"
+                return
+            print(f"[OK] Streamed chat message processed for submission {submission_id}")
+            # Runs after the stream ends, so `done` does not wait for summarization
+            background_tasks.add_task(_fold_chat_summary, submission_id, chat, stored)
+            yield f"event: done\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"  # Disable buffering for nginx
+        },
+        background=background_tasks
+    )
+
+
 @router.get("/submissions/{submission_id}/chat/history")
 async def get_chat_history(
     submission_id: int,
+    limit: int = Query(CHAT_HISTORY_PAGE_SIZE_DEFAULT, ge=1, le=CHAT_HISTORY_PAGE_SIZE_MAX),
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
     current_user: dict = RequireAuth,
 ):
     """
     Get chat history for a submission (Protected Admin endpoint)
 
-    Returns full chat history with timestamps.
+    Returns messages oldest first with timestamps, one page at a time.
+    Pass next_cursor back as ?cursor= until it is null.
 
     Requires valid JWT token in Authorization header
     """
     try:
         print(f"[AUTH] User {current_user['email']} fetching chat history for submission {submission_id}")
 
-        # Get submission
-        submission = await get_submission(submission_id)
-        if not submission:
-            raise HTTPException(status_code=404, detail="Submission not found")
+        chat_history, next_cursor = await chat_repository.list_chat_messages(submission_id, limit, after_id=cursor)
 
-        # Extract chat history
-        chat_history = []
-        try:
-            if submission.get("chat_history"):
-                chat_history = json.loads(submission["chat_history"])
-        except:
-            chat_history = []
+        # An empty page may mean the submission does not exist (only then is it read)
+        if not chat_history and not await get_submission(submission_id):
+            raise HTTPException(status_code=404, detail="Submission not found")
 
         return {
             "success": True,
             "submission_id": submission_id,
-            "chat_history": chat_history
+            "chat_history": chat_history,
+            "next_cursor": next_cursor
         }
 
     except HTTPException:
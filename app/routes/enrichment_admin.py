@@ -22,6 +22,7 @@ import logging
 
 from app.routes.auth import RequireAuth
 from app.repositories import enrichment_repository, audit_repository
+from app.services.enrichment.audit_writer import audit_writer
 from app.services.enrichment import EnrichmentAnalytics
 
 logger = logging.getLogger(__name__)
@@ -667,6 +668,7 @@ async def get_source_monitoring(
             data={
                 "sources": all_stats,
                 "period_hours": hours,
+                "audit_writer": audit_writer.get_stats(),  # This process: queued, written and dropped rows
                 "summary": {
                     "total_sources": len(all_stats),
                     "healthy": sum(1 for s in all_stats if s.get("health") == "healthy"),
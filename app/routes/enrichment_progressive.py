@@ -6,17 +6,17 @@ for instant field auto-fill as data becomes available.
 """
 
 import logging
-import asyncio
 import json
 from datetime import datetime
 from typing import Dict, Any, Optional
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Header
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, validator
 
 from app.services.enrichment.progressive_orchestrator import (
     ProgressiveEnrichmentOrchestrator,
-    ProgressiveEnrichmentSession
+    ProgressiveEnrichmentSession,
+    LayerResult
 )
 from app.services.enrichment.validators import (
     validate_phone,
@@ -27,6 +27,12 @@ from app.services.enrichment.validators import (
     validate_url,
     ValidationResult
 )
+from app.services.enrichment.progressive_session_store import (
+    progressive_session_store,
+    progressive_channel
+)
+from app.core.progress_bus import progress_bus
+from app.core.constants import PROGRESSIVE_STREAM_TIMEOUT
 from app.core.security.rate_limiter import get_redis_client
 
 logger = logging.getLogger(__name__)
@@ -160,12 +166,32 @@ def translate_fields_for_frontend(backend_data: Dict[str, Any]) -> Dict[str, Any
 
 
 # ============================================================================
-# GLOBAL STATE (In-memory session storage)
+# SESSION STATE (shared across workers)
 # ============================================================================
 
-# Store active enrichment sessions
-# In production, use Redis or database
-active_sessions: Dict[str, ProgressiveEnrichmentSession] = {}
+# Sessions started by this worker; snapshots are shared via progressive_session_store
+# and layer events via the progress bus, so any worker can serve status and streams
+active_sessions: Dict[str, ProgressiveEnrichmentSession] = progressive_session_store.local_sessions
+
+LAYER_EVENTS = {1: "layer1_complete", 2: "layer2_complete", 3: "layer3_complete"}
+
+
+def build_layer_event(
+    event: str,
+    session: ProgressiveEnrichmentSession,
+    layer_result: Optional[LayerResult]
+) -> Dict[str, Any]:
+    """Progress bus payload for a completed layer (fields translated for frontend)"""
+    data = {
+        "status": session.status,
+        "fields": translate_fields_for_frontend(session.fields_auto_filled),
+        "confidence_scores": session.confidence_scores,
+        "layer_result": layer_result.model_dump(mode="json") if layer_result else {}
+    }
+    if event == "layer3_complete":
+        data["total_cost_usd"] = session.total_cost_usd
+        data["total_duration_ms"] = session.total_duration_ms
+    return {"event": event, "data": data}
 
 
 # ============================================================================
@@ -192,9 +218,8 @@ async def start_progressive_enrichment(
         import uuid
         session_id = str(uuid.uuid4())
 
-        # Create placeholder session immediately
-        from app.services.enrichment.progressive_orchestrator import ProgressiveEnrichmentSession
-        placeholder_session = ProgressiveEnrichmentSession(
+        # Create session immediately; the orchestrator fills it in layer by layer
+        session = ProgressiveEnrichmentSession(
             session_id=session_id,
             website_url=request.website_url,
             user_email=request.user_email,
@@ -205,39 +230,42 @@ async def start_progressive_enrichment(
             total_cost_usd=0.0,
             total_duration_ms=0
         )
-        active_sessions[session_id] = placeholder_session
+        await progressive_session_store.save(session)
 
         # Create orchestrator
         orchestrator = ProgressiveEnrichmentOrchestrator()
+        channel = progressive_channel(session_id)
 
         # Start enrichment in background
         async def run_enrichment():
-            """Background task to run progressive enrichment - NEVER fails"""
+            """Background task publishing each layer as it completes - NEVER fails"""
+            final_sent = False
             try:
-                session = await orchestrator.enrich_progressive(
+                async for layer_result in orchestrator.enrich_progressive_stream(
                     website_url=request.website_url,
                     user_email=request.user_email,
-                    existing_data=request.existing_data
-                )
-
-                # Update session with enrichment results (keep same session_id)
-                session.session_id = session_id  # Use our session_id
-                active_sessions[session_id] = session
+                    existing_data=request.existing_data,
+                    session=session
+                ):
+                    event = LAYER_EVENTS[layer_result.layer_number]
+                    progress_bus.publish(channel, build_layer_event(event, session, layer_result))
+                    final_sent = event == "layer3_complete"
+                    await progressive_session_store.save(session)
 
                 logger.info(f"Progressive enrichment complete: {session_id}")
 
             except Exception as e:
-                # Log error but NEVER set status to "error"
-                # The orchestrator should have returned partial data
+                # Log error but NEVER report "error" - send whatever was collected
                 logger.error(
                     f"Progressive enrichment had issues (but returned partial data): {str(e)}",
                     exc_info=True
                 )
 
-                # Ensure session exists and has "complete" status
-                if session_id in active_sessions:
-                    active_sessions[session_id].status = "complete"  # ALWAYS complete
-                    logger.info(f"Progressive enrichment completed with partial data: {session_id}")
+            if not final_sent:
+                session.status = "complete"  # ALWAYS complete
+                progress_bus.publish(channel, build_layer_event("layer3_complete", session, session.layer3_result))
+                await progressive_session_store.save(session)
+                logger.info(f"Progressive enrichment completed with partial data: {session_id}")
 
         # Schedule background enrichment
         background_tasks.add_task(run_enrichment)
@@ -255,18 +283,24 @@ async def start_progressive_enrichment(
 
 
 @router.get("/stream/{session_id}")
-async def stream_progressive_enrichment(session_id: str):
+async def stream_progressive_enrichment(
+    session_id: str,
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID")
+):
     """
     Server-Sent Events (SSE) stream for progressive enrichment updates
 
     Client connects to this endpoint to receive real-time updates
-    as each enrichment layer completes.
+    as each enrichment layer completes. Events are pushed the moment
+    a layer finishes and can be served by any worker; reconnecting with
+    `Last-Event-ID` resumes after that event.
 
     Event types:
     - layer1_complete: Layer 1 data available
     - layer2_complete: Layer 2 data available
     - layer3_complete: Layer 3 data available (final)
-    - error: Enrichment failed
+    - timeout: Enrichment did not finish in time
+    - error: Session not found
 
     Usage from frontend:
     ```typescript
@@ -281,76 +315,23 @@ async def stream_progressive_enrichment(session_id: str):
 
     async def event_stream():
         """Generate SSE events"""
-        max_wait = 30  # Maximum 30 seconds wait
-        elapsed = 0
-        check_interval = 0.5  # Check every 500ms
-
-        # Wait for session to be created
-        while session_id not in active_sessions and elapsed < max_wait:
-            await asyncio.sleep(check_interval)
-            elapsed += check_interval
-
-        if session_id not in active_sessions:
+        if await progressive_session_store.get(session_id) is None:
             # Session not found, send error
             yield f"event: error\ndata: {{\"error\": \"Session not found\"}}\n\n"
             return
 
-        session = active_sessions[session_id]
-        last_status = None
-
-        # Stream progressive updates
-        while True:
-            current_status = session.status
-
-            # Send update if status changed
-            if current_status != last_status:
-                if current_status == "layer1_complete":
-                    # Send Layer 1 data (TRANSLATE FIELDS FOR FRONTEND)
-                    layer1_data = {
-                        "status": "layer1_complete",
-                        "fields": translate_fields_for_frontend(session.fields_auto_filled),
-                        "confidence_scores": session.confidence_scores,
-                        "layer_result": session.layer1_result.dict() if session.layer1_result else {}
-                    }
-                    yield f"event: layer1_complete\ndata: {json.dumps(layer1_data)}\n\n"
-
-                elif current_status == "layer2_complete":
-                    # Send Layer 2 data (TRANSLATE FIELDS FOR FRONTEND)
-                    layer2_data = {
-                        "status": "layer2_complete",
-                        "fields": translate_fields_for_frontend(session.fields_auto_filled),
-                        "confidence_scores": session.confidence_scores,
-                        "layer_result": session.layer2_result.dict() if session.layer2_result else {}
-                    }
-                    yield f"event: layer2_complete\ndata: {json.dumps(layer2_data)}\n\n"
-
-                elif current_status == "complete":
-                    # Send Layer 3 data (final) - (TRANSLATE FIELDS FOR FRONTEND)
-                    layer3_data = {
-                        "status": "complete",
-                        "fields": translate_fields_for_frontend(session.fields_auto_filled),
-                        "confidence_scores": session.confidence_scores,
-                        "layer_result": session.layer3_result.dict() if session.layer3_result else {},
-                        "total_cost_usd": session.total_cost_usd,
-                        "total_duration_ms": session.total_duration_ms
-                    }
-                    yield f"event: layer3_complete\ndata: {json.dumps(layer3_data)}\n\n"
-
-                    # Clean up session after sending final data
-                    del active_sessions[session_id]
-                    break
-
-                last_status = current_status
-
-            # Check every 500ms
-            await asyncio.sleep(0.5)
-
-            # Timeout after 30 seconds
-            if elapsed > max_wait:
-                yield f"event: timeout\ndata: {{\"error\": \"Enrichment timeout\"}}\n\n"
-                break
-
-            elapsed += check_interval
+        async for event in progress_bus.subscribe(
+            progressive_channel(session_id),
+            last_event_id=last_event_id,
+            timeout=PROGRESSIVE_STREAM_TIMEOUT
+        ):
+            name = event.data["event"]
+            yield f"event: {name}\nid: {event.id}\ndata: {json.dumps(event.data['data'])}\n\n"
+
+            if name == "layer3_complete":
+                return
+
+        yield f"event: timeout\ndata: {{\"error\": \"Enrichment timeout\"}}\n\n"
 
     return StreamingResponse(
         event_stream(),
@@ -421,11 +402,10 @@ async def get_session_status(session_id: str):
     Returns:
         Current session state with all available data (fields translated for frontend)
     """
-    if session_id not in active_sessions:
+    session = await progressive_session_store.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    session = active_sessions[session_id]
-
     return {
         "session_id": session.session_id,
         "status": session.status,
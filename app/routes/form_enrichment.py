@@ -20,6 +20,7 @@ from pydantic import BaseModel, Field, field_validator, model_validator
 
 from app.services.enrichment.progressive_orchestrator import (
     ProgressiveEnrichmentOrchestrator,
+    ProgressiveEnrichmentSession,
 )
 from app.services.enrichment.validators import validate_url
 
@@ -313,83 +314,37 @@ async def enrich_form(request: FormEnrichmentRequest):
             # Create orchestrator
             orchestrator = ProgressiveEnrichmentOrchestrator()
 
-            # Start enrichment
-            session = await orchestrator.enrich_progressive(
+            session = ProgressiveEnrichmentSession(
+                session_id=session_id,
                 website_url=request.website,
-                user_email=request.email,
-                existing_data={"email": request.email}
+                user_email=request.email
             )
 
-            # Override session_id with our own
-            session.session_id = session_id
-
-            # ================================================================
-            # LAYER 1 COMPLETE
-            # ================================================================
-            if session.layer1_result:
-                layer1_fields = translate_to_form_fields(session.layer1_result.data)
-
-                event_data = {
-                    "status": "layer1_complete",
-                    "fields": layer1_fields,
-                    "duration_ms": session.layer1_result.duration_ms,
-                    "sources": session.layer1_result.sources_called,
-                }
-
-                yield f"event: layer1_complete\n"
-                yield f"data: {json.dumps(event_data)}\n\n"
-
-                logger.info(f"[FORM ENRICHMENT] Layer 1 complete: {len(layer1_fields)} fields")
-
-            # ================================================================
-            # LAYER 2 COMPLETE
-            # ================================================================
-            if session.layer2_result:
-                # Combine Layer 1 + Layer 2 data
-                combined_data = {}
-                if session.layer1_result:
-                    combined_data.update(session.layer1_result.data)
-                combined_data.update(session.layer2_result.data)
-
-                layer2_fields = translate_to_form_fields(combined_data)
-
-                event_data = {
-                    "status": "layer2_complete",
-                    "fields": layer2_fields,
-                    "duration_ms": session.layer2_result.duration_ms,
-                    "sources": session.layer2_result.sources_called,
-                }
-
-                yield f"event: layer2_complete\n"
-                yield f"data: {json.dumps(event_data)}\n\n"
-
-                logger.info(f"[FORM ENRICHMENT] Layer 2 complete: {len(layer2_fields)} fields")
-
-            # ================================================================
-            # LAYER 3 COMPLETE (FINAL)
-            # ================================================================
-            if session.layer3_result:
-                # Combine all layers
-                combined_data = {}
-                if session.layer1_result:
-                    combined_data.update(session.layer1_result.data)
-                if session.layer2_result:
-                    combined_data.update(session.layer2_result.data)
-                combined_data.update(session.layer3_result.data)
-
-                layer3_fields = translate_to_form_fields(combined_data)
+            # Stream each layer as soon as it completes (fields are cumulative)
+            combined_data = {}
+            async for layer_result in orchestrator.enrich_progressive_stream(
+                website_url=request.website,
+                user_email=request.email,
+                existing_data={"email": request.email},
+                session=session
+            ):
+                combined_data.update(layer_result.data)
+                layer_fields = translate_to_form_fields(combined_data)
+                event_name = f"layer{layer_result.layer_number}_complete"
 
                 event_data = {
-                    "status": "layer3_complete",
-                    "fields": layer3_fields,
-                    "duration_ms": session.layer3_result.duration_ms,
-                    "sources": session.layer3_result.sources_called,
+                    "status": event_name,
+                    "fields": layer_fields,
+                    "duration_ms": layer_result.duration_ms,
+                    "sources": layer_result.sources_called,
                 }
 
-                yield f"event: layer3_complete\n"
+                yield f"event: {event_name}\n"
                 yield f"data: {json.dumps(event_data)}\n\n"
 
-                logger.info(f"[FORM ENRICHMENT] Layer 3 complete: {len(layer3_fields)} fields")
+                logger.info(
+                    f"[FORM ENRICHMENT] Layer {layer_result.layer_number} complete: {len(layer_fields)} fields"
+                )
 
             # ================================================================
             # COMPLETE (Save session for Phase 2)
@@ -2,95 +2,91 @@
 Intelligence Routes for Dashboard AI Intelligence
 
 Provides AI-powered dashboard insights and analytics for admin users.
+Insights are generated off the request path (scheduled snapshot in the worker,
+see app/services/intelligence/snapshots.py); reading them is a cache lookup.
 """
 
-from fastapi import APIRouter, Depends
-from datetime import datetime, timedelta, timezone
-import json
+from fastapi import APIRouter, Query
 from typing import Dict, Any
 
-from app.core.database import (
-    get_all_submissions,
-)
-from app.services.intelligence.dashboard import generate_dashboard_intelligence
+from app.services.intelligence.snapshots import refresh_dashboard_intelligence, snapshot_age_seconds
 from app.routes.auth import RequireAuth
-from app.core.cache import (
-    get_cached_dashboard_stats,
-    cache_dashboard_stats,
-)
+from app.core.cache import get_cached_dashboard_intelligence
+from app.core.constants import DASHBOARD_INTELLIGENCE_REFRESH_SECONDS
 
 # Initialize router with prefix
 router = APIRouter(prefix="/api/admin")
 
+# Longest period an admin can request (the trend analysis reads twice as many days)
+MAX_INTELLIGENCE_DAYS = 90
 
-@router.get("/dashboard/intelligence")
-async def get_dashboard_intelligence(
-    days: int = 7,
-    current_user: dict = RequireAuth,
-):
-    """
-    Get FREE AI-powered dashboard intelligence (Protected Admin endpoint)
-
-    DISABLED: All free models hitting 429 rate limits
-    Returns empty response immediately to avoid blocking dashboard
-    """
-    print(f"[DASHBOARD AI] DISABLED - Returning empty intelligence to avoid 429 rate limits")
 
-    # Return empty intelligence structure immediately
+def _pending_intelligence(days: int) -> Dict[str, Any]:
+    """Placeholder until the first snapshot of a period exists"""
     return {
-        "executive_summary": "Dashboard Intelligence temporariamente desabilitado devido a limites de taxa dos modelos gratuitos.",
+        "executive_summary": "Dashboard Intelligence ainda não foi gerado para este período. Use 'Atualizar' para gerar agora.",
         "quality_trends": None,
         "common_challenges": [],
         "high_risk_submissions": [],
-        "system_recommendations": [],
+        "system_improvement_recommendations": [],
         "metadata": {
             "days_analyzed": days,
             "cost": 0.0,
-            "disabled": True
+            "pending": True
         }
     }
 
-    # OLD CODE (DISABLED):
-    """
-    try:
-        print(f"[DASHBOARD AI] User {current_user['email']} requesting intelligence (last {days} days)")
 
-        # Get all submissions
-        all_submissions = await get_all_submissions()
+@router.get("/dashboard/intelligence")
+async def get_dashboard_intelligence(
+    days: int = Query(7, ge=1, le=MAX_INTELLIGENCE_DAYS),
+    current_user: dict = RequireAuth,
+):
+    """
+    Get FREE AI-powered dashboard intelligence (Protected Admin endpoint)
 
-        # Filter by date range (timezone-aware)
-        current_cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-        previous_cutoff = datetime.now(timezone.utc) - timedelta(days=days * 2)
+    Returns the latest snapshot for the period (refreshed hourly for the default
+    period); never calls a model. Use POST /dashboard/intelligence/refresh to
+    regenerate now.
+    """
+    snapshot = await get_cached_dashboard_intelligence(days)
+    age = snapshot_age_seconds(snapshot)
 
-        current_submissions = [
-            s for s in all_submissions
-            if s.get("created_at") and datetime.fromisoformat(s["created_at"].replace("Z", "+00:00")) >= current_cutoff
-        ]
+    return {
+        "success": True,
+        "data": snapshot or _pending_intelligence(days),
+        "snapshot": {
+            "available": snapshot is not None,
+            "generated_at": snapshot.get("snapshot_generated_at") if snapshot else None,
+            "age_seconds": round(age) if age is not None else None,
+            "stale": age is None or age > 2 * DASHBOARD_INTELLIGENCE_REFRESH_SECONDS
+        }
+    }
 
-        previous_submissions = [
-            s for s in all_submissions
-            if s.get("created_at") and previous_cutoff <= datetime.fromisoformat(s["created_at"].replace("Z", "+00:00")) < current_cutoff
-        ]
 
-        print(f"[DASHBOARD AI] Analyzing {len(current_submissions)} current + {len(previous_submissions)} previous submissions")
+@router.post("/dashboard/intelligence/refresh")
+async def refresh_dashboard_intelligence_snapshot(
+    days: int = Query(7, ge=1, le=MAX_INTELLIGENCE_DAYS),
+    current_user: dict = RequireAuth,
+):
+    """
+    Regenerate dashboard intelligence for the period now (Protected Admin endpoint)
 
-        # Generate FREE AI intelligence
-        intelligence = await generate_dashboard_intelligence(
-            current_submissions=current_submissions,
-            previous_submissions=previous_submissions if len(previous_submissions) > 0 else None
-        )
+    Concurrent refreshes share one generation; a failed generation keeps the
+    previous snapshot.
+    """
+    try:
+        print(f"[DASHBOARD AI] User {current_user['email']} refreshing intelligence (last {days} days)")
 
-        print(f"[DASHBOARD AI] ✅ Intelligence generated (cost: $0.00)")
+        intelligence = await refresh_dashboard_intelligence(days)
+        if "error" in intelligence:
+            return {"success": False, "error": intelligence["error"]}
 
-        return {
-            "success": True,
-            "data": intelligence
-        }
+        return {"success": True, "data": intelligence}
 
     except Exception as e:
-        print(f"[ERROR] Dashboard intelligence error: {e}")
+        print(f"[ERROR] Dashboard intelligence refresh error: {e}")
         return {
             "success": False,
             "error": str(e)
         }
-    """
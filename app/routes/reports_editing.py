@@ -10,7 +10,6 @@ from fastapi import APIRouter, BackgroundTasks, HTTPException
 from datetime import datetime, timezone
 import json
 import logging
-import os
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +29,7 @@ from app.core.database import get_submission
 from app.routes.auth import RequireAuth
 
 # Import services
-from app.services.pdf_generator import generate_pdf_from_report
+from app.services.pdf_store import pdf_artifact_store, pdf_render_inputs
 from app.services.ai.editor import (
     generate_edit_suggestion,
     apply_edit_to_json_path,
@@ -165,6 +164,9 @@ async def apply_report_edit(
 
         logger.info(f"[AI EDITOR] ✅ Edit applied successfully (total edits: {edit_count})")
 
+        # Render the edited PDF now so the admin's next download is instant
+        pdf_artifact_store.schedule_prerender(submission_id)
+
         return ApplyEditResponse(
             success=True,
             updated_report=updated_report,
@@ -189,42 +191,6 @@ async def apply_report_edit(
 # PDF REGENERATION WITH EDITS
 # ============================================================================
 
-def _generate_pdf_background(submission_id: int, submission_data: dict, report_json: dict):
-    """
-    Background task to generate PDF without blocking HTTP response
-    """
-    try:
-        import os
-        logger.info(f"[PDF BACKGROUND] Starting PDF generation for submission {submission_id}")
-
-        # Generate PDF
-        pdf_bytes = generate_pdf_from_report(
-            submission_data=submission_data,
-            report_json=report_json
-        )
-
-        # Save PDF to file system
-        pdf_filename = f"report_{submission_id}_edited.pdf"
-        pdf_path = f"./reports/{pdf_filename}"
-
-        # Create reports directory if it doesn't exist
-        os.makedirs("./reports", exist_ok=True)
-
-        # Write PDF to file
-        with open(pdf_path, "wb") as f:
-            f.write(pdf_bytes)
-
-        logger.info(f"[PDF BACKGROUND] ✅ PDF generated successfully: {pdf_filename}")
-
-    except FileNotFoundError as e:
-        logger.error(f"[PDF BACKGROUND] ❌ Required file not found: {e}", exc_info=True)
-    except OSError as e:
-        logger.error(f"[PDF BACKGROUND] ❌ File system error: {e}", exc_info=True)
-    except Exception as e:
-        # Catch-all for PDF generation errors
-        logger.exception(f"[PDF BACKGROUND] ❌ PDF generation failed: {e}")
-
-
 @router.post("/submissions/{submission_id}/regenerate-pdf", response_model=RegeneratePDFResponse)
 async def regenerate_pdf_with_edits(
     submission_id: int,
@@ -235,7 +201,8 @@ async def regenerate_pdf_with_edits(
     Regenerate PDF with applied edits (Protected Admin endpoint) - ASYNC
 
     Uses edited_json if available, otherwise falls back to original report_json.
-    Generates PDF in background, returns immediately.
+    Renders into the PDF artifact store in background, returns immediately
+    (no-op if the current version is already stored).
 
     Requires valid JWT token in Authorization header
 
@@ -250,29 +217,11 @@ async def regenerate_pdf_with_edits(
             raise HTTPException(status_code=404, detail="Submission not found")
 
         # Get report JSON (use edited_json if available)
-        report_json_str = submission.get("edited_json") or submission.get("report_json")
-        if not report_json_str:
+        if pdf_render_inputs(submission) is None:
             raise HTTPException(status_code=400, detail="Report not yet generated")
 
-        report_json = json.loads(report_json_str)
-
-        # Build submission data for PDF generator
-        submission_data = {
-            "company": submission.get("company", ""),
-            "industry": submission.get("industry", ""),
-            "website": submission.get("website", ""),
-            "challenge": submission.get("challenge", ""),
-            "name": submission.get("name", ""),
-            "updated_at": submission.get("last_edited_at") or submission.get("updated_at", "")
-        }
-
         # Add PDF generation to background queue (non-blocking!)
-        background_tasks.add_task(
-            _generate_pdf_background,
-            submission_id,
-            submission_data,
-            report_json
-        )
+        background_tasks.add_task(pdf_artifact_store.prerender, submission_id)
 
         logger.info(f"[AI EDITOR] ✅ PDF generation queued (background task)")
 
@@ -6,9 +6,10 @@ This module contains routes for:
 - Exporting reports as Markdown
 - Downloading markdown editing instructions
 """
-from fastapi import APIRouter, HTTPException, Response
+from fastapi import APIRouter, Header, HTTPException, Response
 from fastapi.responses import FileResponse
 from datetime import datetime
+from typing import Optional
 import json
 import logging
 from pathlib import Path
@@ -22,7 +23,7 @@ from app.core.database import get_submission
 from app.routes.auth import RequireAuth
 
 # Import services
-from app.services.pdf_generator import generate_pdf_from_report
+from app.services.pdf_store import pdf_artifact_store, pdf_render_inputs, etag_matches
 from app.services.markdown_generator import generate_markdown_from_report
 
 # Initialize router
@@ -91,8 +92,10 @@ router = APIRouter()
 
     **Caching:**
     - Cache-Control: 5 minutes (private)
-    - Regenerate only if report edited
-    - Instant download from cache
+    - ETag is a hash of the report content + renderer version
+    - `If-None-Match` with the current ETag returns 304 without loading the PDF
+    - PDFs are pre-rendered when the analysis completes or an edit is applied
+    - Instant download from cache (memory, then storage); rendered off the event loop on a miss
 
     **Authentication:**
     - Requires valid JWT token in Authorization header
@@ -127,6 +130,9 @@ router = APIRouter()
                 }
             }
         },
+        304: {
+            "description": "PDF unchanged since the ETag sent in If-None-Match"
+        },
         404: {
             "description": "Submission not found or report not generated",
             "content": {
@@ -148,12 +154,10 @@ router = APIRouter()
 async def export_submission_pdf(
     submission_id: int,
     current_user: dict = RequireAuth,
+    if_none_match: Optional[str] = Header(default=None),
 ):
     """Export report as professional PDF - uses edited version if available"""
     try:
-        from fastapi.responses import Response
-        from app.services.pdf_generator import generate_pdf_from_report
-
         logger.info(f"[AUTH] User {current_user['email']} exporting PDF for submission {submission_id}")
 
         # Get submission
@@ -161,50 +165,37 @@ async def export_submission_pdf(
         if not submission:
             return {"success": False, "error": f"Submission {submission_id} not found"}
 
-        # Use edited_json if available (has edits), otherwise fallback to report_json
-        report_json_str = submission.get('edited_json') or submission.get('report_json')
-        if not report_json_str:
-            return {"success": False, "error": "Report not yet generated"}
-
-        # Parse report JSON
+        # Parse report JSON (edited_json if available, otherwise report_json)
         try:
-            report_json = json.loads(report_json_str)
+            inputs = pdf_render_inputs(submission)
         except json.JSONDecodeError:
             return {"success": False, "error": "Invalid report JSON"}
+        if inputs is None:
+            return {"success": False, "error": "Report not yet generated"}
+        submission_data, report_json = inputs
 
-        # Build submission data for PDF generator (consistent format)
-        submission_data = {
-            "company": submission.get("company", ""),
-            "industry": submission.get("industry", ""),
-            "website": submission.get("website", ""),
-            "challenge": submission.get("challenge", ""),
-            "name": submission.get("name", ""),
-            "updated_at": submission.get("last_edited_at") or submission.get("updated_at", "")
+        # Content-addressed ETag - unchanged report means unchanged PDF
+        etag = pdf_artifact_store.etag(submission_data, report_json)
+        cache_headers = {
+            "Cache-Control": "private, max-age=300",  # 5 minute cache, revalidate with ETag
+            "ETag": etag
         }
+        if etag_matches(if_none_match, etag):
+            logger.info(f"[PDF] Not modified for submission {submission_id}")
+            return Response(status_code=304, headers=cache_headers)
 
-        # Generate PDF
-        logger.info(f"[PDF] Generating PDF for submission {submission_id}...")
-        pdf_bytes = generate_pdf_from_report(submission_data, report_json)
-
-        if not pdf_bytes or len(pdf_bytes) == 0:
-            logger.error(f"[ERROR] PDF generation returned empty bytes!")
-            return {"success": False, "error": "PDF generation failed - empty output"}
-
-        logger.info(f"[PDF] PDF generated successfully ({len(pdf_bytes)} bytes)")
+        pdf_bytes = await pdf_artifact_store.get(submission_id, submission_data, report_json)
 
-        # Return PDF file
-        has_edits = submission.get('edited_json') is not None
         filename = f"relatorio-estrategico-{submission['company'].replace(' ', '-')}-{datetime.now().strftime('%Y-%m-%d')}.pdf"
 
-        # Add cache headers (5 min cache - PDFs don't change unless edited)
+        # Return PDF file
         return Response(
             content=pdf_bytes,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f'attachment; filename="{filename}"',
                 "Content-Length": str(len(pdf_bytes)),
-                "Cache-Control": "private, max-age=300",  # 5 minute cache
-                "ETag": f'"{submission_id}-v{submission.get("last_edited_at", submission.get("updated_at"))}"'
+                **cache_headers
             }
         )
 
@@ -22,6 +22,7 @@ from app.routes.auth import RequireAuth
 # Import services
 from app.services.pdf_generator import generate_pdf_from_report
 from app.services.markdown_parser import parse_markdown_to_report, MarkdownParseError
+from app.core.offload import offload
 
 # Initialize router
 router = APIRouter()
@@ -67,7 +68,7 @@ async def import_markdown_and_generate_pdf(
 
         # Parse markdown to JSON
         try:
-            report_json, warnings = parse_markdown_to_report(markdown_text)
+            report_json, warnings = await offload(parse_markdown_to_report, markdown_text)
             logger.info(f"[MARKDOWN] Parsed successfully with {len(warnings)} warnings")
 
             if warnings:
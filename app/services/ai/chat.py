@@ -17,11 +17,25 @@ System Prompt Context:
 
 import httpx
 import os
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, AsyncIterator
 from datetime import datetime, timezone
 import json
 from dotenv import load_dotenv
 
+from app.core.cache import generate_content_hash
+from app.core.constants import (
+    CHAT_CONTEXT_CACHE_TTL_SECONDS,
+    CHAT_HISTORY_TOKEN_BUDGET,
+    CHAT_MAX_TOKENS,
+    CHAT_MESSAGE_OVERHEAD_TOKENS,
+    CHAT_REPORT_CONTEXT_TOKENS,
+    CHAT_SUMMARY_MAX_TOKENS
+)
+from app.core.http_client import get_http_client
+from app.core.tiered_cache import TieredCache
+from app.services.analysis.prompt_context import estimate_tokens, serialize_prompt_context
+
 load_dotenv()
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
@@ -35,6 +49,22 @@ CHAT_MODELS = {
 
 TIMEOUT = 60.0
 
+# System prompts per report version (the report is only re-serialized when it changes)
+_system_prompt_cache = TieredCache("chat_context", ttl_seconds=CHAT_CONTEXT_CACHE_TTL_SECONDS, redis=True)
+
+
+@dataclass
+class ChatSummary:
+    """Rolling summary of a submission's chat messages up to through_id (chat_summaries row)"""
+    text: str = ""
+    through_id: int = 0  # Last chat_messages.id folded into the summary
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "ChatSummary":
+        if not data:
+            return cls()
+        return cls(text=data.get("summary", ""), through_id=int(data.get("through_message_id", 0)))
+
 
 def create_chat_system_prompt(
     submission_data: Dict[str, Any],
@@ -90,6 +120,12 @@ Sources Succeeded: {sources_succeeded}
 Sources Failed: {sources_failed}
 Data Completeness: {data_quality.get('data_completeness', 'Unknown')}
 
+"""
+
+    # Add the report itself (compact JSON, bounded)
+    context += f"""## Report Content (JSON)
+{serialize_prompt_context(report_data, CHAT_REPORT_CONTEXT_TOKENS)}
+
 """
 
     # Add key insights from report
@@ -114,13 +150,152 @@ User is an admin reviewing the report before sending to client. Help them verify
     return context
 
 
+def report_version(
+    submission_data: Dict[str, Any],
+    report_data: Dict[str, Any],
+    data_quality: Optional[Dict[str, Any]] = None
+) -> str:
+    """Key of the system prompt: changes whenever the report, quality data or submission context does"""
+    return generate_content_hash({
+        "id": submission_data.get("id"),
+        "company": submission_data.get("company"),
+        "industry": submission_data.get("industry"),
+        "challenge": submission_data.get("challenge"),
+        "website": submission_data.get("website"),
+        # Stored JSON strings hash faster than re-serializing the parsed report
+        "report": submission_data.get("report_json") or report_data,
+        "data_quality": submission_data.get("data_quality_json") or data_quality
+    })
+
+
+async def get_chat_system_prompt(
+    submission_data: Dict[str, Any],
+    report_data: Dict[str, Any],
+    data_quality: Optional[Dict[str, Any]] = None
+) -> str:
+    """System prompt for a report version, built once and cached"""
+    async def build() -> str:
+        return create_chat_system_prompt(submission_data, report_data, data_quality)
+
+    return await _system_prompt_cache.get_or_load(report_version(submission_data, report_data, data_quality), build)
+
+
+def _message_tokens(message: Dict[str, str]) -> int:
+    return estimate_tokens(message["content"]) + CHAT_MESSAGE_OVERHEAD_TOKENS
+
+
+def window_history(
+    chat_history: List[Dict[str, Any]],
+    budget: int = CHAT_HISTORY_TOKEN_BUDGET
+) -> List[Dict[str, Any]]:
+    """
+    Newest messages (all newer than the summary) that fit in the token budget
+
+    The window always starts with a user message. Turns that fall out of it before
+    they are summarized (e.g. a failed summary update) are left out of the prompt.
+    """
+    window: List[Dict[str, Any]] = []
+    used = 0
+    for message in reversed(chat_history):
+        used += _message_tokens(message)
+        if used > budget:
+            break
+        window.append(message)
+    window.reverse()
+
+    while window and window[0]["role"] != "user":
+        window.pop(0)
+    return window
+
+
+def turns_to_fold(
+    chat_history: List[Dict[str, Any]],
+    budget: int = CHAT_HISTORY_TOKEN_BUDGET
+) -> int:
+    """
+    Number of oldest messages to fold into the summary (0 while they fit the budget)
+
+    Folds down to half the budget so the summary is updated once every few turns,
+    not on every message.
+    """
+    pending = chat_history
+    if sum(_message_tokens(message) for message in pending) <= budget:
+        return 0
+
+    kept = 0
+    used = 0
+    for message in reversed(pending):
+        used += _message_tokens(message)
+        if used > budget // 2:
+            break
+        kept += 1
+    # Keep whole exchanges: the verbatim part starts with a user message
+    while kept and pending[len(pending) - kept]["role"] != "user":
+        kept -= 1
+    return len(pending) - kept
+
+
+def build_chat_messages(
+    system_prompt: str,
+    summary: ChatSummary,
+    window: List[Dict[str, str]],
+    user_message: str
+) -> List[Dict[str, Any]]:
+    """System prompt (cacheable prefix) + rolling summary + recent turns + new message"""
+    system_content = [
+        # Stable per report version, so the provider can reuse its prompt cache
+        {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+    ]
+    if summary.text:
+        system_content.append({"type": "text", "text": f"## Earlier Conversation (summary)\n{summary.text}"})
+
+    messages: List[Dict[str, Any]] = [{"role": "system", "content": system_content}]
+    messages.extend({"role": m["role"], "content": m["content"]} for m in window)
+    messages.append({"role": "user", "content": user_message})
+    return messages
+
+
+def _headers() -> Dict[str, str]:
+    return {
+        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "Content-Type": "application/json",
+        "HTTP-Referer": "https://strategy-ai.com",
+        "X-Title": "Strategy AI - Chat System",
+    }
+
+
+async def _prepare_messages(
+    submission_data: Dict[str, Any],
+    report_data: Dict[str, Any],
+    data_quality: Optional[Dict[str, Any]],
+    chat_history: List[Dict[str, str]],
+    user_message: str,
+    summary: Optional[ChatSummary]
+) -> List[Dict[str, Any]]:
+    system_prompt = await get_chat_system_prompt(submission_data, report_data, data_quality)
+    window = window_history(chat_history)
+    return build_chat_messages(system_prompt, summary or ChatSummary(), window, user_message)
+
+
+def _error_result(model: str, message: str, error: Exception) -> Dict[str, Any]:
+    return {
+        "message": message,
+        "model_used": model,
+        "tokens_used": 0,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "success": False,
+        "error": str(error)
+    }
+
+
 async def send_chat_message(
     submission_data: Dict[str, Any],
     report_data: Dict[str, Any],
     data_quality: Optional[Dict[str, Any]],
     chat_history: List[Dict[str, str]],
     user_message: str,
-    model: str = "haiku"
+    model: str = "haiku",
+    summary: Optional[ChatSummary] = None
 ) -> Dict[str, Any]:
     """
     Send a chat message and get AI response
@@ -129,9 +304,10 @@ async def send_chat_message(
         submission_data: Company submission data
         report_data: Generated report JSON
         data_quality: Data quality metrics
-        chat_history: Previous messages [{"role": "user"|"assistant", "content": "..."}]
+        chat_history: Messages newer than the summary [{"role": "user"|"assistant", "content": "..."}]
         user_message: New message from user
         model: "haiku" (fast/cheap) or "sonnet" (high quality)
+        summary: Rolling summary of the messages before chat_history
 
     Returns:
         {
@@ -146,73 +322,172 @@ async def send_chat_message(
         # Get OpenRouter model ID
         openrouter_model = CHAT_MODELS.get(model, CHAT_MODELS["haiku"])
 
-        # Create system prompt with full context
-        system_prompt = create_chat_system_prompt(submission_data, report_data, data_quality)
-
-        # Build messages array (system + history + new message)
-        messages = [{"role": "system", "content": system_prompt}]
-        messages.extend(chat_history)
-        messages.append({"role": "user", "content": user_message})
-
-        # Prepare request
-        headers = {
-            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://strategy-ai.com",
-            "X-Title": "Strategy AI - Chat System",
-        }
+        messages = await _prepare_messages(
+            submission_data, report_data, data_quality, chat_history, user_message, summary
+        )
 
         payload = {
             "model": openrouter_model,
             "messages": messages,
             "temperature": 0.7,
-            "max_tokens": 2000,
+            "max_tokens": CHAT_MAX_TOKENS,
         }
 
         # Call OpenRouter API
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            response = await client.post(OPENROUTER_URL, headers=headers, json=payload)
-            response.raise_for_status()
+        client = get_http_client("openrouter")
+        response = await client.post(OPENROUTER_URL, headers=_headers(), json=payload, timeout=TIMEOUT)
+        response.raise_for_status()
 
-            data = response.json()
+        data = response.json()
 
-            if "choices" in data and len(data["choices"]) > 0:
-                assistant_message = data["choices"][0]["message"]["content"].strip()
+        if "choices" in data and len(data["choices"]) > 0:
+            assistant_message = data["choices"][0]["message"]["content"].strip()
 
-                # Calculate approximate tokens
-                tokens_used = data.get("usage", {}).get("total_tokens", 0)
+            # Calculate approximate tokens
+            tokens_used = data.get("usage", {}).get("total_tokens", 0)
 
-                return {
-                    "message": assistant_message,
-                    "model_used": openrouter_model,
-                    "tokens_used": tokens_used,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "success": True
-                }
-            else:
-                raise Exception("No response from OpenRouter")
+            return {
+                "message": assistant_message,
+                "model_used": openrouter_model,
+                "tokens_used": tokens_used,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "success": True
+            }
+        else:
+            raise Exception("No response from OpenRouter")
 
     except httpx.HTTPStatusError as e:
         print(f"[AI CHAT ERROR] OpenRouter HTTP error: {e.response.status_code} - {e.response.text}")
-        return {
-            "message": f"Error calling AI: HTTP {e.response.status_code}",
-            "model_used": model,
-            "tokens_used": 0,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "success": False,
-            "error": str(e)
-        }
+        return _error_result(model, f"Error calling AI: HTTP {e.response.status_code}", e)
     except Exception as e:
         print(f"[AI CHAT ERROR] Unexpected error: {e}")
-        return {
-            "message": f"Unexpected error: {str(e)}",
-            "model_used": model,
-            "tokens_used": 0,
+        return _error_result(model, f"Unexpected error: {str(e)}", e)
+
+
+async def stream_chat_message(
+    submission_data: Dict[str, Any],
+    report_data: Dict[str, Any],
+    data_quality: Optional[Dict[str, Any]],
+    chat_history: List[Dict[str, str]],
+    user_message: str,
+    model: str = "haiku",
+    summary: Optional[ChatSummary] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of send_chat_message
+
+    Yields {"type": "delta", "content": str} as text arrives, then one final event
+    shaped like send_chat_message's result with "type": "done" (or "error").
+    """
+    openrouter_model = CHAT_MODELS.get(model, CHAT_MODELS["haiku"])
+    parts: List[str] = []
+    usage: Dict[str, Any] = {}
+
+    try:
+        messages = await _prepare_messages(
+            submission_data, report_data, data_quality, chat_history, user_message, summary
+        )
+        payload = {
+            "model": openrouter_model,
+            "messages": messages,
+            "temperature": 0.7,
+            "max_tokens": CHAT_MAX_TOKENS,
+            "stream": True,
+            "usage": {"include": True},  # Final chunk carries token usage
+        }
+
+        client = get_http_client("openrouter")
+        async with client.stream("POST", OPENROUTER_URL, headers=_headers(), json=payload, timeout=TIMEOUT) as response:
+            response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data_str = line[6:]
+                if data_str == "[DONE]":
+                    break
+
+                try:
+                    data = json.loads(data_str)
+                except json.JSONDecodeError:
+                    continue
+
+                usage = data.get("usage") or usage
+                if data.get("choices"):
+                    content = data["choices"][0].get("delta", {}).get("content", "")
+                    if content:
+                        parts.append(content)
+                        yield {"type": "delta", "content": content}
+
+        message = "".join(parts).strip()
+        if not message:
+            raise Exception("No response from OpenRouter")
+
+        yield {
+            "type": "done",
+            "message": message,
+            "model_used": openrouter_model,
+            "tokens_used": usage.get("total_tokens", 0),
             "timestamp": datetime.now(timezone.utc).isoformat(),
-            "success": False,
-            "error": str(e)
+            "success": True
         }
 
+    except httpx.HTTPStatusError as e:
+        print(f"[AI CHAT ERROR] OpenRouter HTTP error (stream): {e.response.status_code}")
+        yield {"type": "error", **_error_result(model, f"Error calling AI: HTTP {e.response.status_code}", e)}
+    except Exception as e:
+        print(f"[AI CHAT ERROR] Unexpected streaming error: {e}")
+        yield {"type": "error", **_error_result(model, f"Unexpected error: {str(e)}", e)}
+
+
+async def update_chat_summary(
+    chat_history: List[Dict[str, Any]],
+    summary: ChatSummary,
+    budget: int = CHAT_HISTORY_TOKEN_BUDGET
+) -> ChatSummary:
+    """
+    Fold the oldest messages into the rolling summary once they exceed the budget
+
+    chat_history holds the stored messages (with ids) newer than the summary.
+    Returns the summary unchanged when nothing needs folding or the call fails
+    (those turns then simply drop out of the window).
+    """
+    count = turns_to_fold(chat_history, budget)
+    if count == 0:
+        return summary
+
+    folded = chat_history[:count]
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in folded)
+    prompt = f"""Update the running summary of a conversation between an admin and the analyst who wrote a strategy report.
+
+Current summary:
+{summary.text or '(empty)'}
+
+New turns to include:
+{transcript}
+
+Return only the updated summary: the questions asked, the answers and conclusions, corrections agreed on and open points.
+Keep it under 250 words, in the language of the conversation."""
+
+    payload = {
+        "model": CHAT_MODELS["haiku"],
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.2,
+        "max_tokens": CHAT_SUMMARY_MAX_TOKENS,
+    }
+
+    try:
+        client = get_http_client("openrouter")
+        response = await client.post(OPENROUTER_URL, headers=_headers(), json=payload, timeout=TIMEOUT)
+        response.raise_for_status()
+        text = response.json()["choices"][0]["message"]["content"].strip()
+    except Exception as e:
+        # Non-critical: the window still bounds the prompt
+        print(f"[AI CHAT WARNING] Failed to update chat summary: {e}")
+        return summary
+
+    return ChatSummary(text=text, through_id=folded[-1]["id"])
+
 
 def get_quick_prompts() -> List[Dict[str, str]]:
     """
@@ -7,12 +7,12 @@ import json
 import logging
 import re
 from typing import Dict, Any, Optional, AsyncIterator
-import httpx
 import os
 from dotenv import load_dotenv
 
 # Import prompt injection sanitization
-from app.core.security.prompt_sanitizer import sanitize_for_prompt, validate_instruction
+from app.core.security.prompt_sanitizer import sanitize_for_prompt_async, validate_instruction
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 load_dotenv()
@@ -124,8 +124,8 @@ async def generate_edit_suggestion(
         raise Exception(f"Invalid instruction: {str(e)}")
 
     # STEP 2: Sanitize user-provided text (could be manipulated)
-    selected_text = sanitize_for_prompt(selected_text, max_length=2000, strict_mode=True)
-    section_context = sanitize_for_prompt(section_context, max_length=1000, strict_mode=True)
+    selected_text = await sanitize_for_prompt_async(selected_text, max_length=2000, strict_mode=True)
+    section_context = await sanitize_for_prompt_async(section_context, max_length=1000, strict_mode=True)
 
     logger.info(f"[AI EDITOR] Inputs sanitized successfully")
 
@@ -458,37 +458,37 @@ async def call_llm(
         "max_tokens": max_tokens,
     }
 
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-        response = await client.post(OPENROUTER_URL, headers=headers, json=payload)
-        response.raise_for_status()
+    client = get_http_client("openrouter")
+    response = await client.post(OPENROUTER_URL, headers=headers, json=payload, timeout=TIMEOUT)
+    response.raise_for_status()
+
+    data = response.json()
+
+    if "choices" in data and len(data["choices"]) > 0:
+        content = data["choices"][0]["message"]["content"].strip()
+
+        # Clean markdown code blocks if present
+        if "```json" in content:
+            start = content.find("```json") + 7
+            end = content.find("```", start)
+            if end != -1:
+                content = content[start:end].strip()
+        elif "```" in content:
+            start = content.find("```") + 3
+            end = content.find("```", start)
+            if end != -1:
+                content = content[start:end].strip()
+
+        # Extract usage stats
+        usage = data.get("usage", {})
+        usage_stats = {
+            "input_tokens": usage.get("prompt_tokens", 0),
+            "output_tokens": usage.get("completion_tokens", 0)
+        }
 
-        data = response.json()
-
-        if "choices" in data and len(data["choices"]) > 0:
-            content = data["choices"][0]["message"]["content"].strip()
-
-            # Clean markdown code blocks if present
-            if "```json" in content:
-                start = content.find("```json") + 7
-                end = content.find("```", start)
-                if end != -1:
-                    content = content[start:end].strip()
-            elif "```" in content:
-                start = content.find("```") + 3
-                end = content.find("```", start)
-                if end != -1:
-                    content = content[start:end].strip()
-
-            # Extract usage stats
-            usage = data.get("usage", {})
-            usage_stats = {
-                "input_tokens": usage.get("prompt_tokens", 0),
-                "output_tokens": usage.get("completion_tokens", 0)
-            }
-
-            return content, usage_stats
-        else:
-            raise Exception(f"Unexpected API response: {data}")
+        return content, usage_stats
+    else:
+        raise Exception(f"Unexpected API response: {data}")
 
 
 # ============================================================================
@@ -531,26 +531,26 @@ async def call_llm_streaming(
         "stream": True
     }
 
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-        async with client.stream("POST", OPENROUTER_URL, headers=headers, json=payload) as response:
-            response.raise_for_status()
-
-            async for line in response.aiter_lines():
-                if line.startswith("data: "):
-                    data_str = line[6:]  # Remove "data: " prefix
-
-                    if data_str == "[DONE]":
-                        break
-
-                    try:
-                        data = json.loads(data_str)
-                        if "choices" in data and len(data["choices"]) > 0:
-                            delta = data["choices"][0].get("delta", {})
-                            content = delta.get("content", "")
-                            if content:
-                                yield content
-                    except json.JSONDecodeError:
-                        continue
+    client = get_http_client("openrouter")
+    async with client.stream("POST", OPENROUTER_URL, headers=headers, json=payload, timeout=TIMEOUT) as response:
+        response.raise_for_status()
+
+        async for line in response.aiter_lines():
+            if line.startswith("data: "):
+                data_str = line[6:]  # Remove "data: " prefix
+
+                if data_str == "[DONE]":
+                    break
+
+                try:
+                    data = json.loads(data_str)
+                    if "choices" in data and len(data["choices"]) > 0:
+                        delta = data["choices"][0].get("delta", {})
+                        content = delta.get("content", "")
+                        if content:
+                            yield content
+                except json.JSONDecodeError:
+                    continue
 
 
 # ============================================================================
@@ -16,6 +16,7 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.core.config import get_settings
 from app.core.exceptions import ExternalServiceError
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -89,28 +90,26 @@ class OpenRouterClient:
         # Graceful degradation if no API key
         if not self.api_key:
             logger.warning("OpenRouter API key not configured - creating disabled client")
-            self.client = None
+            self.enabled = False
             self.total_tokens_used = 0
             self.total_cost_usd = 0.0
             return
 
-        self.client = httpx.AsyncClient(
-            base_url=self.BASE_URL,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "HTTP-Referer": "https://imensiah.com",  # Optional
-                "X-Title": "IMENSIAH Form Intelligence"  # Optional
-            },
-            timeout=30.0
-        )
+        # Requests go through the shared "openrouter" connection pool
+        self.enabled = True
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "HTTP-Referer": "https://imensiah.com",  # Optional
+            "X-Title": "IMENSIAH Form Intelligence"  # Optional
+        }
+        self.timeout = 30.0
 
         self.total_tokens_used = 0
         self.total_cost_usd = 0.0
 
     async def close(self):
-        """Close HTTP client"""
-        if self.client:
-            await self.client.aclose()
+        """Release client (the pooled connection is owned by the HTTP client registry)"""
+        self.enabled = False
 
     @retry(
         stop=stop_after_attempt(3),
@@ -137,7 +136,7 @@ class OpenRouterClient:
             ExternalServiceError: If API call fails
         """
         # Graceful failure if client not initialized
-        if not self.client:
+        if not self.enabled:
             logger.error("OpenRouter client not initialized (missing API key)")
             raise ExternalServiceError(
                 "OpenRouter",
@@ -145,8 +144,11 @@ class OpenRouterClient:
             )
 
         try:
-            response = await self.client.post(
-                "/chat/completions",
+            client = get_http_client("openrouter")
+            response = await client.post(
+                f"{self.BASE_URL}/chat/completions",
+                headers=self.headers,
+                timeout=self.timeout,
                 json={
                     "model": self.MODEL,
                     "messages": messages,
@@ -8,9 +8,13 @@ from typing import Dict, Any, Callable
 
 from app.core.cache import (
     cache_stage_result,
+    generate_content_hash,
+    generate_stage_cache_key,
     get_cached_stage_result,
 )
+from app.core.constants import SINGLE_FLIGHT_STAGE_WAIT_SECONDS
 from app.core.exceptions import CacheError
+from app.core.single_flight import single_flight
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +33,7 @@ async def run_stage_with_cache(
 
     This wrapper provides transparent caching for expensive LLM operations.
     It checks the cache first, and only executes the stage function on cache miss.
+    Concurrent misses for the same stage input (in any process) run it once.
 
     Args:
         stage_name: Name of the stage (e.g., "extraction", "strategy")
@@ -67,28 +72,44 @@ async def run_stage_with_cache(
                 }
             return cached_result
 
-        # Cache miss - execute stage
-        logger.info(f"[CACHE MISS] Stage '{stage_name}' - executing fresh...")
-        result = await stage_function(**stage_kwargs)
-
-        # Cache the result (async, non-blocking)
-        try:
-            await cache_stage_result(
+        async def execute_and_cache():
+            # Cache miss - execute stage
+            logger.info(f"[CACHE MISS] Stage '{stage_name}' - executing fresh...")
+            result = await stage_function(**stage_kwargs)
+
+            # Cache the result (async, non-blocking)
+            try:
+                await cache_stage_result(
+                    stage_name=stage_name,
+                    company=company,
+                    industry=industry,
+                    input_data=input_data,
+                    stage_result=result,
+                    cost=estimated_cost
+                )
+            except Exception as cache_error:
+                # Don't fail the stage if caching fails
+                logger.warning(
+                    f"[CACHE] Failed to cache stage '{stage_name}': {cache_error}",
+                    exc_info=True
+                )
+
+            return result
+
+        async def read_cached_stage():
+            return await get_cached_stage_result(
                 stage_name=stage_name,
                 company=company,
                 industry=industry,
-                input_data=input_data,
-                stage_result=result,
-                cost=estimated_cost
-            )
-        except Exception as cache_error:
-            # Don't fail the stage if caching fails
-            logger.warning(
-                f"[CACHE] Failed to cache stage '{stage_name}': {cache_error}",
-                exc_info=True
+                input_data=input_data
             )
 
-        return result
+        return await single_flight.run(
+            generate_stage_cache_key(stage_name, company, industry, generate_content_hash(input_data)),
+            execute_and_cache,
+            read_cached_stage,
+            wait_timeout=SINGLE_FLIGHT_STAGE_WAIT_SECONDS
+        )
 
     except CacheError as e:
         # If caching infrastructure fails, execute without cache
@@ -13,6 +13,7 @@ from dotenv import load_dotenv
 
 # Import prompt injection sanitization
 from app.core.security.prompt_sanitizer import sanitize_for_prompt, wrap_with_boundaries
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -573,70 +574,71 @@ async def generate_enhanced_analysis(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            logger.info(f"[AI] Sending request to {model} (prompt length: {len(prompt)} chars)")
-
-            response = await client.post(
-                OPENROUTER_URL,
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
-
-            data = response.json()
-
-            if "choices" in data and len(data["choices"]) > 0:
-                content = data["choices"][0]["message"]["content"]
-
-                # Check for refusal
-                if content and ("I'm sorry" in content or "I cannot" in content or "I can't" in content) and len(content) < 200:
-                    logger.error(f"[AI] Model refused request: {content}")
-
-                    # Retry without Perplexity data if we had it
-                    if perplexity_data:
-                        logger.warning("[AI] Retrying without Perplexity data due to content filter...")
-                        return await generate_enhanced_analysis(
-                            company=company,
-                            industry=industry,
-                            website=website,
-                            challenge=challenge,
-                            apify_data=apify_data,
-                            perplexity_data=None,  # Remove Perplexity data
-                            use_multi_model=use_multi_model
-                        )
-                    else:
-                        raise Exception(f"AI model refused request: {content}")
-
-                # Clean markdown code blocks
-                content = content.strip()
-                if content.startswith("```json"):
-                    content = content[7:]
-                if content.startswith("```"):
-                    content = content[3:]
-                if content.endswith("```"):
-                    content = content[:-3]
-                content = content.strip()
-
-                # Parse JSON
-                try:
-                    analysis_json = json.loads(content)
-
-                    # Add metadata
-                    analysis_json["_metadata"] = {
-                        "generated_at": datetime.now().isoformat(),
-                        "model_used": model,
-                        "framework_version": "10XMentorAI v2.0",
-                        "quality_tier": "Premium Executive",
-                        "used_perplexity": perplexity_data is not None
-                    }
-
-                    return analysis_json
-
-                except json.JSONDecodeError as e:
-                    logger.error(f"[AI] JSON parse error. Content: {content[:1000]}")
-                    raise Exception(f"Failed to parse AI response as JSON: {e}. Content preview: {content[:500]}")
-            else:
-                raise Exception(f"Unexpected API response: {data}")
+        client = get_http_client("openrouter")
+        logger.info(f"[AI] Sending request to {model} (prompt length: {len(prompt)} chars)")
+
+        response = await client.post(
+            OPENROUTER_URL,
+            headers=headers,
+            json=payload,
+            timeout=TIMEOUT
+        )
+        response.raise_for_status()
+
+        data = response.json()
+
+        if "choices" in data and len(data["choices"]) > 0:
+            content = data["choices"][0]["message"]["content"]
+
+            # Check for refusal
+            if content and ("I'm sorry" in content or "I cannot" in content or "I can't" in content) and len(content) < 200:
+                logger.error(f"[AI] Model refused request: {content}")
+
+                # Retry without Perplexity data if we had it
+                if perplexity_data:
+                    logger.warning("[AI] Retrying without Perplexity data due to content filter...")
+                    return await generate_enhanced_analysis(
+                        company=company,
+                        industry=industry,
+                        website=website,
+                        challenge=challenge,
+                        apify_data=apify_data,
+                        perplexity_data=None,  # Remove Perplexity data
+                        use_multi_model=use_multi_model
+                    )
+                else:
+                    raise Exception(f"AI model refused request: {content}")
+
+            # Clean markdown code blocks
+            content = content.strip()
+            if content.startswith("```json"):
+                content = content[7:]
+            if content.startswith("```"):
+                content = content[3:]
+            if content.endswith("```"):
+                content = content[:-3]
+            content = content.strip()
+
+            # Parse JSON
+            try:
+                analysis_json = json.loads(content)
+
+                # Add metadata
+                analysis_json["_metadata"] = {
+                    "generated_at": datetime.now().isoformat(),
+                    "model_used": model,
+                    "framework_version": "10XMentorAI v2.0",
+                    "quality_tier": "Premium Executive",
+                    "used_perplexity": perplexity_data is not None
+                }
+
+                return analysis_json
+
+            except json.JSONDecodeError as e:
+                logger.error(f"[AI] JSON parse error. Content: {content[:1000]}")
+                raise Exception(f"Failed to parse AI response as JSON: {e}. Content preview: {content[:500]}")
+        else:
+            raise Exception(f"Unexpected API response: {data}")
 
     except httpx.TimeoutException:
         raise Exception("Analysis timed out after 2 minutes. The comprehensive analysis requires significant processing time.")
@@ -12,6 +12,7 @@ from dotenv import load_dotenv
 
 from app.utils.validation import CostTracker
 from app.core.exceptions import ExternalServiceError, ValidationError
+from app.core.http_client import get_http_client
 from app.core.constants import (
     LLM_TIMEOUT_DEFAULT,
     LLM_MAX_RETRIES,
@@ -216,38 +217,40 @@ class LLMClient:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                logger.info(f"[LLM] Calling {model} (prompt: {len(prompt)} chars)")
+            client = get_http_client("openrouter")
+            logger.info(f"[LLM] Calling {model} (prompt: {len(prompt)} chars)")
 
-                response = await client.post(OPENROUTER_URL, headers=headers, json=payload)
-                response.raise_for_status()
+            response = await client.post(
+                OPENROUTER_URL, headers=headers, json=payload, timeout=self.timeout
+            )
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
-                if "choices" in data and len(data["choices"]) > 0:
-                    content = data["choices"][0]["message"]["content"].strip()
+            if "choices" in data and len(data["choices"]) > 0:
+                content = data["choices"][0]["message"]["content"].strip()
 
-                    # Clean markdown code blocks if JSON expected
-                    if response_format == "json":
-                        content = self._clean_json_response(content)
+                # Clean markdown code blocks if JSON expected
+                if response_format == "json":
+                    content = self._clean_json_response(content)
 
-                    # Extract usage stats
-                    usage = data.get("usage", {})
-                    usage_stats = {
-                        "input_tokens": usage.get("prompt_tokens", 0),
-                        "output_tokens": usage.get("completion_tokens", 0)
-                    }
+                # Extract usage stats
+                usage = data.get("usage", {})
+                usage_stats = {
+                    "input_tokens": usage.get("prompt_tokens", 0),
+                    "output_tokens": usage.get("completion_tokens", 0)
+                }
 
-                    logger.info(
-                        f"[LLM] {model} responded ({len(content)} chars, "
-                        f"{usage_stats['input_tokens']} in, {usage_stats['output_tokens']} out)"
-                    )
-                    return content, usage_stats
-                else:
-                    raise ExternalServiceError(
-                        f"Unexpected API response: {data}",
-                        service_name="OpenRouter"
-                    )
+                logger.info(
+                    f"[LLM] {model} responded ({len(content)} chars, "
+                    f"{usage_stats['input_tokens']} in, {usage_stats['output_tokens']} out)"
+                )
+                return content, usage_stats
+            else:
+                raise ExternalServiceError(
+                    f"Unexpected API response: {data}",
+                    service_name="OpenRouter"
+                )
 
         except httpx.TimeoutException as e:
             logger.error(f"[LLM] Timeout calling {model}: {e}")
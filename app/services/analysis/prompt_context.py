@@ -0,0 +1,156 @@
+"""
+Prompt Context - Compact, token-budgeted JSON for stage prompts
+Replaces indent=2 dumps sliced by characters: output is compact canonical JSON,
+pruned of empty/internal/duplicate values and shrunk structurally (long lists
+and strings first) so it always stays valid JSON within the stage budget.
+"""
+
+import json
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.constants import PROMPT_CHARS_PER_TOKEN
+
+# Shrink steps tried in order: (max list items, max string chars)
+_SHRINK_STEPS = [
+    (20, 1500), (12, 800), (8, 500), (5, 300), (3, 200), (2, 120), (1, 80)
+]
+_ELLIPSIS = "…"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (no tokenizer dependency)"""
+    return math.ceil(len(text) / PROMPT_CHARS_PER_TOKEN)
+
+
+def to_compact_json(value: Any) -> str:
+    """Canonical JSON without whitespace (stable key order, UTF-8 kept)"""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=True, default=str)
+
+
+def prune(value: Any) -> Any:
+    """
+    Drop what costs tokens without informing the model
+
+    Removes None, empty strings/containers, internal "_" keys (e.g. _usage_stats),
+    duplicate list items and sibling fields repeating an earlier sibling's value.
+    """
+    if isinstance(value, dict):
+        pruned = {}
+        seen = set()
+        for key, item in value.items():
+            if str(key).startswith("_"):
+                continue
+            item = prune(item)
+            if _is_empty(item):
+                continue
+            if isinstance(item, (dict, list)) or (isinstance(item, str) and len(item) > 40):
+                fingerprint = to_compact_json(item)
+                if fingerprint in seen:
+                    continue
+                seen.add(fingerprint)
+            pruned[key] = item
+        return pruned
+
+    if isinstance(value, (list, tuple)):
+        pruned_items = []
+        seen = set()
+        for item in value:
+            item = prune(item)
+            if _is_empty(item):
+                continue
+            fingerprint = to_compact_json(item)
+            if fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+            pruned_items.append(item)
+        return pruned_items
+
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, (str, list, dict)) and not value)
+
+
+def _shrink(value: Any, max_items: int, max_chars: int) -> Any:
+    if isinstance(value, dict):
+        return {key: _shrink(item, max_items, max_chars) for key, item in value.items()}
+    if isinstance(value, list):
+        kept = [_shrink(item, max_items, max_chars) for item in value[:max_items]]
+        if len(value) > max_items:
+            kept.append(f"{_ELLIPSIS} +{len(value) - max_items}")
+        return kept
+    if isinstance(value, str) and len(value) > max_chars:
+        return value[:max_chars].rstrip() + _ELLIPSIS
+    return value
+
+
+@dataclass
+class PromptContext:
+    """Serialized context plus the numbers reported to AnalysisLogger"""
+    text: str
+    tokens: int
+    original_tokens: int  # Estimate for the raw indent=2 dump of the same data
+    truncated: bool
+    dropped_fields: List[str]
+
+    def __str__(self) -> str:
+        return self.text
+
+
+def serialize_prompt_context(value: Any, max_tokens: int, empty: str = "{}") -> PromptContext:
+    """
+    Compact JSON for a prompt, shrunk to max_tokens
+
+    Lists are cut to their first items and long strings are clipped, progressively;
+    if that is not enough the largest top-level fields are dropped.
+
+    Args:
+        value: Data to embed (dict, list or scalar)
+        max_tokens: Token budget for this piece of context
+        empty: Text used when nothing is left after pruning
+
+    Returns:
+        PromptContext (str() gives the text to embed)
+    """
+    original_tokens = estimate_tokens(json.dumps(value, indent=2, ensure_ascii=False, default=str)) if value else 0
+    pruned = prune(value)
+    if _is_empty(pruned):
+        return PromptContext(empty, estimate_tokens(empty), original_tokens, False, [])
+
+    text = to_compact_json(pruned)
+    truncated = False
+    if estimate_tokens(text) > max_tokens:
+        truncated = True
+        for max_items, max_chars in _SHRINK_STEPS:
+            text = to_compact_json(_shrink(pruned, max_items, max_chars))
+            if estimate_tokens(text) <= max_tokens:
+                break
+
+    dropped: List[str] = []
+    if estimate_tokens(text) > max_tokens and isinstance(pruned, dict):
+        shrunk = _shrink(pruned, *_SHRINK_STEPS[-1])
+        sizes = {key: len(to_compact_json(item)) for key, item in shrunk.items()}
+        for key in sorted(sizes, key=sizes.get, reverse=True):
+            if estimate_tokens(text) <= max_tokens or len(shrunk) == 1:
+                break
+            del shrunk[key]
+            dropped.append(key)
+            text = to_compact_json(shrunk)
+
+    return PromptContext(text, estimate_tokens(text), original_tokens, truncated, dropped)
+
+
+def context_report(contexts: Iterable[Optional[PromptContext]]) -> Dict[str, Any]:
+    """Totals for one stage's contexts (stored in _usage_stats["prompt_context"])"""
+    contexts = [context for context in contexts if context is not None]
+    return {
+        "context_tokens": sum(context.tokens for context in contexts),
+        "original_tokens": sum(context.original_tokens for context in contexts),
+        "truncated": any(context.truncated for context in contexts),
+        "dropped_fields": [field for context in contexts for field in context.dropped_fields]
+    }
@@ -0,0 +1,224 @@
+"""
+Stage Graph - Declarative dependency graph and scheduler for pipeline stages
+
+Each stage declares which stages it consumes. The executor starts every stage
+as soon as all of its dependencies have finished, so independent LLM calls
+(e.g. competitive matrix, risk scoring and polish after strategy) run concurrently.
+Caching, AnalysisLogger bookkeeping and per-stage fallbacks are applied uniformly.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from app.services.analysis.cache_wrapper import run_stage_with_cache
+from app.core.model_config import get_estimated_cost
+from app.utils.logger import AnalysisLogger
+
+logger = logging.getLogger(__name__)
+
+# Builders receive the shared pipeline context: {"inputs": {...}, "results": {...}, **derived}
+ContextBuilder = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+@dataclass
+class StageNode:
+    """Declarative definition of one pipeline stage"""
+    name: str  # Stage name used for caching, logging and cost lookup
+    function: Callable  # Async stage function
+    model: str
+    description: str
+    estimated_cost: float
+    build_cache_input: ContextBuilder  # Deterministic input hashed into the cache key
+    build_kwargs: ContextBuilder  # Keyword arguments passed to the stage function
+    depends_on: Tuple[str, ...] = ()
+    enabled: Callable[[Dict[str, Any]], bool] = lambda ctx: True
+    # Called with (context, error) when the stage fails; None means the failure aborts the pipeline
+    fallback: Optional[Callable[[Dict[str, Any], Exception], Any]] = None
+    # Value used when the stage is disabled
+    default: Callable[[], Any] = dict
+    # Optional hook run after success, before dependents start (e.g. derive shared context)
+    after: Optional[Callable[[Dict[str, Any], Any], None]] = None
+    completed_label: str = ""  # Name reported in metadata.stages_completed
+    model_key: str = ""  # Key reported in metadata.models_used
+
+
+@dataclass
+class StageGraphResult:
+    """Outcome of a graph run"""
+    results: Dict[str, Any] = field(default_factory=dict)
+    completed: List[str] = field(default_factory=list)  # Stage names that succeeded, in graph order
+    failed: Dict[str, str] = field(default_factory=dict)  # Stage name -> error message
+    skipped: List[str] = field(default_factory=list)
+
+
+class StageGraphExecutor:
+    """
+    Runs a set of StageNodes respecting their dependencies
+
+    Example:
+        executor = StageGraphExecutor(nodes, analysis_logger)
+        outcome = await executor.run(company, industry, inputs={...})
+    """
+
+    def __init__(self, nodes: List[StageNode], analysis_logger: AnalysisLogger):
+        self.nodes = {node.name: node for node in nodes}
+        self.order = [node.name for node in nodes]
+        self.analysis_logger = analysis_logger
+        self._validate()
+
+    def _validate(self) -> None:
+        """Ensure dependencies exist and the graph is acyclic"""
+        for node in self.nodes.values():
+            for dep in node.depends_on:
+                if dep not in self.nodes:
+                    raise ValueError(f"Stage '{node.name}' depends on unknown stage '{dep}'")
+
+        visiting: Set[str] = set()
+        visited: Set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage graph has a cycle through '{name}'")
+            visiting.add(name)
+            for dep in self.nodes[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.order:
+            visit(name)
+
+    async def _run_node(
+        self,
+        node: StageNode,
+        company: str,
+        industry: str,
+        context: Dict[str, Any]
+    ) -> Any:
+        """Execute one stage with caching and logging; raises only if the stage has no fallback"""
+        self.analysis_logger.log_stage_start(node.name, node.model, node.description)
+        stage_start = time.time()
+
+        try:
+            result = await run_stage_with_cache(
+                stage_name=node.name,
+                stage_function=node.function,
+                company=company,
+                industry=industry,
+                input_data=node.build_cache_input(context),
+                estimated_cost=node.estimated_cost,
+                **node.build_kwargs(context)
+            )
+        except Exception as e:
+            if node.fallback is None:
+                self.analysis_logger.log_stage_complete(
+                    node.name, time.time() - stage_start, 0, 0, 0, success=False, error=str(e)
+                )
+                raise
+            logger.warning(f"[STAGE GRAPH] Stage '{node.name}' failed (non-critical): {str(e)}")
+            self.analysis_logger.log_stage_complete(node.name, 0, 0, 0, 0, success=False, error=str(e))
+            raise _StageFallback(node.fallback(context, e), str(e))
+
+        usage = result.get("_usage_stats", {"input_tokens": 0, "output_tokens": 0})
+        self.analysis_logger.log_stage_complete(
+            node.name,
+            time.time() - stage_start,
+            usage["input_tokens"],
+            usage["output_tokens"],
+            get_estimated_cost(node.name, usage["input_tokens"], usage["output_tokens"]),
+            success=True
+        )
+        if usage.get("prompt_context"):
+            self.analysis_logger.log_prompt_context(node.name, usage["prompt_context"])
+        return result
+
+    async def run(
+        self,
+        company: str,
+        industry: str,
+        inputs: Dict[str, Any]
+    ) -> StageGraphResult:
+        """
+        Run the graph to completion
+
+        Args:
+            company: Company name (cache key)
+            industry: Industry (cache key)
+            inputs: Pipeline inputs available to every builder as context["inputs"]
+
+        Returns:
+            StageGraphResult with every stage's result (or fallback/default value)
+
+        Raises:
+            Exception: The error of the first stage without a fallback that fails
+        """
+        outcome = StageGraphResult()
+        context: Dict[str, Any] = {"inputs": inputs, "results": outcome.results}
+        done: Set[str] = set()
+        running: Dict[asyncio.Task, str] = {}
+
+        def ready_nodes() -> List[StageNode]:
+            started = set(running.values()) | done
+            return [
+                self.nodes[name] for name in self.order
+                if name not in started
+                and all(dep in done for dep in self.nodes[name].depends_on)
+            ]
+
+        try:
+            while len(done) < len(self.nodes):
+                # Start everything that is ready (skipping a disabled stage may unlock others)
+                ready = ready_nodes()
+                while ready:
+                    for node in ready:
+                        if not node.enabled(context):
+                            outcome.results[node.name] = node.default()
+                            outcome.skipped.append(node.name)
+                            done.add(node.name)
+                            continue
+                        task = asyncio.create_task(self._run_node(node, company, industry, context))
+                        running[task] = node.name
+                    ready = ready_nodes()
+
+                if not running:
+                    break
+
+                finished, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    name = running.pop(task)
+                    node = self.nodes[name]
+                    try:
+                        result = task.result()
+                    except _StageFallback as fb:
+                        outcome.results[name] = fb.value
+                        outcome.failed[name] = fb.error
+                    else:
+                        outcome.results[name] = result
+                        if node.after:
+                            node.after(context, result)
+                    done.add(name)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+
+        outcome.completed = [
+            name for name in self.order
+            if name in outcome.results and name not in outcome.failed and name not in outcome.skipped
+        ]
+        return outcome
+
+
+class _StageFallback(Exception):
+    """Internal signal carrying the fallback value of a failed non-critical stage"""
+
+    def __init__(self, value: Any, error: str):
+        super().__init__(error)
+        self.value = value
+        self.error = error
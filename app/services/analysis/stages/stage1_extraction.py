@@ -11,7 +11,8 @@ from typing import Dict, Any, Optional
 from app.services.analysis.llm_client import call_llm_with_retry
 from app.core.security.prompt_sanitizer import sanitize_dict_recursive
 from app.core.model_config import get_model_for_stage
-from app.core.constants import STAGE1_MAX_TOKENS, TEMPERATURE_FACTUAL
+from app.services.analysis.prompt_context import context_report, serialize_prompt_context
+from app.core.constants import STAGE1_CONTEXT_TOKENS_PER_SOURCE, STAGE1_MAX_TOKENS, TEMPERATURE_FACTUAL
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +41,11 @@ async def stage1_extract_data(
 
     logger.info(f"[STAGE 1] Data sanitized for prompt injection")
 
+    apify_context = serialize_prompt_context(safe_apify_data, STAGE1_CONTEXT_TOKENS_PER_SOURCE, empty="No Apify data")
+    perplexity_context = serialize_prompt_context(
+        safe_perplexity_data, STAGE1_CONTEXT_TOKENS_PER_SOURCE, empty="No Perplexity data"
+    )
+
     # Build context with sanitized data
     data_context = f"""# RAW DATA SOURCES
 
@@ -50,10 +56,10 @@ async def stage1_extract_data(
 - Challenge: {challenge or 'N/A'}
 
 ## Apify Data (Web Scraping) - SANITIZED
-{json.dumps(safe_apify_data, indent=2, ensure_ascii=False) if safe_apify_data else 'No Apify data'}
+{apify_context}
 
 ## Perplexity Data (Real-Time Research) - SANITIZED
-{json.dumps(safe_perplexity_data, indent=2, ensure_ascii=False) if safe_perplexity_data else 'No Perplexity data'}
+{perplexity_context}
 """
 
     prompt = f"""{data_context}
@@ -186,5 +192,7 @@ List any critical missing information that would help strategic analysis:
                f"{len(extracted_data.get('data_gaps', []))} gaps identified")
 
     # Add usage stats to result
-    extracted_data["_usage_stats"] = usage_stats
+    extracted_data["_usage_stats"] = {
+        **usage_stats, "prompt_context": context_report([apify_context, perplexity_context])
+    }
     return extracted_data
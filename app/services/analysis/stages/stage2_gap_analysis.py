@@ -9,8 +9,11 @@ import logging
 from typing import Dict, Any
 
 from app.services.analysis.llm_client import call_llm_with_retry
+from app.services.analysis.prompt_context import context_report, serialize_prompt_context
 from app.core.model_config import get_model_for_stage
 from app.core.constants import (
+    STAGE2_CONTEXT_TOKENS_DATA,
+    STAGE2_CONTEXT_TOKENS_GAPS,
     STAGE2_MAX_TOKENS_ANALYSIS,
     STAGE2_MAX_TOKENS_FOLLOWUP,
     TEMPERATURE_FACTUAL
@@ -46,14 +49,17 @@ async def stage2_gap_analysis_and_followup(
             "_usage_stats": {"input_tokens": 0, "output_tokens": 0}
         }
 
+    gaps_context = serialize_prompt_context(data_gaps, STAGE2_CONTEXT_TOKENS_GAPS, empty="[]")
+    data_context = serialize_prompt_context(extracted_data, STAGE2_CONTEXT_TOKENS_DATA)
+
     # Generate targeted follow-up queries
     prompt = f"""Based on these data gaps for {company} in {industry}, generate 2-3 targeted research queries:
 
 Data Gaps Identified:
-{json.dumps(data_gaps, indent=2, ensure_ascii=False)}
+{gaps_context}
 
 Current Data:
-{json.dumps(extracted_data, indent=2, ensure_ascii=False)[:2000]}
+{data_context}
 
 Generate specific, actionable research queries that would fill the most important gaps.
 
@@ -89,6 +95,7 @@ Focus on high-impact gaps (competitor data, market sizing, financial metrics).
         temperature=TEMPERATURE_FACTUAL,
         max_tokens=STAGE2_MAX_TOKENS_ANALYSIS
     )
+    usage_stats = {**usage_stats, "prompt_context": context_report([gaps_context, data_context])}
 
     gap_analysis = json.loads(response)
     follow_up_queries = gap_analysis.get("follow_up_queries", [])[:3]  # Max 3 queries
@@ -104,19 +111,21 @@ Focus on high-impact gaps (competitor data, market sizing, financial metrics).
     # Run follow-up research with Perplexity
     logger.info(f"[STAGE 2] Running {len(follow_up_queries)} follow-up research queries...")
 
+    # Queries run concurrently through the cached Perplexity query engine
+    answers = await perplexity_service.query_perplexity_many(
+        follow_up_queries, max_tokens=STAGE2_MAX_TOKENS_FOLLOWUP
+    )
+
     follow_up_results = {}
-    for i, query in enumerate(follow_up_queries):
-        try:
-            result = await perplexity_service.call_perplexity(query, max_tokens=STAGE2_MAX_TOKENS_FOLLOWUP)
-            if result:
-                follow_up_results[f"followup_{i+1}"] = {
-                    "query": query,
-                    "research": result
-                }
-                logger.info(f"[STAGE 2] ✅ Follow-up {i+1} completed")
-        except Exception as e:
-            logger.warning(f"[STAGE 2] Follow-up {i+1} failed: {str(e)}")
-            continue
+    for i, (query, result) in enumerate(zip(follow_up_queries, answers)):
+        if result:
+            follow_up_results[f"followup_{i+1}"] = {
+                "query": query,
+                "research": result
+            }
+            logger.info(f"[STAGE 2] ✅ Follow-up {i+1} completed")
+        else:
+            logger.warning(f"[STAGE 2] Follow-up {i+1} failed")
 
     logger.info(f"[STAGE 2] ✅ Completed {len(follow_up_results)}/{len(follow_up_queries)} follow-up queries")
 
@@ -9,7 +9,9 @@ import logging
 from typing import Dict, Any, Optional, List
 
 from app.services.analysis.llm_client import call_llm_with_retry
+from app.services.analysis.prompt_context import context_report, serialize_prompt_context
 from app.core.model_config import get_model_for_stage, get_stage_config
+from app.core.constants import STAGE3_CONTEXT_TOKENS
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +42,8 @@ async def stage3_strategic_analysis(
 
     logger.info(f"[STAGE 3] Applying strategic frameworks (tier: {data_quality_tier}, sections: {len(enabled_sections)})")
 
+    data_context = serialize_prompt_context(extracted_data, STAGE3_CONTEXT_TOKENS)
+
     prompt = f"""# STRATEGIC BUSINESS ANALYSIS FOR {company}
 
 **IMPORTANT CONTEXT:**
@@ -58,7 +62,7 @@ You are a strategic business analyst conducting professional consulting work. Ap
 - **Data Quality Tier:** {data_quality_tier}
 
 ## Available Market Intelligence
-{json.dumps(extracted_data, indent=2, ensure_ascii=False)[:3000]}...
+{data_context}
 (Data provided for analysis purposes only)
 
 ---
@@ -1108,5 +1112,5 @@ Recommend highest-scoring option WITH confidence level
     logger.info(f"[STAGE 3] ✅ Generated strategic analysis with {okrs_count} OKRs (4-part structure)")
 
     # Add usage stats to result
-    strategic_analysis["_usage_stats"] = usage_stats
+    strategic_analysis["_usage_stats"] = {**usage_stats, "prompt_context": context_report([data_context])}
     return strategic_analysis
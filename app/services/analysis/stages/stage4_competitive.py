@@ -9,7 +9,9 @@ import logging
 from typing import Dict, Any
 
 from app.services.analysis.llm_client import call_llm_with_retry
+from app.services.analysis.prompt_context import context_report, serialize_prompt_context
 from app.core.model_config import get_model_for_stage, get_stage_config
+from app.core.constants import STAGE4_CONTEXT_TOKENS_COMPETITORS, STAGE4_CONTEXT_TOKENS_POSITIONING
 
 logger = logging.getLogger(__name__)
 
@@ -32,16 +34,18 @@ async def stage4_competitive_matrix(
 
     competitors_data = extracted_data.get("competitors", [])
     positioning = strategic_analysis.get("posicionamento_competitivo", {})
+    competitors_context = serialize_prompt_context(competitors_data, STAGE4_CONTEXT_TOKENS_COMPETITORS, empty="[]")
+    positioning_context = serialize_prompt_context(positioning, STAGE4_CONTEXT_TOKENS_POSITIONING)
 
     prompt = f"""**TAREFA:** Gere uma matriz de inteligência competitiva COMPLETA para {company} no setor de {industry} no Brasil.
 
 **REQUISITO CRÍTICO: LISTE TODOS OS CONCORRENTES RELEVANTES (mínimo 5-7 empresas, incluindo grandes, médios e emergentes).**
 
 Dados de Concorrentes Disponíveis:
-{json.dumps(competitors_data, indent=2, ensure_ascii=False)}
+{competitors_context}
 
 Análise de Posicionamento:
-{json.dumps(positioning, indent=2, ensure_ascii=False)}
+{positioning_context}
 
 **INSTRUÇÃO:** Baseie-se nos dados fornecidos, MAS também liste concorrentes conhecidos do mercado brasileiro de {industry} que NÃO estão nos dados (ex: se for pagamentos, inclua Cielo, PagSeguro, GetNet, Mercado Pago, SumUp, Rede, SafraPay, etc).
 
@@ -191,5 +195,7 @@ Retorne JSON em PORTUGUÊS BRASILEIRO:
     logger.info(f"[STAGE 4] ✅ Generated competitive matrix with {num_competitors} competitors")
 
     # Add usage stats to result
-    competitive_intel["_usage_stats"] = usage_stats
+    competitive_intel["_usage_stats"] = {
+        **usage_stats, "prompt_context": context_report([competitors_context, positioning_context])
+    }
     return competitive_intel
@@ -9,7 +9,13 @@ import logging
 from typing import Dict, Any
 
 from app.services.analysis.llm_client import call_llm_with_retry
+from app.services.analysis.prompt_context import context_report, serialize_prompt_context
 from app.core.model_config import get_model_for_stage, get_stage_config
+from app.core.constants import (
+    STAGE5_CONTEXT_TOKENS_RECOMMENDATIONS,
+    STAGE5_CONTEXT_TOKENS_SCENARIOS,
+    STAGE5_CONTEXT_TOKENS_SWOT
+)
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +43,12 @@ async def stage5_risk_and_priority(
     recommendations = strategic_analysis.get("recomendacoes_prioritarias", [])
     swot = strategic_analysis.get("analise_swot", {})
     scenarios = strategic_analysis.get("planejamento_cenarios", {})
+    contexts = [
+        serialize_prompt_context(recommendations, STAGE5_CONTEXT_TOKENS_RECOMMENDATIONS, empty="[]"),
+        serialize_prompt_context(swot, STAGE5_CONTEXT_TOKENS_SWOT),
+        serialize_prompt_context(scenarios, STAGE5_CONTEXT_TOKENS_SCENARIOS)
+    ]
+    recommendations_context, swot_context, scenarios_context = contexts
 
     prompt = f"""**ATENÇÃO CRÍTICA: TODO O OUTPUT DEVE ESTAR EM PORTUGUÊS BRASILEIRO (pt-BR) ABSOLUTAMENTE PERFEITO E PROFISSIONAL.**
 
@@ -47,13 +59,13 @@ async def stage5_risk_and_priority(
 Para {company}, quantifique riscos e pontue recomendações por prioridade, com base nos dados fornecidos.
 
 Recomendações Estratégicas:
-{json.dumps(recommendations, indent=2, ensure_ascii=False)}
+{recommendations_context}
 
 Análise SWOT:
-{json.dumps(swot, indent=2, ensure_ascii=False)}
+{swot_context}
 
 Cenários de Planejamento:
-{json.dumps(scenarios, indent=2, ensure_ascii=False)}
+{scenarios_context}
 
 ---
 
@@ -211,5 +223,5 @@ Seja específico, quantitativo e acionável. Use português natural e profission
                f"{len(risk_priority.get('recommendation_scoring', []))} recommendations")
 
     # Add usage stats to result
-    risk_priority["_usage_stats"] = usage_stats
+    risk_priority["_usage_stats"] = {**usage_stats, "prompt_context": context_report(contexts)}
     return risk_priority
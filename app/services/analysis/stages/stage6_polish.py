@@ -9,7 +9,9 @@ import logging
 from typing import Dict, Any
 
 from app.services.analysis.llm_client import call_llm_with_retry
+from app.services.analysis.prompt_context import PromptContext, context_report, estimate_tokens
 from app.core.model_config import get_model_for_stage, get_stage_config
+from app.core.constants import STAGE6_CONTEXT_TOKENS
 
 logger = logging.getLogger(__name__)
 
@@ -34,12 +36,23 @@ async def stage6_executive_polish(
 
     logger.info("[STAGE 6] Polishing report for executive readability...")
 
+    # The model returns this document with the same structure, so it is sent
+    # whole (compact, never pruned or shrunk); if it does not fit, skip polish
+    analysis_json = json.dumps(strategic_analysis, ensure_ascii=False, separators=(",", ":"), default=str)
+    analysis_tokens = estimate_tokens(analysis_json)
+    if analysis_tokens > STAGE6_CONTEXT_TOKENS:
+        logger.warning(
+            f"[STAGE 6] Analysis too large to polish ({analysis_tokens} > {STAGE6_CONTEXT_TOKENS} tokens), skipping"
+        )
+        raise ValueError(f"Strategic analysis exceeds the stage 6 context budget ({analysis_tokens} tokens)")
+    analysis_context = PromptContext(analysis_json, analysis_tokens, analysis_tokens, False, [])
+
     prompt = f"""# EXECUTIVE POLISH TASK
 
 You are an executive communications specialist. Polish this strategic analysis for C-level readability.
 
 ## Current Analysis (Generated by Strategy Team)
-{json.dumps(strategic_analysis, indent=2, ensure_ascii=False)}
+{analysis_context}
 
 ---
 
@@ -141,5 +154,5 @@ Return JSON only. No markdown, no explanations.
     logger.info(f"[STAGE 6] ✅ Report polished for executive readability")
 
     # Add usage stats to result
-    polished_analysis["_usage_stats"] = usage_stats
+    polished_analysis["_usage_stats"] = {**usage_stats, "prompt_context": context_report([analysis_context])}
     return polished_analysis
@@ -4,7 +4,7 @@ Uses Perplexity's Sonar models for real-time web research with citations
 """
 
 import os
-import httpx
+import asyncio
 import logging
 import re
 from typing import Dict, Any, List, Optional
@@ -12,6 +12,9 @@ from datetime import datetime
 
 # Import comprehensive prompt injection sanitization
 from app.core.security.prompt_sanitizer import sanitize_for_prompt, neutralize_injection_patterns
+from app.core.http_client import get_http_client
+from app.core.offload import offload
+from app.services.data.perplexity_engine import PerplexityQueryEngine
 from app.core.constants import (
     HTTP_TIMEOUT_PERPLEXITY,
     PERPLEXITY_MAX_TOKENS_DEFAULT,
@@ -108,40 +111,63 @@ async def call_perplexity(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT_PERPLEXITY) as client:
-            logger.info(f"[PERPLEXITY] Calling {model} for research...")
-
-            response = await client.post(
-                f"{OPENROUTER_BASE_URL}/chat/completions",
-                headers=headers,
-                json=payload
-            )
+        client = get_http_client("openrouter")
+        logger.info(f"[PERPLEXITY] Calling {model} for research...")
+
+        response = await client.post(
+            f"{OPENROUTER_BASE_URL}/chat/completions",
+            headers=headers,
+            json=payload,
+            timeout=HTTP_TIMEOUT_PERPLEXITY
+        )
 
-            if response.status_code == 200:
-                result = response.json()
-                content = result["choices"][0]["message"]["content"]
-                logger.info(f"[PERPLEXITY] Research completed successfully ({len(content)} chars)")
+        if response.status_code == 200:
+            result = response.json()
+            content = result["choices"][0]["message"]["content"]
+            logger.info(f"[PERPLEXITY] Research completed successfully ({len(content)} chars)")
 
-                # Sanitize to prevent content filter triggers
-                sanitized = sanitize_research_data(content, max_length=MAX_RESEARCH_DATA_LENGTH)
-                logger.info(f"[PERPLEXITY] Sanitized: {len(content)} → {len(sanitized)} chars")
+            # Sanitize to prevent content filter triggers (off the event loop for long answers)
+            sanitized = await offload(sanitize_research_data, content, MAX_RESEARCH_DATA_LENGTH)
+            logger.info(f"[PERPLEXITY] Sanitized: {len(content)} → {len(sanitized)} chars")
 
-                return sanitized
-            else:
-                logger.error(f"[PERPLEXITY] API error: {response.status_code} - {response.text}")
+            return sanitized
+        else:
+            logger.error(f"[PERPLEXITY] API error: {response.status_code} - {response.text}")
 
-                # Try fallback model if pro failed
-                if use_pro:
-                    logger.info("[PERPLEXITY] Retrying with standard model...")
-                    return await call_perplexity(prompt, max_tokens, temperature, use_pro=False)
+            # Try fallback model if pro failed
+            if use_pro:
+                logger.info("[PERPLEXITY] Retrying with standard model...")
+                return await call_perplexity(prompt, max_tokens, temperature, use_pro=False)
 
-                return None
+            return None
 
     except Exception as e:
         logger.error(f"[PERPLEXITY] Exception during API call: {str(e)}")
         return None
 
 
+# Shared query engine: cache + in-flight dedup + bounded concurrency in front of call_perplexity
+query_engine = PerplexityQueryEngine(call_perplexity)
+
+
+async def query_perplexity(
+    prompt: str,
+    max_tokens: int = PERPLEXITY_MAX_TOKENS_DEFAULT,
+    temperature: float = 0.7
+) -> Optional[str]:
+    """Cached research query (preferred over calling call_perplexity directly)"""
+    return await query_engine.query(prompt, max_tokens=max_tokens, temperature=temperature)
+
+
+async def query_perplexity_many(
+    prompts: List[str],
+    max_tokens: int = PERPLEXITY_MAX_TOKENS_DEFAULT,
+    temperature: float = 0.7
+) -> List[Optional[str]]:
+    """Cached research queries fanned out with bounded concurrency, results in prompt order"""
+    return await query_engine.query_many(prompts, max_tokens=max_tokens, temperature=temperature)
+
+
 async def research_competitors(
     company: str,
     industry: str,
@@ -177,7 +203,7 @@ Provide comprehensive competitor analysis including:
 Please provide specific numbers, percentages, and recent data where available.
 Include sources and dates for all information."""
 
-    result = await call_perplexity(prompt, max_tokens=PERPLEXITY_MAX_TOKENS_COMPETITORS)
+    result = await query_perplexity(prompt, max_tokens=PERPLEXITY_MAX_TOKENS_COMPETITORS)
 
     return {
         "query": f"Competitors of {company} in {industry}",
@@ -230,7 +256,7 @@ Include:
 Please provide specific numbers with currency and dates.
 Cite sources for all data points."""
 
-    result = await call_perplexity(prompt, max_tokens=PERPLEXITY_MAX_TOKENS_MARKET)
+    result = await query_perplexity(prompt, max_tokens=PERPLEXITY_MAX_TOKENS_MARKET)
 
     return {
         "query": f"Market sizing for {industry} in {region}",
@@ -284,7 +310,7 @@ Provide detailed analysis including:
 Include specific examples, company names, dates, and quantitative data where available.
 Focus on actionable insights."""
 
-    result = await call_perplexity(prompt, max_tokens=PERPLEXITY_MAX_TOKENS_MARKET)
+    result = await query_perplexity(prompt, max_tokens=PERPLEXITY_MAX_TOKENS_MARKET)
 
     return {
         "query": f"Industry trends for {industry} in {region}",
@@ -344,7 +370,7 @@ Include:
 Include specific dates, sources, and quantitative metrics.
 Focus on information from the last {timeframe_days} days."""
 
-    result = await call_perplexity(prompt, max_tokens=PERPLEXITY_MAX_TOKENS_COMPANY)
+    result = await query_perplexity(prompt, max_tokens=PERPLEXITY_MAX_TOKENS_COMPANY)
 
     return {
         "query": f"Company intelligence for {company}",
@@ -407,7 +433,7 @@ Provide comprehensive analysis including:
 Include specific company names, metrics, dates, and quantitative results.
 Focus on actionable, implementable strategies."""
 
-    result = await call_perplexity(prompt, max_tokens=PERPLEXITY_MAX_TOKENS_SOLUTIONS)
+    result = await query_perplexity(prompt, max_tokens=PERPLEXITY_MAX_TOKENS_SOLUTIONS)
 
     return {
         "query": f"Solution strategies for: {challenge}",
@@ -432,9 +458,8 @@ async def comprehensive_market_research(
     logger.info(f"[PERPLEXITY] Starting comprehensive research for {company}")
 
     try:
-        # Run all research queries in parallel (much faster than sequential)
-        import asyncio
-
+        # Run all research queries in parallel; the query engine bounds upstream
+        # concurrency and serves repeated industry-level queries from cache
         results = await asyncio.gather(
             research_competitors(company, industry, region),
             research_market_sizing(industry, specific_segment, region),
@@ -466,6 +491,7 @@ async def comprehensive_market_research(
             "solution_strategies": solution_data,
             "metadata": {
                 "model_used": PERPLEXITY_MODEL,
+                "query_engine": query_engine.get_stats(),
                 "research_depth": "comprehensive",
                 "data_freshness": "real-time"
             }
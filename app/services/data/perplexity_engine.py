@@ -0,0 +1,143 @@
+"""
+Perplexity Query Engine - Cached, deduplicated and bounded research queries
+Sits in front of call_perplexity: normalized-query cache (memory + Supabase),
+coalescing of identical in-flight queries and a bounded-concurrency fan-out.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.cache import (
+    generate_perplexity_cache_key,
+    get_cached_perplexity_result,
+    cache_perplexity_result
+)
+from app.core.constants import (
+    PERPLEXITY_MAX_TOKENS_DEFAULT,
+    PERPLEXITY_MAX_CONCURRENT_QUERIES
+)
+
+logger = logging.getLogger(__name__)
+
+# call_perplexity(prompt, max_tokens=..., temperature=...) -> Optional[str]
+PerplexityFetcher = Callable[..., Awaitable[Optional[str]]]
+
+
+class PerplexityQueryEngine:
+    """
+    Query engine for Perplexity research
+
+    Example:
+        engine = PerplexityQueryEngine(call_perplexity)
+        answer = await engine.query("fintech market size brazil")
+        answers = await engine.query_many(["query 1", "query 2"])
+    """
+
+    def __init__(
+        self,
+        fetch: PerplexityFetcher,
+        max_concurrency: int = PERPLEXITY_MAX_CONCURRENT_QUERIES
+    ):
+        self.fetch = fetch
+        self.max_concurrency = max_concurrency
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._limiter: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+        self.stats = {
+            "queries": 0,
+            "cache_hits": 0,
+            "coalesced": 0,
+            "upstream_calls": 0,
+            "upstream_failures": 0
+        }
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Upstream concurrency limiter bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._limiter is None or self._limiter[0] is not loop:
+            self._limiter = (loop, asyncio.Semaphore(self.max_concurrency))
+        return self._limiter[1]
+
+    async def query(
+        self,
+        prompt: str,
+        max_tokens: int = PERPLEXITY_MAX_TOKENS_DEFAULT,
+        temperature: float = 0.7
+    ) -> Optional[str]:
+        """
+        Answer a research query from cache, an identical in-flight call, or Perplexity
+
+        Returns:
+            Research results as string, or None on error (failures are not cached)
+        """
+        self.stats["queries"] += 1
+        cache_key = generate_perplexity_cache_key(prompt, max_tokens, temperature)
+
+        task = self._in_flight.get(cache_key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            logger.info(f"[PERPLEXITY] Joining in-flight query {cache_key}")
+        else:
+            # Run as its own task so a cancelled caller does not cancel the followers
+            task = asyncio.create_task(self._resolve(cache_key, prompt, max_tokens, temperature))
+            self._in_flight[cache_key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(cache_key, None))
+
+        return await asyncio.shield(task)
+
+    async def _resolve(
+        self,
+        cache_key: str,
+        prompt: str,
+        max_tokens: int,
+        temperature: float
+    ) -> Optional[str]:
+        cached = await get_cached_perplexity_result(cache_key)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+
+        async with self._semaphore():
+            self.stats["upstream_calls"] += 1
+            result = await self.fetch(prompt, max_tokens=max_tokens, temperature=temperature)
+
+        if result:
+            await cache_perplexity_result(cache_key, prompt, result)
+        else:
+            self.stats["upstream_failures"] += 1
+        return result
+
+    async def query_many(
+        self,
+        prompts: List[str],
+        max_tokens: int = PERPLEXITY_MAX_TOKENS_DEFAULT,
+        temperature: float = 0.7
+    ) -> List[Optional[str]]:
+        """
+        Run several queries concurrently (bounded by max_concurrency)
+
+        Returns:
+            Answers in the same order as prompts; failed queries yield None
+        """
+        results = await asyncio.gather(
+            *(self.query(prompt, max_tokens, temperature) for prompt in prompts),
+            return_exceptions=True
+        )
+
+        answers: List[Optional[str]] = []
+        for prompt, result in zip(prompts, results):
+            if isinstance(result, Exception):
+                logger.warning(f"[PERPLEXITY] Query failed: {prompt[:80]} - {str(result)}")
+                answers.append(None)
+            else:
+                answers.append(result)
+        return answers
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Engine counters plus derived cache hit rate"""
+        queries = self.stats["queries"]
+        return {
+            **self.stats,
+            "in_flight": len(self._in_flight),
+            "hit_rate": round((self.stats["cache_hits"] + self.stats["coalesced"]) / queries, 3) if queries else 0.0
+        }
@@ -0,0 +1,356 @@
+"""
+Enrichment Audit Writer - Source call audit rows off the request path
+
+EnrichmentSource.enrich_with_monitoring() submits one row per source call;
+a background task writes them to enrichment_audit_log in bulk inserts, every
+flush_interval seconds or as soon as a full batch is waiting. The queue is
+bounded: when it is full the overflow policy decides between dropping the
+oldest row, dropping the new one, or making the caller wait briefly for space
+(backpressure) before dropping it. Every drop is counted in get_stats().
+
+Only transient write failures (connection loss, timeouts, 5xx) are retried,
+after a backoff. A batch the database rejects is retried row by row so one
+bad row does not hold back the rest; rejected rows are dropped.
+
+Orchestrators tag the calls they make with the enrichment record:
+
+    with audit_context(enrichment_id):
+        results = await asyncio.gather(*[s.enrich_with_monitoring(domain) for s in sources])
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from app.core.constants import (
+    AUDIT_BATCH_SIZE,
+    AUDIT_BLOCK_TIMEOUT_SECONDS,
+    AUDIT_FLUSH_INTERVAL_SECONDS,
+    AUDIT_OVERFLOW_POLICY,
+    AUDIT_QUEUE_MAX_ROWS,
+    AUDIT_RETRY_BACKOFF_MAX_SECONDS,
+    AUDIT_RETRY_BACKOFF_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+# SQLSTATE classes worth retrying: connection exception, transaction rollback
+# (deadlock, serialization), insufficient resources, operator intervention
+# (statement timeout, shutdown)
+TRANSIENT_SQLSTATE_CLASSES = ("08", "40", "53", "57")
+
+# Enrichment record the current task's source calls belong to (copied into gather() tasks)
+audit_enrichment_id: ContextVar[Optional[int]] = ContextVar("audit_enrichment_id", default=None)
+
+
+@contextmanager
+def audit_context(enrichment_id: Optional[int]) -> Iterator[None]:
+    """Attribute source calls made inside the block to an enrichment record"""
+    token = audit_enrichment_id.set(enrichment_id)
+    try:
+        yield
+    finally:
+        audit_enrichment_id.reset(token)
+
+
+def build_audit_row(
+    source_name: str,
+    success: bool,
+    called_at: datetime,
+    request_params: Optional[Dict[str, Any]] = None,
+    response_data: Optional[Dict[str, Any]] = None,
+    error_type: Optional[str] = None,
+    error_message: Optional[str] = None,
+    cost_usd: float = 0.0,
+    duration_ms: Optional[int] = None,
+    circuit_breaker_state: Optional[str] = None,
+    cached: bool = False,
+) -> Dict[str, Any]:
+    """One enrichment_audit_log row (migrations/001_create_enrichment_tables.sql)"""
+    return {
+        "enrichment_id": audit_enrichment_id.get(),
+        "source_name": source_name,
+        "source_type": "cache" if cached else ("api" if success else "error"),
+        "request_params": request_params,
+        "response_data": response_data,
+        "duration_ms": duration_ms,
+        "cost_usd": cost_usd,
+        "success": success,
+        "error_message": error_message,
+        "error_type": error_type,
+        "circuit_breaker_state": circuit_breaker_state,
+        # Time of the call, not of the (later) insert
+        "called_at": called_at.astimezone(timezone.utc).isoformat(),
+    }
+
+
+def _is_transient_write_error(error: BaseException) -> bool:
+    """
+    True if an insert may succeed when retried unchanged
+
+    The repository wraps client errors in DatabaseError, so the chain is
+    searched. Constraint violations, bad values and unknown columns are not
+    transient: the same rows would fail again.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (httpx.TimeoutException, httpx.TransportError, asyncio.TimeoutError, ConnectionError)):
+            return True
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code >= 500 or error.response.status_code == 429
+        code = str(getattr(error, "code", None) or "")
+        if len(code) == 3 and code.isdigit():
+            # HTTP status, reported when the PostgREST response is not JSON (SQLSTATEs have 5 characters)
+            return int(code) >= 500 or int(code) == 429
+        if code:
+            # PGRST000-PGRST003: PostgREST cannot reach the database or its pool is exhausted
+            return code[:2] in TRANSIENT_SQLSTATE_CLASSES or code in ("PGRST000", "PGRST001", "PGRST002", "PGRST003")
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class AuditWriter:
+    """
+    Bounded, batched writer for enrichment_audit_log
+
+    submit() only touches memory unless the queue is full under the "block"
+    policy. A transient insert failure puts the rows back at the head of the
+    queue (as far as space allows; the rest count as dropped) and pauses the
+    flusher for retry_backoff seconds, doubling per consecutive failure up to
+    max_retry_backoff; submit() does not wake it during the pause. A batch
+    the database rejects is written row by row instead, dropping the rows it
+    rejects. aclose() stops the flusher and writes everything still queued.
+
+    Example:
+        await audit_writer.submit(build_audit_row("clearbit", True, datetime.now(timezone.utc)))
+    """
+
+    def __init__(
+        self,
+        max_queue: int = AUDIT_QUEUE_MAX_ROWS,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL_SECONDS,
+        overflow_policy: str = AUDIT_OVERFLOW_POLICY,
+        block_timeout: float = AUDIT_BLOCK_TIMEOUT_SECONDS,
+        retry_backoff: float = AUDIT_RETRY_BACKOFF_SECONDS,
+        max_retry_backoff: float = AUDIT_RETRY_BACKOFF_MAX_SECONDS
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown audit overflow policy: {overflow_policy}")
+
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._flusher: Optional[asyncio.Task] = None
+        self._flusher_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._space: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._closing = False
+        self._failed_flushes = 0
+        self._retry_at = 0.0  # time.monotonic() before which the flusher does not retry
+        self.stats = {
+            "submitted": 0,
+            "written": 0,
+            "batches": 0,
+            "flush_errors": 0,
+            "dropped_oldest": 0,
+            "dropped_newest": 0,
+            "dropped_write_failures": 0,
+            "blocked": 0,
+            "block_timeouts": 0,
+        }
+
+    async def submit(self, row: Dict[str, Any]) -> bool:
+        """
+        Queue one audit row
+
+        Returns:
+            False if the row was dropped by the overflow policy
+        """
+        self._ensure_flusher()
+        self.stats["submitted"] += 1
+
+        if len(self._queue) >= self.max_queue:
+            if self.overflow_policy == "drop_oldest":
+                self._queue.popleft()
+                self.stats["dropped_oldest"] += 1
+            elif self.overflow_policy == "drop_newest" or not await self._wait_for_space():
+                self.stats["dropped_newest"] += 1
+                return False
+
+        self._queue.append(row)
+        if len(self._queue) >= self.batch_size:
+            self._wake_flusher()
+        return True
+
+    def _backing_off(self) -> bool:
+        return time.monotonic() < self._retry_at
+
+    def _wake_flusher(self) -> None:
+        # While a failed flush is backing off, waking the flusher would only hit the database again
+        if not self._backing_off():
+            self._wakeup.set()
+
+    async def _wait_for_space(self) -> bool:
+        self.stats["blocked"] += 1
+        self._space.clear()
+        self._wake_flusher()
+        try:
+            while len(self._queue) >= self.max_queue:
+                await asyncio.wait_for(self._space.wait(), timeout=self.block_timeout)
+                self._space.clear()
+        except asyncio.TimeoutError:
+            self.stats["block_timeouts"] += 1
+            return False
+        return True
+
+    def _ensure_flusher(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._flusher is None or self._flusher.done() or self._flusher_loop is not loop:
+            if self._flusher_loop is not loop:
+                self._space = asyncio.Event()
+                self._flush_lock = asyncio.Lock()
+            self._wakeup = asyncio.Event()
+            self._flusher = asyncio.create_task(self._flush_loop(self._wakeup))
+            self._flusher_loop = loop
+
+    async def _flush_loop(self, wakeup: asyncio.Event) -> None:
+        while not self._closing:
+            backoff = self._retry_at - time.monotonic()
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=backoff if backoff > 0 else self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+            if self._backing_off() and not self._closing:
+                continue
+            await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write queued rows in batches of batch_size until the queue is empty or a transient error occurs
+
+        Returns:
+            Number of rows written
+        """
+        if self._flush_lock is None:
+            return 0
+
+        written = 0
+        async with self._flush_lock:
+            while self._queue:
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                self._space.set()
+                try:
+                    await _insert_audit_rows(batch)
+                except Exception as e:
+                    self.stats["flush_errors"] += 1
+                    if _is_transient_write_error(e):
+                        # Audit rows are non-critical; retry after the backoff if there is room
+                        logger.warning(f"[AUDIT] Failed to write {len(batch)} audit rows, will retry: {e}")
+                        self._requeue(batch)
+                        break
+                    logger.warning(f"[AUDIT] Database rejected a batch of {len(batch)} audit rows, writing them one by one: {e}")
+                    rows_written, unwritten = await self._write_rows_individually(batch)
+                    written += rows_written
+                    if unwritten:
+                        self._requeue(unwritten)
+                        break
+                    continue
+                written += len(batch)
+                self.stats["batches"] += 1
+            else:
+                self._failed_flushes = 0
+                self._retry_at = 0.0
+
+        if written:
+            self.stats["written"] += written
+            logger.debug(f"[AUDIT] Wrote {written} audit rows")
+        return written
+
+    async def _write_rows_individually(self, batch: List[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
+        """Insert rows one at a time, dropping rejected ones; stops at a transient error and returns the rest"""
+        written = 0
+        for index, row in enumerate(batch):
+            try:
+                await _insert_audit_rows([row])
+            except Exception as e:
+                if _is_transient_write_error(e):
+                    return written, batch[index:]
+                self.stats["dropped_write_failures"] += 1
+                logger.error(f"[AUDIT] Dropping audit row for {row.get('source_name')} rejected by the database: {e}")
+                continue
+            written += 1
+        return written, []
+
+    def _requeue(self, batch: List[Dict[str, Any]]) -> None:
+        self._failed_flushes += 1
+        backoff = min(self.retry_backoff * 2 ** (self._failed_flushes - 1), self.max_retry_backoff)
+        self._retry_at = time.monotonic() + backoff
+        room = max(self.max_queue - len(self._queue), 0)
+        keep = batch[:room]
+        self.stats["dropped_write_failures"] += len(batch) - len(keep)
+        self._queue.extendleft(reversed(keep))
+
+    async def aclose(self) -> None:
+        """Stop the background flusher and write everything still queued (call on shutdown)"""
+        if (
+            self._flusher is not None
+            and not self._flusher.done()
+            and self._flusher_loop is asyncio.get_running_loop()
+        ):
+            # Let an in-progress flush finish instead of cancelling it mid-write
+            self._closing = True
+            self._wakeup.set()
+            await self._flusher
+        self._flusher = None
+        self._closing = False
+
+        if self._queue and self._flush_lock is not None:
+            await self.flush()
+        if self._queue:
+            # Final attempt failed; nothing will retry these
+            logger.error(f"[AUDIT] Dropping {len(self._queue)} audit rows that could not be written on shutdown")
+            self.stats["dropped_write_failures"] += len(self._queue)
+            self._queue.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth plus write and drop counters"""
+        return {
+            **self.stats,
+            "queued": len(self._queue),
+            "max_queue": self.max_queue,
+            "overflow_policy": self.overflow_policy
+        }
+
+
+async def _insert_audit_rows(rows: List[Dict[str, Any]]) -> None:
+    # Imported lazily: the repository builds a Supabase client on import
+    from app.repositories.audit_repository import audit_repository
+    await audit_repository.insert_call_rows(rows)
+
+
+# Global audit writer instance
+audit_writer = AuditWriter()
+
+
+async def close_audit_writer() -> None:
+    """Write buffered audit rows (call on shutdown)"""
+    await audit_writer.aclose()
@@ -2,7 +2,7 @@
 Enrichment Caching Layer for IMENSIAH System
 
 Implements aggressive 30-day caching with multi-layer strategy:
-1. In-memory cache (fastest)
+1. Bounded in-memory tier (fastest) + Redis when configured
 2. Database cache (persistent)
 
 Provides massive cost savings by avoiding redundant API calls
@@ -12,25 +12,84 @@ Created: 2025-01-09
 Version: 1.0.0
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Any, Tuple
 from datetime import datetime, timedelta
 import hashlib
 import logging
 from .models import QuickEnrichmentData, DeepEnrichmentData
 from app.core.supabase import supabase_service
+from app.core.hit_counter import cache_hit_counter
+from app.core.tiered_cache import PersistentTier, TieredCache
 
 logger = logging.getLogger(__name__)
 
-# In-memory cache (cleared on server restart)
-_in_memory_cache: Dict[str, Dict[str, Any]] = {}
+ENRICHMENT_CACHE_TTL_SECONDS = 30 * 86400
+
+
+class _EnrichmentResultsTable(PersistentTier):
+    """
+    enrichment_results rows (read side)
+
+    Keys are "enrichment:{quick|deep}:..."; deep hits are merged over the
+    quick data of the same row. Writes stay in set_quick/set_deep, which own
+    the row layout.
+    """
+
+    async def load(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        enrichment_type = key.split(":")[1]
+        column = f"{enrichment_type}_data"
+
+        result = (
+            await supabase_service.table("enrichment_results")
+            .select("*")
+            .eq("cache_key", key)
+            .not_.is_(column, "null")
+            .maybe_single()
+            .execute()
+        )
+
+        if not result.data:
+            return None
+
+        expires_at = datetime.fromisoformat(result.data["expires_at"])
+        if expires_at <= datetime.now():
+            return None
+
+        logger.info(
+            f"{enrichment_type.capitalize()} enrichment cache HIT (database): {result.data.get('domain')}",
+            extra={
+                "cache_key": key,
+                "source": "database",
+                "enrichment_id": result.data["id"],
+                "cost_saved": result.data["total_cost_usd"],
+            },
+        )
+
+        # cache_hits / cache_savings_usd are written in bulk by the hit counter
+        cache_hit_counter.record("enrichment_results", key)
+
+        data = result.data[column]
+        if enrichment_type == "deep":
+            # Merge quick + deep data
+            data = {**(result.data.get("quick_data") or {}), **data}
+        return data, expires_at.timestamp()
+
+
+# Bounded memory + Redis tiers over enrichment_results (shared by all EnrichmentCache instances)
+_in_memory_cache = TieredCache(
+    "enrichment",
+    ttl_seconds=ENRICHMENT_CACHE_TTL_SECONDS,
+    persistence=_EnrichmentResultsTable(),
+    redis=True
+)
 
 
 class EnrichmentCache:
     """
     30-day TTL cache for enrichment results.
 
-    Implements two-layer caching:
-    1. In-memory: Fastest, but cleared on restart
+    Implements tiered caching:
+    1. In-memory: Fastest, bounded, cleared on restart (Redis shares it across processes)
     2. Database: Persistent, survives restarts
 
     Cache hits provide massive cost savings:
@@ -100,65 +159,14 @@ class EnrichmentCache:
         """
         cache_key = self._generate_cache_key(domain, "quick")
 
-        # Check in-memory cache first (fastest)
-        cached = _in_memory_cache.get(cache_key)
-        if cached and cached["expires_at"] > datetime.now():
+        # Memory/Redis first, then database (concurrent misses share one query)
+        cached = await _in_memory_cache.get(cache_key)
+        if cached is not None:
             logger.info(
-                f"Quick enrichment cache HIT (in-memory): {domain}",
-                extra={"cache_key": cache_key, "source": "memory"},
-            )
-            return QuickEnrichmentData(**cached["data"])
-
-        # Check database cache (persistent)
-        try:
-            result = (
-                await supabase_service.table("enrichment_results")
-                .select("*")
-                .eq("cache_key", cache_key)
-                .not_.is_("quick_data", "null")
-                .maybe_single()
-                .execute()
-            )
-
-            if (
-                result.data
-                and datetime.fromisoformat(result.data["expires_at"])
-                > datetime.now()
-            ):
-                logger.info(
-                    f"Quick enrichment cache HIT (database): {domain}",
-                    extra={
-                        "cache_key": cache_key,
-                        "source": "database",
-                        "enrichment_id": result.data["id"],
-                    },
-                )
-
-                # Store in memory for next time
-                _in_memory_cache[cache_key] = {
-                    "data": result.data["quick_data"],
-                    "expires_at": datetime.fromisoformat(
-                        result.data["expires_at"]
-                    ),
-                }
-
-                # Increment hit counter
-                await supabase_service.table("enrichment_results").update(
-                    {
-                        "cache_hits": result.data["cache_hits"] + 1,
-                        "cache_savings_usd": result.data["cache_savings_usd"]
-                        + result.data["total_cost_usd"],
-                        "updated_at": datetime.now().isoformat(),
-                    }
-                ).eq("id", result.data["id"]).execute()
-
-                return QuickEnrichmentData(**result.data["quick_data"])
-
-        except Exception as e:
-            logger.error(
-                f"Error checking database cache for {domain}: {e}",
-                exc_info=True,
+                f"Quick enrichment cache HIT: {domain}",
+                extra={"cache_key": cache_key},
             )
+            return QuickEnrichmentData(**cached)
 
         logger.info(
             f"Quick enrichment cache MISS: {domain}",
@@ -234,11 +242,10 @@ class EnrichmentCache:
                 on_conflict="cache_key",
             ).execute()
 
-            # Store in memory (keep datetime objects for in-memory comparisons)
-            _in_memory_cache[cache_key] = {
-                "data": quick_data_serialized,  # Use serialized version for consistency
-                "expires_at": expires_at,
-            }
+            # Store in memory/Redis (serialized version for consistency)
+            await _in_memory_cache.set(
+                cache_key, quick_data_serialized, self.ttl_days * 86400, persist=False
+            )
 
             logger.info(
                 f"Quick enrichment cached: {domain} (expires: {expires_at})",
@@ -269,72 +276,13 @@ class EnrichmentCache:
         """
         cache_key = self._generate_cache_key(domain, "deep")
 
-        # Check in-memory cache first
-        cached = _in_memory_cache.get(cache_key)
-        if cached and cached["expires_at"] > datetime.now():
+        cached = await _in_memory_cache.get(cache_key)
+        if cached is not None:
             logger.info(
-                f"Deep enrichment cache HIT (in-memory): {domain}",
-                extra={"cache_key": cache_key, "source": "memory"},
-            )
-            return DeepEnrichmentData(**cached["data"])
-
-        # Check database cache
-        try:
-            result = (
-                await supabase_service.table("enrichment_results")
-                .select("*")
-                .eq("cache_key", cache_key)
-                .not_.is_("deep_data", "null")
-                .maybe_single()
-                .execute()
-            )
-
-            if (
-                result.data
-                and datetime.fromisoformat(result.data["expires_at"])
-                > datetime.now()
-            ):
-                logger.info(
-                    f"Deep enrichment cache HIT (database): {domain}",
-                    extra={
-                        "cache_key": cache_key,
-                        "source": "database",
-                        "enrichment_id": result.data["id"],
-                        "cost_saved": result.data["total_cost_usd"],
-                    },
-                )
-
-                # Merge quick + deep data
-                merged_data = {
-                    **(result.data.get("quick_data") or {}),
-                    **(result.data["deep_data"]),
-                }
-
-                # Store in memory
-                _in_memory_cache[cache_key] = {
-                    "data": merged_data,
-                    "expires_at": datetime.fromisoformat(
-                        result.data["expires_at"]
-                    ),
-                }
-
-                # Increment hit counter
-                await supabase_service.table("enrichment_results").update(
-                    {
-                        "cache_hits": result.data["cache_hits"] + 1,
-                        "cache_savings_usd": result.data["cache_savings_usd"]
-                        + result.data["total_cost_usd"],
-                        "updated_at": datetime.now().isoformat(),
-                    }
-                ).eq("id", result.data["id"]).execute()
-
-                return DeepEnrichmentData(**merged_data)
-
-        except Exception as e:
-            logger.error(
-                f"Error checking database cache for {domain}: {e}",
-                exc_info=True,
+                f"Deep enrichment cache HIT: {domain}",
+                extra={"cache_key": cache_key},
             )
+            return DeepEnrichmentData(**cached)
 
         logger.info(
             f"Deep enrichment cache MISS: {domain}",
@@ -385,11 +333,10 @@ class EnrichmentCache:
                 on_conflict="cache_key",
             ).execute()
 
-            # Store in memory (use serialized version for consistency)
-            _in_memory_cache[cache_key] = {
-                "data": deep_data_serialized,
-                "expires_at": expires_at,
-            }
+            # Store in memory/Redis (use serialized version for consistency)
+            await _in_memory_cache.set(
+                cache_key, deep_data_serialized, self.ttl_days * 86400, persist=False
+            )
 
             enrichment_id = result.data[0]["id"] if result.data else None
 
@@ -442,5 +389,5 @@ class EnrichmentCache:
 
     def clear_memory_cache(self) -> None:
         """Clear in-memory cache (useful for testing)"""
-        _in_memory_cache.clear()
+        _in_memory_cache.clear_memory()
         logger.info("Cleared in-memory enrichment cache")
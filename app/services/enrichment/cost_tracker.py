@@ -16,15 +16,37 @@ Features:
 5. Budget forecasting
 6. Optimization alerts
 
+Storage:
+Events are not kept. Each one is added to fixed-size time buckets (per minute,
+hour and day per source; per day per user) held in flat arrays that wrap
+around as a ring, so memory stays constant on a long-lived worker and every
+summary reads a few buckets instead of scanning history. Hourly deltas are
+flushed to enrichment_cost_buckets (migrations/019_enrichment_cost_buckets.sql).
+
 Created: 2025-01-11
 Version: 1.0.0
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 from pydantic import BaseModel
 
+from app.core.constants import (
+    COST_DAY_BUCKETS,
+    COST_FLUSH_INTERVAL_SECONDS,
+    COST_HOUR_BUCKETS,
+    COST_MAX_PENDING_ROWS,
+    COST_MAX_TRACKED_USERS,
+    COST_MINUTE_BUCKETS,
+)
+from app.core.supabase import supabase_service
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,10 +62,86 @@ class CostRecord(BaseModel):
     fields_returned: int
 
 
+# Counters held by every bucket (indexes into its slice of the array)
+COST, REQUESTS, CACHE_HITS, CACHE_SAVINGS, FIELDS, DURATION_MS = range(6)
+COUNTER_NAMES = ("cost_usd", "requests", "cache_hits", "cache_savings_usd", "fields_returned", "duration_ms")
+_COUNTERS = len(COUNTER_NAMES)
+# Stored as INTEGER/BIGINT in enrichment_cost_buckets; "1.0" is not valid input there
+_INTEGER_COUNTERS = (REQUESTS, CACHE_HITS, FIELDS, DURATION_MS)
+
+# Bucket width (seconds) and retained buckets per resolution
+RESOLUTIONS = {
+    "minute": (60, COST_MINUTE_BUCKETS),
+    "hour": (3600, COST_HOUR_BUCKETS),
+    "day": (86400, COST_DAY_BUCKETS),
+}
+_FLUSH_WIDTH = RESOLUTIONS["hour"][0]
+
+
+class BucketRing:
+    """
+    Fixed number of equal-width time buckets stored in two flat arrays
+
+    Bucket n covers [n * width, (n + 1) * width) seconds since the epoch and
+    lives in slot n % slots. Writing into a slot that still holds an older
+    bucket resets it first, so expiry is free and memory never grows.
+    """
+
+    __slots__ = ("width", "slots", "_buckets", "_values")
+
+    def __init__(self, width: int, slots: int):
+        self.width = width
+        self.slots = slots
+        self._buckets = array("q", [-1]) * slots
+        self._values = array("d", [0.0]) * (slots * _COUNTERS)
+
+    def bucket_of(self, timestamp: float) -> int:
+        return int(timestamp // self.width)
+
+    def add(self, timestamp: float, deltas: Tuple[float, ...]) -> None:
+        """Add counter deltas to the bucket containing timestamp (O(1))"""
+        bucket = self.bucket_of(timestamp)
+        slot = bucket % self.slots
+        base = slot * _COUNTERS
+        current = self._buckets[slot]
+        if current != bucket:
+            if current > bucket:
+                return  # Older than the retained window
+            self._buckets[slot] = bucket
+            for i in range(base, base + _COUNTERS):
+                self._values[i] = 0.0
+        for i, delta in enumerate(deltas):
+            self._values[base + i] += delta
+
+    def get(self, bucket: int) -> Optional[List[float]]:
+        """Counters of one bucket, or None if it is empty or no longer retained"""
+        slot = bucket % self.slots
+        if self._buckets[slot] != bucket:
+            return None
+        base = slot * _COUNTERS
+        return self._values[base:base + _COUNTERS].tolist()
+
+    def total(self, first: int, last: int, into: Optional[List[float]] = None) -> List[float]:
+        """Sum the counters of buckets first..last (inclusive) into `into`"""
+        totals = into if into is not None else [0.0] * _COUNTERS
+        for bucket in range(max(first, last - self.slots + 1), last + 1):
+            values = self.get(bucket)
+            if values is not None:
+                for i, value in enumerate(values):
+                    totals[i] += value
+        return totals
+
+
 class CostTracker:
     """
     Track and analyze enrichment costs in real-time.
 
+    track() is O(1): it adds the event to the source's minute/hour/day buckets,
+    the user's day buckets and the pending hourly deltas. A background task
+    writes the pending deltas every flush_interval seconds (or sooner once
+    max_pending_rows are waiting); deltas from a failed flush are merged back.
+    Summaries cover whole UTC days (today included) up to COST_DAY_BUCKETS.
+
     Usage:
         tracker = CostTracker()
 
@@ -64,9 +162,14 @@ class CostTracker:
         print(f"Cache saved: ${summary['cache_savings']}")
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        flush_interval: float = COST_FLUSH_INTERVAL_SECONDS,
+        max_pending_rows: int = COST_MAX_PENDING_ROWS,
+        max_tracked_users: int = COST_MAX_TRACKED_USERS,
+        clock: Callable[[], float] = time.time
+    ):
         """Initialize cost tracker"""
-        self.records: List[CostRecord] = []
         self.source_costs = {
             "clearbit": 0.10,
             "google_places": 0.02,
@@ -79,6 +182,21 @@ class CostTracker:
             "ip_api": 0.0,
             "receita_ws": 0.0
         }
+        self.flush_interval = flush_interval
+        self.max_pending_rows = max_pending_rows
+        self.max_tracked_users = max_tracked_users
+        self._clock = clock
+
+        self._sources: Dict[str, Dict[str, BucketRing]] = {}
+        self._users: "OrderedDict[str, BucketRing]" = OrderedDict()  # Least recently active first
+        # (hour bucket, dimension, key) -> counter deltas not yet written
+        self._pending: Dict[Tuple[int, str, str], List[float]] = {}
+
+        self._flusher: Optional[asyncio.Task] = None
+        self._flusher_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._closing = False
+        self.stats = {"tracked": 0, "flushes": 0, "rows_flushed": 0, "flush_errors": 0, "dropped": 0, "users_evicted": 0}
 
     async def track(
         self,
@@ -102,18 +220,33 @@ class CostTracker:
             cache_hit: Whether this was a cache hit
             fields_returned: Number of fields returned
         """
-        record = CostRecord(
-            timestamp=datetime.now(),
-            user_id=user_id,
-            session_id=session_id,
-            source_name=source_name,
-            cost_usd=cost if not cache_hit else 0.0,
-            duration_ms=duration_ms,
-            cache_hit=cache_hit,
-            fields_returned=fields_returned
+        now = self._clock()
+        deltas = (
+            cost if not cache_hit else 0.0,
+            1,
+            1 if cache_hit else 0,
+            # What the cache hit would have cost
+            self.source_costs.get(source_name, 0.05) if cache_hit else 0.0,
+            fields_returned,
+            duration_ms
         )
 
-        self.records.append(record)
+        rings = self._sources.get(source_name)
+        if rings is None:
+            rings = self._sources[source_name] = {
+                name: BucketRing(width, slots) for name, (width, slots) in RESOLUTIONS.items()
+            }
+        for ring in rings.values():
+            ring.add(now, deltas)
+
+        self._user_ring(user_id).add(now, deltas)
+
+        hour = int(now // _FLUSH_WIDTH)
+        self._add_pending((hour, "source", source_name), deltas)
+        self._add_pending((hour, "user", user_id), deltas)
+
+        self.stats["tracked"] += 1
+        self._ensure_flusher()
 
         # Log if significant cost
         if cost > 0.01 and not cache_hit:
@@ -122,6 +255,56 @@ class CostTracker:
                 f"({fields_returned} fields, {duration_ms}ms)"
             )
 
+    def _user_ring(self, user_id: str) -> BucketRing:
+        ring = self._users.get(user_id)
+        if ring is not None:
+            self._users.move_to_end(user_id)
+            return ring
+
+        if len(self._users) >= self.max_tracked_users:
+            # Its hourly deltas are already pending/flushed; only the in-memory view is lost
+            self._users.popitem(last=False)
+            self.stats["users_evicted"] += 1
+        width, slots = RESOLUTIONS["day"]
+        ring = self._users[user_id] = BucketRing(width, slots)
+        return ring
+
+    def _add_pending(self, row_key: Tuple[int, str, str], deltas) -> None:
+        pending = self._pending.get(row_key)
+        if pending is None:
+            self._pending[row_key] = list(map(float, deltas))
+        else:
+            for i, delta in enumerate(deltas):
+                pending[i] += delta
+
+    # ------------------------------------------------------------------------
+    # Bucket queries
+    # ------------------------------------------------------------------------
+
+    def _window(self, resolution: str, periods: int) -> Tuple[int, int]:
+        """First and last bucket of the newest `periods` buckets (current one included)"""
+        width, _ = RESOLUTIONS[resolution]
+        last = int(self._clock() // width)
+        return last - max(periods, 1) + 1, last
+
+    def _totals_by_source(self, days: int) -> Dict[str, List[float]]:
+        first, last = self._window("day", days)
+        return {source: rings["day"].total(first, last) for source, rings in self._sources.items()}
+
+    def _series(self, resolution: str, periods: int) -> List[Tuple[int, List[float]]]:
+        """(bucket, counters summed over sources) for non-empty buckets, oldest first"""
+        first, last = self._window(resolution, periods)
+        series = []
+        for bucket in range(first, last + 1):
+            totals = None
+            for rings in self._sources.values():
+                values = rings[resolution].get(bucket)
+                if values is not None:
+                    totals = values if totals is None else [a + b for a, b in zip(totals, values)]
+            if totals is not None and totals[REQUESTS] > 0:
+                series.append((bucket, totals))
+        return series
+
     def get_summary(self, days: int = 7) -> Dict[str, Any]:
         """
         Get cost summary for last N days.
@@ -129,10 +312,14 @@ class CostTracker:
         Returns:
             Dict with comprehensive cost breakdown
         """
-        cutoff = datetime.now() - timedelta(days=days)
-        recent_records = [r for r in self.records if r.timestamp >= cutoff]
-
-        if not recent_records:
+        by_source = self._totals_by_source(days)
+        totals = [0.0] * _COUNTERS
+        for counters in by_source.values():
+            for i, value in enumerate(counters):
+                totals[i] += value
+
+        total_requests = int(totals[REQUESTS])
+        if not total_requests:
             return {
                 "total_cost": 0.0,
                 "cache_savings": 0.0,
@@ -140,24 +327,16 @@ class CostTracker:
                 "cache_hit_rate": 0.0
             }
 
-        # Calculate totals
-        total_cost = sum(r.cost_usd for r in recent_records if not r.cache_hit)
-        cache_hits = sum(1 for r in recent_records if r.cache_hit)
-        total_requests = len(recent_records)
+        total_cost = totals[COST]
+        cache_hits = int(totals[CACHE_HITS])
+        cache_savings = totals[CACHE_SAVINGS]
 
-        # Calculate cache savings (what we WOULD have paid)
-        cache_savings = sum(
-            self.source_costs.get(r.source_name, 0.05)
-            for r in recent_records if r.cache_hit
-        )
-
-        # Cost per source
-        cost_by_source = {}
-        for record in recent_records:
-            if not record.cache_hit:
-                cost_by_source[record.source_name] = (
-                    cost_by_source.get(record.source_name, 0.0) + record.cost_usd
-                )
+        # Cost per source (sources that were actually called)
+        cost_by_source = {
+            source: counters[COST]
+            for source, counters in by_source.items()
+            if counters[REQUESTS] > counters[CACHE_HITS]
+        }
 
         # Most expensive sources
         top_sources = sorted(
@@ -184,10 +363,32 @@ class CostTracker:
                 total_cost / total_requests, 4
             ) if total_requests > 0 else 0,
             "avg_fields_per_request": round(
-                sum(r.fields_returned for r in recent_records) / total_requests, 1
+                totals[FIELDS] / total_requests, 1
             ) if total_requests > 0 else 0
         }
 
+    def get_user_summary(self, user_id: str, days: int = 7) -> Dict[str, Any]:
+        """
+        Get one user's costs for last N days (users idle long enough to be evicted report zero).
+
+        Returns:
+            Dict with cost, requests and cache usage
+        """
+        ring = self._users.get(user_id)
+        first, last = self._window("day", days)
+        totals = ring.total(first, last) if ring is not None else [0.0] * _COUNTERS
+        total_requests = int(totals[REQUESTS])
+
+        return {
+            "user_id": user_id,
+            "period_days": days,
+            "total_cost": round(totals[COST], 4),
+            "cache_savings": round(totals[CACHE_SAVINGS], 4),
+            "total_requests": total_requests,
+            "cache_hits": int(totals[CACHE_HITS]),
+            "avg_cost_per_request": round(totals[COST] / total_requests, 4) if total_requests > 0 else 0
+        }
+
     def get_optimization_recommendations(self) -> List[Dict[str, str]]:
         """
         Generate cost optimization recommendations based on usage patterns.
@@ -259,37 +460,36 @@ class CostTracker:
         Returns:
             Dict with daily breakdowns
         """
-        cutoff = datetime.now() - timedelta(days=days)
-        recent_records = [r for r in self.records if r.timestamp >= cutoff]
-
-        # Group by day
-        daily_costs = {}
-        for record in recent_records:
-            day = record.timestamp.date().isoformat()
-            if day not in daily_costs:
-                daily_costs[day] = {
-                    "cost": 0.0,
-                    "requests": 0,
-                    "cache_hits": 0
-                }
-
-            daily_costs[day]["requests"] += 1
-            if record.cache_hit:
-                daily_costs[day]["cache_hits"] += 1
-            else:
-                daily_costs[day]["cost"] += record.cost_usd
+        series = self._series("day", days)
+        return {
+            "dates": [datetime.fromtimestamp(bucket * RESOLUTIONS["day"][0], timezone.utc).date().isoformat() for bucket, _ in series],
+            **self._trend_values(series)
+        }
+
+    def get_recent_trends(self, resolution: str = "hour", periods: int = 24) -> Dict[str, List[Any]]:
+        """
+        Get per-minute or per-hour cost trends (up to the retained buckets).
+
+        Args:
+            resolution: "minute" or "hour"
+            periods: Number of buckets back from the current one
 
-        # Format for charts
-        dates = sorted(daily_costs.keys())
+        Returns:
+            Dict with bucket start times (UTC ISO) and per-bucket breakdowns
+        """
+        width, _ = RESOLUTIONS[resolution]
+        series = self._series(resolution, periods)
+        return {
+            "buckets": [datetime.fromtimestamp(bucket * width, timezone.utc).isoformat() for bucket, _ in series],
+            **self._trend_values(series)
+        }
+
+    @staticmethod
+    def _trend_values(series: List[Tuple[int, List[float]]]) -> Dict[str, List[Any]]:
         return {
-            "dates": dates,
-            "costs": [daily_costs[d]["cost"] for d in dates],
-            "requests": [daily_costs[d]["requests"] for d in dates],
-            "cache_hit_rates": [
-                (daily_costs[d]["cache_hits"] / daily_costs[d]["requests"] * 100)
-                if daily_costs[d]["requests"] > 0 else 0
-                for d in dates
-            ]
+            "costs": [counters[COST] for _, counters in series],
+            "requests": [int(counters[REQUESTS]) for _, counters in series],
+            "cache_hit_rates": [counters[CACHE_HITS] / counters[REQUESTS] * 100 for _, counters in series]
         }
 
     def forecast_monthly_cost(self) -> Dict[str, Any]:
@@ -328,3 +528,117 @@ class CostTracker:
             ),
             "potential_savings": round(summary_7d["cache_savings"] / 7 * 30, 2)
         }
+
+    # ------------------------------------------------------------------------
+    # Durable storage
+    # ------------------------------------------------------------------------
+
+    def _ensure_flusher(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop (scripts, sync tests) - deltas wait for an explicit flush()
+            return
+
+        if self._flusher is None or self._flusher.done() or self._flusher_loop is not loop:
+            self._wakeup = asyncio.Event()
+            self._flusher = asyncio.create_task(self._flush_loop(self._wakeup))
+            self._flusher_loop = loop
+        if len(self._pending) >= self.max_pending_rows:
+            self._wakeup.set()
+
+    async def _flush_loop(self, wakeup: asyncio.Event) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write the pending hourly deltas to enrichment_cost_buckets (one bulk call)
+
+        Returns:
+            Number of rows written
+        """
+        if not self._pending:
+            return 0
+
+        batch, self._pending = self._pending, {}
+        payload = [
+            {
+                "bucket_start": datetime.fromtimestamp(hour * _FLUSH_WIDTH, timezone.utc).isoformat(),
+                "dimension": dimension,
+                "key": key,
+                **_payload_counters(counters)
+            }
+            for (hour, dimension, key), counters in batch.items()
+        ]
+
+        try:
+            await asyncio.to_thread(_apply_enrichment_costs, payload)
+        except Exception as e:
+            # Keep the deltas for the next flush unless the backlog is already full
+            self.stats["flush_errors"] += 1
+            logger.warning(f"[CostTracker] Failed to flush {len(payload)} cost buckets: {e}")
+            self._merge_back(batch)
+            return 0
+
+        self.stats["flushes"] += 1
+        self.stats["rows_flushed"] += len(payload)
+        logger.debug(f"[CostTracker] Flushed {len(payload)} cost buckets")
+        return len(payload)
+
+    def _merge_back(self, batch: Dict[Tuple[int, str, str], List[float]]) -> None:
+        for row_key, counters in batch.items():
+            if row_key in self._pending or len(self._pending) < self.max_pending_rows:
+                self._add_pending(row_key, counters)
+            else:
+                self.stats["dropped"] += 1
+
+    async def aclose(self) -> None:
+        """Stop the background flusher and write what is left (call on shutdown)"""
+        if (
+            self._flusher is not None
+            and not self._flusher.done()
+            and self._flusher_loop is asyncio.get_running_loop()
+        ):
+            # Let an in-progress flush finish instead of cancelling it mid-write
+            self._closing = True
+            self._wakeup.set()
+            await self._flusher
+        self._flusher = None
+        self._closing = False
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Tracking/flush counters and bucket footprint"""
+        return {
+            **self.stats,
+            "sources": len(self._sources),
+            "users": len(self._users),
+            "pending_rows": len(self._pending)
+        }
+
+
+def _apply_enrichment_costs(payload: List[Dict[str, Any]]) -> None:
+    supabase_service.rpc("apply_enrichment_costs", {"p_rows": payload}).execute()
+
+
+def _payload_counters(counters: List[float]) -> Dict[str, Any]:
+    """Counter columns of one apply_enrichment_costs row, integers where the table has them"""
+    return {
+        name: int(round(value)) if index in _INTEGER_COUNTERS else value
+        for index, (name, value) in enumerate(zip(COUNTER_NAMES, counters))
+    }
+
+
+# Global cost tracker instance
+cost_tracker = CostTracker()
+
+
+async def close_cost_tracker() -> None:
+    """Flush buffered cost buckets (call on shutdown)"""
+    await cost_tracker.aclose()
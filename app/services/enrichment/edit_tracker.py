@@ -8,10 +8,40 @@ from sqlalchemy import select, update, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.offload import offload
 
 logger = logging.getLogger(__name__)
 
 
+def calculate_edit_distance(original: str, edited: str) -> int:
+    """
+    Levenshtein distance between two strings (O(n·m) time, O(min(n, m)) memory).
+
+    Module-level so it can run in the CPU offload pool.
+    """
+    if original == edited:
+        return 0
+
+    if len(original) < len(edited):
+        original, edited = edited, original
+
+    if len(edited) == 0:
+        return len(original)
+
+    previous_row = list(range(len(edited) + 1))
+    for i, c1 in enumerate(original):
+        current_row = [i + 1]
+        for j, c2 in enumerate(edited):
+            # j+1 instead of j since previous_row and current_row are one character longer
+            insertions = previous_row[j + 1] + 1
+            deletions = current_row[j] + 1
+            substitutions = previous_row[j] + (c1 != c2)
+            current_row.append(min(insertions, deletions, substitutions))
+        previous_row = current_row
+
+    return previous_row[-1]
+
+
 class EditTracker:
     """
     Tracks user edits to auto-filled fields and stores them for learning.
@@ -158,6 +188,14 @@ class EditTracker:
     ) -> Dict[str, Any]:
         """Update field validation history with edit event."""
         try:
+            # O(n·m) - long values are compared in the CPU offload pool
+            edit_distance = await offload(
+                calculate_edit_distance,
+                original_value or "",
+                edited_value or "",
+                size=len(original_value or "") * len(edited_value or "")
+            )
+
             edit_record = {
                 "session_id": session_id,
                 "field_name": field_name,
@@ -165,13 +203,11 @@ class EditTracker:
                 "edited_value": edited_value,
                 "source": source,
                 "original_confidence": original_confidence,
-                "edit_distance": self._calculate_edit_distance(
-                    original_value,
-                    edited_value
-                ),
+                "edit_distance": edit_distance,
                 "edit_type": self._classify_edit_type(
                     original_value,
-                    edited_value
+                    edited_value,
+                    edit_distance=edit_distance
                 ),
                 "user_id": user_id,
                 "created_at": datetime.utcnow()
@@ -256,33 +292,13 @@ class EditTracker:
         Returns:
             Edit distance as integer
         """
-        if original == edited:
-            return 0
-
-        # Simple Levenshtein distance implementation
-        if len(original) < len(edited):
-            return self._calculate_edit_distance(edited, original)
-
-        if len(edited) == 0:
-            return len(original)
-
-        previous_row = range(len(edited) + 1)
-        for i, c1 in enumerate(original):
-            current_row = [i + 1]
-            for j, c2 in enumerate(edited):
-                # j+1 instead of j since previous_row and current_row are one character longer
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-
-        return previous_row[-1]
+        return calculate_edit_distance(original, edited)
 
     def _classify_edit_type(
         self,
         original: str,
-        edited: str
+        edited: str,
+        edit_distance: Optional[int] = None
     ) -> str:
         """
         Classify the type of edit made.
@@ -293,7 +309,8 @@ class EditTracker:
         if not original or not edited:
             return "complete_rewrite"
 
-        edit_distance = self._calculate_edit_distance(original, edited)
+        if edit_distance is None:
+            edit_distance = self._calculate_edit_distance(original, edited)
         max_length = max(len(original), len(edited))
 
         if edit_distance == 0:
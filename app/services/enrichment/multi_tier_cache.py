@@ -27,10 +27,13 @@ import hashlib
 import json
 import asyncio
 
+from app.core.tiered_cache import TieredCache
+
 logger = logging.getLogger(__name__)
 
-# In-memory cache for hot data (simulating Redis)
-_hot_cache: Dict[str, Dict[str, Any]] = {}
+# Hot tier: bounded memory + shared Redis (attached by init_tiered_caches or redis_client)
+HOT_CACHE_TTL_SECONDS = 3600
+_hot_cache = TieredCache("enrichment_hot", ttl_seconds=HOT_CACHE_TTL_SECONDS, redis=True)
 
 
 class MultiTierCache:
@@ -41,7 +44,7 @@ class MultiTierCache:
     - TTL: 1 hour
     - Latency: <1ms
     - Use: Active requests, high-traffic domains
-    - Implementation: Redis (or in-memory fallback)
+    - Implementation: bounded in-memory tier + Redis when configured
 
     Tier 2 (Warm - Supabase):
     - TTL: 30 days
@@ -85,6 +88,8 @@ class MultiTierCache:
             r2_client: Cloudflare R2 client for cold cache
         """
         self.redis = redis_client
+        if redis_client is not None:
+            _hot_cache.configure_redis(redis_client)
         self.supabase = supabase_client
         self.r2 = r2_client
 
@@ -191,45 +196,17 @@ class MultiTierCache:
         return f"enrich:{layer}:{normalized}:{hash_part}"
 
     async def _get_hot_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
-        """Get from hot cache (Redis or in-memory)"""
-        if self.redis:
-            try:
-                cached = await self.redis.get(cache_key)
-                if cached:
-                    return json.loads(cached)
-            except Exception as e:
-                logger.debug(f"Redis get failed: {e}")
-
-        # Fallback to in-memory cache
-        cached = _hot_cache.get(cache_key)
-        if cached and cached["expires_at"] > datetime.now():
-            return cached["data"]
-
-        return None
+        """Get from hot cache (memory, then Redis)"""
+        return await _hot_cache.get(cache_key)
 
     async def _set_hot_cache(
         self,
         cache_key: str,
         data: Dict[str, Any],
-        ttl_seconds: int = 3600
+        ttl_seconds: int = HOT_CACHE_TTL_SECONDS
     ):
         """Set hot cache with 1 hour TTL"""
-        if self.redis:
-            try:
-                await self.redis.setex(
-                    cache_key,
-                    ttl_seconds,
-                    json.dumps(data)
-                )
-                return
-            except Exception as e:
-                logger.debug(f"Redis set failed: {e}")
-
-        # Fallback to in-memory cache
-        _hot_cache[cache_key] = {
-            "data": data,
-            "expires_at": datetime.now() + timedelta(seconds=ttl_seconds)
-        }
+        await _hot_cache.set(cache_key, data, ttl_seconds)
 
     async def _get_warm_cache(
         self,
@@ -366,6 +343,7 @@ class MultiTierCache:
 
         return {
             **self.stats,
+            "hot_tier": _hot_cache.get_stats(),
             "total_requests": total_requests,
             "hit_rate_percent": round(hit_rate, 2),
             "estimated_cost_without_cache": total_requests * 0.05,
@@ -375,5 +353,5 @@ class MultiTierCache:
 
     def clear_hot_cache(self):
         """Clear hot cache (useful for testing)"""
-        _hot_cache.clear()
+        _hot_cache.clear_memory()
         logger.info("Cleared hot cache")
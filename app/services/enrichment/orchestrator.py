@@ -32,6 +32,7 @@ from .models import (
 )
 from .cache import EnrichmentCache
 from .analytics import EnrichmentAnalytics
+from .audit_writer import audit_context
 from .sources import (
     MetadataSource,
     IpApiSource,
@@ -39,6 +40,7 @@ from .sources import (
     ClearbitSource,
     GooglePlacesSource,
     ProxycurlSource,
+    get_source,
 )
 
 logger = logging.getLogger(__name__)
@@ -94,16 +96,16 @@ class EnrichmentOrchestrator:
 
         # Initialize quick sources (free, fast)
         self.quick_sources = [
-            MetadataSource(),  # ~400ms
-            IpApiSource(),  # ~150ms
+            get_source(MetadataSource),  # ~400ms
+            get_source(IpApiSource),  # ~150ms
         ]
 
         # Initialize deep sources (paid/slow, comprehensive)
         self.deep_sources = [
-            ClearbitSource(),  # ~1.5s, $0.10
-            GooglePlacesSource(),  # ~1.5s, $0.02
-            ProxycurlSource(),  # ~4s, $0.03
-            ReceitaWSSource(),  # ~2.5s, free
+            get_source(ClearbitSource),  # ~1.5s, $0.10
+            get_source(GooglePlacesSource),  # ~1.5s, $0.02
+            get_source(ProxycurlSource),  # ~4s, $0.03
+            get_source(ReceitaWSSource),  # ~2.5s, free
         ]
 
         logger.info(
@@ -259,7 +261,8 @@ class EnrichmentOrchestrator:
         # Get quick data (from cache or run it)
         quick_data = await self.cache.get_quick(domain)
         if not quick_data:
-            quick_data = await self.enrich_quick(website)
+            with audit_context(enrichment_id):
+                quick_data = await self.enrich_quick(website)
 
         # Prepare kwargs for sources that need extra params
         source_kwargs = {
@@ -305,7 +308,9 @@ class EnrichmentOrchestrator:
 
             tasks.append(task)
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Source calls are audited in the background, tagged with this enrichment
+        with audit_context(enrichment_id):
+            results = await asyncio.gather(*tasks, return_exceptions=True)
 
         # Filter out exceptions
         valid_results = []
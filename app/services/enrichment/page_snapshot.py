@@ -0,0 +1,270 @@
+"""
+Page Snapshot - Fetch-once, parse-once homepage snapshots for enrichment sources
+The page is streamed with a byte cap, parsed once (in the offload pool for large
+pages) and indexed (meta tags, links, scripts, JSON-LD) so every extractor shares the work.
+"""
+
+import asyncio
+import codecs
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from app.core.constants import (
+    PAGE_SNAPSHOT_MAX_BYTES,
+    PAGE_SNAPSHOT_TTL_SECONDS,
+    PAGE_SNAPSHOT_MAX_ENTRIES
+)
+from app.core.http_client import get_http_client
+from app.core.offload import offload
+from app.utils.social_media import is_social_media_url
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PageSnapshot:
+    """
+    One fetched and parsed page with precomputed indexes
+
+    Holds only plain data (no parse tree) so it can be built in a worker
+    process and pickled back.
+
+    Indexes:
+        meta: lowercased meta name/property → content (first occurrence wins)
+        links: href of every <a>
+        social_links: subset of links pointing at known social platforms
+        link_tags: (rel, href) of every <link>, rel lowercased and space-joined
+        scripts: src of every external <script>
+        json_ld: parsed JSON-LD objects (arrays are flattened)
+        first_paragraph: text of the first <p> with a single string child
+        footer_text: text of <footer> (whole page text if there is none)
+        logo_images: src of <img> tags whose class or id mentions "logo"
+    """
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    html: str
+    truncated: bool = False
+    title: Optional[str] = None
+    meta: Dict[str, str] = field(default_factory=dict)
+    links: List[str] = field(default_factory=list)
+    social_links: List[str] = field(default_factory=list)
+    link_tags: List[Tuple[str, str]] = field(default_factory=list)
+    scripts: List[str] = field(default_factory=list)
+    json_ld: List[Any] = field(default_factory=list)
+    first_paragraph: Optional[str] = None
+    footer_text: str = ""
+    logo_images: List[str] = field(default_factory=list)
+    _html_lower: Optional[str] = field(default=None, repr=False)
+
+    @classmethod
+    def parse(
+        cls,
+        url: str,
+        html: str,
+        status_code: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+        truncated: bool = False
+    ) -> "PageSnapshot":
+        """Parse html once and build the indexes in a single pass over the tags"""
+        soup = BeautifulSoup(html, "html.parser")
+        page = cls(
+            url=url,
+            status_code=status_code,
+            headers={k.lower(): v for k, v in (headers or {}).items()},
+            html=html,
+            truncated=truncated
+        )
+
+        first_p = soup.find("p")
+        if first_p and first_p.string:
+            page.first_paragraph = first_p.string.strip()
+        page.footer_text = (soup.find("footer") or soup).get_text()
+
+        for tag in soup.find_all(["title", "meta", "a", "link", "script", "img"]):
+            if tag.name == "meta":
+                key = (tag.get("property") or tag.get("name") or "").strip().lower()
+                content = tag.get("content")
+                if key and content and key not in page.meta:
+                    page.meta[key] = content.strip()
+            elif tag.name == "a":
+                href = tag.get("href")
+                if href:
+                    page.links.append(href)
+                    if is_social_media_url(href):
+                        page.social_links.append(href)
+            elif tag.name == "link":
+                href = tag.get("href")
+                if href:
+                    rel = tag.get("rel") or []
+                    rel = " ".join(rel) if isinstance(rel, list) else rel
+                    page.link_tags.append((rel.lower(), href))
+            elif tag.name == "script":
+                if tag.get("src"):
+                    page.scripts.append(tag["src"])
+                elif (tag.get("type") or "").lower() == "application/ld+json":
+                    page._add_json_ld(tag.string)
+            elif tag.name == "img":
+                marker = " ".join(tag.get("class") or []) + " " + (tag.get("id") or "")
+                if "logo" in marker.lower() and tag.get("src"):
+                    page.logo_images.append(tag["src"])
+            elif tag.name == "title" and page.title is None and tag.string:
+                page.title = tag.string.strip()
+
+        return page
+
+    def _add_json_ld(self, raw: Optional[str]) -> None:
+        try:
+            data = json.loads(raw or "")
+        except (json.JSONDecodeError, TypeError):
+            return
+        self.json_ld.extend(data if isinstance(data, list) else [data])
+
+    @property
+    def html_lower(self) -> str:
+        """Lowercased html (computed once, for case-insensitive pattern scans)"""
+        if self._html_lower is None:
+            self._html_lower = self.html.lower()
+        return self._html_lower
+
+    def first_link(self, rel_contains: str) -> Optional[str]:
+        """href of the first <link> whose rel contains the given text"""
+        for rel, href in self.link_tags:
+            if rel_contains in rel:
+                return href
+        return None
+
+
+async def fetch_page_snapshot(
+    url: str,
+    user_agent: str,
+    timeout: float,
+    max_bytes: int = PAGE_SNAPSHOT_MAX_BYTES
+) -> PageSnapshot:
+    """
+    Stream a page (decoding incrementally, stopping at max_bytes) and parse it
+
+    Raises:
+        httpx.TimeoutException, httpx.HTTPStatusError: as for a plain GET
+    """
+    client = get_http_client("web")
+    async with client.stream(
+        "GET",
+        url,
+        headers={"User-Agent": user_agent},
+        follow_redirects=True,
+        timeout=timeout,
+    ) as response:
+        response.raise_for_status()
+
+        try:
+            decoder = codecs.getincrementaldecoder(response.charset_encoding or "utf-8")(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+        parts: List[str] = []
+        received = 0
+        truncated = False
+        async for chunk in response.aiter_bytes():
+            if received + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - received]
+                truncated = True
+            received += len(chunk)
+            parts.append(decoder.decode(chunk))
+            if truncated:
+                break
+        parts.append(decoder.decode(b"", final=True))
+
+        final_url = str(response.url)
+        status_code = response.status_code
+        headers = dict(response.headers)
+
+    if truncated:
+        logger.info(f"[PageSnapshot] Truncated {url} at {max_bytes} bytes")
+
+    html = "".join(parts)
+    return await offload(PageSnapshot.parse, final_url, html, status_code, headers, truncated, size=len(html))
+
+
+class PageSnapshotCache:
+    """
+    Short-lived LRU of page snapshots with in-flight deduplication
+
+    Sources enriching the same site within one session (and concurrent
+    sessions for the same site) share a single fetch and parse. Failed
+    fetches are not cached.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = PAGE_SNAPSHOT_TTL_SECONDS,
+        max_entries: int = PAGE_SNAPSHOT_MAX_ENTRIES
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, PageSnapshot]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.stats = {"fetches": 0, "hits": 0, "coalesced": 0}
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return url.strip().rstrip("/").lower()
+
+    def _get_fresh(self, key: str) -> Optional[PageSnapshot]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, page = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return page
+
+    def _store(self, key: str, page: PageSnapshot) -> None:
+        self._entries[key] = (time.monotonic(), page)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, url: str, fetch: Callable[[], Awaitable[PageSnapshot]]) -> PageSnapshot:
+        """Return a fresh snapshot for url, calling fetch() at most once at a time"""
+        key = self._key(url)
+
+        page = self._get_fresh(key)
+        if page is not None:
+            self.stats["hits"] += 1
+            return page
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(in_flight)
+
+        self.stats["fetches"] += 1
+        task = asyncio.ensure_future(fetch())
+        self._in_flight[key] = task
+        try:
+            page = await asyncio.shield(task)
+            self._store(key, page)
+            return page
+        finally:
+            self._in_flight.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Global snapshot cache shared by website-derived sources
+page_snapshots = PageSnapshotCache()
+
+
+async def get_page_snapshot(url: str, user_agent: str, timeout: float) -> PageSnapshot:
+    """Shared snapshot of url (fetched at most once per TTL window)"""
+    return await page_snapshots.get(url, lambda: fetch_page_snapshot(url, user_agent, timeout))
@@ -12,7 +12,7 @@ Each layer returns results progressively to provide instant feedback.
 import logging
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 from pydantic import BaseModel
 
 from app.services.enrichment.sources.metadata import MetadataSource
@@ -23,6 +23,7 @@ from app.services.enrichment.sources.receita_ws import ReceitaWSSource
 from app.services.enrichment.sources.google_places import GooglePlacesSource
 from app.services.enrichment.sources.proxycurl import ProxycurlSource
 from app.services.enrichment.sources.ai_inference_enhanced import EnhancedAIInferenceSource
+from app.services.enrichment.sources.base import get_source
 from app.services.enrichment.cache import EnrichmentCache
 from app.services.enrichment.intelligent_orchestrator import IntelligentSourceOrchestrator
 from app.services.enrichment.confidence_scorer import calculate_confidence_for_session
@@ -95,17 +96,18 @@ class ProgressiveEnrichmentOrchestrator:
 
     def __init__(self):
         # Layer 1 sources (free, instant) - ENHANCED
-        self.metadata_source = EnhancedMetadataSource()  # Enhanced with social media + structured data
-        self.ip_api_source = IpApiSource()
+        # Shared instances so provider circuit breakers persist across requests
+        self.metadata_source = get_source(EnhancedMetadataSource)  # Enhanced with social media + structured data
+        self.ip_api_source = get_source(IpApiSource)
 
         # Layer 2 sources (paid, parallel)
-        self.clearbit_source = ClearbitSource()
-        self.receita_ws_source = ReceitaWSSource()
-        self.google_places_source = GooglePlacesSource()
+        self.clearbit_source = get_source(ClearbitSource)
+        self.receita_ws_source = get_source(ReceitaWSSource)
+        self.google_places_source = get_source(GooglePlacesSource)
 
         # Layer 3 sources (AI + LinkedIn) - ENHANCED
-        self.proxycurl_source = ProxycurlSource()
-        self.ai_inference_source = EnhancedAIInferenceSource()  # Enhanced structured AI
+        self.proxycurl_source = get_source(ProxycurlSource)
+        self.ai_inference_source = get_source(EnhancedAIInferenceSource)  # Enhanced structured AI
 
         # Intelligence systems
         self.intelligent_orchestrator = IntelligentSourceOrchestrator()
@@ -138,23 +140,69 @@ class ProgressiveEnrichmentOrchestrator:
         Returns:
             ProgressiveEnrichmentSession with all layer results (may be empty data)
 
+        Use enrich_progressive_stream() to receive each layer as it completes.
+        """
+        import uuid
+
+        session = ProgressiveEnrichmentSession(
+            session_id=str(uuid.uuid4()),
+            website_url=website_url,
+            user_email=user_email
+        )
+
+        async for _ in self.enrich_progressive_stream(
+            website_url,
+            user_email=user_email,
+            existing_data=existing_data,
+            session=session
+        ):
+            pass
+
+        return session
+
+    async def enrich_progressive_stream(
+        self,
+        website_url: str,
+        user_email: Optional[str] = None,
+        existing_data: Optional[Dict[str, Any]] = None,
+        session: Optional[ProgressiveEnrichmentSession] = None
+    ) -> AsyncIterator[LayerResult]:
+        """
+        Execute progressive 3-layer enrichment, yielding each LayerResult
+        the moment its layer completes
+
+        The session (created if not given) is updated in place before every
+        yield, so status, auto-filled fields, confidence scores and cost are
+        current when the consumer sees the layer. Never raises; failed layers
+        yield empty results. Consume the generator to exhaustion - the
+        completed session is cached after the final layer is yielded.
+
+        Args:
+            website_url: Company website URL
+            user_email: User's email (optional)
+            existing_data: Data already collected from user (optional)
+            session: Session to fill in (optional)
+
+        Yields:
+            LayerResult for layer 1, 2 and 3, in order
+
         Flow:
-            1. Check cache
-            2. Execute Layer 1 (metadata + IP) → return immediately
-            3. Execute Layer 2 (Clearbit + ReceitaWS + Google) → return
-            4. Execute Layer 3 (AI inference + Proxycurl) → return final
-
-        Error Handling:
-            - Each layer wrapped in try/except
-            - Layer failures return empty data but continue
-            - Always returns "complete" status, never "error"
+            1. Execute Layer 1 (metadata + IP) → yield
+            2. Execute Layer 2 (Clearbit + ReceitaWS + Google) → yield
+            3. Execute Layer 3 (AI inference + Proxycurl) → yield final
         """
         import uuid
 
-        session_id = str(uuid.uuid4())
         start_time = datetime.now()
 
         try:
+            if session is None:
+                session = ProgressiveEnrichmentSession(
+                    session_id=str(uuid.uuid4()),
+                    website_url=website_url,
+                    user_email=user_email
+                )
+
             logger.info(f"Starting progressive enrichment: {website_url}")
 
             # Extract domain
@@ -162,26 +210,12 @@ class ProgressiveEnrichmentOrchestrator:
             parsed = urlparse(website_url)
             domain = parsed.netloc or parsed.path
 
-            # Initialize session
-            session = ProgressiveEnrichmentSession(
-                session_id=session_id,
-                website_url=website_url,
-                user_email=user_email
-            )
-
         except Exception as e:
-            # Even initialization failed - return minimal session
+            # Even initialization failed - finish with no data
             logger.error(f"Failed to initialize enrichment session: {e}", exc_info=True)
-            return ProgressiveEnrichmentSession(
-                session_id=session_id,
-                website_url=website_url,
-                user_email=user_email,
-                status="complete",  # Complete with no data
-                total_duration_ms=0,
-                total_cost_usd=0.0,
-                fields_auto_filled={},
-                confidence_scores={}
-            )
+            if session is not None:
+                session.status = "complete"  # Complete with no data
+            return
 
         # NOTE: Cache check disabled for progressive enrichment
         # Progressive enrichment needs real-time updates via SSE
@@ -199,8 +233,8 @@ class ProgressiveEnrichmentOrchestrator:
 
         try:
             layer1_tasks = [
-                self.metadata_source.enrich(domain),
-                self.ip_api_source.enrich(domain)
+                self.metadata_source.enrich_with_monitoring(domain),
+                self.ip_api_source.enrich_with_monitoring(domain)
             ]
 
             layer1_results = await asyncio.gather(*layer1_tasks, return_exceptions=True)
@@ -244,6 +278,8 @@ class ProgressiveEnrichmentOrchestrator:
         except Exception as e:
             logger.warning(f"Failed to update auto-fill suggestions from Layer 1: {e}")
 
+        yield session.layer1_result
+
         # ====================================================================
         # LAYER 2: STRUCTURED DATA (3-6s)
         # ====================================================================
@@ -259,9 +295,9 @@ class ProgressiveEnrichmentOrchestrator:
             location = layer1_data.get("location")
 
             layer2_tasks = [
-                self.clearbit_source.enrich(domain),
-                self.receita_ws_source.enrich(domain, company_name=company_name) if company_name else self._empty_result(),
-                self.google_places_source.enrich(domain, company_name=company_name, city=location) if company_name else self._empty_result()
+                self.clearbit_source.enrich_with_monitoring(domain),
+                self.receita_ws_source.enrich_with_monitoring(domain, company_name=company_name) if company_name else self._empty_result(),
+                self.google_places_source.enrich_with_monitoring(domain, company_name=company_name, city=location) if company_name else self._empty_result()
             ]
 
             layer2_results = await asyncio.gather(*layer2_tasks, return_exceptions=True)
@@ -305,6 +341,8 @@ class ProgressiveEnrichmentOrchestrator:
         except Exception as e:
             logger.warning(f"Failed to update auto-fill suggestions from Layer 2: {e}")
 
+        yield session.layer2_result
+
         # ====================================================================
         # LAYER 3: AI INFERENCE + LINKEDIN (6-10s) - ENHANCED
         # ====================================================================
@@ -324,7 +362,7 @@ class ProgressiveEnrichmentOrchestrator:
             # Task 1: Enhanced AI inference with strategic insights
             try:
                 layer3_tasks.append(
-                    self.ai_inference_source.enrich(
+                    self.ai_inference_source.enrich_with_monitoring(
                         domain=domain,
                         website_url=website_url,
                         scraped_metadata=layer1_data,
@@ -340,7 +378,7 @@ class ProgressiveEnrichmentOrchestrator:
                 linkedin_url = existing_data.get("linkedin_company") if existing_data else None
                 if linkedin_url or company_name:
                     layer3_tasks.append(
-                        self.proxycurl_source.enrich(domain, linkedin_url=linkedin_url, company_name=company_name)
+                        self.proxycurl_source.enrich_with_monitoring(domain, linkedin_url=linkedin_url, company_name=company_name)
                     )
             except Exception as e:
                 logger.warning(f"Failed to prepare Proxycurl enrichment (continuing anyway): {e}")
@@ -419,6 +457,8 @@ class ProgressiveEnrichmentOrchestrator:
         except Exception as e:
             logger.warning(f"Failed to calculate confidence scores (non-critical): {e}")
 
+        yield session.layer3_result
+
         # Cache the complete result (30-day TTL) - skip if caching fails
         try:
             cache_key = f"progressive_enrichment:{domain}"
@@ -426,8 +466,6 @@ class ProgressiveEnrichmentOrchestrator:
         except Exception as e:
             logger.warning(f"Failed to cache enrichment session (non-critical): {e}")
 
-        return session
-
     async def _update_auto_fill_suggestions(
         self,
         session: ProgressiveEnrichmentSession,
@@ -0,0 +1,120 @@
+"""
+Progressive Session Store - Shared state for progressive enrichment sessions
+Session snapshots are written to Redis (with an in-process fallback) so any API
+worker can answer status and SSE requests for a session started elsewhere.
+"""
+
+import logging
+import time
+from typing import Dict, Optional
+
+from app.core.constants import PROGRESSIVE_SESSION_TTL_SECONDS
+from app.services.enrichment.progressive_orchestrator import ProgressiveEnrichmentSession
+
+logger = logging.getLogger(__name__)
+
+
+def progressive_channel(session_id: str) -> str:
+    """Progress bus channel carrying the layer events of a session"""
+    return f"enrichment:{session_id}"
+
+
+class ProgressiveSessionStore:
+    """
+    Session snapshots keyed by session id
+
+    Sessions saved by this process are kept locally (they are authoritative
+    here, the enrichment runs in this process); other sessions are read from
+    Redis. Both tiers expire after ttl_seconds.
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        prefix: str = "progressive_session",
+        ttl_seconds: int = PROGRESSIVE_SESSION_TTL_SECONDS
+    ):
+        self.redis = redis_client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.local_sessions: Dict[str, ProgressiveEnrichmentSession] = {}
+        self._expires_at: Dict[str, float] = {}
+
+    def configure(self, redis_client) -> None:
+        """Attach (or detach) the Redis client"""
+        self.redis = redis_client
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}:{session_id}"
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for session_id in [s for s, expires in self._expires_at.items() if expires <= now]:
+            self.local_sessions.pop(session_id, None)
+            self._expires_at.pop(session_id, None)
+
+    async def save(self, session: ProgressiveEnrichmentSession) -> None:
+        """Store the current snapshot of a session"""
+        self._evict_expired()
+        self.local_sessions[session.session_id] = session
+        self._expires_at[session.session_id] = time.monotonic() + self.ttl_seconds
+
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(self._key(session.session_id), session.model_dump_json(), ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"[PROGRESSIVE] Failed to share session {session.session_id} via Redis: {e}")
+
+    async def get(self, session_id: str) -> Optional[ProgressiveEnrichmentSession]:
+        """Latest snapshot of a session, or None if unknown/expired"""
+        self._evict_expired()
+        session = self.local_sessions.get(session_id)
+        if session is not None or self.redis is None:
+            return session
+
+        try:
+            raw = await self.redis.get(self._key(session_id))
+        except Exception as e:
+            logger.warning(f"[PROGRESSIVE] Failed to read session {session_id} from Redis: {e}")
+            return None
+        return ProgressiveEnrichmentSession.model_validate_json(raw) if raw else None
+
+    async def delete(self, session_id: str) -> None:
+        """Forget a session in both tiers"""
+        self.local_sessions.pop(session_id, None)
+        self._expires_at.pop(session_id, None)
+        if self.redis is not None:
+            try:
+                await self.redis.delete(self._key(session_id))
+            except Exception as e:
+                logger.warning(f"[PROGRESSIVE] Failed to delete session {session_id} from Redis: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Sessions held by this process"""
+        self._evict_expired()
+        return {"local_sessions": len(self.local_sessions), "shared": int(self.redis is not None)}
+
+
+# Global session store instance
+progressive_session_store = ProgressiveSessionStore()
+
+
+def get_progressive_session_store() -> ProgressiveSessionStore:
+    """Get global progressive session store"""
+    return progressive_session_store
+
+
+def init_progressive_session_store(redis_enabled: bool = True) -> None:
+    """Share session snapshots through Redis when enabled and configured"""
+    if not redis_enabled:
+        progressive_session_store.configure(None)
+        return
+
+    try:
+        from app.core.security.rate_limiter import get_async_redis_client
+        progressive_session_store.configure(get_async_redis_client())
+        logger.info("[PROGRESSIVE] Redis session store enabled")
+    except ValueError as e:
+        progressive_session_store.configure(None)
+        logger.warning(f"[PROGRESSIVE] Redis not configured, sessions stay in-process: {e}")
@@ -0,0 +1,65 @@
+"""
+Progressive Enrichment Analytics Rollups
+
+Keeps enrichment_daily_rollups (migrations/018_enrichment_rollups.sql) current:
+the worker runs the incremental job on a schedule (only days with rows changed
+since the stored watermark are recomputed), and backfill re-rolls a date range
+in bounded chunks, e.g. for history or after a metric definition changes.
+
+Usage:
+    python scripts/backfill_enrichment_rollups.py --days 90
+"""
+
+import asyncio
+import logging
+from datetime import date, timedelta
+from typing import List
+
+from app.core.constants import ENRICHMENT_ROLLUP_BACKFILL_CHUNK_DAYS, ENRICHMENT_ROLLUP_INTERVAL_SECONDS
+from app.repositories import progressive_enrichment_repository as repo
+
+logger = logging.getLogger(__name__)
+
+
+async def run_enrichment_rollup_schedule(interval_seconds: float = ENRICHMENT_ROLLUP_INTERVAL_SECONDS) -> None:
+    """Run the incremental rollup job every interval_seconds (runs until cancelled)"""
+    logger.info(f"[ROLLUP] Enrichment rollup schedule started (every {interval_seconds:.0f}s)")
+    while True:
+        try:
+            days_rolled = await repo.refresh_rollups()
+            if days_rolled:
+                logger.info(f"[ROLLUP] Re-rolled {days_rolled} day(s) of enrichment analytics")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Analytics keep serving the previous rollups; the watermark did not move
+            logger.error(f"[ROLLUP] Enrichment rollup failed: {str(e)}", exc_info=True)
+
+        await asyncio.sleep(interval_seconds)
+
+
+def backfill_days(start: date, end: date, chunk_days: int = ENRICHMENT_ROLLUP_BACKFILL_CHUNK_DAYS) -> List[List[date]]:
+    """Days from start to end (inclusive) in chunks of chunk_days"""
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    return [days[i:i + chunk_days] for i in range(0, len(days), chunk_days)]
+
+
+async def backfill_enrichment_rollups(
+    start: date,
+    end: date,
+    chunk_days: int = ENRICHMENT_ROLLUP_BACKFILL_CHUNK_DAYS
+) -> int:
+    """
+    Recompute the stored rollups of every day from start to end (inclusive)
+
+    Idempotent; the incremental job's watermark is left alone.
+
+    Returns:
+        Number of rollup rows written
+    """
+    written = 0
+    for chunk in backfill_days(start, end, chunk_days):
+        rows = await repo.rollup_days(chunk)
+        written += rows
+        logger.info(f"[ROLLUP] Backfilled {chunk[0]} .. {chunk[-1]} ({rows} rows)")
+    return written
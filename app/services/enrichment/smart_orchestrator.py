@@ -399,17 +399,18 @@ class SmartEnrichmentOrchestrator:
         from app.services.enrichment.sources.clearbit import ClearbitSource
         from app.services.enrichment.sources.google_places import GooglePlacesSource
         from app.services.enrichment.sources.receita_ws import ReceitaWSSource
+        from app.services.enrichment.sources.base import get_source
 
-        # Map source names to instances
+        # Map source names to shared instances (breakers persist across calls)
         source_instances = {
-            "metadata": EnhancedMetadataSource(),
-            "ip_api": IpApiSource(),
-            "free_company_data": FreeCompanyDataSource(),
-            "free_geocoding": FreeGeocodingSource(),
-            "groq_ai": GroqAIInferenceSource(),
-            "clearbit": ClearbitSource(),
-            "google_places": GooglePlacesSource(),
-            "receita_ws": ReceitaWSSource()
+            "metadata": get_source(EnhancedMetadataSource),
+            "ip_api": get_source(IpApiSource),
+            "free_company_data": get_source(FreeCompanyDataSource),
+            "free_geocoding": get_source(FreeGeocodingSource),
+            "groq_ai": get_source(GroqAIInferenceSource),
+            "clearbit": get_source(ClearbitSource),
+            "google_places": get_source(GooglePlacesSource),
+            "receita_ws": get_source(ReceitaWSSource)
         }
 
         # Execute sources in parallel
@@ -431,7 +432,7 @@ class SmartEnrichmentOrchestrator:
     ):
         """Call source with error handling"""
         try:
-            source_result = await source_instance.enrich(domain)
+            source_result = await source_instance.enrich_with_monitoring(domain)
 
             if source_result.success:
                 result["data"].update(source_result.data)
@@ -35,9 +35,9 @@ All sources follow the same interface:
 
 Usage:
 ------
-    from app.services.enrichment.sources import MetadataSource
+    from app.services.enrichment.sources import MetadataSource, get_source
 
-    source = MetadataSource()
+    source = get_source(MetadataSource)  # Shared instance keeps breaker state
     result = await source.enrich_with_monitoring("techstart.com")
 
     print(f"Success: {result.success}")
@@ -49,7 +49,7 @@ Created: 2025-01-09
 Version: 1.0.0
 """
 
-from .base import EnrichmentSource, SourceResult
+from .base import EnrichmentSource, SourceResult, get_source
 from .metadata import MetadataSource
 from .ip_api import IpApiSource
 from .receita_ws import ReceitaWSSource
@@ -61,6 +61,7 @@ __all__ = [
     # Base classes
     "EnrichmentSource",
     "SourceResult",
+    "get_source",
     # Free sources
     "MetadataSource",
     "IpApiSource",
@@ -13,14 +13,55 @@ Version: 1.0.0
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Type, TypeVar
 from pydantic import BaseModel, Field
+import asyncio
 import time
 import logging
+from datetime import datetime, timezone
+import httpx
 from app.core.circuit_breaker import CircuitBreaker
+from app.core.exceptions import CircuitBreakerOpenError
+from app.services.enrichment.audit_writer import audit_writer, build_audit_row
 
 logger = logging.getLogger(__name__)
 
+SourceT = TypeVar("SourceT", bound="EnrichmentSource")
+
+# Long-lived source instances (one circuit breaker per provider per process)
+_shared_sources: Dict[type, "EnrichmentSource"] = {}
+
+
+def get_source(source_class: Type[SourceT]) -> SourceT:
+    """
+    Shared instance of an enrichment source
+
+    Orchestrators use this instead of constructing sources per request, so
+    failures accumulate on one breaker and a tripped provider stays tripped.
+    """
+    source = _shared_sources.get(source_class)
+    if source is None:
+        source = _shared_sources[source_class] = source_class()
+    return source
+
+
+def _is_provider_outage(error: BaseException) -> bool:
+    """
+    True if the error means the provider is unreachable or failing
+
+    Sources re-raise transport errors as plain exceptions, so the chain is
+    searched. Answers such as "not found" or invalid input are not outages.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (httpx.TimeoutException, httpx.TransportError, asyncio.TimeoutError, ConnectionError)):
+            return True
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code >= 500 or error.response.status_code == 429
+        error = error.__cause__ or error.__context__
+    return False
+
 
 class SourceResult(BaseModel):
     """
@@ -108,6 +149,10 @@ class EnrichmentSource(ABC):
         result = await source.enrich_with_monitoring("techstart.com")
     """
 
+    # False for sources that call the company's own site rather than a provider:
+    # one unreachable website says nothing about the next one
+    trips_on_outage: bool = True
+
     def __init__(self, name: str, cost_per_call: float = 0.0):
         """
         Initialize enrichment source.
@@ -157,7 +202,7 @@ class EnrichmentSource(ABC):
         - Timing measurement
         - Circuit breaker protection
         - Error handling and logging
-        - Audit trail preparation
+        - Audit trail (queued for the background audit writer)
 
         This method should be called by consumers instead of enrich() directly.
 
@@ -169,13 +214,16 @@ class EnrichmentSource(ABC):
             SourceResult with complete monitoring data
         """
         start_time = time.time()
+        called_at = datetime.now(timezone.utc)
 
-        # Check circuit breaker state
-        if self.circuit_breaker.state == "open":
+        # Check circuit breaker state (shared across processes)
+        try:
+            probe = await self.circuit_breaker.before_call()
+        except CircuitBreakerOpenError:
             logger.warning(
                 f"Circuit breaker OPEN for {self.name} - failing fast"
             )
-            return SourceResult(
+            result = SourceResult(
                 source_name=self.name,
                 success=False,
                 error_message="Circuit breaker open - service unavailable",
@@ -183,6 +231,8 @@ class EnrichmentSource(ABC):
                 duration_ms=0,
                 cost_usd=0.0,
             )
+            await self._audit(domain, kwargs, result, called_at)
+            return result
 
         try:
             # Log enrichment attempt
@@ -194,7 +244,7 @@ class EnrichmentSource(ABC):
             result = await self.enrich(domain, **kwargs)
 
             # Record success in circuit breaker
-            self.circuit_breaker.record_success()
+            await self.circuit_breaker.record_success(probe)
 
             # Log success
             logger.info(
@@ -202,11 +252,15 @@ class EnrichmentSource(ABC):
                 f"in {result.duration_ms}ms (cost: ${result.cost_usd:.4f})"
             )
 
+            await self._audit(domain, kwargs, result, called_at)
             return result
 
         except Exception as e:
-            # Record failure in circuit breaker
-            self.circuit_breaker.record_failure()
+            # Only outages count toward the breaker; any other answer shows the provider is up
+            if self.trips_on_outage and _is_provider_outage(e):
+                await self.circuit_breaker.record_failure(probe)
+            else:
+                await self.circuit_breaker.record_success(probe)
 
             # Calculate duration
             duration_ms = int((time.time() - start_time) * 1000)
@@ -228,7 +282,7 @@ class EnrichmentSource(ABC):
             )
 
             # Return failure result
-            return SourceResult(
+            result = SourceResult(
                 source_name=self.name,
                 success=False,
                 error_message=str(e),
@@ -236,11 +290,38 @@ class EnrichmentSource(ABC):
                 duration_ms=duration_ms,
                 cost_usd=0.0,  # No cost on failure
             )
+            await self._audit(domain, kwargs, result, called_at)
+            return result
+
+    async def _audit(
+        self,
+        domain: str,
+        kwargs: Dict[str, Any],
+        result: SourceResult,
+        called_at: datetime,
+    ) -> None:
+        """Queue the audit row for one call (written in bulk later; never fails the call)"""
+        try:
+            await audit_writer.submit(build_audit_row(
+                source_name=result.source_name,
+                success=result.success,
+                called_at=called_at,
+                request_params={"domain": domain, **kwargs},
+                response_data=result.data,
+                error_type=result.error_type,
+                error_message=result.error_message,
+                cost_usd=result.cost_usd,
+                duration_ms=result.duration_ms,
+                circuit_breaker_state=self.circuit_breaker.state.value,
+                cached=result.cached,
+            ))
+        except Exception as e:
+            logger.warning(f"[AUDIT] Could not queue audit row for {self.name}: {e}")
 
     def __repr__(self) -> str:
         """String representation for logging and debugging."""
         return (
             f"EnrichmentSource(name='{self.name}', "
             f"cost=${self.cost_per_call:.4f}, "
-            f"circuit_state='{self.circuit_breaker.state}')"
+            f"circuit_state='{self.circuit_breaker.state.value}')"
         )
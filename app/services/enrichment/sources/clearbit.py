@@ -26,6 +26,7 @@ from typing import Optional
 import httpx
 from .base import EnrichmentSource, SourceResult
 from app.core.config import get_settings
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -110,23 +111,23 @@ class ClearbitSource(EnrichmentSource):
             headers = {"Authorization": f"Bearer {self.api_key}"}
             params = {"domain": clean_domain}
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    self.API_URL, headers=headers, params=params
-                )
+            client = get_http_client("clearbit")
+            response = await client.get(
+                self.API_URL, headers=headers, params=params, timeout=self.timeout
+            )
 
-                # Handle 404 (company not found)
-                if response.status_code == 404:
-                    logger.info(f"[Clearbit] Company not found: {clean_domain}")
-                    raise Exception(f"Company not found: {clean_domain}")
+            # Handle 404 (company not found)
+            if response.status_code == 404:
+                logger.info(f"[Clearbit] Company not found: {clean_domain}")
+                raise Exception(f"Company not found: {clean_domain}")
 
-                # Handle 402 (payment required / credits exhausted)
-                if response.status_code == 402:
-                    logger.warning("[Clearbit] Credits exhausted - payment required")
-                    raise Exception("Credits exhausted - payment required")
+            # Handle 402 (payment required / credits exhausted)
+            if response.status_code == 402:
+                logger.warning("[Clearbit] Credits exhausted - payment required")
+                raise Exception("Credits exhausted - payment required")
 
-                response.raise_for_status()
-                data = response.json()
+            response.raise_for_status()
+            data = response.json()
 
             # Extract and normalize data
             enriched_data = {}
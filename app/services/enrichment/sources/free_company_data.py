@@ -18,11 +18,11 @@ Version: 1.0.0
 import time
 import logging
 from typing import Optional, Dict, Any, List
-import httpx
 from bs4 import BeautifulSoup
 import json
 from .base import EnrichmentSource, SourceResult
 from app.core.config import get_settings
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -136,26 +136,27 @@ class FreeCompanyDataSource(EnrichmentSource):
         Provides: Legal name, registration number, status, jurisdiction
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    self.OPENCORPORATES_API,
-                    params={"q": domain, "format": "json"}
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    companies = data.get("results", {}).get("companies", [])
-
-                    if companies:
-                        company = companies[0].get("company", {})
-                        return {
-                            "legal_name": company.get("name"),
-                            "company_number": company.get("company_number"),
-                            "jurisdiction": company.get("jurisdiction_code"),
-                            "company_type": company.get("company_type"),
-                            "registration_status": company.get("current_status"),
-                            "opencorporates_url": company.get("opencorporates_url")
-                        }
+            client = get_http_client("opencorporates")
+            response = await client.get(
+                self.OPENCORPORATES_API,
+                params={"q": domain, "format": "json"},
+                timeout=self.timeout
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                companies = data.get("results", {}).get("companies", [])
+
+                if companies:
+                    company = companies[0].get("company", {})
+                    return {
+                        "legal_name": company.get("name"),
+                        "company_number": company.get("company_number"),
+                        "jurisdiction": company.get("jurisdiction_code"),
+                        "company_type": company.get("company_type"),
+                        "registration_status": company.get("current_status"),
+                        "opencorporates_url": company.get("opencorporates_url")
+                    }
         except Exception as e:
             logger.debug(f"OpenCorporates lookup failed: {e}")
 
@@ -179,42 +180,44 @@ class FreeCompanyDataSource(EnrichmentSource):
             search_term = company_name or domain.split('.')[0]
             linkedin_url = f"https://www.linkedin.com/company/{search_term.lower().replace(' ', '-')}"
 
-            async with httpx.AsyncClient(
-                timeout=self.timeout,
+            client = get_http_client("web")
+            response = await client.get(
+                linkedin_url,
                 headers={
                     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                }
-            ) as client:
-                response = await client.get(linkedin_url, follow_redirects=True)
+                },
+                follow_redirects=True,
+                timeout=self.timeout
+            )
 
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
+            if response.status_code == 200:
+                soup = BeautifulSoup(response.text, 'html.parser')
 
-                    # Extract structured data from meta tags
-                    data = {}
+                # Extract structured data from meta tags
+                data = {}
 
-                    # Company name
-                    og_title = soup.find("meta", property="og:title")
-                    if og_title:
-                        data["company_name"] = og_title.get("content", "").replace(" | LinkedIn", "")
+                # Company name
+                og_title = soup.find("meta", property="og:title")
+                if og_title:
+                    data["company_name"] = og_title.get("content", "").replace(" | LinkedIn", "")
 
-                    # Description
-                    og_description = soup.find("meta", property="og:description")
-                    if og_description:
-                        data["description"] = og_description.get("content", "")
+                # Description
+                og_description = soup.find("meta", property="og:description")
+                if og_description:
+                    data["description"] = og_description.get("content", "")
 
-                    # Try to extract employee count from page text
-                    page_text = soup.get_text()
-                    if "employees" in page_text.lower():
-                        # Parse patterns like "51-200 employees"
-                        import re
-                        match = re.search(r'(\d+[\-\d]*)\s*employees', page_text, re.IGNORECASE)
-                        if match:
-                            data["employee_count"] = match.group(1)
+                # Try to extract employee count from page text
+                page_text = soup.get_text()
+                if "employees" in page_text.lower():
+                    # Parse patterns like "51-200 employees"
+                    import re
+                    match = re.search(r'(\d+[\-\d]*)\s*employees', page_text, re.IGNORECASE)
+                    if match:
+                        data["employee_count"] = match.group(1)
 
-                    data["linkedin_company"] = linkedin_url
+                data["linkedin_company"] = linkedin_url
 
-                    return data
+                return data
 
         except Exception as e:
             logger.debug(f"LinkedIn scraping failed: {e}")
@@ -229,24 +232,25 @@ class FreeCompanyDataSource(EnrichmentSource):
         """
         try:
             # Free tier allows limited lookups per month
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.WAPPALYZER_API}?urls=https://{domain}",
-                    headers={"x-api-key": getattr(settings, "wappalyzer_api_key", "")}
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    technologies = data.get("technologies", [])
-
-                    if technologies:
-                        return {
-                            "website_tech": [tech.get("name") for tech in technologies[:15]],
-                            "tech_categories": list(set(
-                                cat for tech in technologies
-                                for cat in tech.get("categories", [])
-                            ))[:10]
-                        }
+            client = get_http_client("wappalyzer")
+            response = await client.get(
+                f"{self.WAPPALYZER_API}?urls=https://{domain}",
+                headers={"x-api-key": getattr(settings, "wappalyzer_api_key", "")},
+                timeout=self.timeout
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                technologies = data.get("technologies", [])
+
+                if technologies:
+                    return {
+                        "website_tech": [tech.get("name") for tech in technologies[:15]],
+                        "tech_categories": list(set(
+                            cat for tech in technologies
+                            for cat in tech.get("categories", [])
+                        ))[:10]
+                    }
         except Exception as e:
             logger.debug(f"Wappalyzer lookup failed: {e}")
 
@@ -262,24 +266,25 @@ class FreeCompanyDataSource(EnrichmentSource):
             return {}
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    self.HUNTER_API,
-                    params={"domain": domain, "api_key": self.hunter_api_key}
-                )
-
-                if response.status_code == 200:
-                    data = response.json().get("data", {})
-
-                    result = {}
-                    if data.get("organization"):
-                        result["company_name"] = data["organization"]
-                    if data.get("pattern"):
-                        result["email_pattern"] = data["pattern"]
-                    if data.get("emails"):
-                        result["email_count"] = len(data["emails"])
-
-                    return result
+            client = get_http_client("hunter")
+            response = await client.get(
+                self.HUNTER_API,
+                params={"domain": domain, "api_key": self.hunter_api_key},
+                timeout=self.timeout
+            )
+
+            if response.status_code == 200:
+                data = response.json().get("data", {})
+
+                result = {}
+                if data.get("organization"):
+                    result["company_name"] = data["organization"]
+                if data.get("pattern"):
+                    result["email_pattern"] = data["pattern"]
+                if data.get("emails"):
+                    result["email_count"] = len(data["emails"])
+
+                return result
         except Exception as e:
             logger.debug(f"Hunter.io lookup failed: {e}")
 
@@ -17,9 +17,9 @@ Version: 1.0.0
 import time
 import logging
 from typing import Optional, Dict, Any
-import httpx
 from .base import EnrichmentSource, SourceResult
 from app.core.config import get_settings
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -167,35 +167,36 @@ class FreeGeocodingSource(EnrichmentSource):
                 "User-Agent": "IMENSIAH/1.0 (AI-Powered Strategy Analysis)"
             }
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    self.NOMINATIM_URL,
-                    params=params,
-                    headers=headers
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    if data:
-                        place = data[0]
-                        address_parts = place.get("address", {})
-
-                        return {
-                            "address": place.get("display_name"),
-                            "latitude": float(place.get("lat", 0)),
-                            "longitude": float(place.get("lon", 0)),
-                            "city": address_parts.get("city") or address_parts.get("town") or address_parts.get("village"),
-                            "state": address_parts.get("state"),
-                            "country": address_parts.get("country"),
-                            "postal_code": address_parts.get("postcode"),
-                            "place_type": place.get("type"),
-                            "osm_id": place.get("osm_id"),
-                            "source": "nominatim",
-                            "confidence": 80  # Nominatim confidence estimate
-                        }
-
-                # Rate limit: Wait 1 second between requests
-                await asyncio.sleep(1.0)
+            client = get_http_client("geocoding")
+            response = await client.get(
+                self.NOMINATIM_URL,
+                params=params,
+                headers=headers,
+                timeout=self.timeout
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                if data:
+                    place = data[0]
+                    address_parts = place.get("address", {})
+
+                    return {
+                        "address": place.get("display_name"),
+                        "latitude": float(place.get("lat", 0)),
+                        "longitude": float(place.get("lon", 0)),
+                        "city": address_parts.get("city") or address_parts.get("town") or address_parts.get("village"),
+                        "state": address_parts.get("state"),
+                        "country": address_parts.get("country"),
+                        "postal_code": address_parts.get("postcode"),
+                        "place_type": place.get("type"),
+                        "osm_id": place.get("osm_id"),
+                        "source": "nominatim",
+                        "confidence": 80  # Nominatim confidence estimate
+                    }
+
+            # Rate limit: Wait 1 second between requests
+            await asyncio.sleep(1.0)
 
         except Exception as e:
             logger.debug(f"Nominatim geocoding failed: {e}")
@@ -219,29 +220,29 @@ class FreeGeocodingSource(EnrichmentSource):
                 "no_annotations": 1
             }
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.OPENCAGE_URL, params=params)
-
-                if response.status_code == 200:
-                    data = response.json()
-                    results = data.get("results", [])
-
-                    if results:
-                        result = results[0]
-                        components = result.get("components", {})
-                        geometry = result.get("geometry", {})
-
-                        return {
-                            "address": result.get("formatted"),
-                            "latitude": geometry.get("lat"),
-                            "longitude": geometry.get("lng"),
-                            "city": components.get("city") or components.get("town"),
-                            "state": components.get("state"),
-                            "country": components.get("country"),
-                            "postal_code": components.get("postcode"),
-                            "source": "opencage",
-                            "confidence": result.get("confidence", 0) * 10  # Convert to 0-100
-                        }
+            client = get_http_client("geocoding")
+            response = await client.get(self.OPENCAGE_URL, params=params, timeout=self.timeout)
+
+            if response.status_code == 200:
+                data = response.json()
+                results = data.get("results", [])
+
+                if results:
+                    result = results[0]
+                    components = result.get("components", {})
+                    geometry = result.get("geometry", {})
+
+                    return {
+                        "address": result.get("formatted"),
+                        "latitude": geometry.get("lat"),
+                        "longitude": geometry.get("lng"),
+                        "city": components.get("city") or components.get("town"),
+                        "state": components.get("state"),
+                        "country": components.get("country"),
+                        "postal_code": components.get("postcode"),
+                        "source": "opencage",
+                        "confidence": result.get("confidence", 0) * 10  # Convert to 0-100
+                    }
 
         except Exception as e:
             logger.debug(f"OpenCage geocoding failed: {e}")
@@ -264,31 +265,31 @@ class FreeGeocodingSource(EnrichmentSource):
                 "limit": 1
             }
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.GEOAPIFY_URL, params=params)
-
-                if response.status_code == 200:
-                    data = response.json()
-                    features = data.get("features", [])
-
-                    if features:
-                        feature = features[0]
-                        properties = feature.get("properties", {})
-                        geometry = feature.get("geometry", {})
-                        coords = geometry.get("coordinates", [])
-
-                        return {
-                            "address": properties.get("formatted"),
-                            "latitude": coords[1] if len(coords) > 1 else None,
-                            "longitude": coords[0] if len(coords) > 0 else None,
-                            "city": properties.get("city"),
-                            "state": properties.get("state"),
-                            "country": properties.get("country"),
-                            "postal_code": properties.get("postcode"),
-                            "place_type": properties.get("result_type"),
-                            "source": "geoapify",
-                            "confidence": properties.get("rank", {}).get("confidence", 0) * 100
-                        }
+            client = get_http_client("geocoding")
+            response = await client.get(self.GEOAPIFY_URL, params=params, timeout=self.timeout)
+
+            if response.status_code == 200:
+                data = response.json()
+                features = data.get("features", [])
+
+                if features:
+                    feature = features[0]
+                    properties = feature.get("properties", {})
+                    geometry = feature.get("geometry", {})
+                    coords = geometry.get("coordinates", [])
+
+                    return {
+                        "address": properties.get("formatted"),
+                        "latitude": coords[1] if len(coords) > 1 else None,
+                        "longitude": coords[0] if len(coords) > 0 else None,
+                        "city": properties.get("city"),
+                        "state": properties.get("state"),
+                        "country": properties.get("country"),
+                        "postal_code": properties.get("postcode"),
+                        "place_type": properties.get("result_type"),
+                        "source": "geoapify",
+                        "confidence": properties.get("rank", {}).get("confidence", 0) * 100
+                    }
 
         except Exception as e:
             logger.debug(f"Geoapify geocoding failed: {e}")
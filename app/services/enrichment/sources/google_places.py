@@ -24,6 +24,7 @@ from typing import Optional
 import httpx
 from .base import EnrichmentSource, SourceResult
 from app.core.config import get_settings
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -179,10 +180,10 @@ class GooglePlacesSource(EnrichmentSource):
             "key": self.api_key,
         }
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(self.FIND_PLACE_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
+        client = get_http_client("google_places")
+        response = await client.get(self.FIND_PLACE_URL, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
 
         if data.get("status") == "ZERO_RESULTS":
             logger.info(
@@ -239,12 +240,12 @@ class GooglePlacesSource(EnrichmentSource):
             "key": self.api_key,
         }
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(
-                self.PLACE_DETAILS_URL, params=params
-            )
-            response.raise_for_status()
-            data = response.json()
+        client = get_http_client("google_places")
+        response = await client.get(
+            self.PLACE_DETAILS_URL, params=params, timeout=self.timeout
+        )
+        response.raise_for_status()
+        data = response.json()
 
         if data.get("status") != "OK":
             error_msg = data.get("error_message", data.get("status"))
@@ -21,6 +21,7 @@ import httpx
 import json
 from .base import EnrichmentSource, SourceResult
 from app.core.config import get_settings
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -203,53 +204,54 @@ Return JSON with this exact structure:
 Return ONLY the JSON object, nothing else."""
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    self.GROQ_API_URL,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a business analyst. Return ONLY valid JSON, no markdown formatting."
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ],
-                        "temperature": 0.3,  # Lower temperature for consistent output
-                        "max_tokens": 1000,
-                        "response_format": {"type": "json_object"}  # Force JSON output
-                    }
-                )
+            client = get_http_client("groq")
+            response = await client.post(
+                self.GROQ_API_URL,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "model": self.model,
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "You are a business analyst. Return ONLY valid JSON, no markdown formatting."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    "temperature": 0.3,  # Lower temperature for consistent output
+                    "max_tokens": 1000,
+                    "response_format": {"type": "json_object"}  # Force JSON output
+                },
+                timeout=self.timeout
+            )
 
-                response.raise_for_status()
-                data = response.json()
-
-                # Extract AI response
-                ai_response = data["choices"][0]["message"]["content"]
-
-                # Parse JSON response
-                insights = json.loads(ai_response)
-
-                # Add AI confidence scores
-                return {
-                    "ai_industry": insights.get("industry"),
-                    "ai_target_audience": insights.get("target_audience"),
-                    "ai_digital_maturity": insights.get("digital_maturity"),
-                    "ai_competitive_position": insights.get("competitive_position"),
-                    "ai_growth_stage": insights.get("growth_stage"),
-                    "ai_key_strengths": insights.get("key_strengths", []),
-                    "ai_strategic_recommendations": insights.get("strategic_recommendations", []),
-                    "ai_market_opportunity": insights.get("market_opportunity"),
-                    "ai_model_used": self.model,
-                    "ai_confidence": 75  # Groq/Llama confidence estimate
-                }
+            response.raise_for_status()
+            data = response.json()
+
+            # Extract AI response
+            ai_response = data["choices"][0]["message"]["content"]
+
+            # Parse JSON response
+            insights = json.loads(ai_response)
+
+            # Add AI confidence scores
+            return {
+                "ai_industry": insights.get("industry"),
+                "ai_target_audience": insights.get("target_audience"),
+                "ai_digital_maturity": insights.get("digital_maturity"),
+                "ai_competitive_position": insights.get("competitive_position"),
+                "ai_growth_stage": insights.get("growth_stage"),
+                "ai_key_strengths": insights.get("key_strengths", []),
+                "ai_strategic_recommendations": insights.get("strategic_recommendations", []),
+                "ai_market_opportunity": insights.get("market_opportunity"),
+                "ai_model_used": self.model,
+                "ai_confidence": 75  # Groq/Llama confidence estimate
+            }
 
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse Groq AI response as JSON: {e}")
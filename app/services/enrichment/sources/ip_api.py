@@ -21,6 +21,7 @@ import socket
 from typing import Optional
 import httpx
 from .base import EnrichmentSource, SourceResult
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -94,10 +95,10 @@ class IpApiSource(EnrichmentSource):
 
             # Query ip-api.com
             url = self.API_URL.format(ip=ip_address)
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                data = response.json()
+            client = get_http_client("ip_api")
+            response = await client.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
 
             # Check if request was successful
             if data.get("status") != "success":
@@ -18,10 +18,11 @@ import time
 import logging
 from typing import Dict, Any, Optional, List
 import httpx
-from bs4 import BeautifulSoup
 import re
 from urllib.parse import urlparse
 from .base import EnrichmentSource, SourceResult
+from app.services.enrichment.page_snapshot import PageSnapshot, get_page_snapshot
+from app.services.enrichment.tech_fingerprints import detect_technologies
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +34,7 @@ class MetadataSource(EnrichmentSource):
     Capabilities:
     - Extract company name from title, og:site_name, or domain
     - Extract description from meta tags
-    - Detect technology stack (React, Next.js, WordPress, etc.)
+    - Detect technology stack (React, Next.js, WordPress, etc. - see tech_fingerprints)
     - Extract meta keywords
     - Parse Open Graph data
 
@@ -52,63 +53,8 @@ class MetadataSource(EnrichmentSource):
         # }
     """
 
-    # Technology detection patterns
-    TECH_PATTERNS = {
-        "React": [
-            r'react',
-            r'__NEXT_DATA__',
-            r'_reactRoot',
-        ],
-        "Next.js": [
-            r'__NEXT_DATA__',
-            r'_next/static',
-            r'next\.js',
-        ],
-        "WordPress": [
-            r'wp-content',
-            r'wp-includes',
-            r'wordpress',
-        ],
-        "Vercel": [
-            r'vercel',
-            r'_vercel',
-        ],
-        "Shopify": [
-            r'shopify',
-            r'cdn\.shopify\.com',
-        ],
-        "Wix": [
-            r'wix\.com',
-            r'parastorage',
-        ],
-        "Webflow": [
-            r'webflow',
-        ],
-        "Django": [
-            r'django',
-            r'csrfmiddlewaretoken',
-        ],
-        "Flask": [
-            r'flask',
-        ],
-        "Vue.js": [
-            r'vue\.js',
-            r'__vue__',
-        ],
-        "Angular": [
-            r'angular',
-            r'ng-',
-        ],
-        "Bootstrap": [
-            r'bootstrap',
-        ],
-        "Tailwind": [
-            r'tailwind',
-        ],
-        "jQuery": [
-            r'jquery',
-        ],
-    }
+    # Fetches the target website itself, so its timeouts are not a provider outage
+    trips_on_outage = False
 
     def __init__(self):
         """Initialize metadata source (free, fast)"""
@@ -126,7 +72,7 @@ class MetadataSource(EnrichmentSource):
 
         Args:
             domain: Domain to scrape (e.g., "techstart.com")
-            **kwargs: Additional parameters (unused)
+            **kwargs: page - PageSnapshot to reuse instead of fetching (optional)
 
         Returns:
             SourceResult with metadata
@@ -140,34 +86,10 @@ class MetadataSource(EnrichmentSource):
             else:
                 url = domain
 
-            # Fetch website
-            async with httpx.AsyncClient(
-                timeout=self.timeout,
-                follow_redirects=True,
-                headers={"User-Agent": self.user_agent},
-            ) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-
-            # Parse HTML
-            soup = BeautifulSoup(response.text, "html.parser")
-            html_content = response.text.lower()
-
-            # Extract metadata
-            data = {
-                "company_name": self._extract_company_name(soup, domain),
-                "description": self._extract_description(soup),
-                "meta_description": self._extract_meta_description(soup),
-                "meta_keywords": self._extract_meta_keywords(soup),
-                "website_tech": self._detect_technologies(
-                    html_content, response.headers
-                ),
-                "logo_url": self._extract_logo(soup, url),
-                "social_media": self._extract_social_media(soup),
-            }
-
-            # Remove None values
-            data = {k: v for k, v in data.items() if v is not None}
+            # Fetch and parse once (shared with other website-derived extractors)
+            page = kwargs.get("page") or await get_page_snapshot(url, self.user_agent, self.timeout)
+
+            data = self._extract_metadata(page, domain, url)
 
             duration_ms = int((time.time() - start_time) * 1000)
 
@@ -209,19 +131,34 @@ class MetadataSource(EnrichmentSource):
             )
             raise
 
+    def _extract_metadata(
+        self, page: PageSnapshot, domain: str, url: str
+    ) -> Dict[str, Any]:
+        """Run all extractors over a page snapshot (None values removed)"""
+        data = {
+            "company_name": self._extract_company_name(page, domain),
+            "description": self._extract_description(page),
+            "meta_description": self._extract_meta_description(page),
+            "meta_keywords": self._extract_meta_keywords(page),
+            "website_tech": detect_technologies(page),
+            "logo_url": self._extract_logo(page, url),
+            "social_media": self._extract_social_media(page),
+        }
+
+        # Remove None values
+        return {k: v for k, v in data.items() if v is not None}
+
     def _extract_company_name(
-        self, soup: BeautifulSoup, domain: str
+        self, page: PageSnapshot, domain: str
     ) -> Optional[str]:
         """Extract company name from various sources"""
         # Try Open Graph site_name
-        og_site_name = soup.find("meta", property="og:site_name")
-        if og_site_name and og_site_name.get("content"):
-            return og_site_name["content"].strip()
+        if page.meta.get("og:site_name"):
+            return page.meta["og:site_name"]
 
         # Try title tag (remove common suffixes)
-        title = soup.find("title")
-        if title and title.string:
-            name = title.string.strip()
+        if page.title:
+            name = page.title
             # Remove common suffixes
             for suffix in [
                 "- Home",
@@ -238,41 +175,31 @@ class MetadataSource(EnrichmentSource):
         domain_name = domain_name.replace("www.", "").split(".")[0]
         return domain_name.title()
 
-    def _extract_description(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_description(self, page: PageSnapshot) -> Optional[str]:
         """Extract company description (prefer og:description)"""
-        # Try Open Graph description
-        og_desc = soup.find("meta", property="og:description")
-        if og_desc and og_desc.get("content"):
-            return og_desc["content"].strip()
-
-        # Try meta description
-        meta_desc = soup.find("meta", attrs={"name": "description"})
-        if meta_desc and meta_desc.get("content"):
-            return meta_desc["content"].strip()
+        # Try Open Graph description, then meta description
+        description = page.meta.get("og:description") or page.meta.get("description")
+        if description:
+            return description
 
         # Try first paragraph
-        first_p = soup.find("p")
-        if first_p and first_p.string:
-            return first_p.string.strip()[:200]
+        if page.first_paragraph:
+            return page.first_paragraph[:200]
 
         return None
 
     def _extract_meta_description(
-        self, soup: BeautifulSoup
+        self, page: PageSnapshot
     ) -> Optional[str]:
         """Extract meta description tag"""
-        meta_desc = soup.find("meta", attrs={"name": "description"})
-        if meta_desc and meta_desc.get("content"):
-            return meta_desc["content"].strip()
-        return None
+        return page.meta.get("description")
 
     def _extract_meta_keywords(
-        self, soup: BeautifulSoup
+        self, page: PageSnapshot
     ) -> Optional[List[str]]:
         """Extract meta keywords"""
-        meta_keywords = soup.find("meta", attrs={"name": "keywords"})
-        if meta_keywords and meta_keywords.get("content"):
-            keywords = meta_keywords["content"].strip()
+        keywords = page.meta.get("keywords")
+        if keywords:
             # Split by comma and clean
             return [
                 k.strip()
@@ -281,57 +208,24 @@ class MetadataSource(EnrichmentSource):
             ][:10]  # Limit to 10
         return None
 
-    def _detect_technologies(
-        self, html_content: str, headers: Dict[str, str]
-    ) -> List[str]:
-        """Detect technologies used on the website"""
-        detected = []
-
-        # Check HTML content patterns
-        for tech, patterns in self.TECH_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, html_content, re.IGNORECASE):
-                    detected.append(tech)
-                    break  # Only add once
-
-        # Check server headers
-        server = headers.get("server", "").lower()
-        if "nginx" in server:
-            detected.append("Nginx")
-        elif "apache" in server:
-            detected.append("Apache")
-        elif "cloudflare" in server:
-            detected.append("Cloudflare")
-
-        # Check X-Powered-By header
-        powered_by = headers.get("x-powered-by", "").lower()
-        if "php" in powered_by:
-            detected.append("PHP")
-        elif "asp.net" in powered_by:
-            detected.append("ASP.NET")
-
-        # Remove duplicates and return
-        return list(set(detected))
-
     def _extract_logo(
-        self, soup: BeautifulSoup, base_url: str
+        self, page: PageSnapshot, base_url: str
     ) -> Optional[str]:
         """Extract logo URL"""
         # Try Open Graph image
-        og_image = soup.find("meta", property="og:image")
-        if og_image and og_image.get("content"):
-            logo = og_image["content"]
+        logo = page.meta.get("og:image")
+        if logo:
             if logo.startswith("http"):
                 return logo
             elif logo.startswith("/"):
                 return f"{base_url.rstrip('/')}{logo}"
 
         # Try favicon
-        favicon = soup.find("link", rel="icon") or soup.find(
-            "link", rel="shortcut icon"
+        logo = next(
+            (href for rel, href in page.link_tags if "icon" in rel.split()),
+            None
         )
-        if favicon and favicon.get("href"):
-            logo = favicon["href"]
+        if logo:
             if logo.startswith("http"):
                 return logo
             elif logo.startswith("/"):
@@ -340,7 +234,7 @@ class MetadataSource(EnrichmentSource):
         return None
 
     def _extract_social_media(
-        self, soup: BeautifulSoup
+        self, page: PageSnapshot
     ) -> Optional[Dict[str, str]]:
         """Extract social media links"""
         social = {}
@@ -353,10 +247,8 @@ class MetadataSource(EnrichmentSource):
             "instagram": r"instagram\.com/([^/\s\"]+)",
         }
 
-        # Find all links
-        links = soup.find_all("a", href=True)
-        for link in links:
-            href = link["href"]
+        # Only links to known social platforms (indexed by the snapshot)
+        for href in page.social_links:
             for platform, pattern in patterns.items():
                 match = re.search(pattern, href, re.IGNORECASE)
                 if match and platform not in social:
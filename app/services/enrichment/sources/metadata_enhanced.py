@@ -13,11 +13,9 @@ Layer: 1 (Free, <2s)
 
 import logging
 import re
-import json
-from typing import Dict, Any, Optional, List
-from bs4 import BeautifulSoup
+from typing import Dict, Any, Optional
 from .metadata import MetadataSource
-from .base import SourceResult
+from app.services.enrichment.page_snapshot import PageSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -87,45 +85,25 @@ class EnhancedMetadataSource(MetadataSource):
         super().__init__()
         self.name = "metadata_enhanced"
 
-    async def enrich(self, domain: str, **kwargs) -> SourceResult:
+    def _extract_metadata(
+        self, page: PageSnapshot, domain: str, url: str
+    ) -> Dict[str, Any]:
         """
-        Extract enhanced metadata from website.
+        Extract base metadata plus enhanced intelligence from the same snapshot.
 
-        This extends the base MetadataSource.enrich() with additional intelligence.
+        The page is fetched and parsed once by MetadataSource.enrich(); if the
+        enhanced extractors fail the base metadata is returned.
         """
-        # Get base metadata first
-        base_result = await super().enrich(domain, **kwargs)
-
-        if not base_result.success:
-            return base_result
+        base_data = super()._extract_metadata(page, domain, url)
 
-        # Add enhanced intelligence
         try:
-            # Re-fetch for enhanced parsing (we need the soup object)
-            if not domain.startswith(("http://", "https://")):
-                url = f"https://{domain}"
-            else:
-                url = domain
-
-            import httpx
-            async with httpx.AsyncClient(
-                timeout=self.timeout,
-                follow_redirects=True,
-                headers={"User-Agent": self.user_agent},
-            ) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, "html.parser")
-            html_content = response.text
-
             # Enhanced extractions
             enhanced_data = {
-                **base_result.data,  # Keep base metadata
-                **self._extract_structured_data(soup),
-                **self._extract_social_media_enhanced(soup, html_content),
-                **self._extract_contact_info(soup, html_content),
-                "logo_url": self._extract_logo_enhanced(soup, url),
+                **base_data,  # Keep base metadata
+                **self._extract_structured_data(page),
+                **self._extract_social_media_enhanced(page),
+                **self._extract_contact_info(page),
+                "logo_url": self._extract_logo_enhanced(page, url),
             }
 
             # Remove None values
@@ -140,23 +118,17 @@ class EnhancedMetadataSource(MetadataSource):
                 }
             )
 
-            return SourceResult(
-                source_name=self.name,
-                success=True,
-                data=enhanced_data,
-                duration_ms=base_result.duration_ms,
-                cost_usd=0.0,
-            )
+            return enhanced_data
 
         except Exception as e:
             logger.warning(
                 f"[Metadata Enhanced] Failed to enhance metadata for {domain}: {e}",
                 exc_info=True
             )
-            # Return base result if enhancement fails
-            return base_result
+            # Return base metadata if enhancement fails
+            return base_data
 
-    def _extract_structured_data(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _extract_structured_data(self, page: PageSnapshot) -> Dict[str, Any]:
         """
         Extract JSON-LD structured data.
 
@@ -167,50 +139,40 @@ class EnhancedMetadataSource(MetadataSource):
         """
         structured_data = {}
 
-        # Find all JSON-LD scripts
-        json_ld_scripts = soup.find_all("script", type="application/ld+json")
+        # JSON-LD objects were parsed (and arrays flattened) by the snapshot
+        for item in page.json_ld:
+            if not isinstance(item, dict):
+                continue
 
-        for script in json_ld_scripts:
             try:
-                data = json.loads(script.string)
-
-                # Handle both single object and array
-                if isinstance(data, list):
-                    items = data
-                else:
-                    items = [data]
-
-                for item in items:
-                    schema_type = item.get("@type", "")
-
-                    # Organization/LocalBusiness/Corporation
-                    if schema_type in ["Organization", "LocalBusiness", "Corporation"]:
-                        if item.get("name"):
-                            structured_data["company_name"] = item["name"]
-                        if item.get("description"):
-                            structured_data["description"] = item["description"]
-                        if item.get("logo"):
-                            structured_data["logo_url"] = item["logo"]
-                        if item.get("telephone"):
-                            structured_data["phone"] = item["telephone"]
-                        if item.get("address"):
-                            addr = item["address"]
-                            if isinstance(addr, dict):
-                                if addr.get("addressLocality"):
-                                    structured_data["city"] = addr["addressLocality"]
-                                if addr.get("addressRegion"):
-                                    structured_data["region"] = addr["addressRegion"]
-                                if addr.get("addressCountry"):
-                                    structured_data["country"] = addr["addressCountry"]
-                        if item.get("sameAs"):
-                            # Social media links in sameAs
-                            same_as = item["sameAs"]
-                            if isinstance(same_as, list):
-                                for link in same_as:
-                                    self._parse_social_link(link, structured_data)
-
-            except json.JSONDecodeError:
-                continue
+                schema_type = item.get("@type", "")
+
+                # Organization/LocalBusiness/Corporation
+                if schema_type in ["Organization", "LocalBusiness", "Corporation"]:
+                    if item.get("name"):
+                        structured_data["company_name"] = item["name"]
+                    if item.get("description"):
+                        structured_data["description"] = item["description"]
+                    if item.get("logo"):
+                        structured_data["logo_url"] = item["logo"]
+                    if item.get("telephone"):
+                        structured_data["phone"] = item["telephone"]
+                    if item.get("address"):
+                        addr = item["address"]
+                        if isinstance(addr, dict):
+                            if addr.get("addressLocality"):
+                                structured_data["city"] = addr["addressLocality"]
+                            if addr.get("addressRegion"):
+                                structured_data["region"] = addr["addressRegion"]
+                            if addr.get("addressCountry"):
+                                structured_data["country"] = addr["addressCountry"]
+                    if item.get("sameAs"):
+                        # Social media links in sameAs
+                        same_as = item["sameAs"]
+                        if isinstance(same_as, list):
+                            for link in same_as:
+                                self._parse_social_link(link, structured_data)
+
             except Exception as e:
                 logger.debug(f"Failed to parse JSON-LD: {e}")
                 continue
@@ -218,7 +180,7 @@ class EnhancedMetadataSource(MetadataSource):
         return structured_data
 
     def _extract_social_media_enhanced(
-        self, soup: BeautifulSoup, html_content: str
+        self, page: PageSnapshot
     ) -> Dict[str, Any]:
         """
         Enhanced social media detection.
@@ -231,18 +193,15 @@ class EnhancedMetadataSource(MetadataSource):
         """
         social_media = {}
 
-        # Find all links and text
-        links = soup.find_all("a", href=True)
-
-        for link in links:
-            href = link.get("href", "")
+        # Links to known social platforms (indexed by the snapshot)
+        for href in page.social_links:
             self._parse_social_link(href, social_media)
 
         # Also scan raw HTML for patterns
         for platform, patterns in self.SOCIAL_PATTERNS.items():
             if platform not in social_media:
                 for pattern in patterns:
-                    match = re.search(pattern, html_content, re.IGNORECASE)
+                    match = re.search(pattern, page.html, re.IGNORECASE)
                     if match:
                         handle = match.group(1)
                         # Format as full URL
@@ -279,7 +238,7 @@ class EnhancedMetadataSource(MetadataSource):
         return url_formats.get(platform, f"https://{platform}.com/{handle}")
 
     def _extract_contact_info(
-        self, soup: BeautifulSoup, html_content: str
+        self, page: PageSnapshot
     ) -> Dict[str, Any]:
         """
         Extract contact information.
@@ -293,14 +252,13 @@ class EnhancedMetadataSource(MetadataSource):
 
         # WhatsApp
         for pattern in self.CONTACT_PATTERNS["whatsapp"]:
-            match = re.search(pattern, html_content, re.IGNORECASE)
+            match = re.search(pattern, page.html, re.IGNORECASE)
             if match:
                 contacts["whatsapp"] = f"+{match.group(1)}"
                 break
 
         # Phone (look in footer or contact section)
-        footer = soup.find("footer") or soup
-        footer_text = footer.get_text()
+        footer_text = page.footer_text
 
         for pattern in self.CONTACT_PATTERNS["phone"]:
             match = re.search(pattern, footer_text)
@@ -312,15 +270,15 @@ class EnhancedMetadataSource(MetadataSource):
                 break
 
         # Email (look in footer or mailto links)
-        mailto_links = soup.find_all("a", href=re.compile(r'^mailto:', re.I))
-        if mailto_links:
-            email = mailto_links[0].get("href", "").replace("mailto:", "")
+        mailto = next((href for href in page.links if href.lower().startswith("mailto:")), None)
+        if mailto:
+            email = mailto[len("mailto:"):]
             contacts["email"] = email.split("?")[0]  # Remove query params
 
         return contacts
 
     def _extract_logo_enhanced(
-        self, soup: BeautifulSoup, base_url: str
+        self, page: PageSnapshot, base_url: str
     ) -> Optional[str]:
         """
         Enhanced logo extraction from multiple sources.
@@ -335,39 +293,32 @@ class EnhancedMetadataSource(MetadataSource):
         # 1. JSON-LD (already handled in structured data)
 
         # 2. Open Graph image
-        og_image = soup.find("meta", property="og:image")
-        if og_image and og_image.get("content"):
-            logo = og_image["content"]
+        logo = page.meta.get("og:image")
+        if logo:
             if logo.startswith("http"):
                 return logo
             elif logo.startswith("/"):
                 return f"{base_url.rstrip('/')}{logo}"
 
         # 3. Apple touch icon
-        apple_icon = soup.find("link", rel=re.compile(r"apple-touch-icon", re.I))
-        if apple_icon and apple_icon.get("href"):
-            logo = apple_icon["href"]
+        logo = page.first_link("apple-touch-icon")
+        if logo:
             if logo.startswith("http"):
                 return logo
             elif logo.startswith("/"):
                 return f"{base_url.rstrip('/')}{logo}"
 
         # 4. Favicon
-        favicon = soup.find("link", rel=re.compile(r"icon", re.I))
-        if favicon and favicon.get("href"):
-            logo = favicon["href"]
+        logo = page.first_link("icon")
+        if logo:
             if logo.startswith("http"):
                 return logo
             elif logo.startswith("/"):
                 return f"{base_url.rstrip('/')}{logo}"
 
         # 5. <img> with "logo" in class/id
-        logo_imgs = soup.find_all("img", class_=re.compile(r"logo", re.I))
-        if not logo_imgs:
-            logo_imgs = soup.find_all("img", id=re.compile(r"logo", re.I))
-
-        if logo_imgs:
-            logo = logo_imgs[0].get("src", "")
+        if page.logo_images:
+            logo = page.logo_images[0]
             if logo.startswith("http"):
                 return logo
             elif logo.startswith("/"):
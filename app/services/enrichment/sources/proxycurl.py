@@ -24,6 +24,7 @@ from typing import Optional
 import httpx
 from .base import EnrichmentSource, SourceResult
 from app.core.config import get_settings
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -217,22 +218,23 @@ class ProxycurlSource(EnrichmentSource):
             if not params:
                 return None
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    self.COMPANY_SEARCH_ENDPOINT,
-                    headers=headers,
-                    params=params,
-                )
+            client = get_http_client("proxycurl")
+            response = await client.get(
+                self.COMPANY_SEARCH_ENDPOINT,
+                headers=headers,
+                params=params,
+                timeout=self.timeout,
+            )
 
-                # 404 means not found - not an error
-                if response.status_code == 404:
-                    logger.debug(
-                        f"No LinkedIn profile found for domain: {clean_domain}"
-                    )
-                    return None
+            # 404 means not found - not an error
+            if response.status_code == 404:
+                logger.debug(
+                    f"No LinkedIn profile found for domain: {clean_domain}"
+                )
+                return None
 
-                response.raise_for_status()
-                data = response.json()
+            response.raise_for_status()
+            data = response.json()
 
             linkedin_url = data.get("url")
 
@@ -264,14 +266,15 @@ class ProxycurlSource(EnrichmentSource):
         headers = {"Authorization": f"Bearer {self.api_key}"}
         params = {"url": linkedin_url}
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(
-                self.COMPANY_URL_ENDPOINT,
-                headers=headers,
-                params=params,
-            )
-            response.raise_for_status()
-            data = response.json()
+        client = get_http_client("proxycurl")
+        response = await client.get(
+            self.COMPANY_URL_ENDPOINT,
+            headers=headers,
+            params=params,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        data = response.json()
 
         # Extract and normalize data
         enriched_data = {}
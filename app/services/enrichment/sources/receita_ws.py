@@ -25,6 +25,7 @@ import re
 from typing import Optional
 import httpx
 from .base import EnrichmentSource, SourceResult
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -163,10 +164,10 @@ class ReceitaWSSource(EnrichmentSource):
 
             # Query ReceitaWS search API
             url = self.SEARCH_URL.format(name=search_name)
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                data = response.json()
+            client = get_http_client("receita_ws")
+            response = await client.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
 
             # ReceitaWS returns array of matches
             if isinstance(data, list) and len(data) > 0:
@@ -206,10 +207,10 @@ class ReceitaWSSource(EnrichmentSource):
             Exception if CNPJ not found or API error
         """
         url = self.CNPJ_URL.format(cnpj=cnpj)
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            data = response.json()
+        client = get_http_client("receita_ws")
+        response = await client.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
 
         # Check for API error
         if data.get("status") == "ERROR":
@@ -0,0 +1,177 @@
+"""
+Technology Fingerprints - Compiled single-pass technology detection
+Fingerprints are loaded from a JSON data file and compiled once into a single
+matcher per input (HTML, script src), plus per-name rules for headers and meta tags.
+"""
+
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+from app.core.config import get_settings
+from app.services.enrichment.page_snapshot import PageSnapshot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FINGERPRINTS_FILE = Path(__file__).parent / "data" / "tech_fingerprints.json"
+
+
+def _lowercase_pattern(pattern: str) -> str:
+    """Lowercase a regex for matching lowercased text, leaving escapes (\\S, \\D, ...) intact"""
+    out = []
+    escaped = False
+    for ch in pattern:
+        out.append(ch if escaped else ch.lower())
+        escaped = not escaped and ch == "\\"
+    return "".join(out)
+
+
+def _compile_rule(tech: str, pattern: str, allow_empty: bool = False) -> Pattern:
+    if not pattern and not allow_empty:
+        raise ValueError(f"Empty pattern for {tech}")
+    compiled = re.compile(_lowercase_pattern(pattern))
+    if compiled.groups:
+        # Capturing groups disable the literal-prefix scan of the combined matcher
+        raise ValueError(f"Pattern {pattern!r} for {tech} has capturing groups; use (?:...)")
+    return compiled
+
+
+class _Matcher:
+    """
+    One compiled alternation over many patterns, scanned once per document
+
+    The alternation only finds candidate positions; at each one the individual
+    patterns of still-undetected technologies are tried, so a token overlapping
+    another technology's match is not missed.
+    """
+
+    def __init__(self, rules: Dict[str, List[str]]):
+        self.rules: List[Tuple[Pattern, Set[str]]] = [
+            (re.compile(pattern), set(techs)) for pattern, techs in rules.items()
+        ]
+        self.combined: Optional[Pattern] = (
+            re.compile("|".join(f"(?:{pattern})" for pattern in rules)) if rules else None
+        )
+        self.techs: Set[str] = set().union(*(techs for _, techs in self.rules)) if self.rules else set()
+
+    def scan(self, text: str, found: Set[str]) -> None:
+        if self.combined is None or not text:
+            return
+        search = self.combined.search
+        pos = 0
+        while not self.techs <= found:
+            match = search(text, pos)
+            if match is None:
+                return
+            start = match.start()
+            for pattern, techs in self.rules:
+                if not techs <= found and pattern.match(text, start):
+                    found |= techs
+            pos = start + 1
+
+
+class TechFingerprintEngine:
+    """
+    Detect website technologies from HTML, script sources, headers and meta tags
+
+    Fingerprint format (one entry per technology, every key optional):
+        {"Next.js": {"html": ["_next/static"], "scripts": ["/_next/"],
+                     "headers": {"x-powered-by": "next\\\\.js"},
+                     "meta": {"generator": "..."}}}
+
+    Patterns are case-insensitive regexes without capturing groups. Header
+    and meta patterns may be empty to match on presence alone.
+
+    Example:
+        engine = TechFingerprintEngine.from_files(DEFAULT_FINGERPRINTS_FILE, "extra.json")
+        engine.detect_page(page)  # ["React", "Next.js", "Nginx"]
+    """
+
+    def __init__(self, fingerprints: Dict[str, Dict[str, Any]]):
+        self.fingerprints = fingerprints
+
+        html_rules: Dict[str, List[str]] = {}
+        script_rules: Dict[str, List[str]] = {}
+        self._header_rules: Dict[str, List[Tuple[Pattern, str]]] = {}
+        self._meta_rules: Dict[str, List[Tuple[Pattern, str]]] = {}
+
+        for tech, spec in fingerprints.items():
+            for key, rules in (("html", html_rules), ("scripts", script_rules)):
+                for pattern in spec.get(key, []):
+                    # Identical patterns are scanned once for every technology using them
+                    rules.setdefault(_compile_rule(tech, pattern).pattern, []).append(tech)
+            for key, rules in (("headers", self._header_rules), ("meta", self._meta_rules)):
+                for name, pattern in spec.get(key, {}).items():
+                    rules.setdefault(name.lower(), []).append((_compile_rule(tech, pattern, allow_empty=True), tech))
+
+        self._html = _Matcher(html_rules)
+        self._scripts = _Matcher(script_rules)
+
+    @classmethod
+    def from_files(cls, *paths: Any) -> "TechFingerprintEngine":
+        """Load and merge fingerprint files (later files replace same-named technologies)"""
+        fingerprints: Dict[str, Dict[str, Any]] = {}
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                fingerprints.update(json.load(f))
+        return cls(fingerprints)
+
+    def detect(
+        self,
+        html_lower: str = "",
+        headers: Optional[Dict[str, str]] = None,
+        scripts: Iterable[str] = (),
+        meta: Optional[Dict[str, str]] = None
+    ) -> List[str]:
+        """
+        Detected technologies, in fingerprint-file order
+
+        Args:
+            html_lower: Lowercased page HTML
+            headers: Response headers (lowercased names)
+            scripts: src of external scripts
+            meta: Meta name/property → content (lowercased names)
+        """
+        found: Set[str] = set()
+
+        self._html.scan(html_lower, found)
+        self._scripts.scan("\n".join(scripts).lower(), found)
+
+        for values, rules in ((headers or {}, self._header_rules), (meta or {}, self._meta_rules)):
+            for name, name_rules in rules.items():
+                value = values.get(name)
+                if value is None:
+                    continue
+                value = value.lower()
+                for pattern, tech in name_rules:
+                    if tech not in found and pattern.search(value):
+                        found.add(tech)
+
+        return [tech for tech in self.fingerprints if tech in found]
+
+    def detect_page(self, page: PageSnapshot) -> List[str]:
+        """Detect technologies on a PageSnapshot"""
+        return self.detect(page.html_lower, page.headers, page.scripts, page.meta)
+
+
+_engine: Optional[TechFingerprintEngine] = None
+
+
+def get_fingerprint_engine() -> TechFingerprintEngine:
+    """Shared engine: bundled fingerprints plus settings.tech_fingerprints_file (compiled once)"""
+    global _engine
+    if _engine is None:
+        paths: List[Any] = [DEFAULT_FINGERPRINTS_FILE]
+        extra = get_settings().tech_fingerprints_file
+        if extra:
+            paths.append(extra)
+        _engine = TechFingerprintEngine.from_files(*paths)
+        logger.info(f"[Fingerprints] Compiled {len(_engine.fingerprints)} technology fingerprints")
+    return _engine
+
+
+def detect_technologies(page: PageSnapshot) -> List[str]:
+    """Detect technologies on a PageSnapshot with the shared engine"""
+    return get_fingerprint_engine().detect_page(page)
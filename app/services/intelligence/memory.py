@@ -2,21 +2,21 @@
 Institutional Memory & Caching System
 Store and reuse key findings across analyses to reduce costs and improve quality
 
-Uses Supabase for persistent storage + in-memory caching
+Uses Supabase for persistent storage + bounded memory/Redis tiers (app/core/tiered_cache.py)
 """
 
 import json
 import hashlib
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime, timedelta, timezone
 from app.core.supabase import supabase_service
+from app.core.tiered_cache import PersistentTier, TieredCache
 import logging
 
 logger = logging.getLogger(__name__)
 
-# In-memory cache (resets on restart, but fast)
-_memory_cache: Dict[str, Dict[str, Any]] = {}
 CACHE_TTL_HOURS = 24 * 7  # 7 days
+MEMORY_MAX_AGE_HOURS = 24 * 30  # Longest max_age_hours any caller asks for
 
 # Table names (create via Supabase SQL)
 MEMORY_TABLE = "institutional_memory"
@@ -36,71 +36,130 @@ def generate_hash(content: str) -> str:
     return hashlib.sha256(content.encode()).hexdigest()[:16]
 
 
+def _hours_since(timestamp: str) -> float:
+    accessed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    if accessed.tzinfo is not None:
+        accessed = accessed.astimezone(timezone.utc).replace(tzinfo=None)
+    return (datetime.utcnow() - accessed).total_seconds() / 3600
+
+
 # ============================================================================
 # MEMORY STORAGE (Supabase)
 # ============================================================================
 
-async def store_memory(
-    entity_type: str,  # "company", "competitor", "industry_trends", "market_data"
-    entity_id: str,  # Company name, competitor name, industry name
-    data: Dict[str, Any],
-    source: str = "analysis",  # Where this came from
-    confidence: float = 0.8  # How confident are we in this data
-) -> bool:
+class _InstitutionalMemoryTable(PersistentTier):
     """
-    Store institutional memory in Supabase
+    institutional_memory rows, deduplicated by content hash
 
-    Args:
-        entity_type: Type of entity (company, competitor, industry_trends, market_data)
-        entity_id: Unique identifier (company name, etc.)
-        data: The actual data to store
-        source: Where this data came from (analysis, apify, perplexity)
-        confidence: Confidence score 0-1
+    Cached values are {"data": ..., "accessed_at": iso timestamp}; callers
+    apply their own max_age_hours to accessed_at.
     """
-    try:
-        cache_key = generate_cache_key(entity_type, entity_id)
-        content_hash = generate_hash(json.dumps(data, sort_keys=True))
+
+    async def load(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        cutoff_time = (datetime.utcnow() - timedelta(hours=MEMORY_MAX_AGE_HOURS)).isoformat()
+
+        result = supabase_service.table(MEMORY_TABLE)\
+            .select("*")\
+            .eq("cache_key", key)\
+            .gte("last_accessed_at", cutoff_time)\
+            .order("confidence", desc=True)\
+            .limit(1)\
+            .execute()
+
+        if not result.data:
+            return None
+
+        record = result.data[0]
+
+        # Update access stats
+        supabase_service.table(MEMORY_TABLE)\
+            .update({
+                "last_accessed_at": datetime.utcnow().isoformat(),
+                "access_count": record["access_count"] + 1
+            })\
+            .eq("id", record["id"])\
+            .execute()
+
+        logger.info(f"[MEMORY] Database cache hit: {key} (age: {record['created_at']})")
+        return {"data": json.loads(record["data"]), "accessed_at": record["last_accessed_at"]}, None
+
+    async def store(self, key: str, value: Any, ttl_seconds: float, metadata: Dict[str, Any]) -> bool:
+        content_hash = generate_hash(json.dumps(value["data"], sort_keys=True))
 
         # Check if exact same data already exists
         existing = supabase_service.table(MEMORY_TABLE)\
-            .select("id, data")\
-            .eq("cache_key", cache_key)\
+            .select("id")\
+            .eq("cache_key", key)\
             .eq("content_hash", content_hash)\
             .execute()
 
         if existing.data and len(existing.data) > 0:
             # Update last_accessed timestamp
             supabase_service.table(MEMORY_TABLE)\
-                .update({"last_accessed_at": datetime.utcnow().isoformat()})\
+                .update({"last_accessed_at": value["accessed_at"]})\
                 .eq("id", existing.data[0]["id"])\
                 .execute()
 
-            logger.info(f"[MEMORY] Cache hit: {cache_key} (updated timestamp)")
-            _memory_cache[cache_key] = existing.data[0]["data"]
+            logger.info(f"[MEMORY] Cache hit: {key} (updated timestamp)")
             return True
 
         # Store new memory
         record = {
-            "entity_type": entity_type,
-            "entity_id": entity_id.lower().strip(),
-            "cache_key": cache_key,
+            "entity_type": metadata["entity_type"],
+            "entity_id": metadata["entity_id"].lower().strip(),
+            "cache_key": key,
             "content_hash": content_hash,
-            "data": json.dumps(data, ensure_ascii=False),
-            "source": source,
-            "confidence": confidence,
-            "created_at": datetime.utcnow().isoformat(),
-            "last_accessed_at": datetime.utcnow().isoformat(),
+            "data": json.dumps(value["data"], ensure_ascii=False),
+            "source": metadata["source"],
+            "confidence": metadata["confidence"],
+            "created_at": value["accessed_at"],
+            "last_accessed_at": value["accessed_at"],
             "access_count": 1
         }
 
         result = supabase_service.table(MEMORY_TABLE).insert(record).execute()
-
         if result.data:
-            _memory_cache[cache_key] = data
-            logger.info(f"[MEMORY] Stored new memory: {cache_key}")
-            return True
+            logger.info(f"[MEMORY] Stored new memory: {key}")
+        return bool(result.data)
 
-        return False
+
+# Bounded memory + Redis tiers over the institutional_memory table
+_memory_cache = TieredCache(
+    "institutional_memory",
+    ttl_seconds=MEMORY_MAX_AGE_HOURS * 3600,
+    persistence=_InstitutionalMemoryTable(),
+    redis=True
+)
+
+
+async def store_memory(
+    entity_type: str,  # "company", "competitor", "industry_trends", "market_data"
+    entity_id: str,  # Company name, competitor name, industry name
+    data: Dict[str, Any],
+    source: str = "analysis",  # Where this came from
+    confidence: float = 0.8  # How confident are we in this data
+) -> bool:
+    """
+    Store institutional memory in Supabase
+
+    Args:
+        entity_type: Type of entity (company, competitor, industry_trends, market_data)
+        entity_id: Unique identifier (company name, etc.)
+        data: The actual data to store
+        source: Where this data came from (analysis, apify, perplexity)
+        confidence: Confidence score 0-1
+    """
+    try:
+        return await _memory_cache.set(
+            generate_cache_key(entity_type, entity_id),
+            {"data": data, "accessed_at": datetime.utcnow().isoformat()},
+            metadata={
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "source": source,
+                "confidence": confidence
+            }
+        )
 
     except Exception as e:
         logger.error(f"[MEMORY] Failed to store memory: {str(e)}")
@@ -120,43 +179,12 @@ async def retrieve_memory(
     try:
         cache_key = generate_cache_key(entity_type, entity_id)
 
-        # Check in-memory cache first
-        if cache_key in _memory_cache:
-            logger.info(f"[MEMORY] In-memory cache hit: {cache_key}")
-            return _memory_cache[cache_key]
-
-        # Query Supabase
-        cutoff_time = (datetime.utcnow() - timedelta(hours=max_age_hours)).isoformat()
+        cached = await _memory_cache.get(cache_key)
+        if cached is None or _hours_since(cached["accessed_at"]) > max_age_hours:
+            logger.info(f"[MEMORY] Cache miss: {cache_key}")
+            return None
 
-        result = supabase_service.table(MEMORY_TABLE)\
-            .select("*")\
-            .eq("cache_key", cache_key)\
-            .gte("last_accessed_at", cutoff_time)\
-            .order("confidence", desc=True)\
-            .limit(1)\
-            .execute()
-
-        if result.data and len(result.data) > 0:
-            record = result.data[0]
-
-            # Update access stats
-            supabase_service.table(MEMORY_TABLE)\
-                .update({
-                    "last_accessed_at": datetime.utcnow().isoformat(),
-                    "access_count": record["access_count"] + 1
-                })\
-                .eq("id", record["id"])\
-                .execute()
-
-            # Parse and cache
-            data = json.loads(record["data"])
-            _memory_cache[cache_key] = data
-
-            logger.info(f"[MEMORY] Database cache hit: {cache_key} (age: {record['created_at']})")
-            return data
-
-        logger.info(f"[MEMORY] Cache miss: {cache_key}")
-        return None
+        return cached["data"]
 
     except Exception as e:
         logger.error(f"[MEMORY] Failed to retrieve memory: {str(e)}")
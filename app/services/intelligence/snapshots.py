@@ -0,0 +1,140 @@
+"""
+Dashboard Intelligence Snapshots
+
+Dashboard intelligence is generated off the request path: the worker refreshes
+a snapshot per period on a schedule (and admins can force a refresh), and the
+admin endpoint only reads the latest snapshot from the stats cache.
+
+Generation reads the trigger-maintained daily counters (dashboard_daily_stats)
+for the period totals and only the newest projected rows of the period for the
+challenge and risk reviews - never every submission.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from app.core.cache import (
+    cache_dashboard_intelligence,
+    dashboard_intelligence_key,
+    get_cached_dashboard_intelligence,
+)
+from app.core.constants import (
+    DASHBOARD_INTELLIGENCE_DAYS,
+    DASHBOARD_INTELLIGENCE_MAX_SUBMISSIONS,
+    DASHBOARD_INTELLIGENCE_REFRESH_SECONDS,
+    DASHBOARD_INTELLIGENCE_REFRESH_WAIT_SECONDS,
+)
+from app.core.database import get_dashboard_daily_stats, list_submissions_created_since
+from app.core.single_flight import single_flight
+from app.services.intelligence.dashboard import generate_dashboard_intelligence, merge_daily_stats
+
+logger = logging.getLogger(__name__)
+
+
+async def build_dashboard_intelligence(days: int) -> Dict[str, Any]:
+    """
+    Generate dashboard intelligence for the last `days` days (UTC calendar days, today included)
+
+    The previous period of the same length feeds the trend analysis.
+    """
+    today = datetime.now(timezone.utc).date()
+    current_start = today - timedelta(days=days - 1)
+    previous_start = current_start - timedelta(days=days)
+
+    rows, submissions = await asyncio.gather(
+        get_dashboard_daily_stats(previous_start.isoformat()),
+        list_submissions_created_since(current_start.isoformat(), DASHBOARD_INTELLIGENCE_MAX_SUBMISSIONS)
+    )
+
+    current_stats = merge_daily_stats(row for row in rows if row["day"] >= current_start.isoformat())
+    previous_stats = merge_daily_stats(row for row in rows if row["day"] < current_start.isoformat())
+
+    logger.info(
+        f"[DASHBOARD AI] Snapshot {days}d: {current_stats['total_submissions']} current + "
+        f"{previous_stats['total_submissions']} previous submissions ({len(submissions)} reviewed)"
+    )
+
+    return await generate_dashboard_intelligence(
+        current_submissions=submissions,
+        current_stats=current_stats,
+        previous_stats=previous_stats,
+        days=days
+    )
+
+
+async def refresh_dashboard_intelligence(days: int) -> Dict[str, Any]:
+    """
+    Regenerate and store the snapshot for a period
+
+    Concurrent refreshes (admin clicks, schedulers in several workers) share one
+    generation. A failed generation is returned but never replaces the stored
+    snapshot.
+    """
+    requested_at = datetime.now(timezone.utc)
+
+    async def compute() -> Dict[str, Any]:
+        intelligence = await build_dashboard_intelligence(days)
+        if "error" not in intelligence:
+            intelligence["snapshot_generated_at"] = datetime.now(timezone.utc).isoformat()
+            await cache_dashboard_intelligence(days, intelligence)
+        return intelligence
+
+    async def lookup() -> Optional[Dict[str, Any]]:
+        # Another process's result counts only if it was generated after this request
+        snapshot = await get_cached_dashboard_intelligence(days)
+        if snapshot and _generated_at(snapshot) >= requested_at:
+            return snapshot
+        return None
+
+    return await single_flight.run(
+        dashboard_intelligence_key(days),
+        compute,
+        lookup,
+        wait_timeout=DASHBOARD_INTELLIGENCE_REFRESH_WAIT_SECONDS
+    )
+
+
+def _generated_at(snapshot: Dict[str, Any]) -> datetime:
+    try:
+        return datetime.fromisoformat(snapshot["snapshot_generated_at"])
+    except (KeyError, TypeError, ValueError):
+        return datetime.min.replace(tzinfo=timezone.utc)
+
+
+def snapshot_age_seconds(snapshot: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Seconds since the snapshot was generated (None without a snapshot)"""
+    if not snapshot:
+        return None
+    return (datetime.now(timezone.utc) - _generated_at(snapshot)).total_seconds()
+
+
+async def run_dashboard_snapshot_schedule(
+    interval_seconds: float = DASHBOARD_INTELLIGENCE_REFRESH_SECONDS,
+    periods=DASHBOARD_INTELLIGENCE_DAYS
+) -> None:
+    """
+    Keep the scheduled periods' snapshots at most interval_seconds old (runs until cancelled)
+
+    Snapshots refreshed elsewhere (admin refresh, another worker) push the next
+    run back, so several workers do not regenerate the same period.
+    """
+    logger.info(f"[DASHBOARD AI] Snapshot schedule started (every {interval_seconds:.0f}s for {list(periods)} days)")
+    while True:
+        next_due = interval_seconds
+        for days in periods:
+            try:
+                age = snapshot_age_seconds(await get_cached_dashboard_intelligence(days))
+                if age is None or age >= interval_seconds:
+                    snapshot = await refresh_dashboard_intelligence(days)
+                    age = 0 if "error" not in snapshot else None
+                if age is not None:
+                    next_due = min(next_due, interval_seconds - age)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep serving the previous snapshot; retry on the next run
+                logger.error(f"[DASHBOARD AI] Scheduled snapshot ({days}d) failed: {str(e)}", exc_info=True)
+
+        await asyncio.sleep(max(next_due, 60))
@@ -0,0 +1,172 @@
+"""
+PDF Artifact Store - Content-addressed report PDFs
+Artifacts are keyed by report content + rendered submission fields + renderer
+version (see generate_pdf_cache_key), cached in memory over Supabase Storage,
+rendered off the event loop and pre-rendered when a report changes.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.core.cache import cache_pdf, generate_pdf_cache_key, get_cached_pdf
+from app.core.database import get_submission
+from app.core.offload import offload, offload_executor
+from app.services.pdf_generator import generate_pdf_from_report
+
+logger = logging.getLogger(__name__)
+
+
+def pdf_render_inputs(submission: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Build (submission_data, report_json) for the PDF renderer from a submission row
+
+    Uses edited_json if available, otherwise report_json. Only the date of the
+    last edit/update is kept since that is all the PDF prints - unrelated row
+    updates on the same day do not invalidate the artifact.
+
+    Returns:
+        None if the report is not generated yet
+
+    Raises:
+        json.JSONDecodeError: If the stored report is not valid JSON
+    """
+    report_json_str = submission.get("edited_json") or submission.get("report_json")
+    if not report_json_str:
+        return None
+
+    report_json = json.loads(report_json_str)
+    submission_data = {
+        "company": submission.get("company", ""),
+        "industry": submission.get("industry", ""),
+        "website": submission.get("website", ""),
+        "challenge": submission.get("challenge", ""),
+        "name": submission.get("name", ""),
+        "updated_at": (submission.get("last_edited_at") or submission.get("updated_at") or "")[:10]
+    }
+    return submission_data, report_json
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value matches etag (weak comparison, RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class PdfArtifactStore:
+    """
+    Get-or-render for report PDFs
+
+    Identical concurrent requests (an admin double-clicking export while the
+    pre-render is still running) share a single render.
+
+    Example:
+        etag = pdf_artifact_store.etag(submission_data, report_json)
+        pdf_bytes = await pdf_artifact_store.get(submission_id, submission_data, report_json)
+        pdf_artifact_store.schedule_prerender(submission_id)
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._background: Set[asyncio.Task] = set()
+        self.stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "coalesced": 0,
+            "renders": 0,
+            "prerenders": 0
+        }
+
+    @staticmethod
+    def etag(submission_data: Dict[str, Any], report_json: Dict[str, Any]) -> str:
+        """Strong ETag of the artifact - known without rendering or loading it"""
+        return f'"{generate_pdf_cache_key(report_json, submission_data)}"'
+
+    async def get(
+        self,
+        submission_id: int,
+        submission_data: Dict[str, Any],
+        report_json: Dict[str, Any]
+    ) -> bytes:
+        """Return the PDF from cache, an identical in-flight render, or a new render"""
+        self.stats["requests"] += 1
+        cache_key = generate_pdf_cache_key(report_json, submission_data)
+
+        task = self._in_flight.get(cache_key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            logger.info(f"[PDF] Joining in-flight render {cache_key}")
+        else:
+            # Own task so a disconnected client does not cancel a shared render
+            task = asyncio.create_task(self._resolve(submission_id, submission_data, report_json))
+            self._in_flight[cache_key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(cache_key, None))
+
+        return await asyncio.shield(task)
+
+    async def _resolve(
+        self,
+        submission_id: int,
+        submission_data: Dict[str, Any],
+        report_json: Dict[str, Any]
+    ) -> bytes:
+        cached = await get_cached_pdf(report_json, submission_data)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+
+        logger.info(f"[PDF] Rendering PDF for submission {submission_id}...")
+        self.stats["renders"] += 1
+        pdf_bytes = await self._render(submission_data, report_json)
+        if not pdf_bytes:
+            raise ValueError("PDF generation failed - empty output")
+
+        logger.info(f"[PDF] PDF rendered for submission {submission_id} ({len(pdf_bytes)} bytes)")
+        await cache_pdf(report_json, pdf_bytes, submission_id, submission_data)
+        return pdf_bytes
+
+    @staticmethod
+    async def _render(submission_data: Dict[str, Any], report_json: Dict[str, Any]) -> bytes:
+        if offload_executor.started:
+            # fpdf rendering is heavy whatever the report size, so bypass inline routing
+            return await offload(
+                generate_pdf_from_report, submission_data, report_json,
+                size=offload_executor.inline_threshold
+            )
+        return await asyncio.to_thread(generate_pdf_from_report, submission_data, report_json)
+
+    async def prerender(self, submission_id: int) -> bool:
+        """Render and store the current PDF of a submission (never raises)"""
+        try:
+            submission = await get_submission(submission_id)
+            inputs = pdf_render_inputs(submission) if submission else None
+            if inputs is None:
+                return False
+
+            self.stats["prerenders"] += 1
+            await self.get(submission_id, *inputs)
+            return True
+
+        except Exception as e:
+            # Pre-rendering is an optimization; the download path renders on demand
+            logger.warning(f"[PDF] Pre-render failed for submission {submission_id}: {e}")
+            return False
+
+    def schedule_prerender(self, submission_id: int) -> None:
+        """Pre-render in the background of the running event loop"""
+        task = asyncio.create_task(self.prerender(submission_id))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Store counters plus in-flight renders"""
+        return {**self.stats, "in_flight": len(self._in_flight)}
+
+
+# Global PDF artifact store instance
+pdf_artifact_store = PdfArtifactStore()
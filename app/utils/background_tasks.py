@@ -20,7 +20,11 @@ from app.services.analysis.confidence_scorer import calculate_confidence_score
 from app.services.data.apify import gather_all_apify_data
 from app.services.data.perplexity import comprehensive_market_research
 import app.services.data.perplexity as perplexity_service
-from app.core.cache import get_cached_analysis, cache_analysis_result
+from app.core.cache import get_cached_analysis, cache_analysis_result, generate_analysis_cache_key
+from app.core.constants import SINGLE_FLIGHT_ANALYSIS_WAIT_SECONDS
+from app.core.single_flight import single_flight
+from app.core.progress_bus import progress_bus
+from app.services.pdf_store import pdf_artifact_store
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +33,9 @@ logger = logging.getLogger(__name__)
 # PROGRESS TRACKING FOR SSE STREAMING
 # ============================================================================
 
-# In-memory progress tracker (maps submission_id -> progress updates)
-_progress_tracker: Dict[int, List[Dict]] = {}
+def progress_channel(submission_id: int) -> str:
+    """Progress bus channel for a submission"""
+    return f"analysis:{submission_id}"
 
 
 def emit_progress(submission_id: int, stage: str, message: str, progress: int):
@@ -43,9 +48,6 @@ def emit_progress(submission_id: int, stage: str, message: str, progress: int):
         message: Human-readable progress message
         progress: Progress percentage (0-100)
     """
-    if submission_id not in _progress_tracker:
-        _progress_tracker[submission_id] = []
-
     update = {
         "stage": stage,
         "message": message,
@@ -53,19 +55,18 @@ def emit_progress(submission_id: int, stage: str, message: str, progress: int):
         "timestamp": datetime.utcnow().isoformat()
     }
 
-    _progress_tracker[submission_id].append(update)
+    progress_bus.publish(progress_channel(submission_id), update)
     logger.info(f"[PROGRESS] Submission {submission_id}: {progress}% - {message}")
 
 
 def get_progress_updates(submission_id: int) -> List[Dict]:
-    """Get all progress updates for a submission"""
-    return _progress_tracker.get(submission_id, [])
+    """Get progress updates retained in this process for a submission"""
+    return progress_bus.history(progress_channel(submission_id))
 
 
 def clear_progress(submission_id: int):
-    """Clear progress tracking for a submission (after completion)"""
-    if submission_id in _progress_tracker:
-        del _progress_tracker[submission_id]
+    """Clear locally retained progress for a submission"""
+    progress_bus.clear(progress_channel(submission_id))
 
 
 # ============================================================================
@@ -240,41 +241,71 @@ async def process_analysis_task(
             emit_progress(submission_id, "ai_analysis", "Gerando análise estratégica com IA (pipeline de 6 etapas)", 60)
 
             start_time = time.time()
-
-            # Generate analysis
-            # If enrichment_data provided (Phase 1 cache), pass it along to avoid re-scraping
-            analysis = await generate_multistage_analysis(
-                company=submission["company"],
-                industry=submission["industry"],
-                website=submission.get("website"),
-                challenge=submission.get("challenge"),
-                apify_data=apify_data,
-                perplexity_data=perplexity_data,
-                enrichment_data=enrichment_data,  # NEW: Reuse Phase 1 data if available
-                run_all_stages=True,
-                perplexity_service=perplexity_service,
-                submission_id=submission_id  # Pass submission ID for comprehensive logging
+            ran_pipeline = False
+
+            async def generate_and_cache():
+                nonlocal ran_pipeline
+                ran_pipeline = True
+
+                # Generate analysis
+                # If enrichment_data provided (Phase 1 cache), pass it along to avoid re-scraping
+                generated = await generate_multistage_analysis(
+                    company=submission["company"],
+                    industry=submission["industry"],
+                    website=submission.get("website"),
+                    challenge=submission.get("challenge"),
+                    apify_data=apify_data,
+                    perplexity_data=perplexity_data,
+                    enrichment_data=enrichment_data,  # NEW: Reuse Phase 1 data if available
+                    run_all_stages=True,
+                    perplexity_service=perplexity_service,
+                    submission_id=submission_id  # Pass submission ID for comprehensive logging
+                )
+
+                # Get ACTUAL cost from analysis metadata (comprehensive logging tracks real token usage)
+                # Smart 6-stage pipeline: Premium models for client work, budget for backend
+                # - Stages 1-2 (backend): Gemini Flash (~$0.005)
+                # - Stages 3-6 (client-facing): GPT-4o, Gemini Pro, Claude Sonnet (~$0.40)
+                # Total: ~$0.41-0.47 per analysis - WORTH IT for quality client deliverables!
+                actual_cost = generated.get("_metadata", {}).get("total_cost_actual_usd", 0.41)
+                estimated_cost = actual_cost  # Use actual cost for accurate tracking
+                await cache_analysis_result(
+                    company=submission["company"],
+                    industry=submission["industry"],
+                    challenge=submission.get("challenge"),
+                    website=submission.get("website"),
+                    analysis_result=generated,
+                    cost=estimated_cost,
+                    processing_time=time.time() - start_time
+                )
+                logger.info(f"[CACHE] ✅ Analysis cached - will save ${estimated_cost:.2f} on next request")
+                return generated
+
+            async def read_cached_analysis():
+                cached = await get_cached_analysis(
+                    company=submission["company"],
+                    industry=submission["industry"],
+                    challenge=submission.get("challenge"),
+                    website=submission.get("website")
+                )
+                return cached["analysis"] if cached else None
+
+            # Identical submissions in flight at the same time (in this or another worker) share one pipeline run
+            analysis = await single_flight.run(
+                generate_analysis_cache_key(
+                    submission["company"],
+                    submission["industry"],
+                    submission.get("challenge"),
+                    submission.get("website")
+                ),
+                generate_and_cache,
+                read_cached_analysis,
+                wait_timeout=SINGLE_FLIGHT_ANALYSIS_WAIT_SECONDS
             )
 
             processing_time = time.time() - start_time
-
-            # Get ACTUAL cost from analysis metadata (comprehensive logging tracks real token usage)
-            # Smart 6-stage pipeline: Premium models for client work, budget for backend
-            # - Stages 1-2 (backend): Gemini Flash (~$0.005)
-            # - Stages 3-6 (client-facing): GPT-4o, Gemini Pro, Claude Sonnet (~$0.40)
-            # Total: ~$0.41-0.47 per analysis - WORTH IT for quality client deliverables!
-            actual_cost = analysis.get("_metadata", {}).get("total_cost_actual_usd", 0.41)
-            estimated_cost = actual_cost  # Use actual cost for accurate tracking
-            await cache_analysis_result(
-                company=submission["company"],
-                industry=submission["industry"],
-                challenge=submission.get("challenge"),
-                website=submission.get("website"),
-                analysis_result=analysis,
-                cost=estimated_cost,
-                processing_time=processing_time
-            )
-            logger.info(f"[CACHE] ✅ Analysis cached - will save ${estimated_cost:.2f} on next request")
+            if not ran_pipeline:
+                logger.info("[CACHE] 🤝 Reused analysis generated for an identical concurrent submission")
 
         # Add data disclaimer if needed
         if data_quality["quality_tier"] in ["partial", "minimal"]:
@@ -282,9 +313,8 @@ async def process_analysis_task(
             if data_quality["failed_sources"]:
                 disclaimer += f"Fontes indisponíveis: {', '.join(data_quality['failed_sources'])}. "
             disclaimer += "A análise foi feita com base nas informações públicas disponíveis."
-            if "_metadata" not in analysis:
-                analysis["_metadata"] = {}
-            analysis["_metadata"]["data_disclaimer"] = disclaimer
+            # Copy rather than mutate: the dict is shared with the cache and concurrent identical submissions
+            analysis = {**analysis, "_metadata": {**analysis.get("_metadata", {}), "data_disclaimer": disclaimer}}
 
         # Extract processing metadata
         processing_meta = {
@@ -362,6 +392,9 @@ async def process_analysis_task(
         # Progress: Complete
         emit_progress(submission_id, "completed", f"✅ Relatório concluído! Qualidade: {data_quality['quality_tier'].upper()}", 100)
 
+        # Pre-render the PDF so the first admin download is served from the artifact store
+        await pdf_artifact_store.prerender(submission_id)
+
     except Exception as e:
         error_message = str(e)
         logger.error(f"[ERROR] Analysis failed for submission {submission_id}: {error_message}", exc_info=True)
@@ -116,6 +116,23 @@ class AnalysisLogger:
                 }
             )
 
+    def log_prompt_context(self, stage_name: str, prompt_context: Dict[str, Any]):
+        """Log estimated input tokens of the JSON context embedded in a stage prompt"""
+        stage_data = next((s for s in self.stages if s["stage"] == stage_name), None)
+        if stage_data is not None:
+            stage_data["prompt_context"] = prompt_context
+
+        saved = prompt_context.get("original_tokens", 0) - prompt_context.get("context_tokens", 0)
+        logger.info(
+            f"[PROMPT CONTEXT] {stage_name} - ~{prompt_context.get('context_tokens', 0)} tokens "
+            f"(~{saved} saved{', truncated' if prompt_context.get('truncated') else ''})",
+            extra={
+                "submission_id": self.submission_id,
+                "stage": stage_name,
+                "prompt_context": prompt_context
+            }
+        )
+
     def log_api_call(
         self,
         endpoint: str,
@@ -183,6 +200,7 @@ class AnalysisLogger:
             "total_input_tokens": self.total_input_tokens,
             "total_output_tokens": self.total_output_tokens,
             "total_tokens": self.total_input_tokens + self.total_output_tokens,
+            "total_context_tokens": sum(s.get("prompt_context", {}).get("context_tokens", 0) for s in self.stages),
             "stages_completed": len([s for s in self.stages if s.get("status") == "completed"]),
             "stages_failed": len([s for s in self.stages if s.get("status") == "failed"]),
             "stages": self.stages,
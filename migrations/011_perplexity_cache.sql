@@ -0,0 +1,25 @@
+-- Migration: Perplexity Research Cache
+-- Version: 011
+-- Date: 2026-10-16
+-- Description: Persistent cache for Perplexity research answers keyed by normalized query
+-- Safe: Creates a new table only
+
+CREATE TABLE IF NOT EXISTS perplexity_cache (
+    id BIGSERIAL PRIMARY KEY,
+    cache_key TEXT NOT NULL UNIQUE,
+    query TEXT NOT NULL,  -- Normalized query (truncated)
+    result_text TEXT NOT NULL,  -- Sanitized research answer
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    last_accessed_at TIMESTAMPTZ DEFAULT NOW(),
+    hit_count INTEGER DEFAULT 0,
+
+    CONSTRAINT unique_perplexity_cache_key UNIQUE (cache_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_perplexity_cache_created ON perplexity_cache(created_at DESC);
+
+ALTER TABLE perplexity_cache ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role can manage perplexity_cache"
+    ON perplexity_cache FOR ALL
+    USING (auth.role() = 'service_role');
@@ -0,0 +1,13 @@
+-- Migration: PDF Artifact Storage
+-- Version: 012
+-- Date: 2026-10-16
+-- Description: Private Storage bucket for rendered report PDFs (metadata stays in pdf_cache)
+-- Safe: Creates a new bucket only
+
+INSERT INTO storage.buckets (id, name, public)
+VALUES ('pdf-artifacts', 'pdf-artifacts', false)
+ON CONFLICT (id) DO NOTHING;
+
+CREATE POLICY "Service role can manage pdf-artifacts"
+    ON storage.objects FOR ALL
+    USING (bucket_id = 'pdf-artifacts' AND auth.role() = 'service_role');
@@ -0,0 +1,64 @@
+-- Migration: Lightweight Submissions Listing
+-- Version: 013
+-- Date: 2026-10-16
+-- Description: Projection view for admin list views (no report bodies), keyset
+--              pagination indexes and a reliable updated_at for incremental refresh
+-- Safe: Adds a view, indexes and a trigger; no data changes
+
+-- ============================================================================
+-- 1. LIST VIEW (report_json / edited_json / data_quality_json never leave the DB)
+-- ============================================================================
+-- quality_tier uses the same expression as idx_submissions_quality_tier (006),
+-- so filters on it are served by that index.
+
+CREATE OR REPLACE VIEW submissions_list
+WITH (security_invoker = true) AS
+SELECT
+    id,
+    name,
+    email,
+    company,
+    website,
+    industry,
+    challenge,
+    status,
+    processing_state,
+    user_status,
+    error_message,
+    edit_count,
+    last_edited_at,
+    created_at,
+    updated_at,
+    (report_json IS NOT NULL) AS has_report,
+    (data_quality_json::jsonb->>'quality_tier') AS quality_tier
+FROM submissions;
+
+-- ============================================================================
+-- 2. KEYSET PAGINATION INDEXES
+-- ============================================================================
+
+-- Dashboard order: newest first, id breaks ties
+CREATE INDEX IF NOT EXISTS idx_submissions_created_id
+ON submissions (created_at DESC, id DESC);
+
+-- Incremental refresh: rows changed after the (updated_at, id) watermark
+CREATE INDEX IF NOT EXISTS idx_submissions_updated_id
+ON submissions (updated_at, id);
+
+-- ============================================================================
+-- 3. UPDATED_AT TRIGGER (not every writer sets updated_at)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS update_submissions_updated_at ON submissions;
+CREATE TRIGGER update_submissions_updated_at
+    BEFORE UPDATE ON submissions
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
@@ -0,0 +1,40 @@
+-- Migration: Batched Cache Hit Counters
+-- Version: 014
+-- Date: 2026-10-16
+-- Description: Bulk hit-count updates for the cache tables. The API buffers cache
+--              hits in memory and applies the deltas with one call per table per
+--              flush (app/core/hit_counter.py) instead of an UPDATE on every hit
+-- Safe: Adds a function only; no schema or data changes
+
+-- p_hits: [{"cache_key": "...", "hits": 3, "last_accessed_at": "2026-10-16T12:00:00+00:00"}, ...]
+CREATE OR REPLACE FUNCTION apply_cache_hits(p_table TEXT, p_hits JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated INTEGER;
+BEGIN
+    IF p_table = 'enrichment_results' THEN
+        -- Enrichment rows count hits and accumulate the provider cost each hit avoided
+        UPDATE enrichment_results t
+        SET cache_hits = t.cache_hits + h.hits,
+            cache_savings_usd = t.cache_savings_usd + h.hits * t.total_cost_usd,
+            updated_at = NOW()
+        FROM jsonb_to_recordset(p_hits) AS h(cache_key TEXT, hits INTEGER, last_accessed_at TIMESTAMPTZ)
+        WHERE t.cache_key = h.cache_key;
+    ELSIF p_table IN ('analysis_cache', 'stage_cache', 'perplexity_cache', 'pdf_cache') THEN
+        -- last_accessed_at drives the sliding TTL of these tables
+        EXECUTE format(
+            'UPDATE %I t
+             SET hit_count = t.hit_count + h.hits,
+                 last_accessed_at = GREATEST(t.last_accessed_at, h.last_accessed_at)
+             FROM jsonb_to_recordset($1) AS h(cache_key TEXT, hits INTEGER, last_accessed_at TIMESTAMPTZ)
+             WHERE t.cache_key = h.cache_key',
+            p_table
+        ) USING p_hits;
+    ELSE
+        RAISE EXCEPTION 'apply_cache_hits: unsupported table %', p_table;
+    END IF;
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,26 @@
+-- Migration: Near-Duplicate Challenge Index
+-- Version: 015
+-- Date: 2026-10-16
+-- Description: MinHash signatures of the challenges behind cached analyses and
+--              stage-1 extractions, loaded at startup by app/core/challenge_index.py
+--              so reworded challenges can reuse a cached result
+-- Safe: Creates a new table only
+
+CREATE TABLE IF NOT EXISTS challenge_index (
+    id BIGSERIAL PRIMARY KEY,
+    kind TEXT NOT NULL,  -- "analysis" or a stage name
+    scope TEXT NOT NULL,  -- Hash of the non-challenge parts of the cache key (company, industry, ...)
+    cache_key TEXT NOT NULL,  -- Key in analysis_cache / stage_cache
+    signature JSONB NOT NULL,  -- MinHash signature (array of integers)
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+
+    CONSTRAINT unique_challenge_index_entry UNIQUE (kind, cache_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_challenge_index_created ON challenge_index(created_at DESC);
+
+ALTER TABLE challenge_index ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role can manage challenge_index"
+    ON challenge_index FOR ALL
+    USING (auth.role() = 'service_role');
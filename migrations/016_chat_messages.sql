@@ -0,0 +1,67 @@
+-- Migration: Append-Only Chat Message Store
+-- Version: 016
+-- Date: 2026-10-16
+-- Description: Report chat turns move out of submissions.processing_metadata into
+--              their own table (one INSERT per turn, keyset-paginated reads) plus
+--              the rolling summary used for the model context. Chat no longer
+--              writes the submissions row
+-- Safe: Creates new tables and copies existing chat histories; the old
+--       processing_metadata keys are left in place (unused)
+
+-- ============================================================================
+-- 1. MESSAGES
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id BIGSERIAL PRIMARY KEY,  -- Insertion order; also the pagination cursor
+    submission_id INTEGER NOT NULL REFERENCES submissions(id) ON DELETE CASCADE,
+    role TEXT NOT NULL CHECK (role IN ('user', 'assistant')),
+    content TEXT NOT NULL,
+    model_used TEXT,
+    tokens_used INTEGER,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_chat_messages_submission ON chat_messages(submission_id, id);
+
+ALTER TABLE chat_messages ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role can manage chat_messages"
+    ON chat_messages FOR ALL
+    USING (auth.role() = 'service_role');
+
+-- ============================================================================
+-- 2. ROLLING SUMMARY (messages up to through_message_id)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS chat_summaries (
+    submission_id INTEGER PRIMARY KEY REFERENCES submissions(id) ON DELETE CASCADE,
+    summary TEXT NOT NULL,
+    through_message_id BIGINT NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE chat_summaries ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role can manage chat_summaries"
+    ON chat_summaries FOR ALL
+    USING (auth.role() = 'service_role');
+
+-- ============================================================================
+-- 3. BACKFILL from processing_metadata.chat_history
+-- ============================================================================
+
+INSERT INTO chat_messages (submission_id, role, content, created_at)
+SELECT
+    s.id,
+    m.value->>'role',
+    m.value->>'content',
+    COALESCE((s.processing_metadata::jsonb->>'last_chat_at')::timestamptz, s.updated_at, NOW())
+FROM submissions s
+CROSS JOIN LATERAL jsonb_array_elements(s.processing_metadata::jsonb->'chat_history') WITH ORDINALITY AS m(value, position)
+WHERE s.processing_metadata IS NOT NULL
+  AND jsonb_typeof(s.processing_metadata::jsonb->'chat_history') = 'array'
+  AND m.value->>'role' IN ('user', 'assistant')
+  AND m.value->>'content' IS NOT NULL
+  AND NOT EXISTS (SELECT 1 FROM chat_messages c WHERE c.submission_id = s.id)
+ORDER BY s.id, m.position;
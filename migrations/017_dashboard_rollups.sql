@@ -0,0 +1,193 @@
+-- Migration: Incremental Dashboard Aggregates
+-- Version: 017
+-- Date: 2026-10-16
+-- Description: Daily per-industry counters for the admin dashboard intelligence
+--              (quality tiers, sources, failure patterns), maintained by triggers
+--              on submissions so the dashboard never re-parses data_quality_json
+--              for every row. The list view also exposes sources_succeeded for
+--              the per-submission risk review
+-- Safe: Adds a table, functions and triggers, backfills the counters from the
+--       existing rows and appends one column to submissions_list
+
+-- ============================================================================
+-- 1. DAILY ROLLUP
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS dashboard_daily_stats (
+    day DATE NOT NULL,  -- created_at day (UTC)
+    industry TEXT NOT NULL,
+    submissions INTEGER NOT NULL DEFAULT 0,
+    with_quality INTEGER NOT NULL DEFAULT 0,  -- Rows with data_quality_json
+    sources_succeeded INTEGER NOT NULL DEFAULT 0,  -- Sum over rows
+    quality_tiers JSONB NOT NULL DEFAULT '{}',  -- {"legendary": 3, "good": 5, ...}
+    failed_sources JSONB NOT NULL DEFAULT '{}',  -- {"linkedin_company": 2, ...}
+    perplexity_failures INTEGER NOT NULL DEFAULT 0,
+    ai_refusals INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (day, industry)
+);
+
+ALTER TABLE dashboard_daily_stats ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role can manage dashboard_daily_stats"
+    ON dashboard_daily_stats FOR ALL
+    USING (auth.role() = 'service_role');
+
+-- ============================================================================
+-- 2. COUNTER FUNCTIONS
+-- ============================================================================
+
+-- Malformed data_quality_json must never block a submission write
+CREATE OR REPLACE FUNCTION try_parse_jsonb(p_text TEXT)
+RETURNS JSONB AS $$
+BEGIN
+    RETURN p_text::jsonb;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- Adds counter maps key by key; keys that drop to zero are removed
+CREATE OR REPLACE FUNCTION jsonb_add_counts(p_a JSONB, p_b JSONB)
+RETURNS JSONB AS $$
+    SELECT COALESCE(jsonb_object_agg(key, total) FILTER (WHERE total <> 0), '{}'::jsonb)
+    FROM (
+        SELECT key, SUM(value::INTEGER) AS total
+        FROM (
+            SELECT * FROM jsonb_each_text(COALESCE(p_a, '{}'::jsonb))
+            UNION ALL
+            SELECT * FROM jsonb_each_text(COALESCE(p_b, '{}'::jsonb))
+        ) counts
+        GROUP BY key
+    ) totals;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Adds (p_sign = 1) or removes (p_sign = -1) one submission's contribution.
+-- Mirrors aggregate_submissions() in app/services/intelligence/dashboard.py
+CREATE OR REPLACE FUNCTION dashboard_stats_apply(p_row submissions, p_sign INTEGER)
+RETURNS VOID AS $$
+DECLARE
+    quality JSONB := try_parse_jsonb(p_row.data_quality_json::TEXT);
+    tiers JSONB := '{}'::jsonb;
+    failed_sources JSONB := '{}'::jsonb;
+    sources INTEGER := 0;
+    perplexity_failure INTEGER := 0;
+BEGIN
+    IF jsonb_typeof(quality) = 'object' THEN
+        tiers := jsonb_build_object(COALESCE(quality->>'quality_tier', 'unknown'), p_sign);
+        IF jsonb_typeof(quality->'sources_succeeded') = 'number' THEN
+            sources := (quality->>'sources_succeeded')::NUMERIC::INTEGER;
+        END IF;
+        perplexity_failure := CASE WHEN quality->'perplexity_sources' = '0'::jsonb THEN 1 ELSE 0 END;
+
+        IF jsonb_typeof(quality->'failed_sources') = 'array' THEN
+            SELECT COALESCE(jsonb_object_agg(source, hits * p_sign), '{}'::jsonb)
+            INTO failed_sources
+            FROM (
+                SELECT source, COUNT(*) AS hits
+                FROM jsonb_array_elements_text(quality->'failed_sources') AS source
+                GROUP BY source
+            ) f;
+        END IF;
+    END IF;
+
+    INSERT INTO dashboard_daily_stats AS t (
+        day, industry, submissions, with_quality, sources_succeeded, quality_tiers,
+        failed_sources, perplexity_failures, ai_refusals, failed
+    )
+    VALUES (
+        (COALESCE(p_row.created_at, NOW()) AT TIME ZONE 'UTC')::DATE,
+        COALESCE(NULLIF(p_row.industry, ''), 'Unknown'),
+        p_sign,
+        CASE WHEN jsonb_typeof(quality) = 'object' THEN p_sign ELSE 0 END,
+        sources * p_sign,
+        tiers,
+        failed_sources,
+        perplexity_failure * p_sign,
+        CASE WHEN p_row.error_message ILIKE '%refused%' THEN p_sign ELSE 0 END,
+        CASE WHEN p_row.status = 'failed' THEN p_sign ELSE 0 END
+    )
+    ON CONFLICT (day, industry) DO UPDATE SET
+        submissions = t.submissions + EXCLUDED.submissions,
+        with_quality = t.with_quality + EXCLUDED.with_quality,
+        sources_succeeded = t.sources_succeeded + EXCLUDED.sources_succeeded,
+        quality_tiers = jsonb_add_counts(t.quality_tiers, EXCLUDED.quality_tiers),
+        failed_sources = jsonb_add_counts(t.failed_sources, EXCLUDED.failed_sources),
+        perplexity_failures = t.perplexity_failures + EXCLUDED.perplexity_failures,
+        ai_refusals = t.ai_refusals + EXCLUDED.ai_refusals,
+        failed = t.failed + EXCLUDED.failed,
+        updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION track_dashboard_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM dashboard_stats_apply(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM dashboard_stats_apply(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- 3. BACKFILL (before the triggers, so no row is counted twice)
+-- ============================================================================
+
+DELETE FROM dashboard_daily_stats;
+SELECT dashboard_stats_apply(s, 1) FROM submissions s;
+
+-- ============================================================================
+-- 4. TRIGGERS
+-- ============================================================================
+
+DROP TRIGGER IF EXISTS track_dashboard_stats_insert_delete ON submissions;
+CREATE TRIGGER track_dashboard_stats_insert_delete
+    AFTER INSERT OR DELETE ON submissions
+    FOR EACH ROW
+    EXECUTE FUNCTION track_dashboard_stats();
+
+-- Only updates that change a counted column touch the rollup (progress writes do not)
+DROP TRIGGER IF EXISTS track_dashboard_stats_update ON submissions;
+CREATE TRIGGER track_dashboard_stats_update
+    AFTER UPDATE OF data_quality_json, status, error_message, industry, created_at ON submissions
+    FOR EACH ROW
+    WHEN (
+        OLD.data_quality_json::TEXT IS DISTINCT FROM NEW.data_quality_json::TEXT
+        OR OLD.status IS DISTINCT FROM NEW.status
+        OR OLD.error_message IS DISTINCT FROM NEW.error_message
+        OR OLD.industry IS DISTINCT FROM NEW.industry
+        OR OLD.created_at IS DISTINCT FROM NEW.created_at
+    )
+    EXECUTE FUNCTION track_dashboard_stats();
+
+-- ============================================================================
+-- 5. LIST VIEW: sources_succeeded for the risk review (columns appended only)
+-- ============================================================================
+
+CREATE OR REPLACE VIEW submissions_list
+WITH (security_invoker = true) AS
+SELECT
+    id,
+    name,
+    email,
+    company,
+    website,
+    industry,
+    challenge,
+    status,
+    processing_state,
+    user_status,
+    error_message,
+    edit_count,
+    last_edited_at,
+    created_at,
+    updated_at,
+    (report_json IS NOT NULL) AS has_report,
+    (data_quality_json::jsonb->>'quality_tier') AS quality_tier,
+    (data_quality_json::jsonb->'sources_succeeded') AS sources_succeeded
+FROM submissions;
@@ -0,0 +1,242 @@
+-- Migration: Daily Rollups for Progressive Enrichment Analytics
+-- Version: 018
+-- Date: 2026-10-16
+-- Description: Per-day aggregates of enrichment sessions (by status), auto-fill
+--              suggestions (by field and by source) and social handle validations
+--              (by platform). A watermarked job re-rolls only the days with rows
+--              changed since its last run; analytics read the rollups plus a live
+--              aggregate of today instead of downloading every session
+-- Safe: Adds tables, indexes and functions; source tables are only read.
+--       Existing history is rolled up by the refresh at the end of this migration
+--       (sessions are purged after 90 days); scripts/backfill_enrichment_rollups.py
+--       recomputes any range
+
+-- ============================================================================
+-- 1. TABLES
+-- ============================================================================
+
+-- metrics are counters/sums, except keys ending in _min/_max (merged with min/max)
+CREATE TABLE IF NOT EXISTS enrichment_daily_rollups (
+    day DATE NOT NULL,  -- UTC day of created_at / suggested_at / validated_at
+    dimension TEXT NOT NULL CHECK (dimension IN ('session', 'field', 'source', 'platform')),
+    key TEXT NOT NULL,  -- status / field_name / source / platform
+    metrics JSONB NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (day, dimension, key)
+);
+
+CREATE TABLE IF NOT EXISTS enrichment_rollup_state (
+    name TEXT PRIMARY KEY,
+    watermark TIMESTAMPTZ NOT NULL,  -- Newest source change already rolled up
+    last_run_at TIMESTAMPTZ,
+    days_rolled INTEGER
+);
+
+ALTER TABLE enrichment_daily_rollups ENABLE ROW LEVEL SECURITY;
+ALTER TABLE enrichment_rollup_state ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role can manage enrichment_daily_rollups"
+    ON enrichment_daily_rollups FOR ALL
+    USING (auth.role() = 'service_role');
+
+CREATE POLICY "Service role can manage enrichment_rollup_state"
+    ON enrichment_rollup_state FOR ALL
+    USING (auth.role() = 'service_role');
+
+-- Change scans behind the watermark
+CREATE INDEX IF NOT EXISTS idx_progressive_sessions_updated_at ON progressive_enrichment_sessions(updated_at);
+CREATE INDEX IF NOT EXISTS idx_progressive_sessions_created_at ON progressive_enrichment_sessions(created_at);
+CREATE INDEX IF NOT EXISTS idx_auto_fill_suggested_at ON auto_fill_suggestions(suggested_at);
+CREATE INDEX IF NOT EXISTS idx_auto_fill_user_action_at ON auto_fill_suggestions(user_action_at);
+CREATE INDEX IF NOT EXISTS idx_social_cache_validated_at ON social_media_cache(validated_at);
+
+-- ============================================================================
+-- 2. AGGREGATES FOR A SET OF DAYS (shared by the job and the live "today" read)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION enrichment_rollup_rows(p_days DATE[])
+RETURNS TABLE (day DATE, dimension TEXT, key TEXT, metrics JSONB) AS $$
+DECLARE
+    lo TIMESTAMPTZ := (SELECT MIN(d) FROM unnest(p_days) AS d)::TIMESTAMP AT TIME ZONE 'UTC';
+    hi TIMESTAMPTZ := ((SELECT MAX(d) FROM unnest(p_days) AS d) + 1)::TIMESTAMP AT TIME ZONE 'UTC';
+BEGIN
+    -- Sessions by status (zero durations/costs are "not measured", as before)
+    RETURN QUERY
+    SELECT
+        (s.created_at AT TIME ZONE 'UTC')::DATE,
+        'session'::TEXT,
+        COALESCE(s.status, 'unknown')::TEXT,
+        jsonb_build_object(
+            'sessions', COUNT(*),
+            'cost_usd', COALESCE(SUM(s.total_cost_usd), 0),
+            'duration_ms', COALESCE(SUM(s.total_duration_ms), 0),
+            'layer1_completed', COUNT(s.layer1_completed_at),
+            'layer1_duration_ms', COALESCE(SUM(s.layer1_duration_ms) FILTER (WHERE s.layer1_duration_ms <> 0), 0),
+            'layer1_duration_count', COUNT(*) FILTER (WHERE s.layer1_duration_ms <> 0),
+            'layer1_duration_ms_min', MIN(s.layer1_duration_ms) FILTER (WHERE s.layer1_duration_ms <> 0),
+            'layer1_duration_ms_max', MAX(s.layer1_duration_ms) FILTER (WHERE s.layer1_duration_ms <> 0),
+            'layer1_cost_usd', COALESCE(SUM(s.layer1_cost_usd) FILTER (WHERE s.layer1_cost_usd <> 0), 0),
+            'layer1_cost_count', COUNT(*) FILTER (WHERE s.layer1_cost_usd <> 0),
+            'layer2_completed', COUNT(s.layer2_completed_at),
+            'layer2_duration_ms', COALESCE(SUM(s.layer2_duration_ms) FILTER (WHERE s.layer2_duration_ms <> 0), 0),
+            'layer2_duration_count', COUNT(*) FILTER (WHERE s.layer2_duration_ms <> 0),
+            'layer2_duration_ms_min', MIN(s.layer2_duration_ms) FILTER (WHERE s.layer2_duration_ms <> 0),
+            'layer2_duration_ms_max', MAX(s.layer2_duration_ms) FILTER (WHERE s.layer2_duration_ms <> 0),
+            'layer2_cost_usd', COALESCE(SUM(s.layer2_cost_usd) FILTER (WHERE s.layer2_cost_usd <> 0), 0),
+            'layer2_cost_count', COUNT(*) FILTER (WHERE s.layer2_cost_usd <> 0),
+            'layer3_completed', COUNT(s.layer3_completed_at),
+            'layer3_duration_ms', COALESCE(SUM(s.layer3_duration_ms) FILTER (WHERE s.layer3_duration_ms <> 0), 0),
+            'layer3_duration_count', COUNT(*) FILTER (WHERE s.layer3_duration_ms <> 0),
+            'layer3_duration_ms_min', MIN(s.layer3_duration_ms) FILTER (WHERE s.layer3_duration_ms <> 0),
+            'layer3_duration_ms_max', MAX(s.layer3_duration_ms) FILTER (WHERE s.layer3_duration_ms <> 0),
+            'layer3_cost_usd', COALESCE(SUM(s.layer3_cost_usd) FILTER (WHERE s.layer3_cost_usd <> 0), 0),
+            'layer3_cost_count', COUNT(*) FILTER (WHERE s.layer3_cost_usd <> 0)
+        )
+    FROM progressive_enrichment_sessions s
+    WHERE s.created_at >= lo AND s.created_at < hi
+      AND (s.created_at AT TIME ZONE 'UTC')::DATE = ANY(p_days)
+    GROUP BY 1, 3;
+
+    -- Auto-fill suggestions by field and by source
+    RETURN QUERY
+    SELECT
+        (a.suggested_at AT TIME ZONE 'UTC')::DATE,
+        g.dimension,
+        g.key,
+        jsonb_build_object(
+            'suggestions', COUNT(*),
+            'accepted', COUNT(*) FILTER (WHERE a.was_accepted),
+            'edited', COUNT(*) FILTER (WHERE a.was_edited),
+            'auto_filled', COUNT(*) FILTER (WHERE a.should_auto_fill),
+            'confidence_sum', COALESCE(SUM(a.confidence) FILTER (WHERE a.confidence <> 0), 0),
+            'confidence_count', COUNT(*) FILTER (WHERE a.confidence <> 0)
+        )
+    FROM auto_fill_suggestions a
+    CROSS JOIN LATERAL (
+        VALUES ('field'::TEXT, a.field_name::TEXT), ('source'::TEXT, COALESCE(a.source, 'unknown')::TEXT)
+    ) AS g(dimension, key)
+    WHERE a.suggested_at >= lo AND a.suggested_at < hi
+      AND (a.suggested_at AT TIME ZONE 'UTC')::DATE = ANY(p_days)
+    GROUP BY 1, 2, 3;
+
+    -- Social handle validations by platform
+    RETURN QUERY
+    SELECT
+        (c.validated_at AT TIME ZONE 'UTC')::DATE,
+        'platform'::TEXT,
+        COALESCE(c.platform, 'unknown')::TEXT,
+        jsonb_build_object(
+            'validations', COUNT(*),
+            'valid', COUNT(*) FILTER (WHERE c.is_valid)
+        )
+    FROM social_media_cache c
+    WHERE c.validated_at >= lo AND c.validated_at < hi
+      AND (c.validated_at AT TIME ZONE 'UTC')::DATE = ANY(p_days)
+    GROUP BY 1, 3;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Replaces the stored rollups of p_days (backfill and the incremental job)
+CREATE OR REPLACE FUNCTION rollup_enrichment_days(p_days DATE[])
+RETURNS INTEGER AS $$
+DECLARE
+    inserted INTEGER;
+BEGIN
+    DELETE FROM enrichment_daily_rollups WHERE day = ANY(p_days);
+
+    INSERT INTO enrichment_daily_rollups (day, dimension, key, metrics)
+    SELECT r.day, r.dimension, r.key, r.metrics FROM enrichment_rollup_rows(p_days) r;
+
+    GET DIAGNOSTICS inserted = ROW_COUNT;
+    RETURN inserted;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- 3. INCREMENTAL JOB
+-- ============================================================================
+-- Re-rolls every day that has a session, suggestion or validation created or
+-- updated after the watermark (minus p_overlap_seconds, so rows committed late
+-- with an older timestamp are not skipped; re-rolling a day is idempotent).
+-- The state row lock serializes concurrent runs.
+
+CREATE OR REPLACE FUNCTION refresh_enrichment_rollups(p_overlap_seconds INTEGER DEFAULT 300)
+RETURNS INTEGER AS $$
+DECLARE
+    wm TIMESTAMPTZ;
+    since TIMESTAMPTZ;
+    newest TIMESTAMPTZ;
+    changed_days DATE[];
+BEGIN
+    INSERT INTO enrichment_rollup_state (name, watermark)
+    VALUES ('enrichment', '-infinity')
+    ON CONFLICT (name) DO NOTHING;
+
+    SELECT watermark INTO wm FROM enrichment_rollup_state WHERE name = 'enrichment' FOR UPDATE;
+    since := wm - make_interval(secs => p_overlap_seconds);
+
+    SELECT array_agg(DISTINCT changes.day), MAX(changes.changed_at)
+    INTO changed_days, newest
+    FROM (
+        SELECT (s.created_at AT TIME ZONE 'UTC')::DATE AS day, GREATEST(s.created_at, s.updated_at) AS changed_at
+        FROM progressive_enrichment_sessions s
+        WHERE s.updated_at > since OR s.created_at > since
+        UNION ALL
+        SELECT (a.suggested_at AT TIME ZONE 'UTC')::DATE, GREATEST(a.suggested_at, a.user_action_at)
+        FROM auto_fill_suggestions a
+        WHERE a.suggested_at > since OR a.user_action_at > since
+        UNION ALL
+        SELECT (c.validated_at AT TIME ZONE 'UTC')::DATE, c.validated_at
+        FROM social_media_cache c
+        WHERE c.validated_at > since
+    ) changes
+    WHERE changes.day IS NOT NULL;
+
+    IF changed_days IS NOT NULL THEN
+        PERFORM rollup_enrichment_days(changed_days);
+    END IF;
+
+    UPDATE enrichment_rollup_state
+    SET watermark = GREATEST(wm, COALESCE(newest, wm)),
+        last_run_at = NOW(),
+        days_rolled = COALESCE(cardinality(changed_days), 0)
+    WHERE name = 'enrichment';
+
+    RETURN COALESCE(cardinality(changed_days), 0);
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- 4. READS
+-- ============================================================================
+-- Stored rollups of one dimension summed per key over [p_since, p_before):
+-- one row per key whatever the window length, so reads stay under PostgREST's
+-- max-rows cap. Metrics merge like merge_metrics() in the repository.
+
+CREATE OR REPLACE FUNCTION sum_enrichment_rollups(p_dimension TEXT, p_since DATE, p_before DATE)
+RETURNS TABLE (key TEXT, metrics JSONB) AS $$
+    SELECT per_metric.key, jsonb_object_agg(per_metric.name, per_metric.value)
+    FROM (
+        SELECT
+            r.key,
+            m.name,
+            to_jsonb(CASE
+                WHEN m.name LIKE '%\_min' THEN MIN((m.value #>> '{}')::NUMERIC)
+                WHEN m.name LIKE '%\_max' THEN MAX((m.value #>> '{}')::NUMERIC)
+                ELSE SUM((m.value #>> '{}')::NUMERIC)
+            END) AS value
+        FROM enrichment_daily_rollups r
+        CROSS JOIN LATERAL jsonb_each(r.metrics) AS m(name, value)
+        WHERE r.dimension = p_dimension
+          AND r.day >= p_since
+          AND r.day < p_before
+        GROUP BY r.key, m.name
+    ) per_metric
+    GROUP BY per_metric.key
+$$ LANGUAGE sql STABLE;
+
+-- ============================================================================
+-- 5. INITIAL ROLLUP OF EXISTING HISTORY
+-- ============================================================================
+
+SELECT refresh_enrichment_rollups();
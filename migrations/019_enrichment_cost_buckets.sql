@@ -0,0 +1,63 @@
+-- Migration: Hourly Enrichment Cost Buckets
+-- Version: 019
+-- Date: 2026-10-16
+-- Description: Durable hourly cost counters per enrichment source and per user.
+--              CostTracker (app/services/enrichment/cost_tracker.py) keeps
+--              fixed-size in-memory buckets and flushes the deltas it collected
+--              since the last flush with one apply_enrichment_costs call
+-- Safe: Adds a table and a function only
+
+CREATE TABLE IF NOT EXISTS enrichment_cost_buckets (
+    bucket_start TIMESTAMPTZ NOT NULL,  -- UTC hour
+    dimension TEXT NOT NULL CHECK (dimension IN ('source', 'user')),
+    key TEXT NOT NULL,  -- source_name / user_id
+    cost_usd DECIMAL(12, 6) NOT NULL DEFAULT 0,
+    requests INTEGER NOT NULL DEFAULT 0,
+    cache_hits INTEGER NOT NULL DEFAULT 0,
+    cache_savings_usd DECIMAL(12, 6) NOT NULL DEFAULT 0,
+    fields_returned INTEGER NOT NULL DEFAULT 0,
+    duration_ms BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (bucket_start, dimension, key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cost_buckets_dimension_key ON enrichment_cost_buckets(dimension, key, bucket_start DESC);
+
+ALTER TABLE enrichment_cost_buckets ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role can manage enrichment_cost_buckets"
+    ON enrichment_cost_buckets FOR ALL
+    USING (auth.role() = 'service_role');
+
+-- p_rows: [{"bucket_start": "2026-10-16T12:00:00+00:00", "dimension": "source", "key": "clearbit",
+--           "cost_usd": 0.3, "requests": 4, "cache_hits": 1, "cache_savings_usd": 0.1,
+--           "fields_returned": 40, "duration_ms": 5200}, ...]
+-- Values are deltas: several processes can flush into the same bucket
+CREATE OR REPLACE FUNCTION apply_enrichment_costs(p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    applied INTEGER;
+BEGIN
+    INSERT INTO enrichment_cost_buckets AS b (
+        bucket_start, dimension, key, cost_usd, requests, cache_hits,
+        cache_savings_usd, fields_returned, duration_ms
+    )
+    SELECT r.bucket_start, r.dimension, r.key, r.cost_usd, r.requests, r.cache_hits,
+           r.cache_savings_usd, r.fields_returned, r.duration_ms
+    FROM jsonb_to_recordset(p_rows) AS r(
+        bucket_start TIMESTAMPTZ, dimension TEXT, key TEXT, cost_usd DECIMAL, requests INTEGER,
+        cache_hits INTEGER, cache_savings_usd DECIMAL, fields_returned INTEGER, duration_ms BIGINT
+    )
+    ON CONFLICT (bucket_start, dimension, key) DO UPDATE
+    SET cost_usd = b.cost_usd + EXCLUDED.cost_usd,
+        requests = b.requests + EXCLUDED.requests,
+        cache_hits = b.cache_hits + EXCLUDED.cache_hits,
+        cache_savings_usd = b.cache_savings_usd + EXCLUDED.cache_savings_usd,
+        fields_returned = b.fields_returned + EXCLUDED.fields_returned,
+        duration_ms = b.duration_ms + EXCLUDED.duration_ms,
+        updated_at = NOW();
+
+    GET DIAGNOSTICS applied = ROW_COUNT;
+    RETURN applied;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,47 @@
+-- Migration: Grouped Counts for Repository Statistics
+-- Version: 020
+-- Date: 2026-10-16
+-- Description: One-query row counts per distinct value of several columns, used by
+--              SupabaseRepository.count_grouped() so statistics endpoints make a
+--              fixed number of round trips instead of one count query per value
+-- Safe: Adds a function only; no schema or data changes
+
+-- p_columns: columns to group by, e.g. ARRAY['status', 'archived']
+-- p_filters: equality filters applied to every group, e.g. {"archived": false}
+--            (JSON null matches IS NULL)
+-- Returns one row per (column, value); value is the text form (NULL for NULLs)
+-- Runs with the caller's rights, so RLS limits the counts to rows the caller can read
+CREATE OR REPLACE FUNCTION grouped_counts(p_table TEXT, p_columns TEXT[], p_filters JSONB DEFAULT '{}'::jsonb)
+RETURNS TABLE (column_name TEXT, value TEXT, count BIGINT) AS $$
+DECLARE
+    where_sql TEXT := '';
+    union_sql TEXT;
+BEGIN
+    IF p_columns IS NULL OR cardinality(p_columns) = 0 THEN
+        RETURN;
+    END IF;
+
+    SELECT COALESCE(
+        ' WHERE ' || string_agg(
+            CASE WHEN f.value = 'null'::jsonb
+                 THEN format('%I IS NULL', f.key)
+                 ELSE format('%I = %L', f.key, f.value #>> '{}')
+            END,
+            ' AND '
+        ),
+        ''
+    )
+    INTO where_sql
+    FROM jsonb_each(COALESCE(p_filters, '{}'::jsonb)) AS f;
+
+    -- One scan per column; grouping sets would need a common type for every column
+    SELECT string_agg(
+        format('SELECT %L::TEXT, %I::TEXT, COUNT(*) FROM %I%s GROUP BY 2', c, c, p_table, where_sql),
+        ' UNION ALL '
+    )
+    INTO union_sql
+    FROM unnest(p_columns) AS c;
+
+    RETURN QUERY EXECUTE union_sql;
+END;
+$$ LANGUAGE plpgsql STABLE;
@@ -0,0 +1,34 @@
+-- Migration: Source Call Statistics
+-- Version: 021
+-- Date: 2026-10-17
+-- Description: Per-source call statistics over a time window, aggregated in the
+--              database. AuditRepository.get_source_statistics() and
+--              get_all_source_statistics() read one row per source instead of
+--              every audit row, which PostgREST would cap at its max-rows limit
+-- Safe: Adds a function only; no schema or data changes
+
+-- p_since: start of the window (called_at >= p_since)
+-- p_source_name: one source, or NULL for all sources
+-- Runs with the caller's rights, so RLS applies as for a direct select
+CREATE OR REPLACE FUNCTION enrichment_source_statistics(p_since TIMESTAMPTZ, p_source_name TEXT DEFAULT NULL)
+RETURNS TABLE (
+    source_name TEXT,
+    total_calls BIGINT,
+    successful_calls BIGINT,
+    total_cost_usd NUMERIC,
+    avg_duration_ms NUMERIC,
+    circuit_breaker_trips BIGINT
+) AS $$
+    SELECT
+        a.source_name,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE a.success),
+        COALESCE(SUM(a.cost_usd), 0),
+        -- Calls without a (non-zero) duration are left out of the average
+        COALESCE(AVG(NULLIF(a.duration_ms, 0)), 0),
+        COUNT(*) FILTER (WHERE a.circuit_breaker_state IN ('open', 'half_open'))
+    FROM enrichment_audit_log a
+    WHERE a.called_at >= p_since
+      AND (p_source_name IS NULL OR a.source_name = p_source_name)
+    GROUP BY a.source_name
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,70 @@
+-- Migration: Partial Batch Updates
+-- Version: 022
+-- Date: 2026-10-17
+-- Description: Update many rows of a table in one statement, setting only the
+--              columns each row supplies. Used by SupabaseRepository.batch_update()
+--              so a batch costs one round trip without writing back columns the
+--              caller did not touch
+-- Safe: Adds a function only; no schema or data changes
+
+-- p_rows: [{"id": 1, "status": "completed", "updated_at": "..."}, {"id": 2, "archived": true}, ...]
+--         Every row needs "id"; ids must be unique within the call
+-- Columns a row does not supply keep their current value (read under the row
+-- lock, so concurrent writes to them are not undone). If any id has no row the
+-- function raises no_data_found (P0002) and nothing is updated.
+-- Runs with the caller's rights, so RLS UPDATE policies apply as for a direct update
+CREATE OR REPLACE FUNCTION batch_update_rows(p_table TEXT, p_rows JSONB)
+RETURNS SETOF JSONB AS $$
+DECLARE
+    set_columns TEXT[];
+    updated_rows JSONB[];
+    updated_ids TEXT[];
+    missing_ids TEXT[];
+BEGIN
+    IF p_rows IS NULL OR jsonb_array_length(p_rows) = 0 THEN
+        RETURN;
+    END IF;
+
+    -- Union of the supplied columns; only these appear in SET
+    SELECT array_agg(DISTINCT k.key ORDER BY k.key)
+    INTO set_columns
+    FROM jsonb_array_elements(p_rows) AS r(data)
+    CROSS JOIN LATERAL jsonb_object_keys(r.data) AS k(key)
+    WHERE k.key <> 'id';
+
+    IF set_columns IS NULL THEN
+        RAISE EXCEPTION 'batch_update_rows: no columns to update';
+    END IF;
+
+    -- jsonb_populate_record(t, ...) starts from the current row, so a column a
+    -- row does not supply is set to its own value
+    EXECUTE format(
+        'WITH updated AS (
+            UPDATE %1$I AS t
+            SET (%2$s) = (SELECT %3$s FROM jsonb_populate_record(t, r.data) AS p)
+            FROM jsonb_array_elements($1) AS r(data)
+            WHERE t.id = (SELECT x.id FROM jsonb_populate_record(NULL::%1$I, r.data) AS x)
+            RETURNING t.id::TEXT AS id, to_jsonb(t) AS row
+        )
+        SELECT array_agg(row), array_agg(id) FROM updated',
+        p_table,
+        (SELECT string_agg(format('%I', c), ', ') FROM unnest(set_columns) AS c),
+        (SELECT string_agg(format('p.%I', c), ', ') FROM unnest(set_columns) AS c)
+    )
+    INTO updated_rows, updated_ids
+    USING p_rows;
+
+    SELECT array_agg(r.data->>'id')
+    INTO missing_ids
+    FROM jsonb_array_elements(p_rows) AS r(data)
+    WHERE NOT (r.data->>'id' = ANY(COALESCE(updated_ids, '{}')));
+
+    IF missing_ids IS NOT NULL THEN
+        RAISE EXCEPTION USING
+            ERRCODE = 'no_data_found',
+            MESSAGE = format('%s: no rows with id %s', p_table, array_to_string(missing_ids, ', '));
+    END IF;
+
+    RETURN QUERY SELECT unnest(updated_rows);
+END;
+$$ LANGUAGE plpgsql;
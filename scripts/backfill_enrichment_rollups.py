@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Backfill Progressive Enrichment Analytics Rollups
+
+Recomputes enrichment_daily_rollups for a date range, a few days per statement.
+Safe to re-run; the incremental job's watermark is not touched.
+
+Usage:
+    python scripts/backfill_enrichment_rollups.py              # last 90 days
+    python scripts/backfill_enrichment_rollups.py --days 30
+    python scripts/backfill_enrichment_rollups.py --start 2026-01-01 --end 2026-03-31
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.constants import ENRICHMENT_ROLLUP_BACKFILL_CHUNK_DAYS  # noqa: E402
+from app.services.enrichment.rollups import backfill_enrichment_rollups  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill enrichment analytics rollups")
+    parser.add_argument("--days", type=int, default=90, help="Days back from today (ignored with --start)")
+    parser.add_argument("--start", type=date.fromisoformat, help="First day (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last day (YYYY-MM-DD, default: today UTC)")
+    parser.add_argument("--chunk-days", type=int, default=ENRICHMENT_ROLLUP_BACKFILL_CHUNK_DAYS, help="Days per statement")
+    args = parser.parse_args()
+
+    end = args.end or datetime.now(timezone.utc).date()
+    start = args.start or end - timedelta(days=args.days - 1)
+    if start > end:
+        parser.error("--start must not be after --end")
+
+    print(f"Backfilling enrichment rollups {start} .. {end} ({args.chunk_days} days per statement)")
+    written = asyncio.run(backfill_enrichment_rollups(start, end, args.chunk_days))
+    print(f"✅ Done: {written} rollup rows written")
+
+
+if __name__ == "__main__":
+    main()
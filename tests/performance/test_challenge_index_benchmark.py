@@ -0,0 +1,140 @@
+"""
+Benchmark: near-duplicate challenge matching (MinHash + LSH) on a synthetic corpus
+
+Builds challenges from business-goal phrases, indexes one per base challenge
+(several companies share a scope to add look-alike negatives) and queries
+rewordings of them (case, accents, punctuation, filler words, clause order,
+a swapped word) plus unrelated challenges. Reports precision, recall and
+lookup latency per similarity threshold.
+
+Run directly for a readable report:
+    python -m tests.performance.test_challenge_index_benchmark
+"""
+
+import random
+import time
+import unicodedata
+from typing import Dict, List, Tuple
+
+import pytest
+
+from app.core.challenge_index import ChallengeIndex, shingles
+
+GOALS = [
+    "aumentar a receita recorrente", "expandir para o mercado europeu", "reduzir o custo de aquisicao de clientes",
+    "melhorar a retencao de clientes", "lancar um novo produto digital", "profissionalizar a gestao financeira",
+    "digitalizar o atendimento ao cliente", "captar investimento serie A", "abrir franquias no nordeste",
+    "aumentar a margem operacional", "estruturar o time comercial", "entrar no varejo online",
+    "reduzir a inadimplencia", "automatizar a producao", "fortalecer a marca nas redes sociais",
+    "negociar melhor com fornecedores", "exportar para a america latina", "contratar e reter talentos de tecnologia",
+]
+CONTEXTS = [
+    "nos proximos 12 meses", "sem perder qualidade", "com orcamento limitado", "diante da concorrencia crescente",
+    "apos a queda de vendas em 2024", "mantendo o foco em pequenas empresas", "com um time enxuto",
+]
+FILLERS = ["precisamos", "queremos", "nosso objetivo e", "o desafio e", "gostariamos de"]
+SWAPS = {"aumentar": "elevar", "reduzir": "diminuir", "melhorar": "aprimorar", "clientes": "consumidores"}
+
+THRESHOLDS = (0.6, 0.7, 0.8, 0.9)
+BASES = 300
+REWORDINGS = 3
+
+
+def _base_challenges(rng: random.Random) -> List[str]:
+    challenges = set()
+    while len(challenges) < BASES:
+        goals = rng.sample(GOALS, 2)
+        challenges.add(f"{goals[0]} e {goals[1]} {rng.choice(CONTEXTS)}")
+    return sorted(challenges)
+
+
+def _reword(challenge: str, rng: random.Random) -> str:
+    text = challenge
+    edits = rng.sample(["filler", "order", "swap", "case", "punctuation"], 2)
+    if "order" in edits and " e " in text:
+        first, rest = text.split(" e ", 1)
+        text = f"{rest} e {first}"
+    if "swap" in edits:
+        words = text.split()
+        options = [i for i, w in enumerate(words) if w in SWAPS]
+        if options:
+            i = rng.choice(options)
+            words[i] = SWAPS[words[i]]
+        text = " ".join(words)
+    if "filler" in edits:
+        text = f"{rng.choice(FILLERS)} {text}"
+    if "case" in edits:
+        text = text.upper() if rng.random() < 0.5 else text.capitalize()
+    if "punctuation" in edits:
+        text = text.replace(" e ", ", e ") + "."
+    if rng.random() < 0.3:
+        text = unicodedata.normalize("NFC", text.replace("acao", "ação").replace("gestao", "gestão"))
+    return text
+
+
+def _scope(i: int) -> str:
+    # Ten bases share each scope, so every query competes with look-alike challenges
+    return f"scope-{i // 10}"
+
+
+def _run(threshold: float, seed: int = 7) -> Dict[str, float]:
+    rng = random.Random(seed)
+    bases = _base_challenges(rng)
+    index = ChallengeIndex(threshold=threshold, persist=False)
+    for i, challenge in enumerate(bases):
+        index._insert("analysis", _scope(i), f"key-{i}", index.hasher.signature(shingles(challenge)))
+
+    queries: List[Tuple[str, str, str]] = []  # (scope, text, expected key or "")
+    for i, challenge in enumerate(bases):
+        for _ in range(REWORDINGS):
+            queries.append((_scope(i), _reword(challenge, rng), f"key-{i}"))
+    for i in range(len(bases)):
+        goals = rng.sample(GOALS, 2)
+        unrelated = f"{goals[0]} e {goals[1]} {rng.choice(CONTEXTS)}"
+        if unrelated not in bases:
+            queries.append((_scope(i), unrelated, ""))
+
+    true_pos = false_pos = false_neg = 0
+    start = time.perf_counter()
+    for scope, text, expected in queries:
+        match = index.find("analysis", scope, text)
+        found = match.cache_key if match else ""
+        if found and found == expected:
+            true_pos += 1
+        elif found:
+            false_pos += 1
+            if expected:
+                false_neg += 1
+        elif expected:
+            false_neg += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "threshold": threshold,
+        "precision": true_pos / (true_pos + false_pos) if true_pos + false_pos else 1.0,
+        "recall": true_pos / (true_pos + false_neg) if true_pos + false_neg else 1.0,
+        "lookup_ms": elapsed / len(queries) * 1000,
+        "queries": len(queries),
+        "candidates_per_lookup": index.stats["candidates"] / len(queries),
+    }
+
+
+@pytest.mark.slow
+def test_default_threshold_is_precise_and_fast():
+    """A reused analysis must belong to the same challenge; lookups stay in the low milliseconds"""
+    result = _run(ChallengeIndex().threshold)
+    print(f"\n{result}")
+
+    assert result["precision"] >= 0.98
+    assert result["recall"] >= 0.5
+    assert result["lookup_ms"] < 5
+
+
+if __name__ == "__main__":
+    for threshold in THRESHOLDS:
+        r = _run(threshold)
+        print(
+            f"threshold {r['threshold']:.1f}: precision {r['precision']:.3f}, recall {r['recall']:.3f}, "
+            f"{r['lookup_ms']:.3f} ms/lookup, {r['candidates_per_lookup']:.2f} candidates/lookup "
+            f"({r['queries']} queries)"
+        )
@@ -0,0 +1,114 @@
+"""
+Benchmark: event-loop lag under concurrent enrichment, inline vs CPU offload pool
+
+Parses large homepages (PageSnapshot.parse, the Layer 1 CPU hot path) for
+several concurrent enrichments while a ticker measures how late the event
+loop wakes it up. Reports p50/p95/max lag and total wall time.
+
+Run directly for a readable report:
+    python -m tests.performance.test_event_loop_lag_benchmark
+"""
+
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import pytest
+
+from app.core.offload import OffloadExecutor
+from app.services.enrichment.page_snapshot import PageSnapshot
+
+ENRICHMENTS = 8
+TICK_SECONDS = 0.005
+WORKERS = 2
+
+
+def _homepage(sections: int = 1500) -> str:
+    body = "".join(
+        f'<div class="card"><a href="/p/{i}">Produto {i}</a><p>Descrição do produto {i}</p>'
+        f'<img src="/img/{i}.png"></div>'
+        for i in range(sections)
+    )
+    return (
+        "<html><head><title>Loja Exemplo</title>"
+        '<meta name="description" content="Loja exemplo">'
+        '<script src="/_next/static/main.js"></script></head>'
+        f"<body>{body}<footer>Contato: +55 11 4000-0000</footer></body></html>"
+    )
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _run(executor: OffloadExecutor, html: str) -> Dict[str, float]:
+    lags: List[float] = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            expected = time.perf_counter() + TICK_SECONDS
+            await asyncio.sleep(TICK_SECONDS)
+            lags.append(max(0.0, (time.perf_counter() - expected) * 1000))
+
+    async def enrichment(i: int):
+        await asyncio.sleep(0)  # let every enrichment start, as concurrent requests would
+        await executor.run(PageSnapshot.parse, f"https://site{i}.com", html, size=len(html))
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(enrichment(i) for i in range(ENRICHMENTS)))
+    wall_ms = (time.perf_counter() - start) * 1000
+    done.set()
+    await tick
+
+    return {
+        "p50_lag_ms": statistics.median(lags) if lags else 0.0,
+        "p95_lag_ms": _percentile(lags, 95) if lags else 0.0,
+        "max_lag_ms": max(lags) if lags else 0.0,
+        "wall_ms": wall_ms,
+    }
+
+
+async def _compare() -> Dict[str, Dict[str, float]]:
+    html = _homepage()
+
+    inline = await _run(OffloadExecutor(), html)
+
+    pooled_executor = OffloadExecutor(inline_threshold=10_000)
+    await pooled_executor.start(WORKERS)
+    try:
+        pooled = await _run(pooled_executor, html)
+        pooled["stats"] = pooled_executor.get_stats()
+    finally:
+        await pooled_executor.shutdown()
+
+    return {"inline": inline, "offload": pooled}
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_offload_keeps_event_loop_responsive():
+    """Parsing in the pool keeps worst-case loop lag well below inline parsing"""
+    results = await _compare()
+
+    print(f"\ninline:  {results['inline']}\noffload: {results['offload']}")
+
+    assert results["offload"]["max_lag_ms"] < results["inline"]["max_lag_ms"] / 2
+    assert results["offload"]["stats"]["pooled"] == ENRICHMENTS
+
+
+if __name__ == "__main__":
+    async def _report():
+        results = await _compare()
+        for mode in ("inline", "offload"):
+            r = results[mode]
+            print(
+                f"{mode:>8}: lag p50 {r['p50_lag_ms']:.2f} ms, p95 {r['p95_lag_ms']:.2f} ms, "
+                f"max {r['max_lag_ms']:.2f} ms, wall {r['wall_ms']:.0f} ms"
+            )
+
+    asyncio.run(_report())
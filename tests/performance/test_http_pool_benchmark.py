@@ -0,0 +1,125 @@
+"""
+Benchmark: per-call httpx clients vs the shared pooled client registry
+
+Runs a local keep-alive HTTP stub server, sends the same request sequence
+through both strategies and reports TCP connection setups and p50/p95 latency.
+
+Run directly for a readable report:
+    python -m tests.performance.test_http_pool_benchmark
+"""
+
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+import pytest
+
+from app.core.http_client import HTTPClientRegistry, HTTPPoolConfig
+
+REQUESTS = 200
+CONCURRENCY = 10
+
+RESPONSE_BODY = b'{"choices": [{"message": {"content": "{}"}}]}'
+
+
+class StubServer:
+    """Minimal HTTP/1.1 keep-alive server that counts accepted connections"""
+
+    def __init__(self):
+        self.connections = 0
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                headers = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in headers.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(RESPONSE_BODY)).encode() + b"\r\n"
+                    b"Connection: keep-alive\r\n\r\n" + RESPONSE_BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/chat/completions"
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _run(strategy: str) -> Dict[str, float]:
+    server = StubServer()
+    url = await server.start()
+    registry = HTTPClientRegistry(HTTPPoolConfig())
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies: List[float] = []
+
+    async def one_call():
+        async with semaphore:
+            start = time.perf_counter()
+            if strategy == "per_call":
+                async with httpx.AsyncClient(timeout=10.0) as client:
+                    response = await client.post(url, json={"model": "stub"})
+            else:
+                client = registry.get_client("openrouter")
+                response = await client.post(url, json={"model": "stub"}, timeout=10.0)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one_call() for _ in range(REQUESTS)))
+    await registry.aclose()
+    await server.stop()
+
+    return {
+        "connections": server.connections,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": _percentile(latencies, 95),
+    }
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_pooled_client_reuses_connections():
+    """Pooled registry opens at most one connection per concurrent slot"""
+    per_call = await _run("per_call")
+    pooled = await _run("pooled")
+
+    print(f"\nper-call: {per_call}\npooled:   {pooled}")
+
+    assert per_call["connections"] == REQUESTS
+    assert pooled["connections"] <= CONCURRENCY
+
+
+if __name__ == "__main__":
+    async def _report():
+        for strategy in ("per_call", "pooled"):
+            result = await _run(strategy)
+            print(
+                f"{strategy:>9}: {result['connections']:4d} connections, "
+                f"p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms"
+            )
+
+    asyncio.run(_report())
@@ -0,0 +1,128 @@
+"""
+Benchmark: rate limit checks per second, get/set-or-incr/ttl vs one atomic script
+
+Both run against a fake Redis that adds a fixed round-trip latency per command,
+with concurrent clients hammering a few keys. The legacy flow is the former
+check_rate_limit (up to three calls, read-then-write); the engine makes one
+call per check and rejects known over-limit clients without any.
+
+Run directly for a readable report:
+    python -m tests.performance.test_rate_limiter_benchmark
+"""
+
+import asyncio
+import time
+from typing import Dict
+
+import pytest
+
+from app.core.security.rate_limiter import MemoryRateLimitBackend, SlidingWindowRateLimiter
+
+ROUND_TRIP_SECONDS = 0.002
+CLIENTS = 20
+CHECKS_PER_CLIENT = 50
+LIMIT = 10
+
+
+class LatencyRedis:
+    """Counter commands of the legacy limiter, each paying one round trip"""
+
+    def __init__(self):
+        self.values: Dict[str, int] = {}
+        self.commands = 0
+
+    async def _round_trip(self):
+        self.commands += 1
+        await asyncio.sleep(ROUND_TRIP_SECONDS)
+
+    async def get(self, key):
+        await self._round_trip()
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        await self._round_trip()
+        self.values[key] = value
+
+    async def incr(self, key):
+        await self._round_trip()
+        self.values[key] += 1
+
+    async def ttl(self, key):
+        await self._round_trip()
+        return 3600
+
+
+class LatencyBackend(MemoryRateLimitBackend):
+    """Sliding-window backend paying one round trip per script call"""
+
+    def __init__(self):
+        super().__init__()
+        self.commands = 0
+
+    async def hit(self, *args, **kwargs):
+        self.commands += 1
+        await asyncio.sleep(ROUND_TRIP_SECONDS)
+        return await super().hit(*args, **kwargs)
+
+
+async def _legacy_check(redis: LatencyRedis, key: str) -> bool:
+    current = await redis.get(key)
+    if current is None:
+        await redis.set(key, 1, ex=3600)
+        return True
+    if int(current) >= LIMIT:
+        await redis.ttl(key)
+        return False
+    await redis.incr(key)
+    return True
+
+
+async def _run(check) -> Dict[str, float]:
+    allowed = 0
+
+    async def client(n: int):
+        nonlocal allowed
+        for _ in range(CHECKS_PER_CLIENT):
+            ok = await check(f"client-{n % 4}")
+            allowed += bool(ok)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(CLIENTS)))
+    elapsed = time.perf_counter() - start
+    return {"checks_per_second": CLIENTS * CHECKS_PER_CLIENT / elapsed, "allowed": allowed}
+
+
+async def _compare() -> Dict[str, Dict[str, float]]:
+    redis = LatencyRedis()
+    legacy = await _run(lambda key: _legacy_check(redis, key))
+    legacy["commands"] = redis.commands
+
+    backend = LatencyBackend()
+    limiter = SlidingWindowRateLimiter(backend=backend)
+    engine = await _run(lambda key: _engine_check(limiter, key))
+    engine["commands"] = backend.commands
+    return {"legacy": legacy, "engine": engine}
+
+
+async def _engine_check(limiter: SlidingWindowRateLimiter, key: str) -> bool:
+    return (await limiter.hit(key, LIMIT, 3600)).allowed
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_engine_checks_faster_and_never_over_admits():
+    """One round trip per check (none once over limit), and no burst gets past the limit"""
+    results = await _compare()
+    for name, r in results.items():
+        print(f"\n{name}: {r['checks_per_second']:.0f} checks/s, {r['commands']} round trips, {r['allowed']} allowed")
+
+    # 4 keys x LIMIT; the read-then-write race lets concurrent bursts through
+    assert results["engine"]["allowed"] == 4 * LIMIT
+    assert results["legacy"]["allowed"] > 4 * LIMIT
+    assert results["engine"]["commands"] < results["legacy"]["commands"]
+    assert results["engine"]["checks_per_second"] > results["legacy"]["checks_per_second"]
+
+
+if __name__ == "__main__":
+    for name, r in asyncio.run(_compare()).items():
+        print(f"{name:>6}: {r['checks_per_second']:8.0f} checks/s  {r['commands']:5d} round trips  {r['allowed']:4d} allowed")
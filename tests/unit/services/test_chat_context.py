@@ -0,0 +1,137 @@
+"""
+Unit tests for chat context handling
+Tests history windowing, summary folding, system prompt caching and SSE parsing
+"""
+
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.services.ai import chat
+from app.services.ai.chat import (
+    ChatSummary,
+    build_chat_messages,
+    stream_chat_message,
+    turns_to_fold,
+    update_chat_summary,
+    window_history
+)
+
+SUBMISSION = {"id": 7, "company": "Acme", "industry": "Varejo", "report_json": '{"sumario_executivo": "ok"}'}
+REPORT = {"sumario_executivo": "ok"}
+
+
+def _history(turns: int, size: int = 350):
+    history = []
+    for i in range(turns):
+        history.append({"id": 2 * i + 1, "role": "user", "content": f"pergunta {i} " + "x" * size})
+        history.append({"id": 2 * i + 2, "role": "assistant", "content": f"resposta {i} " + "y" * size})
+    return history
+
+
+def test_window_keeps_newest_turns_within_budget():
+    history = _history(20)
+
+    window = window_history(history, budget=1000)
+
+    assert window == history[-len(window):]
+    assert window[0]["role"] == "user"
+    assert 0 < len(window) < len(history)
+
+
+def test_window_never_starts_with_an_assistant_message():
+    history = _history(2, size=10)[1:]
+
+    assert window_history(history, budget=1000) == history[1:]
+
+
+def test_fold_waits_for_budget_then_halves_pending():
+    history = _history(20)
+
+    assert turns_to_fold(history[:4], budget=1000) == 0
+    count = turns_to_fold(history, budget=1000)
+
+    assert count > 0
+    assert history[count]["role"] == "user"
+    kept = history[count:]
+    assert sum(chat._message_tokens(m) for m in kept) <= 500
+
+
+def test_messages_put_summary_after_cacheable_prompt():
+    messages = build_chat_messages("SYSTEM", ChatSummary("resumo", 4), [{"role": "user", "content": "a"}], "b")
+
+    system = messages[0]["content"]
+    assert system[0] == {"type": "text", "text": "SYSTEM", "cache_control": {"type": "ephemeral"}}
+    assert "resumo" in system[1]["text"]
+    assert [m["role"] for m in messages[1:]] == ["user", "user"]
+
+
+@pytest.mark.asyncio
+async def test_system_prompt_built_once_per_report_version():
+    chat._system_prompt_cache.clear_memory()
+    with patch.object(chat, "create_chat_system_prompt", return_value="PROMPT") as build:
+        for _ in range(3):
+            assert await chat.get_chat_system_prompt(SUBMISSION, REPORT) == "PROMPT"
+        await chat.get_chat_system_prompt({**SUBMISSION, "report_json": '{"sumario_executivo": "v2"}'}, REPORT)
+
+    assert build.call_count == 2
+
+
+class _FakeStream:
+    def __init__(self, lines):
+        self.lines = lines
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def aiter_lines(self):
+        for line in self.lines:
+            yield line
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_deltas_then_done_with_usage():
+    chunks = [
+        {"choices": [{"delta": {"content": "Olá"}}]},
+        {"choices": [{"delta": {"content": ", mundo"}}]},
+        {"choices": [], "usage": {"total_tokens": 42}},
+    ]
+    client = MagicMock()
+    client.stream.return_value = _FakeStream([f"data: {json.dumps(c)}" for c in chunks] + ["data: [DONE]"])
+
+    chat._system_prompt_cache.clear_memory()
+    with patch.object(chat, "get_http_client", return_value=client):
+        events = [e async for e in stream_chat_message(SUBMISSION, REPORT, None, [], "oi")]
+
+    assert [e["content"] for e in events if e["type"] == "delta"] == ["Olá", ", mundo"]
+    assert events[-1]["type"] == "done"
+    assert events[-1]["message"] == "Olá, mundo"
+    assert events[-1]["tokens_used"] == 42
+    assert client.stream.call_args.kwargs["json"]["stream"] is True
+
+
+@pytest.mark.asyncio
+async def test_summary_update_folds_old_turns_and_survives_failures():
+    history = _history(20)
+    response = MagicMock()
+    response.json.return_value = {"choices": [{"message": {"content": "novo resumo"}}]}
+    client = MagicMock()
+
+    async def post(*args, **kwargs):
+        return response
+    client.post = post
+
+    with patch.object(chat, "get_http_client", return_value=client):
+        summary = await update_chat_summary(history, ChatSummary(), budget=1000)
+    assert summary.text == "novo resumo"
+    assert summary.through_id == history[turns_to_fold(history, budget=1000) - 1]["id"]
+
+    with patch.object(chat, "get_http_client", side_effect=RuntimeError("down")):
+        unchanged = await update_chat_summary(history, ChatSummary("antigo", 0), budget=1000)
+    assert unchanged == ChatSummary("antigo", 0)
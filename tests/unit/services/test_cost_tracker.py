@@ -0,0 +1,132 @@
+"""
+Unit tests for the bucketed enrichment cost tracker
+Tests ring-buffer expiry, summaries/trends from buckets, user eviction and batched flushes
+"""
+
+import pytest
+from unittest.mock import patch
+
+from app.services.enrichment.cost_tracker import BucketRing, CostTracker, COST, REQUESTS
+
+DAY = 86400
+NOW = 20_000 * DAY + 12 * 3600  # 2024-10-04 12:00 UTC
+
+
+class Clock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def writes():
+    calls = []
+    with patch("app.services.enrichment.cost_tracker._apply_enrichment_costs", side_effect=calls.append):
+        yield calls
+
+
+def test_ring_reuses_slots_and_drops_expired_buckets():
+    ring = BucketRing(width=60, slots=3)
+    ring.add(0, (1.0, 1, 0, 0, 0, 0))
+    ring.add(30, (2.0, 1, 0, 0, 0, 0))
+    ring.add(180, (5.0, 1, 0, 0, 0, 0))  # Bucket 3 takes bucket 0's slot
+
+    assert ring.get(0) is None
+    assert ring.get(3)[COST] == 5.0
+    assert ring.total(0, 3)[REQUESTS] == 1
+
+    ring.add(0, (9.0, 1, 0, 0, 0, 0))  # Too old for the window: ignored
+    assert ring.get(3)[COST] == 5.0
+
+
+@pytest.mark.asyncio
+async def test_summary_and_trends_come_from_buckets(writes):
+    clock = Clock(NOW - 2 * DAY)
+    tracker = CostTracker(clock=clock)
+    await tracker.track("u1", "s1", "clearbit", 0.10, 1000, fields_returned=10)
+
+    clock.now = NOW
+    await tracker.track("u1", "s2", "clearbit", 0.10, 1000, fields_returned=6)
+    await tracker.track("u2", "s3", "clearbit", 0.10, 10, cache_hit=True, fields_returned=6)
+    await tracker.track("u2", "s3", "metadata", 0.0, 500, fields_returned=2)
+
+    today = tracker.get_summary(days=1)
+    assert today["total_requests"] == 3
+    assert today["total_cost"] == 0.1
+    assert today["cache_hits"] == 1
+    assert today["cache_savings"] == 0.1
+    assert today["cost_by_source"] == {"clearbit": pytest.approx(0.1), "metadata": 0.0}
+    assert today["avg_fields_per_request"] == 4.7
+
+    assert tracker.get_summary(days=3)["total_cost"] == 0.2
+    assert tracker.get_user_summary("u1", days=3)["total_requests"] == 2
+
+    trends = tracker.get_daily_trends(days=7)
+    assert trends["dates"] == ["2024-10-02", "2024-10-04"]
+    assert trends["requests"] == [1, 3]
+    assert trends["cache_hit_rates"][1] == pytest.approx(100 / 3)
+
+    hourly = tracker.get_recent_trends("hour", periods=2)
+    assert hourly["buckets"] == ["2024-10-04T12:00:00+00:00"]
+    assert tracker.forecast_monthly_cost()["forecast_monthly_cost"] == round(0.2 / 7 * 30, 2)
+    await tracker.aclose()
+
+
+@pytest.mark.asyncio
+async def test_memory_is_bounded_by_retention_and_user_cap(writes):
+    clock = Clock()
+    tracker = CostTracker(max_tracked_users=2, clock=clock)
+    await tracker.track("u1", "s", "clearbit", 0.1, 1)
+    await tracker.track("u2", "s", "clearbit", 0.1, 1)
+    await tracker.track("u1", "s", "clearbit", 0.1, 1)
+    await tracker.track("u3", "s", "clearbit", 0.1, 1)
+
+    assert tracker.get_stats()["users"] == 2
+    assert tracker.get_stats()["users_evicted"] == 1
+    assert tracker.get_user_summary("u2")["total_requests"] == 0
+    assert tracker.get_user_summary("u1")["total_requests"] == 2
+
+    # Past the day-bucket retention the old events no longer count
+    clock.now = NOW + 200 * DAY
+    await tracker.track("u1", "s", "clearbit", 0.1, 1)
+    assert tracker.get_summary(days=365)["total_requests"] == 1
+    await tracker.aclose()
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_hourly_deltas_and_retries_failures(writes):
+    tracker = CostTracker(flush_interval=60, clock=Clock())
+    await tracker.track("u1", "s1", "clearbit", 0.10, 1000, fields_returned=10)
+    await tracker.track("u1", "s2", "clearbit", 0.10, 500, fields_returned=4)
+
+    with patch("app.services.enrichment.cost_tracker._apply_enrichment_costs", side_effect=RuntimeError("db down")):
+        assert await tracker.flush() == 0
+    assert tracker.get_stats()["pending_rows"] == 2
+
+    assert await tracker.flush() == 2
+    rows = {(row["dimension"], row["key"]): row for row in writes[0]}
+    assert rows[("source", "clearbit")]["requests"] == 2
+    assert rows[("source", "clearbit")]["cost_usd"] == pytest.approx(0.2)
+    assert rows[("user", "u1")]["fields_returned"] == 14
+    assert rows[("user", "u1")]["bucket_start"] == "2024-10-04T12:00:00+00:00"
+
+    # Buckets keep answering after the flush
+    assert tracker.get_summary(days=1)["total_requests"] == 2
+    await tracker.aclose()
+    assert len(writes) == 1
+
+
+@pytest.mark.asyncio
+async def test_flush_payload_matches_bucket_column_types(writes):
+    tracker = CostTracker(clock=Clock())
+    await tracker.track("u1", "s1", "clearbit", 0.10, 1500, cache_hit=True, fields_returned=12)
+    await tracker.flush()
+
+    row = writes[0][0]
+    for column in ("requests", "cache_hits", "fields_returned", "duration_ms"):
+        assert type(row[column]) is int, column
+    assert (row["requests"], row["fields_returned"], row["duration_ms"]) == (1, 12, 1500)
+    assert isinstance(row["cost_usd"], float) and isinstance(row["cache_savings_usd"], float)
+    await tracker.aclose()
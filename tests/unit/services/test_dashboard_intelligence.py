@@ -0,0 +1,155 @@
+"""
+Unit tests for dashboard intelligence
+Tests aggregate counters, concurrent section generation and snapshot refreshes
+"""
+
+import asyncio
+import json
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+from app.services.intelligence import dashboard, snapshots
+from app.services.intelligence.dashboard import (
+    aggregate_submissions,
+    generate_dashboard_intelligence,
+    merge_daily_stats,
+    quality_stats,
+    submission_counts
+)
+
+SUBMISSIONS = [
+    {
+        "id": 1, "company": "TechCorp", "industry": "Tecnologia", "status": "completed",
+        "challenge": "Escalar de 100 para 500 clientes",
+        "data_quality_json": json.dumps({"quality_tier": "legendary", "sources_succeeded": 12, "failed_sources": ["linkedin"]})
+    },
+    {
+        "id": 2, "company": "HealthCo", "industry": "Saúde", "status": "failed",
+        "error_message": "Model refused the request",
+        "data_quality_json": json.dumps({"quality_tier": "partial", "sources_succeeded": 3, "perplexity_sources": 0,
+                                         "failed_sources": ["linkedin", "google_places"]})
+    },
+    {"id": 3, "company": "RetailX", "industry": None, "status": "completed", "data_quality_json": "{not json"},
+]
+
+
+def test_aggregates_count_tiers_sources_and_failures():
+    stats = aggregate_submissions(SUBMISSIONS)
+
+    assert stats["total_submissions"] == 3
+    assert stats["industries"] == {"Tecnologia": 1, "Saúde": 1, "Unknown": 1}
+    assert stats["quality_tiers"] == {"legendary": 1, "partial": 1}
+    assert stats["with_quality"] == 2
+    assert stats["sources_succeeded"] == 15
+    assert stats["failed_sources"] == {"linkedin": 2, "google_places": 1}
+    assert (stats["perplexity_failures"], stats["ai_refusals"], stats["failed"]) == (1, 1, 1)
+    assert quality_stats(stats) == {"legendary": 1, "full": 0, "good": 0, "partial": 1, "minimal": 0, "total": 2}
+
+
+def test_rollup_rows_merge_to_the_same_totals():
+    # Rows as the trigger leaves them: one per (day, industry), two submissions in one row
+    per_submission = [submission_counts(sub) for sub in SUBMISSIONS + SUBMISSIONS[:1]]
+    tech = merge_daily_stats([per_submission[0], per_submission[3]])
+    rows = [
+        {"day": "2026-10-15", "industry": "Tecnologia", "submissions": tech["total_submissions"],
+         **{k: v for k, v in tech.items() if k not in ("total_submissions", "industries")}},
+        {"day": "2026-10-16", **per_submission[1]},
+        {"day": "2026-10-16", **per_submission[2]},
+    ]
+
+    assert merge_daily_stats(rows) == aggregate_submissions(SUBMISSIONS + SUBMISSIONS[:1])
+
+
+def _fake_llm(log, delay=0.05):
+    async def call(prompt, temperature=0.5, max_tokens=2000, **kwargs):
+        kind = (
+            "summary" if "resumo executivo" in prompt else
+            "improvements" if "padrões de falha" in prompt else
+            "trends" if "tendências de qualidade" in prompt else
+            "challenges" if "desafios de negócio" in prompt else
+            "risk"
+        )
+        log.append(("start", kind))
+        await asyncio.sleep(delay)
+        log.append(("end", kind))
+        if kind == "summary":
+            return "Resumo"
+        if kind == "trends":
+            return json.dumps({"trend_direction": "ESTÁVEL", "key_insights": []})
+        if kind == "improvements":
+            return json.dumps({"improvement_recommendations": ["Melhoria"]})
+        return json.dumps({"common_challenges": [{"theme": "Crescimento"}], "high_risk_submissions": [{"id": 2}]})
+    return call
+
+
+@pytest.mark.asyncio
+async def test_independent_sections_run_concurrently():
+    log = []
+    with patch.object(dashboard, "call_free_llm", side_effect=_fake_llm(log)):
+        result = await generate_dashboard_intelligence(SUBMISSIONS, previous_submissions=SUBMISSIONS[:1])
+
+    starts = [kind for event, kind in log[:4] if event == "start"]
+    assert sorted(starts) == ["challenges", "risk", "summary", "trends"]
+    assert log.index(("start", "improvements")) > log.index(("end", "trends"))
+
+    assert result["executive_summary"] == "Resumo"
+    assert result["quality_trends"]["current_stats"]["total"] == 2
+    assert result["common_challenges"] == [{"theme": "Crescimento"}]
+    assert result["high_risk_submissions"] == [{"id": 2}]
+    assert result["system_improvement_recommendations"] == ["Melhoria"]
+    assert result["metadata"]["failed_sections"] == []
+
+
+@pytest.mark.asyncio
+async def test_failed_section_does_not_fail_the_rest():
+    fake = _fake_llm([], delay=0)
+
+    async def flaky(prompt, **kwargs):
+        if "alto risco" in prompt:
+            raise RuntimeError("429")
+        return await fake(prompt, **kwargs)
+
+    with patch.object(dashboard, "call_free_llm", side_effect=flaky):
+        result = await generate_dashboard_intelligence(SUBMISSIONS)
+
+    assert result["high_risk_submissions"] == []
+    assert result["executive_summary"] == "Resumo"
+    assert result["quality_trends"] is None
+    assert result["metadata"]["failed_sections"] == ["high_risk_submissions"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("days, timeframe", [(7, "this week"), (30, "this month"), (90, "last 90 days")])
+async def test_summary_timeframe_follows_period(days, timeframe):
+    summary = AsyncMock(return_value="Resumo")
+    with patch.object(dashboard, "call_free_llm", side_effect=_fake_llm([], delay=0)), \
+         patch.object(dashboard, "generate_executive_summary", summary):
+        await generate_dashboard_intelligence(SUBMISSIONS, days=days)
+
+    assert summary.call_args.args[2] == timeframe
+
+
+@pytest.mark.asyncio
+async def test_refresh_stores_snapshot_and_keeps_it_on_failure():
+    stored = {}
+
+    async def cache(days, intelligence):
+        stored[days] = intelligence
+        return True
+
+    rows = [{"day": datetime.now(timezone.utc).date().isoformat(), **submission_counts(SUBMISSIONS[0])}]
+    with patch.object(snapshots, "get_dashboard_daily_stats", AsyncMock(return_value=rows)), \
+         patch.object(snapshots, "list_submissions_created_since", AsyncMock(return_value=[])), \
+         patch.object(snapshots, "cache_dashboard_intelligence", side_effect=cache), \
+         patch.object(dashboard, "call_free_llm", side_effect=_fake_llm([], delay=0)):
+        snapshot = await snapshots.refresh_dashboard_intelligence(7)
+
+        with patch.object(snapshots, "generate_dashboard_intelligence", AsyncMock(return_value={"error": "429"})):
+            failed = await snapshots.refresh_dashboard_intelligence(7)
+
+    assert stored == {7: snapshot}
+    assert snapshot["total_submissions"] == 1
+    assert snapshot["quality_trends"] is None  # Nothing in the previous period
+    assert snapshots.snapshot_age_seconds(snapshot) < 60
+    assert failed == {"error": "429"}
@@ -0,0 +1,159 @@
+"""
+Unit tests for shared page snapshots
+Tests single-pass indexing, capped streaming fetch, fetch-once caching and source reuse
+"""
+
+import asyncio
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.enrichment.page_snapshot import (
+    PageSnapshot,
+    PageSnapshotCache,
+    fetch_page_snapshot
+)
+from app.services.enrichment.sources.metadata_enhanced import EnhancedMetadataSource
+
+
+HTML = """
+<html>
+    <head>
+        <title>TechStart Innovations - Home</title>
+        <meta name="Description" content=" B2B automation platform ">
+        <meta property="og:image" content="/static/logo.png">
+        <link rel="apple-touch-icon" href="/apple.png">
+        <script src="/_next/static/main.js"></script>
+        <script type="application/ld+json">
+            [{"@type": "Organization", "name": "TechStart SA", "telephone": "+55 11 4000-0000",
+              "sameAs": ["https://instagram.com/techstart"]}]
+        </script>
+    </head>
+    <body>
+        <a href="/pricing">Pricing</a>
+        <a href="https://linkedin.com/company/techstart">LinkedIn</a>
+        <a href="mailto:contato@techstart.com?subject=Oi">Email</a>
+        <a href="https://wa.me/5511999999999">WhatsApp</a>
+    </body>
+</html>
+"""
+
+
+@pytest.mark.unit
+class TestPageSnapshot:
+    """Test suite for PageSnapshot parsing and fetching"""
+
+    def test_parse_builds_indexes(self):
+        """Meta tags, links, scripts and JSON-LD are indexed in one pass"""
+        page = PageSnapshot.parse("https://techstart.com", HTML)
+
+        assert page.title == "TechStart Innovations - Home"
+        assert page.meta["description"] == "B2B automation platform"
+        assert page.meta["og:image"] == "/static/logo.png"
+        assert page.social_links == ["https://linkedin.com/company/techstart"]
+        assert page.scripts == ["/_next/static/main.js"]
+        assert page.json_ld[0]["name"] == "TechStart SA"
+        assert page.first_link("apple-touch-icon") == "/apple.png"
+
+    @pytest.mark.asyncio
+    async def test_fetch_caps_bytes_and_decodes_streamed_chunks(self):
+        """The body is cut at max_bytes and multi-byte characters survive chunking"""
+        body = ("<html><title>São Paulo</title>" + "x" * 1000 + "</html>").encode("utf-8")
+
+        async def stream():
+            # Split inside the two-byte "ã"
+            yield body[:16]
+            yield body[16:]
+
+        def handler(request):
+            return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"}, content=stream())
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch("app.services.enrichment.page_snapshot.get_http_client", return_value=client):
+            page = await fetch_page_snapshot("https://example.com", "test-agent", 5.0, max_bytes=100)
+        await client.aclose()
+
+        assert page.truncated is True
+        assert len(page.html.encode("utf-8")) <= 100
+        assert page.title == "São Paulo"
+
+    @pytest.mark.asyncio
+    async def test_fetch_raises_on_http_error(self):
+        """HTTP errors propagate like a plain GET"""
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(404)))
+        with patch("app.services.enrichment.page_snapshot.get_http_client", return_value=client):
+            with pytest.raises(httpx.HTTPStatusError):
+                await fetch_page_snapshot("https://example.com", "test-agent", 5.0)
+        await client.aclose()
+
+
+@pytest.mark.unit
+class TestPageSnapshotCache:
+    """Test suite for PageSnapshotCache"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_fetch(self):
+        """Concurrent and repeated requests for a URL fetch it once"""
+        release = asyncio.Event()
+        page = PageSnapshot.parse("https://techstart.com", HTML)
+
+        async def fetch():
+            await release.wait()
+            return page
+
+        fetch_mock = AsyncMock(side_effect=fetch)
+        cache = PageSnapshotCache()
+
+        tasks = [asyncio.create_task(cache.get("https://techstart.com", fetch_mock)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert all(result is page for result in results)
+        assert await cache.get("https://TechStart.com/", fetch_mock) is page
+        assert fetch_mock.await_count == 1
+        assert cache.stats == {"fetches": 1, "hits": 1, "coalesced": 2}
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_not_cached(self):
+        """A failed fetch is retried on the next request"""
+        page = PageSnapshot.parse("https://techstart.com", HTML)
+        fetch_mock = AsyncMock(side_effect=[httpx.ConnectError("down"), page])
+        cache = PageSnapshotCache()
+
+        with pytest.raises(httpx.ConnectError):
+            await cache.get("https://techstart.com", fetch_mock)
+        assert await cache.get("https://techstart.com", fetch_mock) is page
+
+    @pytest.mark.asyncio
+    async def test_lru_bound(self):
+        """Only max_entries snapshots are kept"""
+        cache = PageSnapshotCache(max_entries=2)
+        for i in range(3):
+            await cache.get(f"https://site{i}.com", AsyncMock(return_value=PageSnapshot.parse("u", "<p>x</p>")))
+
+        assert len(cache._entries) == 2
+
+
+@pytest.mark.unit
+class TestMetadataSourcesShareSnapshot:
+    """Base and enhanced extraction run over a single fetched page"""
+
+    @pytest.mark.asyncio
+    async def test_enhanced_source_fetches_page_once(self):
+        """EnhancedMetadataSource performs one fetch for base and enhanced data"""
+        page = PageSnapshot.parse("https://techstart.com", HTML, headers={"Server": "nginx"})
+        fetch = AsyncMock(return_value=page)
+
+        with patch("app.services.enrichment.sources.metadata.get_page_snapshot", fetch):
+            result = await EnhancedMetadataSource().enrich("techstart.com")
+
+        assert fetch.await_count == 1
+        data = result.data
+        assert data["company_name"] == "TechStart SA"
+        assert "Next.js" in data["website_tech"]
+        assert "Nginx" in data["website_tech"]
+        assert data["social_media"]["linkedin_company"] == "https://linkedin.com/company/techstart"
+        assert data["whatsapp"] == "+5511999999999"
+        assert data["email"] == "contato@techstart.com"
+        assert data["logo_url"] == "https://techstart.com/static/logo.png"
@@ -0,0 +1,112 @@
+"""
+Unit tests for the PDF artifact store
+Tests content-addressed keys, ETag matching, get-or-render coalescing and the bounded memory tier
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+import app.core.cache as cache
+from app.core.tiered_cache import MemoryTier
+from app.services.pdf_store import PdfArtifactStore, etag_matches, pdf_render_inputs
+
+
+SUBMISSION = {
+    "id": 42,
+    "company": "TechStart",
+    "industry": "Technology",
+    "website": "https://techstart.com",
+    "challenge": "Grow",
+    "name": "Ana",
+    "report_json": json.dumps({"sumario_executivo": "original"}),
+    "edited_json": json.dumps({"sumario_executivo": "edited"}),
+    "last_edited_at": "2026-10-16T12:30:00+00:00",
+    "updated_at": "2026-10-15T08:00:00+00:00"
+}
+
+
+def test_render_inputs_prefer_edited_report_and_keep_only_date():
+    submission_data, report_json = pdf_render_inputs(SUBMISSION)
+
+    assert report_json == {"sumario_executivo": "edited"}
+    assert submission_data["updated_at"] == "2026-10-16"
+
+
+def test_render_inputs_without_report():
+    assert pdf_render_inputs({"company": "X", "report_json": None}) is None
+
+
+def test_etag_changes_with_content_not_with_time_of_day():
+    store = PdfArtifactStore()
+    later = {**SUBMISSION, "last_edited_at": "2026-10-16T18:00:00+00:00"}
+    edited = {**SUBMISSION, "edited_json": json.dumps({"sumario_executivo": "edited again"})}
+
+    etag = store.etag(*pdf_render_inputs(SUBMISSION))
+
+    assert etag == store.etag(*pdf_render_inputs(later))
+    assert etag != store.etag(*pdf_render_inputs(edited))
+    assert etag.startswith('"pdf:v')
+
+
+@pytest.mark.parametrize("header,expected", [
+    (None, False),
+    ('"pdf:v1:abc"', True),
+    ('W/"pdf:v1:abc"', True),
+    ('"other", "pdf:v1:abc"', True),
+    ("*", True),
+    ('"pdf:v1:def"', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"pdf:v1:abc"') is expected
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_render():
+    store = PdfArtifactStore()
+    submission_data, report_json = pdf_render_inputs(SUBMISSION)
+
+    async def slow_render(*args):
+        await asyncio.sleep(0.01)
+        return b"%PDF-1.4"
+
+    with patch("app.services.pdf_store.get_cached_pdf", AsyncMock(return_value=None)), \
+         patch("app.services.pdf_store.cache_pdf", AsyncMock(return_value=True)) as cache_pdf, \
+         patch.object(PdfArtifactStore, "_render", side_effect=slow_render) as render:
+        results = await asyncio.gather(*(store.get(42, submission_data, report_json) for _ in range(3)))
+
+    assert results == [b"%PDF-1.4"] * 3
+    assert render.call_count == 1
+    cache_pdf.assert_awaited_once()
+    assert store.stats["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_pdf_skips_render():
+    store = PdfArtifactStore()
+
+    with patch("app.services.pdf_store.get_cached_pdf", AsyncMock(return_value=b"%PDF-cached")), \
+         patch.object(PdfArtifactStore, "_render") as render:
+        pdf_bytes = await store.get(42, *pdf_render_inputs(SUBMISSION))
+
+    assert pdf_bytes == b"%PDF-cached"
+    render.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_prerender_never_raises():
+    store = PdfArtifactStore()
+
+    with patch("app.services.pdf_store.get_submission", AsyncMock(side_effect=RuntimeError("db down"))):
+        assert await store.prerender(42) is False
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_is_bounded_by_bytes():
+    with patch.object(cache.pdf_cache, "memory", MemoryTier(max_entries=10, max_bytes=25)):
+        for key in ("a", "b", "c"):
+            await cache.pdf_cache.set(key, b"x" * 10, persist=False)
+
+        assert len(cache.pdf_cache) == 2
+        assert cache.pdf_cache.memory.bytes <= 25
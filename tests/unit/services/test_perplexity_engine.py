@@ -0,0 +1,106 @@
+"""
+Unit tests for the Perplexity query engine
+Tests caching, in-flight coalescing and bounded fan-out
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.core.cache import generate_perplexity_cache_key
+from app.services.data.perplexity_engine import PerplexityQueryEngine
+
+
+@pytest.mark.unit
+class TestPerplexityQueryEngine:
+    """Test suite for PerplexityQueryEngine"""
+
+    @pytest.fixture(autouse=True)
+    def memory_cache(self):
+        """Replace the memory + Supabase cache with a plain dict"""
+        store = {}
+
+        async def get_cached(cache_key):
+            return store.get(cache_key)
+
+        async def set_cached(cache_key, query, result):
+            store[cache_key] = result
+            return True
+
+        with patch("app.services.data.perplexity_engine.get_cached_perplexity_result", side_effect=get_cached), \
+                patch("app.services.data.perplexity_engine.cache_perplexity_result", side_effect=set_cached):
+            yield store
+
+    def test_cache_key_normalizes_query(self):
+        """Case and whitespace differences map to the same key"""
+        first = generate_perplexity_cache_key("Fintech  market in Brazil", 4000, 0.7)
+        second = generate_perplexity_cache_key("  fintech market\nin brazil ", 4000, 0.7)
+
+        assert first == second
+        assert first != generate_perplexity_cache_key("fintech market in brazil", 2000, 0.7)
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_served_from_cache(self):
+        """Second identical query does not reach Perplexity"""
+        fetch = AsyncMock(return_value="answer")
+        engine = PerplexityQueryEngine(fetch)
+
+        assert await engine.query("market size") == "answer"
+        assert await engine.query("Market  Size") == "answer"
+
+        assert fetch.await_count == 1
+        assert engine.get_stats()["cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_identical_in_flight_queries_coalesce(self):
+        """Concurrent identical queries share a single upstream call"""
+        release = asyncio.Event()
+
+        async def fetch(prompt, max_tokens, temperature):
+            await release.wait()
+            return "shared"
+
+        fetch_mock = AsyncMock(side_effect=fetch)
+        engine = PerplexityQueryEngine(fetch_mock)
+
+        tasks = [asyncio.create_task(engine.query("same question")) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*tasks) == ["shared"] * 5
+        assert fetch_mock.await_count == 1
+        assert engine.get_stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_query_not_cached(self, memory_cache):
+        """None answers are returned but never stored"""
+        fetch = AsyncMock(side_effect=[None, "recovered"])
+        engine = PerplexityQueryEngine(fetch)
+
+        assert await engine.query("flaky") is None
+        assert memory_cache == {}
+        assert await engine.query("flaky") == "recovered"
+
+    @pytest.mark.asyncio
+    async def test_query_many_bounds_concurrency_and_keeps_order(self):
+        """Fan-out never exceeds max_concurrency and preserves prompt order"""
+        active = 0
+        peak = 0
+
+        async def fetch(prompt, max_tokens, temperature):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            if prompt == "q3":
+                raise RuntimeError("upstream error")
+            return prompt.upper()
+
+        engine = PerplexityQueryEngine(fetch, max_concurrency=2)
+        prompts = [f"q{i}" for i in range(6)]
+
+        answers = await engine.query_many(prompts)
+
+        assert answers == ["Q0", "Q1", "Q2", None, "Q4", "Q5"]
+        assert peak == 2
@@ -0,0 +1,180 @@
+"""
+Unit tests for layer-by-layer progressive enrichment
+Tests the orchestrator async generator, the shared session store and the SSE route
+"""
+
+import asyncio
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from app.core.progress_bus import progress_bus
+from app.routes import enrichment_progressive
+from app.services.enrichment.progressive_orchestrator import (
+    ProgressiveEnrichmentOrchestrator,
+    ProgressiveEnrichmentSession
+)
+from app.services.enrichment.progressive_session_store import (
+    ProgressiveSessionStore,
+    progressive_channel
+)
+
+
+def source_result(name, data):
+    return SimpleNamespace(success=True, source_name=name, data=data, cost_usd=0.01)
+
+
+def make_orchestrator(layer2_gate=None):
+    """Orchestrator with stubbed sources; layer 2 blocks on layer2_gate if given"""
+    orchestrator = ProgressiveEnrichmentOrchestrator.__new__(ProgressiveEnrichmentOrchestrator)
+
+    async def clearbit(domain):
+        if layer2_gate is not None:
+            await layer2_gate.wait()
+        return source_result("clearbit", {"employee_count": "50-100"})
+
+    orchestrator.metadata_source = SimpleNamespace(
+        enrich_with_monitoring=AsyncMock(return_value=source_result("metadata", {"company_name": "Acme"}))
+    )
+    orchestrator.ip_api_source = SimpleNamespace(
+        enrich_with_monitoring=AsyncMock(return_value=source_result("ip_api", {"timezone": "America/Sao_Paulo"}))
+    )
+    orchestrator.clearbit_source = SimpleNamespace(enrich_with_monitoring=clearbit)
+    orchestrator.receita_ws_source = SimpleNamespace(
+        enrich_with_monitoring=AsyncMock(return_value=source_result("receita_ws", {"cnpj": "00.000.000/0001-00"}))
+    )
+    orchestrator.google_places_source = SimpleNamespace(
+        enrich_with_monitoring=AsyncMock(return_value=source_result("google_places", {"rating": 4.5}))
+    )
+    orchestrator.ai_inference_source = SimpleNamespace(
+        enrich_with_monitoring=AsyncMock(return_value=source_result("ai_inference", {"ai_industry": "Software"}))
+    )
+    orchestrator.proxycurl_source = SimpleNamespace(
+        enrich_with_monitoring=AsyncMock(return_value=source_result("proxycurl", {"linkedin_followers": 1200}))
+    )
+    orchestrator._cache_session = AsyncMock()
+    return orchestrator
+
+
+class FakeRedis:
+    """Async key/value stand-in shared by several stores"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+
+@pytest.mark.unit
+class TestProgressiveStream:
+    """Test suite for ProgressiveEnrichmentOrchestrator.enrich_progressive_stream"""
+
+    @pytest.mark.asyncio
+    async def test_layer1_yielded_before_layer2_finishes(self):
+        """Layer 1 reaches the consumer while layer 2 is still running"""
+        gate = asyncio.Event()
+        stream = make_orchestrator(layer2_gate=gate).enrich_progressive_stream("https://acme.com")
+
+        first = await asyncio.wait_for(stream.__anext__(), timeout=1)
+        assert first.layer_number == 1
+        assert first.data["company_name"] == "Acme"
+
+        gate.set()
+        rest = [layer async for layer in stream]
+        assert [layer.layer_number for layer in rest] == [2, 3]
+
+    @pytest.mark.asyncio
+    async def test_session_updated_before_each_yield(self):
+        """The given session reflects each layer when it is yielded"""
+        session = ProgressiveEnrichmentSession(session_id="s-1", website_url="https://acme.com")
+        statuses = []
+
+        async for _ in make_orchestrator().enrich_progressive_stream("https://acme.com", session=session):
+            statuses.append(session.status)
+
+        assert statuses == ["layer1_complete", "layer2_complete", "complete"]
+        assert session.session_id == "s-1"
+        assert session.total_cost_usd > 0
+
+    @pytest.mark.asyncio
+    async def test_enrich_progressive_returns_complete_session(self):
+        """The non-streaming API still returns the finished session and caches it"""
+        orchestrator = make_orchestrator()
+
+        session = await orchestrator.enrich_progressive("https://acme.com")
+
+        assert session.status == "complete"
+        assert session.layer3_result.data["ai_industry"] == "Software"
+        orchestrator._cache_session.assert_awaited_once()
+
+
+@pytest.mark.unit
+class TestProgressiveSessionStore:
+    """Test suite for ProgressiveSessionStore"""
+
+    @pytest.mark.asyncio
+    async def test_session_visible_from_other_worker(self):
+        """A session saved by one worker is readable by another through Redis"""
+        redis = FakeRedis()
+        worker_a = ProgressiveSessionStore(redis_client=redis)
+        worker_b = ProgressiveSessionStore(redis_client=redis)
+
+        await worker_a.save(ProgressiveEnrichmentSession(
+            session_id="s-2", website_url="https://acme.com", status="layer1_complete"
+        ))
+
+        session = await worker_b.get("s-2")
+        assert session.status == "layer1_complete"
+        assert worker_b.local_sessions == {}
+
+    @pytest.mark.asyncio
+    async def test_local_sessions_expire(self):
+        """Local snapshots are dropped after the TTL"""
+        store = ProgressiveSessionStore(ttl_seconds=0.01)
+        await store.save(ProgressiveEnrichmentSession(session_id="s-3", website_url="https://acme.com"))
+        await asyncio.sleep(0.02)
+
+        assert await store.get("s-3") is None
+
+
+@pytest.mark.unit
+class TestProgressiveStreamRoute:
+    """Test suite for the progressive enrichment SSE route"""
+
+    @pytest.mark.asyncio
+    async def test_stream_emits_published_layers(self):
+        """Published layer events are streamed with their names and ids"""
+        session = ProgressiveEnrichmentSession(session_id="s-4", website_url="https://acme.com")
+        await enrichment_progressive.progressive_session_store.save(session)
+
+        channel = progressive_channel("s-4")
+        for event in ("layer1_complete", "layer2_complete", "layer3_complete"):
+            progress_bus.publish(channel, enrichment_progressive.build_layer_event(event, session, None))
+
+        response = await enrichment_progressive.stream_progressive_enrichment("s-4", last_event_id=None)
+        frames = [frame async for frame in response.body_iterator]
+
+        assert [frame.split("\n")[0] for frame in frames] == [
+            "event: layer1_complete", "event: layer2_complete", "event: layer3_complete"
+        ]
+        final = json.loads(frames[-1].split("data: ", 1)[1])
+        assert "total_cost_usd" in final
+
+        progress_bus.clear(channel)
+        await enrichment_progressive.progressive_session_store.delete("s-4")
+
+    @pytest.mark.asyncio
+    async def test_unknown_session_reports_error(self):
+        """Streams for unknown sessions end with an error event"""
+        response = await enrichment_progressive.stream_progressive_enrichment("missing", last_event_id=None)
+        frames = [frame async for frame in response.body_iterator]
+
+        assert frames[0].startswith("event: error")
@@ -0,0 +1,118 @@
+"""
+Unit tests for the prompt context serializer
+Tests compact output, pruning, structural truncation and the logged report
+"""
+
+import json
+import pytest
+from unittest.mock import patch
+
+from app.services.analysis.stages.stage6_polish import stage6_executive_polish
+from app.services.analysis.prompt_context import (
+    context_report,
+    estimate_tokens,
+    prune,
+    serialize_prompt_context
+)
+
+EXTRACTED = {
+    "company_info": {"name": "Acme", "employees": None, "location": "São Paulo", "products": []},
+    "competitors": [{"name": f"Concorrente {i}", "notes": "x" * 400} for i in range(30)],
+    "industry_trends": ["Digitalização do varejo", "Digitalização do varejo", ""],
+    "data_gaps": [],
+    "_usage_stats": {"input_tokens": 1200, "output_tokens": 800}
+}
+
+
+def test_output_is_compact_canonical_json():
+    context = serialize_prompt_context({"b": 1, "a": "ação"}, max_tokens=100)
+
+    assert context.text == '{"a":"ação","b":1}'
+    assert str(context) == context.text
+    assert not context.truncated
+
+
+def test_prune_drops_empty_internal_and_duplicate_values():
+    pruned = prune(EXTRACTED)
+
+    assert "_usage_stats" not in pruned
+    assert "data_gaps" not in pruned
+    assert pruned["company_info"] == {"name": "Acme", "location": "São Paulo"}
+    assert pruned["industry_trends"] == ["Digitalização do varejo"]
+
+
+def test_truncation_keeps_valid_json_within_budget():
+    context = serialize_prompt_context(EXTRACTED, max_tokens=500)
+    data = json.loads(context.text)
+
+    assert context.truncated
+    assert context.tokens <= 500
+    assert data["company_info"]["name"] == "Acme"
+    assert len(data["competitors"]) < 30
+    assert data["competitors"][-1].startswith("…")
+
+
+def test_largest_fields_dropped_as_last_resort():
+    data = {"small": "ok", "huge": {f"k{i}": f"value {i}" for i in range(200)}}
+
+    context = serialize_prompt_context(data, max_tokens=20)
+
+    assert json.loads(context.text) == {"small": "ok"}
+    assert context.dropped_fields == ["huge"]
+
+
+def test_empty_input_uses_placeholder():
+    context = serialize_prompt_context(None, max_tokens=100, empty="No Apify data")
+
+    assert context.text == "No Apify data"
+    assert context.original_tokens == 0
+
+
+def test_report_sums_contexts_and_shows_savings():
+    contexts = [serialize_prompt_context(EXTRACTED, 500), serialize_prompt_context({"swot": "ok"}, 100)]
+
+    report = context_report(contexts)
+
+    assert report["context_tokens"] == sum(c.tokens for c in contexts)
+    assert report["original_tokens"] > report["context_tokens"]
+    assert report["truncated"] is True
+    assert estimate_tokens("abcdefg") == 2
+
+
+def _large_strategy(recommendations):
+    return {
+        "sumario_executivo": "Resumo " * 400,
+        "recomendacoes_prioritarias": [
+            {"titulo": f"Recomendação {i}", "como_implementar": ["passo"] * 3, "detalhe": "x" * 600}
+            for i in range(recommendations)
+        ],
+        "okrs": [],
+        "analise_swot": {"forcas": ["Marca"], "fraquezas": ["Marca"]},
+    }
+
+
+@pytest.mark.asyncio
+async def test_stage6_sends_and_returns_large_strategy_unpruned():
+    strategy = _large_strategy(25)  # Beyond every shrink step, within the stage 6 budget
+    prompts = []
+
+    async def echo(**kwargs):
+        prompts.append(kwargs["prompt"])
+        return json.dumps(strategy, ensure_ascii=False), {"input_tokens": 1}
+
+    with patch("app.services.analysis.stages.stage6_polish.call_llm_with_retry", side_effect=echo):
+        polished = await stage6_executive_polish("Acme", "Varejo", strategy)
+
+    assert json.dumps(strategy, ensure_ascii=False, separators=(",", ":")) in prompts[0]
+    assert "…" not in prompts[0]
+    assert {key: value for key, value in polished.items() if key != "_usage_stats"} == strategy
+    assert polished["_usage_stats"]["prompt_context"]["truncated"] is False
+
+
+@pytest.mark.asyncio
+async def test_stage6_skips_polish_when_strategy_exceeds_budget():
+    with patch("app.services.analysis.stages.stage6_polish.call_llm_with_retry") as llm:
+        with pytest.raises(ValueError):
+            await stage6_executive_polish("Acme", "Varejo", _large_strategy(100))
+
+    llm.assert_not_called()
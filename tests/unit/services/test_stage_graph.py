@@ -0,0 +1,176 @@
+"""
+Unit tests for the stage graph executor
+Tests dependency ordering, concurrency, fallbacks and graph validation
+"""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.services.analysis.stage_graph import StageGraphExecutor, StageNode
+
+
+async def _passthrough_cache(stage_name, stage_function, company, industry, input_data, estimated_cost, **stage_kwargs):
+    """Stand-in for run_stage_with_cache that always executes the stage"""
+    return await stage_function(company=company, industry=industry, **stage_kwargs)
+
+
+def _node(name, function, depends_on=(), **kwargs):
+    return StageNode(
+        name=name,
+        function=function,
+        model="test/model",
+        description=name,
+        estimated_cost=0.0,
+        build_cache_input=lambda ctx: {},
+        build_kwargs=kwargs.pop("build_kwargs", lambda ctx: {}),
+        depends_on=depends_on,
+        **kwargs
+    )
+
+
+@pytest.mark.unit
+class TestStageGraphExecutor:
+    """Test suite for StageGraphExecutor"""
+
+    @pytest.fixture(autouse=True)
+    def no_cache(self):
+        with patch("app.services.analysis.stage_graph.run_stage_with_cache", side_effect=_passthrough_cache):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_dependents_receive_upstream_results(self):
+        """A stage only starts after its dependencies and sees their results"""
+        async def root(company, industry):
+            return {"value": 1}
+
+        async def child(company, industry, upstream):
+            return {"value": upstream["value"] + 1}
+
+        nodes = [
+            _node("root", root),
+            _node("child", child, depends_on=("root",),
+                  build_kwargs=lambda ctx: {"upstream": ctx["results"]["root"]}),
+        ]
+
+        outcome = await StageGraphExecutor(nodes, MagicMock()).run("Acme", "Tech", inputs={})
+
+        assert outcome.results["child"] == {"value": 2}
+        assert outcome.completed == ["root", "child"]
+
+    @pytest.mark.asyncio
+    async def test_independent_stages_run_concurrently(self):
+        """Sibling stages overlap instead of running one after another"""
+        active = 0
+        peak = 0
+
+        async def leaf(company, industry):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+            return {}
+
+        async def root(company, industry):
+            return {}
+
+        nodes = [_node("root", root)] + [
+            _node(f"leaf{i}", leaf, depends_on=("root",)) for i in range(3)
+        ]
+
+        await StageGraphExecutor(nodes, MagicMock()).run("Acme", "Tech", inputs={})
+
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_stage_uses_fallback(self):
+        """A non-critical failure stores the fallback and the graph continues"""
+        async def root(company, industry):
+            return {"analysis": True}
+
+        async def broken(company, industry):
+            raise RuntimeError("boom")
+
+        nodes = [
+            _node("root", root),
+            _node("polish", broken, depends_on=("root",),
+                  fallback=lambda ctx, error: ctx["results"]["root"]),
+        ]
+
+        outcome = await StageGraphExecutor(nodes, MagicMock()).run("Acme", "Tech", inputs={})
+
+        assert outcome.results["polish"] == {"analysis": True}
+        assert "boom" in outcome.failed["polish"]
+        assert outcome.completed == ["root"]
+
+    @pytest.mark.asyncio
+    async def test_required_stage_failure_aborts(self):
+        """A failing stage without fallback raises and cancels running siblings"""
+        cancelled = asyncio.Event()
+
+        async def root(company, industry):
+            return {}
+
+        async def slow(company, industry):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def broken(company, industry):
+            raise RuntimeError("required stage failed")
+
+        nodes = [
+            _node("root", root),
+            _node("slow", slow, depends_on=("root",), fallback=lambda ctx, error: {}),
+            _node("broken", broken, depends_on=("root",)),
+        ]
+
+        with pytest.raises(RuntimeError, match="required stage failed"):
+            await StageGraphExecutor(nodes, MagicMock()).run("Acme", "Tech", inputs={})
+
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_disabled_stage_is_skipped(self):
+        """Disabled stages get their default value and do not block dependents"""
+        calls = []
+
+        async def stage(company, industry):
+            calls.append(True)
+            return {"ran": True}
+
+        nodes = [
+            _node("optional", stage, enabled=lambda ctx: ctx["inputs"]["run_all_stages"]),
+            _node("after", stage, depends_on=("optional",)),
+        ]
+
+        outcome = await StageGraphExecutor(nodes, MagicMock()).run("Acme", "Tech", inputs={"run_all_stages": False})
+
+        assert outcome.results["optional"] == {}
+        assert outcome.skipped == ["optional"]
+        assert outcome.completed == ["after"]
+        assert len(calls) == 1
+
+    def test_cycle_is_rejected(self):
+        """Cyclic dependencies are detected when the executor is built"""
+        async def stage(company, industry):
+            return {}
+
+        nodes = [
+            _node("a", stage, depends_on=("b",)),
+            _node("b", stage, depends_on=("a",)),
+        ]
+
+        with pytest.raises(ValueError, match="cycle"):
+            StageGraphExecutor(nodes, MagicMock())
+
+    def test_unknown_dependency_is_rejected(self):
+        """Dependencies must refer to stages in the graph"""
+        async def stage(company, industry):
+            return {}
+
+        with pytest.raises(ValueError, match="unknown stage"):
+            StageGraphExecutor([_node("a", stage, depends_on=("missing",))], MagicMock())
@@ -0,0 +1,74 @@
+"""
+Unit tests for the compiled technology fingerprint engine
+Tests single-pass HTML matching, script/header/meta rules and data-file merging
+"""
+
+import json
+
+import pytest
+
+from app.services.enrichment.page_snapshot import PageSnapshot
+from app.services.enrichment.tech_fingerprints import (
+    DEFAULT_FINGERPRINTS_FILE,
+    TechFingerprintEngine
+)
+
+
+HTML = """
+<html>
+    <head>
+        <meta name="generator" content="WordPress 6.4">
+        <script src="https://code.jquery.com/jquery-3.7.1.min.js"></script>
+    </head>
+    <body><div id="__next" data-reactroot></div></body>
+</html>
+"""
+
+
+@pytest.fixture
+def engine():
+    return TechFingerprintEngine.from_files(DEFAULT_FINGERPRINTS_FILE)
+
+
+def test_detects_from_html_scripts_headers_and_meta(engine):
+    page = PageSnapshot.parse("https://example.com", HTML, headers={"server": "nginx/1.25", "cf-ray": "abc"})
+
+    detected = engine.detect_page(page)
+
+    assert {"React", "WordPress", "jQuery", "Nginx", "Cloudflare"} <= set(detected)
+    assert "Shopify" not in detected
+
+
+def test_overlapping_patterns_all_match(engine):
+    """__NEXT_DATA__ is a fingerprint for both React and Next.js"""
+    detected = engine.detect("<script id=\"__next_data__\">{}</script>")
+
+    assert detected == ["React", "Next.js"]
+
+
+def test_results_follow_fingerprint_order(engine):
+    detected = engine.detect("jquery tailwind bootstrap")
+
+    assert detected == ["Bootstrap", "Tailwind", "jQuery"]
+
+
+def test_header_presence_rule(engine):
+    assert engine.detect(headers={"x-vercel-id": "gru1::xyz"}) == ["Vercel"]
+
+
+def test_extra_file_extends_and_overrides(tmp_path, engine):
+    extra = tmp_path / "extra.json"
+    extra.write_text(json.dumps({
+        "HubSpot": {"scripts": ["js\\.hs-scripts\\.com"]},
+        "Flask": {"headers": {"server": "werkzeug"}}
+    }))
+    merged = TechFingerprintEngine.from_files(DEFAULT_FINGERPRINTS_FILE, extra)
+
+    assert merged.detect(scripts=["//JS.HS-Scripts.com/123.js"]) == ["HubSpot"]
+    assert merged.detect("powered by flask") == []
+    assert merged.detect(headers={"server": "Werkzeug/3.0"}) == ["Flask"]
+
+
+def test_rejects_capturing_groups():
+    with pytest.raises(ValueError):
+        TechFingerprintEngine({"Bad": {"html": ["(foo|bar)"]}})
@@ -0,0 +1,217 @@
+"""
+Unit tests for the batched enrichment audit writer
+Tests size-triggered bulk inserts, overflow policies, retry and backoff of transient failures, row-by-row
+fallback for rejected batches, shutdown flush and source-call rows
+"""
+
+import asyncio
+import httpx
+import pytest
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+from postgrest.exceptions import APIError
+
+from app.core.exceptions import DatabaseError
+from app.services.enrichment import audit_writer as audit_module
+from app.services.enrichment.audit_writer import (
+    AuditWriter,
+    _is_transient_write_error,
+    audit_context,
+    build_audit_row,
+)
+from app.services.enrichment.sources.base import EnrichmentSource, SourceResult
+
+
+def _row(n):
+    return {"source_name": f"s{n}"}
+
+
+@pytest.fixture
+def inserts():
+    batches = []
+
+    async def fake_insert(rows):
+        batches.append(rows)
+
+    with patch.object(audit_module, "_insert_audit_rows", side_effect=fake_insert):
+        yield batches
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_written_in_one_insert(inserts):
+    writer = AuditWriter(batch_size=3, flush_interval=60)
+    for n in range(4):
+        await writer.submit(_row(n))
+
+    await asyncio.sleep(0.01)  # Flusher wakes on the full batch
+    assert [len(batch) for batch in inserts] == [3, 1]
+    assert writer.get_stats()["written"] == 4
+
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_overflow_policies_count_drops(inserts):
+    oldest = AuditWriter(max_queue=2, batch_size=10, flush_interval=60, overflow_policy="drop_oldest")
+    newest = AuditWriter(max_queue=2, batch_size=10, flush_interval=60, overflow_policy="drop_newest")
+    for n in range(3):
+        await oldest.submit(_row(n))
+        await newest.submit(_row(n))
+
+    assert [r["source_name"] for r in oldest._queue] == ["s1", "s2"]
+    assert [r["source_name"] for r in newest._queue] == ["s0", "s1"]
+    assert oldest.get_stats()["dropped_oldest"] == 1
+    assert newest.get_stats()["dropped_newest"] == 1
+
+    await oldest.aclose()
+    await newest.aclose()
+
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_flush_then_times_out():
+    writer = AuditWriter(max_queue=1, batch_size=10, flush_interval=60, overflow_policy="block", block_timeout=0.05)
+    await writer.submit(_row(0))
+
+    # The wait wakes the flusher, which frees space for the blocked row
+    async def ok(rows):
+        pass
+
+    with patch.object(audit_module, "_insert_audit_rows", side_effect=ok):
+        assert await writer.submit(_row(1)) is True
+    assert writer.get_stats()["blocked"] == 1
+
+    # With the database down there is never room: the row is dropped after block_timeout
+    with patch.object(audit_module, "_insert_audit_rows", side_effect=ConnectionError("db down")):
+        assert await writer.submit(_row(2)) is False
+        assert writer.get_stats()["block_timeouts"] == 1
+
+    writer._queue.clear()
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_insert_is_retried_and_shutdown_flushes(inserts):
+    writer = AuditWriter(batch_size=10, flush_interval=60)
+    await writer.submit(_row(0))
+
+    with patch.object(audit_module, "_insert_audit_rows", side_effect=ConnectionError("db down")):
+        assert await writer.flush() == 0
+    assert writer.get_stats()["queued"] == 1
+    assert writer.get_stats()["flush_errors"] == 1
+
+    await writer.submit(_row(1))
+    await writer.aclose()
+    assert [[r["source_name"] for r in batch] for batch in inserts] == [["s0", "s1"]]
+    assert writer.get_stats()["queued"] == 0
+
+
+def _db_error(cause):
+    try:
+        raise DatabaseError("audit rows insert", str(cause)) from cause
+    except DatabaseError as e:
+        return e
+
+
+def test_only_transient_write_errors_are_retried():
+    assert _is_transient_write_error(_db_error(httpx.ConnectError("refused")))
+    assert _is_transient_write_error(_db_error(APIError({"code": "57014", "message": "statement timeout"})))
+    assert _is_transient_write_error(_db_error(APIError({"code": "PGRST003", "message": "pool timeout"})))
+    assert _is_transient_write_error(_db_error(APIError({"code": 503, "message": "JSON could not be generated"})))
+    assert not _is_transient_write_error(_db_error(APIError({"code": "23502", "message": "null value"})))
+    assert not _is_transient_write_error(_db_error(APIError({"code": "PGRST204", "message": "unknown column"})))
+    assert not _is_transient_write_error(ValueError("bad row"))
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_is_written_row_by_row(inserts):
+    async def reject_s1(rows):
+        if any(r["source_name"] == "s1" for r in rows):
+            raise _db_error(APIError({"code": "23502", "message": "null value in column"}))
+        inserts.append(rows)
+
+    writer = AuditWriter(batch_size=10, flush_interval=60)
+    for n in range(3):
+        await writer.submit(_row(n))
+
+    with patch.object(audit_module, "_insert_audit_rows", side_effect=reject_s1):
+        assert await writer.flush() == 2
+
+    assert [[r["source_name"] for r in batch] for batch in inserts] == [["s0"], ["s2"]]
+    stats = writer.get_stats()
+    assert (stats["queued"], stats["dropped_write_failures"], stats["flush_errors"]) == (0, 1, 1)
+
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_backs_off_before_retrying():
+    attempts = []
+
+    async def down(rows):
+        attempts.append(len(rows))
+        raise ConnectionError("db down")
+
+    writer = AuditWriter(max_queue=2, batch_size=1, flush_interval=60, retry_backoff=0.2)
+    with patch.object(audit_module, "_insert_audit_rows", side_effect=down):
+        await writer.submit(_row(0))
+        await asyncio.sleep(0.01)
+        assert attempts == [1]
+
+        # Full batches during the backoff do not wake the flusher
+        for n in range(1, 10):
+            await writer.submit(_row(n))
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.05)
+        assert attempts == [1]
+
+        await asyncio.sleep(0.25)
+        assert attempts == [1, 1]
+        assert writer._retry_at - time.monotonic() > 0.2  # Doubled for the second failure
+
+    writer._queue.clear()
+    await writer.aclose()
+
+
+class _StubSource(EnrichmentSource):
+    def __init__(self, fail=False):
+        super().__init__(name="stub", cost_per_call=0.05)
+        self.fail = fail
+
+    async def enrich(self, domain, **kwargs):
+        if self.fail:
+            raise ValueError("bad domain")
+        return SourceResult(source_name=self.name, success=True, data={"name": "Acme"}, duration_ms=12, cost_usd=0.05)
+
+
+@pytest.mark.asyncio
+async def test_source_calls_are_queued_with_enrichment_id():
+    writer = AuditWriter(batch_size=10, flush_interval=60)
+
+    with patch("app.services.enrichment.sources.base.audit_writer", writer):
+        with audit_context(42):
+            await asyncio.gather(
+                _StubSource().enrich_with_monitoring("acme.com", company_name="Acme"),
+                _StubSource(fail=True).enrich_with_monitoring("acme.com"),
+            )
+        await _StubSource().enrich_with_monitoring("other.com")
+
+    ok, failed, untagged = list(writer._queue)
+    assert ok["enrichment_id"] == 42 and failed["enrichment_id"] == 42
+    assert untagged["enrichment_id"] is None
+    assert ok["source_type"] == "api"
+    assert ok["request_params"] == {"domain": "acme.com", "company_name": "Acme"}
+    assert ok["cost_usd"] == 0.05
+    assert (failed["source_type"], failed["error_type"], failed["success"]) == ("error", "ValueError", False)
+    assert ok["circuit_breaker_state"] == "closed"
+
+    writer._queue.clear()
+    await writer.aclose()
+
+
+def test_row_uses_call_time_and_cache_source_type():
+    called_at = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+    row = build_audit_row("clearbit", True, called_at, cached=True)
+
+    assert row["called_at"] == "2026-10-16T12:00:00+00:00"
+    assert row["source_type"] == "cache"
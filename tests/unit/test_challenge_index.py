@@ -0,0 +1,108 @@
+"""
+Unit tests for near-duplicate challenge matching
+Tests normalization, scoped lookups, eviction, persistence format and cache reuse
+"""
+
+import pytest
+from unittest.mock import patch
+
+import app.core.cache as cache
+from app.core.challenge_index import ChallengeIndex, MinHasher, shingles
+from app.core.tiered_cache import TieredCache
+
+CHALLENGE = "Aumentar a receita recorrente e expandir para o mercado europeu nos próximos 12 meses"
+REWORDED = "Precisamos expandir para o mercado europeu e aumentar a receita recorrente nos proximos 12 meses."
+UNRELATED = "Reduzir a inadimplência e automatizar a produção com orçamento limitado"
+
+
+@pytest.fixture
+def index():
+    return ChallengeIndex(threshold=0.7, persist=False)
+
+
+def test_shingles_ignore_case_accents_and_punctuation():
+    assert shingles("Expansão no Nordeste!") == shingles("expansao no nordeste")
+
+
+@pytest.mark.asyncio
+async def test_reworded_challenge_matches_within_scope(index):
+    await index.add("analysis", "acme", CHALLENGE, "analysis:acme:1")
+
+    match = index.find("analysis", "acme", REWORDED)
+
+    assert match.cache_key == "analysis:acme:1"
+    assert match.similarity >= 0.7
+    assert index.find("analysis", "acme", UNRELATED) is None
+
+
+@pytest.mark.asyncio
+async def test_other_scopes_and_kinds_never_match(index):
+    await index.add("analysis", "acme", CHALLENGE, "analysis:acme:1")
+
+    assert index.find("analysis", "globex", CHALLENGE) is None
+    assert index.find("extraction", "acme", CHALLENGE) is None
+
+
+@pytest.mark.asyncio
+async def test_index_is_bounded():
+    index = ChallengeIndex(max_entries=3, persist=False)
+    for i in range(5):
+        await index.add("analysis", "acme", f"{CHALLENGE} {i}", f"key-{i}")
+
+    assert len(index) == 3
+    match = index.find("analysis", "acme", f"{CHALLENGE} 0")
+    assert match.cache_key in {"key-2", "key-3", "key-4"}
+
+
+@pytest.mark.asyncio
+async def test_discarded_entries_are_not_matched(index):
+    await index.add("analysis", "acme", CHALLENGE, "analysis:acme:1")
+
+    index.discard("analysis", "analysis:acme:1")
+
+    assert index.find("analysis", "acme", CHALLENGE) is None
+    assert index._buckets == {}
+
+
+@pytest.mark.asyncio
+async def test_persist_failure_keeps_entry_in_memory():
+    index = ChallengeIndex()
+    with patch("app.core.challenge_index._store_entry", side_effect=RuntimeError("db down")):
+        await index.add("analysis", "acme", CHALLENGE, "analysis:acme:1")
+
+    assert index.get_stats()["persist_errors"] == 1
+    assert index.find("analysis", "acme", CHALLENGE).cache_key == "analysis:acme:1"
+
+
+def test_signatures_are_stable_across_processes():
+    # Persisted signatures must be comparable after a restart (no per-process hash seed)
+    assert MinHasher().signature(shingles(CHALLENGE)) == MinHasher().signature(shingles(CHALLENGE))
+
+
+@pytest.mark.asyncio
+async def test_load_restores_persisted_entries(index):
+    signature = list(index.hasher.signature(shingles(CHALLENGE)))
+    rows = [{"kind": "analysis", "scope": "acme", "cache_key": "analysis:acme:1", "signature": signature}]
+
+    with patch("app.core.challenge_index._load_entries", return_value=rows):
+        assert await index.load() == 1
+
+    assert index.find("analysis", "acme", REWORDED).cache_key == "analysis:acme:1"
+
+
+@pytest.mark.asyncio
+async def test_get_cached_analysis_reuses_near_duplicate():
+    with patch.object(cache, "analysis_cache", TieredCache("test_near_analysis", ttl_seconds=60)), \
+         patch.object(cache, "challenge_index", ChallengeIndex(threshold=0.7, persist=False)):
+        await cache.cache_analysis_result(
+            "Acme", "Tecnologia", CHALLENGE, "acme.com", {"summary": "ok"}, cost=0.4, processing_time=1.0
+        )
+
+        reused = await cache.get_cached_analysis("Acme", "Tecnologia", REWORDED, "acme.com")
+        unrelated = await cache.get_cached_analysis("Acme", "Tecnologia", UNRELATED, "acme.com")
+        other_company = await cache.get_cached_analysis("Globex", "Tecnologia", REWORDED, "globex.com")
+
+    assert reused["analysis"] == {"summary": "ok"}
+    assert reused["near_match"]["similarity"] >= 0.7
+    assert unrelated is None
+    assert other_company is None
@@ -0,0 +1,114 @@
+"""
+Unit tests for the append-only chat message store
+Tests pagination cursors, context loading after the summary and chat routes not writing submissions
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.routes.chat as chat_routes
+from app.repositories import chat_repository
+from app.routes.auth import get_current_user
+
+
+def _rows(ids):
+    return [{"id": i, "role": "user" if i % 2 else "assistant", "content": f"m{i}"} for i in ids]
+
+
+@pytest.mark.asyncio
+async def test_pages_return_cursor_until_last_page():
+    supabase = MagicMock()
+    page = supabase.table.return_value.select.return_value.eq.return_value.order.return_value.limit.return_value
+    page.execute.return_value.data = _rows([1, 2, 3])
+
+    with patch.object(chat_repository, "supabase_service", supabase):
+        messages, cursor = await chat_repository.list_chat_messages(7, limit=2)
+
+    assert [m["id"] for m in messages] == [1, 2]
+    assert cursor == 2
+    page.execute.return_value.data = _rows([1, 2])
+    with patch.object(chat_repository, "supabase_service", supabase):
+        _, cursor = await chat_repository.list_chat_messages(7, limit=2)
+    assert cursor is None
+
+
+@pytest.mark.asyncio
+async def test_context_reads_only_messages_after_summary():
+    supabase = MagicMock()
+    summaries = supabase.table.return_value.select.return_value.eq.return_value.limit.return_value
+    summaries.execute.return_value.data = [{"summary": "resumo", "through_message_id": 10}]
+    messages = supabase.table.return_value.select.return_value.eq.return_value.gt.return_value
+    messages.order.return_value.limit.return_value.execute.return_value.data = _rows([13, 12, 11])
+
+    with patch.object(chat_repository, "supabase_service", supabase):
+        summary, history = await chat_repository.load_chat_context(7)
+
+    assert summary["through_message_id"] == 10
+    supabase.table.return_value.select.return_value.eq.return_value.gt.assert_called_with("id", 10)
+    assert [m["id"] for m in history] == [11, 12, 13]
+
+
+def test_chat_turn_appends_messages_without_touching_submission():
+    app = FastAPI()
+    app.include_router(chat_routes.router)
+    app.dependency_overrides[get_current_user] = lambda: {"email": "admin@example.com"}
+    submission = {"id": 7, "status": "completed", "report_json": "{}", "processing_metadata": "{}"}
+    reply = {"success": True, "message": "resposta", "model_used": "m", "tokens_used": 9, "timestamp": "t"}
+    stored = [{"id": 1, "role": "user", "content": "oi"}, {"id": 2, "role": "assistant", "content": "resposta"}]
+
+    with patch.object(chat_routes, "get_submission", AsyncMock(return_value=submission)), \
+         patch.object(chat_repository, "load_chat_context", AsyncMock(return_value=(None, []))), \
+         patch.object(chat_repository, "append_chat_messages", AsyncMock(return_value=stored)) as append, \
+         patch.object(chat_routes, "send_chat_message", AsyncMock(return_value=reply)), \
+         patch("app.core.database.update_submission_status", AsyncMock()) as update_submission:
+        response = TestClient(app).post("/api/admin/submissions/7/chat", json={"message": "oi"})
+
+    assert response.json()["chat_history"] == stored
+    append.assert_awaited_once()
+    assert [m["role"] for m in append.call_args.args[1]] == ["user", "assistant"]
+    update_submission.assert_not_called()
+    # The route module has no submission write path to call
+    assert not hasattr(chat_routes, "update_submission_status")
+
+
+def test_history_of_unknown_submission_is_404():
+    app = FastAPI()
+    app.include_router(chat_routes.router)
+    app.dependency_overrides[get_current_user] = lambda: {"email": "admin@example.com"}
+
+    with patch.object(chat_repository, "list_chat_messages", AsyncMock(return_value=([], None))), \
+         patch.object(chat_routes, "get_submission", AsyncMock(return_value=None)) as get_submission:
+        response = TestClient(app).get("/api/admin/submissions/404/chat/history")
+
+    assert response.status_code == 404
+    get_submission.assert_awaited_once_with(404)
+
+
+def test_stream_sends_done_before_summarizing():
+    app = FastAPI()
+    app.include_router(chat_routes.router)
+    app.dependency_overrides[get_current_user] = lambda: {"email": "admin@example.com"}
+    submission = {"id": 7, "status": "completed", "report_json": "{}", "processing_metadata": "{}"}
+    order = []
+
+    async def fake_stream(**kwargs):
+        yield {"type": "delta", "content": "resp"}
+        yield {"type": "done", "message": "resposta", "model_used": "m", "tokens_used": 9, "timestamp": "t"}
+        order.append("done sent")  # Resumed only once the route has yielded `done`
+
+    async def fake_summary(history, summary):
+        order.append("summary")
+        return summary
+
+    with patch.object(chat_routes, "get_submission", AsyncMock(return_value=submission)), \
+         patch.object(chat_repository, "load_chat_context", AsyncMock(return_value=(None, []))), \
+         patch.object(chat_repository, "append_chat_messages", AsyncMock(return_value=_rows([1, 2]))), \
+         patch.object(chat_routes, "stream_chat_message", fake_stream), \
+         patch.object(chat_routes, "update_chat_summary", side_effect=fake_summary):
+        response = TestClient(app).post("/api/admin/submissions/7/chat/stream", json={"message": "oi"})
+
+    assert "event: done" in response.text
+    assert order == ["done sent", "summary"]
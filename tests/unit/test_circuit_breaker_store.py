@@ -0,0 +1,147 @@
+"""
+Unit tests for shared circuit breaker state
+Two breakers with the same name on one InMemoryBreakerStore stand in for two processes
+"""
+
+import asyncio
+import pytest
+import httpx
+from unittest.mock import AsyncMock, patch
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitState, configure_circuit_breakers
+from app.core.circuit_breaker_store import InMemoryBreakerStore
+from app.core.exceptions import CircuitBreakerOpenError
+from app.services.enrichment.sources.base import EnrichmentSource, SourceResult, _is_provider_outage, get_source
+
+
+@pytest.fixture
+def store():
+    shared = InMemoryBreakerStore()
+    configure_circuit_breakers(shared)
+    yield shared
+    configure_circuit_breakers(None)
+
+
+def _breaker(timeout=60):
+    return CircuitBreaker(name="enrichment_test", failure_threshold=3, success_threshold=1, timeout=timeout)
+
+
+@pytest.mark.asyncio
+async def test_failures_in_one_process_open_the_circuit_everywhere(store):
+    api, worker = _breaker(), _breaker()
+
+    for _ in range(3):
+        await api.record_failure()
+
+    with pytest.raises(CircuitBreakerOpenError):
+        await worker.before_call()
+    assert worker.state == CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_rejects_without_store_round_trip(store):
+    breaker = _breaker()
+    for _ in range(3):
+        await breaker.record_failure()
+
+    with patch.object(store, "acquire", wraps=store.acquire) as acquire:
+        for _ in range(5):
+            with pytest.raises(CircuitBreakerOpenError):
+                await breaker.before_call()
+
+    acquire.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_single_probe_cluster_wide_then_closed(store):
+    api, worker = _breaker(timeout=0.01), _breaker(timeout=0.01)
+    for _ in range(3):
+        await api.record_failure()
+    await asyncio.sleep(0.02)
+
+    probe = await api.before_call()
+    with pytest.raises(CircuitBreakerOpenError):
+        await worker.before_call()
+
+    await api.record_success(probe)
+
+    assert probe is True
+    assert api.state == CircuitState.CLOSED
+    assert await worker.before_call() is False
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_reopens(store):
+    breaker = _breaker(timeout=0.01)
+    for _ in range(3):
+        await breaker.record_failure()
+    await asyncio.sleep(0.02)
+
+    probe = await breaker.before_call()
+    await breaker.record_failure(probe)
+
+    assert breaker.state == CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_store_errors_fall_back_to_local_state(store):
+    breaker = _breaker()
+    store.acquire = AsyncMock(side_effect=RuntimeError("redis down"))
+    store.record = AsyncMock(side_effect=RuntimeError("redis down"))
+
+    assert await breaker.before_call() is False
+    for _ in range(3):
+        await breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+
+
+def _status_error(status):
+    request = httpx.Request("GET", "https://api.example.com")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+
+def _wrapped(cause):
+    try:
+        try:
+            raise cause
+        except Exception as e:
+            raise Exception(f"Clearbit API error: {e}") from e
+    except Exception as wrapper:
+        return wrapper
+
+
+@pytest.mark.parametrize("error,expected", [
+    (httpx.ReadTimeout("slow"), True),
+    (_wrapped(httpx.ConnectError("refused")), True),
+    (_wrapped(_status_error(503)), True),
+    (_status_error(429), True),
+    (_wrapped(_status_error(404)), False),
+    (ValueError("Company not found"), False),
+])
+def test_provider_outage_classification(error, expected):
+    assert _is_provider_outage(error) is expected
+
+
+class NotFoundSource(EnrichmentSource):
+    def __init__(self):
+        super().__init__(name="not_found_test")
+
+    async def enrich(self, domain: str, **kwargs) -> SourceResult:
+        raise Exception("Company not found")
+
+
+def test_get_source_returns_shared_instance():
+    assert get_source(NotFoundSource) is get_source(NotFoundSource)
+
+
+@pytest.mark.asyncio
+async def test_non_outage_errors_do_not_trip_the_breaker(store):
+    source = get_source(NotFoundSource)
+
+    for _ in range(source.circuit_breaker.config.failure_threshold + 1):
+        result = await source.enrich_with_monitoring("example.com")
+
+    assert result.success is False
+    assert result.error_type != "circuit_breaker"
+    assert source.circuit_breaker.state == CircuitState.CLOSED
@@ -5,9 +5,7 @@ Tests the 30-day TTL caching system with multi-layer caching strategy.
 """
 
 import pytest
-from datetime import datetime, timedelta
-from unittest.mock import Mock, AsyncMock, patch, MagicMock
-import json
+from unittest.mock import Mock
 
 from app.services.enrichment.cache import EnrichmentCache, _in_memory_cache
 from app.services.enrichment.models import QuickEnrichmentData, DeepEnrichmentData, DataQualityTier
@@ -99,7 +97,7 @@ class TestEnrichmentCache:
         # Check in-memory cache was set
         cache_key = "quick:techstart.com.br"
         assert cache_key in _in_memory_cache
-        assert _in_memory_cache[cache_key]["data"]["company_name"] == "TechStart Innovations"
+        assert _in_memory_cache.peek(cache_key)["company_name"] == "TechStart Innovations"
 
     async def test_cache_expiration(self, enrichment_cache):
         """Test cache expiration logic"""
@@ -107,11 +105,7 @@ class TestEnrichmentCache:
         cache_key = enrichment_cache._generate_cache_key(domain, "quick")
 
         # Set expired cache entry
-        expired_time = datetime.now() - timedelta(days=1)
-        _in_memory_cache[cache_key] = {
-            "data": {"company_name": "Test"},
-            "expires_at": expired_time
-        }
+        _in_memory_cache.memory.set(cache_key, {"company_name": "Test"}, -86400)
 
         # Should return None for expired cache
         result = await enrichment_cache.get_quick(domain)
@@ -123,10 +117,7 @@ class TestEnrichmentCache:
         cache_key = "quick:techstart.com.br"
 
         # Set in-memory cache
-        _in_memory_cache[cache_key] = {
-            "data": sample_quick_data.dict(),
-            "expires_at": datetime.now() + timedelta(days=30)
-        }
+        _in_memory_cache.memory.set(cache_key, sample_quick_data.dict(), 30 * 86400)
 
         # Get from cache (should hit in-memory)
         result = await enrichment_cache.get_quick(domain)
@@ -199,12 +190,10 @@ class TestEnrichmentCache:
 
         # Verify expiration is set correctly
         cache_key = "quick:techstart.com.br"
-        cached_entry = _in_memory_cache[cache_key]
-        expires_at = cached_entry["expires_at"]
+        remaining = _in_memory_cache.memory.remaining_ttl(cache_key)
 
         # Should expire in approximately 7 days
-        time_diff = expires_at - datetime.now()
-        assert 6 <= time_diff.days <= 7
+        assert 6 * 86400 <= remaining <= 7 * 86400
 
     async def test_concurrent_cache_access(
         self, enrichment_cache, sample_quick_data, mock_supabase_client
@@ -234,20 +223,14 @@ class TestEnrichmentCache:
 
     async def test_cache_size_limits(self, enrichment_cache):
         """Test in-memory cache doesn't grow unbounded"""
-        # Note: Current implementation doesn't have size limits
-        # This test documents that behavior
+        max_entries = _in_memory_cache.memory.max_entries
 
-        # Add many entries
-        for i in range(1000):
-            _in_memory_cache[f"test:domain{i}.com"] = {
-                "data": {"test": "data"},
-                "expires_at": datetime.now() + timedelta(days=30)
-            }
+        # Add more entries than the tier holds
+        for i in range(max_entries + 100):
+            _in_memory_cache.memory.set(f"test:domain{i}.com", {"test": "data"}, 30 * 86400)
 
-        # All entries should be in cache
-        assert len(_in_memory_cache) >= 1000
-
-        # TODO: Consider implementing LRU cache with size limit
+        assert len(_in_memory_cache) == max_entries
+        _in_memory_cache.clear_memory()
 
     async def test_serialization_deserialization(
         self, enrichment_cache, sample_quick_data, mock_supabase_client
@@ -277,13 +260,10 @@ class TestEnrichmentCache:
         cache_key = "quick:techstart.com.br"
 
         # Set cache
-        _in_memory_cache[cache_key] = {
-            "data": {"company_name": "Test"},
-            "expires_at": datetime.now() + timedelta(days=30)
-        }
+        _in_memory_cache.memory.set(cache_key, {"company_name": "Test"}, 30 * 86400)
 
         # Clear entire cache
-        _in_memory_cache.clear()
+        _in_memory_cache.clear_memory()
 
         # Cache should be empty
         assert len(_in_memory_cache) == 0
@@ -358,10 +338,7 @@ class TestCachePerformance:
         cache_key = "quick:techstart.com.br"
 
         # Set in-memory cache
-        _in_memory_cache[cache_key] = {
-            "data": sample_quick_data.dict(),
-            "expires_at": datetime.now() + timedelta(days=30)
-        }
+        _in_memory_cache.memory.set(cache_key, sample_quick_data.dict(), 30 * 86400)
 
         # Measure cache hit time
         start = time.time()
@@ -0,0 +1,151 @@
+"""
+Unit tests for the progressive enrichment analytics rollups
+Tests metric merging, analytics built from rollup rows, today's live aggregate and backfill chunking
+"""
+
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.repositories import progressive_enrichment_repository as repo
+from app.services.enrichment import rollups
+
+
+def _row(day, key, **metrics):
+    return {"day": day, "key": key, "metrics": metrics}
+
+
+def test_merge_sums_counters_and_keeps_min_max():
+    merged = repo.merge_rollups([
+        _row("2026-10-14", "completed", sessions=2, layer1_duration_ms_min=300, layer1_duration_ms_max=900),
+        _row("2026-10-15", "completed", sessions=3, layer1_duration_ms_min=200, layer1_duration_ms_max=700),
+        _row("2026-10-15", "failed", sessions=1, layer1_duration_ms_min=None, layer1_duration_ms_max=None),
+    ])
+
+    assert merged["completed"] == {"sessions": 5, "layer1_duration_ms_min": 200, "layer1_duration_ms_max": 900}
+    assert merged["failed"] == {"sessions": 1, "layer1_duration_ms_min": None, "layer1_duration_ms_max": None}
+
+    # A day without measurements does not reset the extremes of the others
+    total = repo.merge_metrics(dict(merged["completed"]), merged["failed"])
+    assert total["layer1_duration_ms_min"] == 200
+    assert total["sessions"] == 6
+
+
+@pytest.mark.asyncio
+async def test_get_rollups_sums_stored_days_in_sql_and_adds_live_today():
+    supabase = MagicMock()
+    stored = MagicMock()
+    stored.execute.return_value.data = [{"key": "completed", "metrics": {"sessions": 1}}]
+    live = MagicMock()
+    live.execute.return_value.data = [
+        {"day": "2026-10-16", "dimension": "session", "key": "completed", "metrics": {"sessions": 2}},
+        {"day": "2026-10-16", "dimension": "field", "key": "name", "metrics": {"suggestions": 4}},
+    ]
+    supabase.rpc.side_effect = lambda name, params: stored if name == "sum_enrichment_rollups" else live
+
+    with patch.object(repo, "supabase_service", supabase), \
+            patch.object(repo, "_utc_today", return_value=date(2026, 10, 16)):
+        rows = await repo.get_rollups("session", 7)
+
+    assert supabase.rpc.call_args_list[0].args == (
+        "sum_enrichment_rollups", {"p_dimension": "session", "p_since": "2026-10-10", "p_before": "2026-10-16"}
+    )
+    assert supabase.rpc.call_args_list[1].args == ("enrichment_rollup_rows", {"p_days": ["2026-10-16"]})
+    supabase.table.assert_not_called()
+    assert [row["metrics"]["sessions"] for row in rows] == [1, 2]
+    assert repo.merge_rollups(rows)["completed"] == {"sessions": 3}
+
+
+@pytest.mark.asyncio
+async def test_overview_and_performance_from_session_rollups():
+    rows = [
+        _row("2026-10-15", "completed", sessions=3, cost_usd=0.3, duration_ms=3000,
+             layer1_completed=3, layer1_duration_ms=600, layer1_duration_count=3,
+             layer1_duration_ms_min=100, layer1_duration_ms_max=300,
+             layer1_cost_usd=0.03, layer1_cost_count=3),
+        _row("2026-10-16", "failed", sessions=1, cost_usd=0.1, duration_ms=1000,
+             layer1_completed=1, layer1_duration_ms=400, layer1_duration_count=1,
+             layer1_duration_ms_min=400, layer1_duration_ms_max=400,
+             layer1_cost_usd=0, layer1_cost_count=0),
+    ]
+
+    with patch.object(repo, "get_rollups", AsyncMock(return_value=rows)):
+        overview = await repo.get_overview_analytics(days=7)
+        performance = await repo.get_performance_analytics(days=7)
+
+    assert overview["total_sessions"] == 4
+    assert overview["total_cost_usd"] == 0.4
+    assert overview["avg_duration_ms"] == 1000
+    assert overview["status_distribution"] == {"completed": 3, "failed": 1}
+    assert overview["completion_rates"]["layer1_pct"] == 100.0
+    assert overview["completion_rates"]["layer2_pct"] == 0
+
+    layer1 = performance["layer_metrics"]["layer1"]
+    assert layer1["avg_duration_ms"] == 250
+    assert (layer1["min_duration_ms"], layer1["max_duration_ms"]) == (100, 400)
+    assert layer1["avg_cost_usd"] == 0.01
+    assert performance["layer_metrics"]["layer3"]["max_duration_ms"] == 0
+
+
+@pytest.mark.asyncio
+async def test_field_and_cache_analytics_from_rollups():
+    by_dimension = {
+        "field": [
+            _row("2026-10-15", "name", suggestions=4, accepted=1, edited=1, auto_filled=2,
+                 confidence_sum=300, confidence_count=4),
+            _row("2026-10-15", "website", suggestions=2, accepted=2, edited=0, auto_filled=2,
+                 confidence_sum=0, confidence_count=0),
+        ],
+        "source": [_row("2026-10-16", "clearbit", suggestions=6, accepted=3)],
+        "platform": [
+            _row("2026-10-15", "instagram", validations=3, valid=2),
+            _row("2026-10-16", "instagram", validations=1, valid=1),
+        ],
+    }
+
+    async def fake_rollups(dimension, days):
+        return by_dimension[dimension]
+
+    with patch.object(repo, "get_rollups", side_effect=fake_rollups):
+        fields = await repo.get_field_analytics(days=7)
+        cache = await repo.get_cache_analytics(days=7)
+
+    assert [f["field_name"] for f in fields["fields"]] == ["website", "name"]
+    name = fields["fields"][1]
+    assert (name["acceptance_rate_pct"], name["auto_fill_rate_pct"], name["avg_confidence"]) == (25.0, 50.0, 75.0)
+    assert fields["fields"][0]["avg_confidence"] == 0
+    assert fields["sources"][0]["source"] == "clearbit"
+    assert fields["sources"][0]["acceptance_rate_pct"] == 50.0
+
+    assert cache["total_cache_entries"] == 4
+    assert cache["validation_rate_pct"] == 75.0
+    assert cache["platform_stats"] == [
+        {"platform": "instagram", "total_validations": 4, "valid_count": 3, "validation_rate_pct": 75.0}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_analytics_report_errors_instead_of_raising():
+    with patch.object(repo, "get_rollups", AsyncMock(side_effect=RuntimeError("db down"))):
+        assert await repo.get_overview_analytics() == {"error": "db down"}
+
+
+def test_backfill_days_chunks_inclusive_range():
+    chunks = rollups.backfill_days(date(2026, 10, 1), date(2026, 10, 5), chunk_days=2)
+
+    assert chunks == [
+        [date(2026, 10, 1), date(2026, 10, 2)],
+        [date(2026, 10, 3), date(2026, 10, 4)],
+        [date(2026, 10, 5)],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_backfill_rolls_each_chunk():
+    rollup_days = AsyncMock(side_effect=[10, 4])
+
+    with patch.object(repo, "rollup_days", rollup_days):
+        written = await rollups.backfill_enrichment_rollups(date(2026, 10, 1), date(2026, 10, 3), chunk_days=2)
+
+    assert written == 14
+    assert rollup_days.await_args_list[1].args[0] == [date(2026, 10, 3)]
@@ -0,0 +1,85 @@
+"""
+Unit tests for batched cache hit accounting
+Tests aggregation, one bulk write per table, retry of failed flushes and shutdown flush
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from app.core.hit_counter import CacheHitCounter
+
+
+@pytest.fixture
+def writes():
+    calls = []
+    with patch("app.core.hit_counter._apply_cache_hits", side_effect=lambda table, payload: calls.append((table, payload))):
+        yield calls
+
+
+@pytest.mark.asyncio
+async def test_hits_are_aggregated_into_one_write_per_table(writes):
+    counter = CacheHitCounter(flush_interval=60)
+    for _ in range(5):
+        counter.record("analysis_cache", "analysis:a")
+    counter.record("analysis_cache", "analysis:b")
+    counter.record("stage_cache", "stage:x")
+
+    assert writes == []
+    assert counter.pending("analysis_cache") == {"analysis:a": 5, "analysis:b": 1}
+
+    assert await counter.flush() == 3
+    assert sorted(table for table, _ in writes) == ["analysis_cache", "stage_cache"]
+    analysis_rows = {row["cache_key"]: row["hits"] for table, rows in writes if table == "analysis_cache" for row in rows}
+    assert analysis_rows == {"analysis:a": 5, "analysis:b": 1}
+    assert counter.pending("analysis_cache") == {}
+    await counter.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_deltas_for_next_flush():
+    counter = CacheHitCounter(flush_interval=60)
+    counter.record("analysis_cache", "analysis:a")
+
+    with patch("app.core.hit_counter._apply_cache_hits", side_effect=RuntimeError("db down")):
+        assert await counter.flush() == 0
+
+    counter.record("analysis_cache", "analysis:a")
+    assert counter.pending("analysis_cache") == {"analysis:a": 2}
+    assert counter.get_stats()["flush_errors"] == 1
+    counter._pending.clear()
+    await counter.aclose()
+
+
+@pytest.mark.asyncio
+async def test_background_flush_after_interval(writes):
+    counter = CacheHitCounter(flush_interval=0.01)
+    counter.record("pdf_cache", "pdf:1")
+
+    await asyncio.sleep(0.05)
+
+    assert writes == [("pdf_cache", [{"cache_key": "pdf:1", "hits": 1, "last_accessed_at": writes[0][1][0]["last_accessed_at"]}])]
+    await counter.aclose()
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_triggers_early_flush(writes):
+    counter = CacheHitCounter(flush_interval=60, max_pending_keys=3)
+    for i in range(3):
+        counter.record("stage_cache", f"stage:{i}")
+
+    await asyncio.sleep(0.01)
+
+    assert len(writes[0][1]) == 3
+    await counter.aclose()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_flushes_remaining_hits(writes):
+    counter = CacheHitCounter(flush_interval=60)
+    counter.record("enrichment_results", "quick:a.com")
+
+    await counter.aclose()
+
+    assert writes[0][0] == "enrichment_results"
+    assert counter.get_stats()["pending_hits"] == 0
@@ -0,0 +1,85 @@
+"""
+Unit tests for the shared HTTP client registry
+Tests pooled client reuse, per-service limits and shutdown behaviour
+"""
+
+import pytest
+import httpx
+
+from app.core.http_client import HTTPClientRegistry, HTTPPoolConfig
+
+
+@pytest.mark.unit
+class TestHTTPClientRegistry:
+    """Test suite for HTTPClientRegistry"""
+
+    @pytest.fixture
+    def registry(self):
+        """Create an isolated registry for each test"""
+        return HTTPClientRegistry(HTTPPoolConfig(max_connections=5, service_limits={"openrouter": 12}))
+
+    @pytest.mark.asyncio
+    async def test_same_service_returns_same_client(self, registry):
+        """Repeated lookups reuse the pooled client"""
+        first = registry.get_client("clearbit")
+        second = registry.get_client("clearbit")
+
+        assert first is second
+        assert isinstance(first, httpx.AsyncClient)
+        assert registry.get_stats()["clients_created"] == 1
+
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_services_get_separate_pools(self, registry):
+        """Each service gets its own connection pool"""
+        openrouter = registry.get_client("openrouter")
+        clearbit = registry.get_client("clearbit")
+
+        assert openrouter is not clearbit
+        assert openrouter._transport._pool._max_connections == 12
+        assert clearbit._transport._pool._max_connections == 5
+
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_clients(self, registry):
+        """Shutdown closes clients and a later lookup creates a fresh one"""
+        client = registry.get_client("web")
+        await registry.aclose()
+
+        assert client.is_closed
+        assert registry.get_stats()["active_clients"] == []
+
+        fresh = registry.get_client("web")
+        assert fresh is not client
+        assert not fresh.is_closed
+
+        await registry.aclose()
+
+    def test_client_recreated_for_new_event_loop(self, registry):
+        """A client created on one loop is not reused from another loop"""
+        import asyncio
+
+        async def lookup():
+            return registry.get_client("openrouter")
+
+        clients = []
+        for _ in range(2):
+            loop = asyncio.new_event_loop()
+            try:
+                clients.append(loop.run_until_complete(lookup()))
+            finally:
+                loop.close()
+        first, second = clients
+
+        assert first is not second
+        assert registry.get_stats()["clients_created"] == 2
+
+    def test_http2_falls_back_without_h2(self, registry, monkeypatch):
+        """HTTP/2 is disabled when the h2 package is missing"""
+        monkeypatch.setattr("app.core.http_client._http2_available", lambda: False)
+
+        registry.configure(HTTPPoolConfig(http2=True))
+
+        assert registry.get_stats()["http2"] is False
@@ -0,0 +1,104 @@
+"""
+Unit tests for the CPU offload executor
+Tests size-based routing, pooled execution, error propagation, broken-pool restart and metrics
+"""
+
+import asyncio
+import multiprocessing
+import os
+import pytest
+
+from app.core.offload import OffloadExecutor, estimate_size
+from app.core.security.prompt_sanitizer import sanitize_for_prompt
+
+
+def current_pid(_payload):
+    return os.getpid()
+
+
+def fail(_payload):
+    raise ValueError("bad input")
+
+
+def crash_in_worker(_payload):
+    # Kill the worker process (breaks the pool); returns normally on the thread fallback
+    if multiprocessing.parent_process() is not None:
+        os._exit(1)
+    return os.getpid()
+
+
+@pytest.mark.unit
+class TestOffloadExecutor:
+    """Test suite for OffloadExecutor"""
+
+    def test_estimate_size_counts_sized_arguments(self):
+        """Strings, bytes and containers contribute their length"""
+        assert estimate_size(("abc", b"de", [1, 2], 7), {"extra": "xyz"}) == 10
+
+    @pytest.mark.asyncio
+    async def test_runs_inline_without_pool(self):
+        """Without a started pool every call runs inline"""
+        executor = OffloadExecutor(inline_threshold=0)
+
+        assert await executor.run(current_pid, "x" * 100) == os.getpid()
+        assert executor.get_stats()["inline"] == 1
+
+    @pytest.mark.asyncio
+    async def test_routes_by_size(self):
+        """Small inputs stay inline, large ones go to a worker process"""
+        executor = OffloadExecutor(inline_threshold=1000)
+        await executor.start(1)
+        try:
+            assert await executor.run(current_pid, "small") == os.getpid()
+            assert await executor.run(current_pid, "x" * 5000) != os.getpid()
+            assert await executor.run(current_pid, "small", size=10_000) != os.getpid()
+
+            with pytest.raises(ValueError, match="bad input"):
+                await executor.run(fail, "x" * 5000)
+
+            stats = executor.get_stats()
+            assert stats["inline"] == 1
+            assert stats["pooled"] == 2
+            assert stats["errors"] == 1
+            assert stats["in_flight"] == 0
+            assert stats["latency_p95_ms"] > 0
+        finally:
+            await executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_offloaded_sanitizer_matches_inline(self):
+        """Sanitizing in the pool gives the same result as inline"""
+        text = "<p>Hello <script>alert(1)</script>world</p> " * 200
+        executor = OffloadExecutor(inline_threshold=100)
+        await executor.start(1)
+        try:
+            pooled = await executor.run(sanitize_for_prompt, text, 5000, True, True)
+        finally:
+            await executor.shutdown()
+
+        assert pooled == sanitize_for_prompt(text, 5000, True, True)
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_is_restarted_once_for_concurrent_calls(self):
+        """Calls that see the same broken pool fall back to a thread; only one restarts it"""
+        executor = OffloadExecutor(inline_threshold=0)
+        await executor.start(2)
+        starts = []
+        original_start = executor.start
+
+        async def counting_start(workers, *args, **kwargs):
+            starts.append(workers)
+            await original_start(workers, *args, **kwargs)
+
+        executor.start = counting_start
+        try:
+            broken = executor._pool
+            results = await asyncio.gather(*(executor.run(crash_in_worker, "x") for _ in range(3)))
+
+            assert results == [os.getpid()] * 3
+            assert starts == [2]
+            assert executor.started and executor._pool is not broken
+            assert executor.get_stats()["fallback"] == 3
+            assert await executor.run(current_pid, "x") != os.getpid()
+        finally:
+            await executor.shutdown()
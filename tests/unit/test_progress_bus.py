@@ -0,0 +1,140 @@
+"""
+Unit tests for the progress event bus
+Tests instant local delivery, Last-Event-ID resume, retention and cross-process fan-out
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.progress_bus import ProgressBus, ProgressEvent, RedisStreamTransport, _id_key
+
+
+class FakeStreamTransport:
+    """In-memory stand-in for RedisStreamTransport shared by several buses"""
+
+    def __init__(self):
+        self.streams = {}
+        self.changed = asyncio.Event()
+
+    async def append(self, channel, event):
+        self.streams.setdefault(channel, []).append(ProgressEvent(event.id, dict(event.data)))
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    async def read_after(self, channel, last_id):
+        return [e for e in self.streams.get(channel, []) if _id_key(e.id) > _id_key(last_id)]
+
+    async def wait(self, channel, last_id, timeout):
+        events = await self.read_after(channel, last_id)
+        if events:
+            return events
+        try:
+            await asyncio.wait_for(self.changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        return await self.read_after(channel, last_id)
+
+
+async def collect(bus, channel, count, **kwargs):
+    events = []
+    async for event in bus.subscribe(channel, **kwargs):
+        events.append(event)
+        if len(events) == count:
+            break
+    return events
+
+
+@pytest.mark.unit
+class TestProgressBus:
+    """Test suite for ProgressBus"""
+
+    @pytest.mark.asyncio
+    async def test_subscriber_woken_immediately(self):
+        """A waiting subscriber receives a new event without polling delay"""
+        bus = ProgressBus()
+        subscriber = asyncio.create_task(collect(bus, "analysis:1", 1, timeout=5))
+        await asyncio.sleep(0.01)
+
+        start = time.monotonic()
+        bus.publish("analysis:1", {"stage": "ai_analysis", "progress": 60})
+        events = await subscriber
+
+        assert events[0].data["progress"] == 60
+        assert time.monotonic() - start < 0.1
+
+    @pytest.mark.asyncio
+    async def test_resume_after_last_event_id(self):
+        """Only events after Last-Event-ID are replayed"""
+        bus = ProgressBus()
+        first = bus.publish("analysis:2", {"progress": 10})
+        bus.publish("analysis:2", {"progress": 20})
+        bus.publish("analysis:2", {"progress": 30})
+
+        events = await collect(bus, "analysis:2", 2, last_event_id=first.id, timeout=1)
+
+        assert [e.data["progress"] for e in events] == [20, 30]
+
+    @pytest.mark.asyncio
+    async def test_history_is_bounded(self):
+        """Per-channel history keeps only the newest events"""
+        bus = ProgressBus(max_events=3)
+        for i in range(5):
+            bus.publish("analysis:3", {"progress": i})
+
+        assert [u["progress"] for u in bus.history("analysis:3")] == [2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_idle_channels_expire(self):
+        """Channels without updates for the retention window are dropped"""
+        bus = ProgressBus(retention_seconds=0.01)
+        bus.publish("analysis:4", {"progress": 1})
+        await asyncio.sleep(0.02)
+        bus.publish("analysis:5", {"progress": 1})
+
+        assert bus.history("analysis:4") == []
+
+    @pytest.mark.asyncio
+    async def test_cross_process_fan_out(self):
+        """A subscriber on another bus receives events through the transport"""
+        transport = FakeStreamTransport()
+        worker_bus = ProgressBus(transport=transport)
+        api_bus = ProgressBus(transport=transport)
+
+        subscriber = asyncio.create_task(collect(api_bus, "analysis:6", 2, timeout=5))
+        await asyncio.sleep(0.01)
+
+        worker_bus.publish("analysis:6", {"stage": "data_gathering"})
+        worker_bus.publish("analysis:6", {"stage": "completed"})
+        await worker_bus.aclose()
+
+        events = await asyncio.wait_for(subscriber, 2)
+        assert [e.data["stage"] for e in events] == ["data_gathering", "completed"]
+
+    def test_event_ids_are_monotonic(self):
+        """Ids increase even within the same millisecond"""
+        bus = ProgressBus()
+        ids = [bus._next_id() for _ in range(50)]
+
+        assert ids == sorted(ids, key=_id_key)
+        assert len(set(ids)) == 50
+
+    @pytest.mark.asyncio
+    async def test_redis_wait_keeps_blocking_after_bad_id_or_transient_error(self):
+        """Only a rejected XREAD BLOCK command switches the transport to polling"""
+        redis = MagicMock()
+        redis.execute = AsyncMock(return_value=None)
+        redis.xread = AsyncMock(return_value=None)
+        transport = RedisStreamTransport(redis)
+
+        await transport.wait("analysis:7", "not-an-id", timeout=0.01)
+        assert redis.execute.call_args.args[0][-1] == "0-0"
+
+        redis.execute.side_effect = ConnectionError("connection reset")
+        await transport.wait("analysis:7", "1-0", timeout=0.01)
+        assert transport._blocking_supported is True
+
+        redis.execute.side_effect = Exception("ERR unknown command 'XREAD BLOCK'")
+        await transport.wait("analysis:7", "1-0", timeout=0.01)
+        assert transport._blocking_supported is False
@@ -0,0 +1,153 @@
+"""
+Unit tests for the sliding-window rate limiter
+Tests window semantics, the in-process shadow, fail-open behavior and the shared middleware
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from app.core.security.rate_limiter import (
+    MemoryRateLimitBackend,
+    RedisRateLimitBackend,
+    SlidingWindowRateLimiter,
+    check_rate_limit
+)
+from app.middleware.security_middleware import RateLimitByEndpointMiddleware
+
+
+class CountingBackend(MemoryRateLimitBackend):
+    """Memory backend that counts round trips"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def hit(self, *args, **kwargs):
+        self.calls += 1
+        return await super().hit(*args, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_allows_up_to_limit_within_window():
+    limiter = SlidingWindowRateLimiter(backend=MemoryRateLimitBackend())
+
+    results = [await limiter.hit("client", 3, 60) for _ in range(4)]
+
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.remaining for r in results] == [2, 1, 0, 0]
+    assert 0 < results[-1].reset_after <= 60
+    assert results[-1].headers()["Retry-After"] == "60"
+
+
+@pytest.mark.asyncio
+async def test_window_slides():
+    backend = MemoryRateLimitBackend()
+
+    with patch("app.core.security.rate_limiter.time.monotonic", return_value=100.0):
+        assert (await backend.hit("k", 1, 10))[0] is True
+        assert (await backend.hit("k", 1, 10))[0] is False
+    with patch("app.core.security.rate_limiter.time.monotonic", return_value=110.0):
+        assert (await backend.hit("k", 1, 10))[0] is True
+
+
+@pytest.mark.asyncio
+async def test_shadow_rejects_without_backend_round_trip():
+    backend = CountingBackend()
+    limiter = SlidingWindowRateLimiter(backend=backend)
+
+    for _ in range(10):
+        await limiter.hit("client", 2, 60)
+
+    # Two allowed requests reach the backend; the rest are rejected locally
+    assert backend.calls == 2
+    assert limiter.get_stats()["local_rejections"] == 8
+    assert limiter.get_stats()["rejected"] == 8
+
+
+@pytest.mark.asyncio
+async def test_reset_clears_shadow():
+    limiter = SlidingWindowRateLimiter(backend=MemoryRateLimitBackend())
+    await limiter.hit("client", 1, 60)
+    assert not (await limiter.hit("client", 1, 60)).allowed
+
+    await limiter.reset("client")
+
+    assert (await limiter.hit("client", 1, 60)).allowed
+
+
+@pytest.mark.asyncio
+async def test_peek_does_not_count():
+    limiter = SlidingWindowRateLimiter(backend=MemoryRateLimitBackend())
+    await limiter.hit("client", 3, 60)
+
+    status = await limiter.peek("client", 3, 60)
+
+    assert status.remaining == 2
+    assert (await limiter.peek("client", 3, 60)).remaining == 2
+
+
+@pytest.mark.asyncio
+async def test_backend_error_fails_open():
+    backend = Mock(hit=AsyncMock(side_effect=ConnectionError("redis down")))
+    limiter = SlidingWindowRateLimiter(backend=backend)
+
+    result = await limiter.hit("client", 1, 60)
+
+    assert result.allowed
+    assert limiter.get_stats()["backend_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_is_one_eval_per_check():
+    redis = Mock(eval=AsyncMock(return_value=[0, 3, 1500]))
+    backend = RedisRateLimitBackend(redis)
+
+    allowed, count, reset_after = await backend.hit("ratelimit:sw:client", 3, 60)
+
+    assert (allowed, count, reset_after) == (False, 3, 1.5)
+    redis.eval.assert_awaited_once()
+    assert redis.eval.call_args.kwargs["args"][:2] == ["60000", "3"]
+
+
+@pytest.mark.asyncio
+async def test_check_rate_limit_raises_429_with_headers():
+    limiter = SlidingWindowRateLimiter(backend=MemoryRateLimitBackend())
+
+    with patch("app.core.security.rate_limiter.rate_limiter", limiter):
+        assert await check_rate_limit("1.2.3.4", max_requests=1) is True
+        with pytest.raises(HTTPException) as exc_info:
+            await check_rate_limit("1.2.3.4", max_requests=1)
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers["X-RateLimit-Remaining"] == "0"
+
+
+@pytest.mark.asyncio
+async def test_endpoint_middleware_limits_matching_routes_only():
+    limiter = SlidingWindowRateLimiter(backend=MemoryRateLimitBackend())
+    middleware = RateLimitByEndpointMiddleware(
+        app=None, limits={"POST /api/auth/login": (1, 60)}, limiter=limiter
+    )
+
+    def make_request(method, path):
+        request = Mock(spec=Request)
+        request.method = method
+        request.url.path = path
+        request.client.host = "127.0.0.1"
+        return request
+
+    async def call_next(request):
+        return JSONResponse({"status": "ok"})
+
+    first = await middleware.dispatch(make_request("POST", "/api/auth/login"), call_next)
+    second = await middleware.dispatch(make_request("POST", "/api/auth/login"), call_next)
+    other = await middleware.dispatch(make_request("GET", "/api/auth/me"), call_next)
+
+    assert first.status_code == 200
+    assert first.headers["X-RateLimit-Remaining"] == "0"
+    assert second.status_code == 429
+    assert "Retry-After" in second.headers
+    assert other.status_code == 200
+    assert "X-RateLimit-Limit" not in other.headers
@@ -0,0 +1,166 @@
+"""
+Unit tests for single-flight cache fills
+Two SingleFlight instances sharing one FakeRedis stand in for two processes
+"""
+
+import asyncio
+import time
+import pytest
+
+from app.core.single_flight import SingleFlight
+
+
+class FakeRedis:
+    """SET NX PX / GET / the lease scripts, with expiry"""
+
+    def __init__(self):
+        self.values = {}
+
+    def _live(self, key):
+        value, expires_at = self.values.get(key, (None, 0))
+        if value is not None and time.monotonic() >= expires_at:
+            del self.values[key]
+            return None
+        return value
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and self._live(key) is not None:
+            return None
+        self.values[key] = (value, time.monotonic() + px / 1000)
+        return True
+
+    async def get(self, key):
+        return self._live(key)
+
+    async def eval(self, script, keys, args):
+        key = keys[0]
+        if self._live(key) != args[0]:
+            return 0
+        if "PEXPIRE" in script:
+            self.values[key] = (args[0], time.monotonic() + int(args[1]) / 1000)
+        else:
+            del self.values[key]
+        return 1
+
+
+def _process(redis, lease_seconds=0.3):
+    return SingleFlight(redis, lease_seconds=lease_seconds, poll_interval=0.01)
+
+
+class Backend:
+    """A cache plus a counted computation that stores into it"""
+
+    def __init__(self, delay=0.05, fail=False):
+        self.cache = {}
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def compute(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("pipeline failed")
+        self.cache["k"] = {"analysis": self.calls}
+        return self.cache["k"]
+
+    async def lookup(self):
+        return self.cache.get("k")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_in_one_process_run_once():
+    flight = SingleFlight()
+    backend = Backend()
+
+    results = await asyncio.gather(*(flight.run("k", backend.compute, backend.lookup) for _ in range(5)))
+
+    assert results == [{"analysis": 1}] * 5
+    assert backend.calls == 1
+    assert (flight.stats["led"], flight.stats["coalesced"]) == (1, 4)
+    assert flight.get_stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_other_process_reads_leader_result_from_cache():
+    redis = FakeRedis()
+    api, worker = _process(redis), _process(redis)
+    backend = Backend()
+
+    results = await asyncio.gather(
+        api.run("k", backend.compute, backend.lookup),
+        worker.run("k", backend.compute, backend.lookup)
+    )
+
+    assert results == [{"analysis": 1}] * 2
+    assert backend.calls == 1
+    assert worker.stats["followed"] == 1
+    assert redis.values == {}
+
+
+@pytest.mark.asyncio
+async def test_follower_takes_over_when_leader_dies():
+    redis = FakeRedis()
+    # A crashed process left its lease behind and will never renew or release it
+    await redis.set("flight:k", "dead-leader", nx=True, px=100)
+    backend = Backend(delay=0)
+
+    result = await _process(redis).run("k", backend.compute, backend.lookup, wait_timeout=5)
+
+    assert result == {"analysis": 1}
+    assert backend.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_leader_releases_lease_for_one_takeover():
+    redis = FakeRedis()
+    api, worker = _process(redis), _process(redis)
+    failing, healthy = Backend(fail=True), Backend()
+    healthy.cache = failing.cache
+
+    leader = asyncio.create_task(api.run("k", failing.compute, failing.lookup))
+    await asyncio.sleep(0.01)
+    follower = await worker.run("k", healthy.compute, healthy.lookup)
+
+    with pytest.raises(RuntimeError):
+        await leader
+    assert follower == {"analysis": 1}
+    assert worker.stats["takeovers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_leader_renews_lease_while_computing():
+    redis = FakeRedis()
+    api, worker = _process(redis, lease_seconds=0.06), _process(redis, lease_seconds=0.06)
+    backend = Backend(delay=0.3)
+
+    await asyncio.gather(
+        api.run("k", backend.compute, backend.lookup),
+        worker.run("k", backend.compute, backend.lookup)
+    )
+
+    assert backend.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_follower_computes_after_wait_timeout():
+    redis = FakeRedis()
+    await redis.set("flight:k", "slow-leader", nx=True, px=60_000)
+    backend = Backend(delay=0)
+
+    result = await _process(redis).run("k", backend.compute, backend.lookup, wait_timeout=0.05)
+
+    assert result == {"analysis": 1}
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_local_compute():
+    class BrokenRedis(FakeRedis):
+        async def set(self, *args, **kwargs):
+            raise ConnectionError("redis down")
+
+    flight = _process(BrokenRedis())
+    backend = Backend(delay=0)
+
+    assert await flight.run("k", backend.compute, backend.lookup) == {"analysis": 1}
+    assert flight.stats["errors"] == 1
@@ -0,0 +1,134 @@
+"""
+Unit tests for the admin submissions listing
+Tests keyset cursors, watermark-based incremental refresh and replica paging
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.core.database import decode_submission_cursor, encode_submission_cursor
+from app.core.submission_list_cache import SubmissionListCache
+
+
+def _row(row_id, created_at, updated_at=None, status="completed"):
+    return {
+        "id": row_id,
+        "company": f"Company {row_id}",
+        "status": status,
+        "created_at": created_at,
+        "updated_at": updated_at or created_at
+    }
+
+
+ROWS = [
+    _row(1, "2026-10-01T10:00:00+00:00"),
+    _row(2, "2026-10-02T10:00:00.5+00:00"),
+    _row(3, "2026-10-02T10:00:00.5+00:00"),
+    _row(4, "2026-10-03T10:00:00+00:00"),
+]
+
+
+class FakeListingSource:
+    """Stands in for get_submissions_updated_since over an in-memory table"""
+
+    def __init__(self, rows):
+        self.rows = {row["id"]: dict(row) for row in rows}
+        self.calls = []
+
+    async def __call__(self, updated_at, after_id=0, limit=500):
+        self.calls.append((updated_at, after_id))
+        from app.core.submission_list_cache import _parse_timestamp
+        rows = sorted(self.rows.values(), key=lambda r: (_parse_timestamp(r["updated_at"]), r["id"]))
+        if updated_at:
+            since = _parse_timestamp(updated_at)
+            rows = [
+                r for r in rows
+                if (_parse_timestamp(r["updated_at"]), r["id"]) > (since, after_id)
+            ]
+        return rows[:limit]
+
+
+@pytest.fixture
+def source():
+    fake = FakeListingSource(ROWS)
+    with patch("app.core.submission_list_cache.get_submissions_updated_since", fake):
+        yield fake
+
+
+def test_cursor_round_trip():
+    cursor = encode_submission_cursor(ROWS[1])
+
+    assert decode_submission_cursor(cursor) == ("2026-10-02T10:00:00.5+00:00", 2)
+
+
+def test_malformed_cursor_rejected():
+    with pytest.raises(ValueError):
+        decode_submission_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_pages_follow_created_at_then_id(source):
+    cache = SubmissionListCache(batch_size=2)
+
+    first = await cache.page(2)
+    second = await cache.page(2, cursor=encode_submission_cursor(first[-1]))
+
+    assert [r["id"] for r in first] == [4, 3]
+    assert [r["id"] for r in second] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_fetches_only_changes(source):
+    cache = SubmissionListCache(sync_interval=0, overlap_seconds=0)
+    await cache.sync()
+    assert cache.get_stats()["rows"] == 4
+
+    source.rows[2]["status"] = "sent"
+    source.rows[2]["updated_at"] = "2026-10-05T09:00:00+00:00"
+    source.rows[5] = _row(5, "2026-10-05T09:30:00+00:00")
+
+    fetched = await cache.sync()
+    page = await cache.page(10)
+
+    assert fetched == 2
+    assert source.calls[-1][0] is not None  # Started from the watermark, not from scratch
+    assert [r["id"] for r in page] == [5, 4, 3, 2, 1]
+    assert page[3]["status"] == "sent"
+    assert cache.get_stats()["full_loads"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_is_rate_limited(source):
+    cache = SubmissionListCache(sync_interval=60)
+
+    await cache.page(10)
+    await cache.page(10)
+
+    assert len(source.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_serves_last_replica(source):
+    cache = SubmissionListCache(sync_interval=0)
+    await cache.sync()
+
+    with patch(
+        "app.core.submission_list_cache.get_submissions_updated_since",
+        AsyncMock(side_effect=RuntimeError("db down"))
+    ):
+        page = await cache.page(10)
+
+    assert [r["id"] for r in page] == [4, 3, 2, 1]
+    assert cache.get_stats()["sync_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_first_sync_failure_raises():
+    cache = SubmissionListCache()
+
+    with patch(
+        "app.core.submission_list_cache.get_submissions_updated_since",
+        AsyncMock(side_effect=RuntimeError("db down"))
+    ):
+        with pytest.raises(RuntimeError):
+            await cache.page(10)
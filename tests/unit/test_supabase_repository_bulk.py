@@ -0,0 +1,155 @@
+"""
+Unit tests for SupabaseRepository bulk paths
+Tests chunked multi-get, chunked upsert, single-statement partial batch updates and single-query grouped counts
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+from postgrest.exceptions import APIError
+
+from app.core.exceptions import ResourceNotFound
+from app.repositories import supabase_repository as repo_module
+from app.repositories.audit_repository import AuditRepository
+from app.repositories.submission_repository import SubmissionRepository
+from app.repositories.supabase_repository import SupabaseRepository
+
+
+def _repo(cls=SupabaseRepository, *args):
+    client = MagicMock()
+    with patch.object(repo_module, "get_supabase_client", return_value=client):
+        repo = cls(*args)
+    return repo, client
+
+
+def _grouped(rows):
+    return [{"column_name": c, "value": v, "count": n} for c, v, n in rows]
+
+
+@pytest.mark.asyncio
+async def test_get_many_chunks_in_filters_and_keeps_order():
+    repo, client = _repo(SupabaseRepository, "items")
+    in_ = client.table.return_value.select.return_value.in_
+    in_.return_value.execute.side_effect = [
+        MagicMock(data=[{"id": 2}, {"id": 1}]),
+        MagicMock(data=[{"id": 3}]),
+    ]
+
+    with patch.object(repo_module, "REPOSITORY_IN_CHUNK_SIZE", 2):
+        records = await repo.get_many([3, 1, 2, 1, 4])
+
+    assert [r["id"] for r in records] == [3, 1, 2]
+    assert [c.args for c in in_.call_args_list] == [("id", [3, 1]), ("id", [2, 4])]
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_sends_one_statement_per_chunk():
+    repo, client = _repo(SupabaseRepository, "items")
+    upsert = client.table.return_value.upsert
+    upsert.return_value.execute.side_effect = lambda: MagicMock(data=upsert.call_args.args[0])
+
+    written = await repo.bulk_upsert([{"id": n, "name": f"n{n}"} for n in range(5)], chunk_size=2)
+
+    assert [len(c.args[0]) for c in upsert.call_args_list] == [2, 2, 1]
+    assert upsert.call_args.kwargs == {"on_conflict": "id"}
+    assert len(written) == 5 and all("updated_at" in r for r in written)
+
+
+@pytest.mark.asyncio
+async def test_batch_update_sends_only_supplied_columns_in_one_call():
+    repo, client = _repo(SupabaseRepository, "items")
+    client.rpc.return_value.execute.return_value.data = [
+        {"id": 2, "name": "c", "status": "pending"},
+        {"id": 1, "name": "a", "status": "done"},
+    ]
+
+    updates = [{"id": 1, "status": "done"}, {"id": 2, "name": "c", "status": None}, {"id": 1, "status": "done"}]
+    written = await repo.batch_update(updates)
+
+    client.rpc.assert_called_once()
+    name, params = client.rpc.call_args.args
+    assert (name, params["p_table"]) == ("batch_update_rows", "items")
+    assert [sorted(row) for row in params["p_rows"]] == [["id", "status", "updated_at"], ["id", "name", "updated_at"]]
+    client.table.assert_not_called()
+    assert [r["id"] for r in written] == [1, 2]
+    assert updates[0] == {"id": 1, "status": "done"}  # Caller's dicts are not modified
+
+
+@pytest.mark.asyncio
+async def test_batch_update_with_missing_record_raises_not_found():
+    repo, client = _repo(SupabaseRepository, "items")
+    client.rpc.return_value.execute.side_effect = APIError(
+        {"code": "P0002", "message": "items: no rows with id 9"}
+    )
+
+    with pytest.raises(ResourceNotFound) as exc_info:
+        await repo.batch_update([{"id": 1, "name": "a"}, {"id": 9, "name": "b"}])
+    assert "9" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_count_by_fills_missing_values_with_zero():
+    repo, client = _repo(SupabaseRepository, "items")
+    client.rpc.return_value.execute.return_value.data = _grouped([("archived", "true", 3), ("archived", None, 1)])
+
+    counts = await repo.count_by("archived", [True, False, None], {"status": "completed"})
+
+    assert counts == {True: 3, False: 0, None: 1}
+    client.rpc.assert_called_once_with(
+        "grouped_counts",
+        {"p_table": "items", "p_columns": ["archived"], "p_filters": {"status": "completed"}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_submission_statistics_use_two_queries():
+    repo, client = _repo(SubmissionRepository)
+    client.rpc.return_value.execute.return_value.data = _grouped([
+        ("status", "completed", 5), ("status", "pending", 2), ("status", None, 1),
+        ("archived", "true", 3), ("archived", "false", 5),
+    ])
+    client.table.return_value.select.return_value.gte.return_value.execute.return_value.count = 4
+
+    stats = await repo.get_statistics()
+
+    assert stats == {
+        "total": 8,
+        "by_status": {"pending": 2, "processing": 0, "completed": 5, "failed": 0},
+        "last_7_days": 4,
+        "archived": 3,
+        "active": 5,
+    }
+    assert client.rpc.call_count == 1
+    assert client.table.return_value.select.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_source_statistics_are_aggregated_in_the_database():
+    repo, client = _repo(AuditRepository)
+    client.rpc.return_value.execute.return_value.data = [
+        {"source_name": "metadata", "total_calls": 1, "successful_calls": 1, "total_cost_usd": 0,
+         "avg_duration_ms": 0, "circuit_breaker_trips": 0},
+        {"source_name": "clearbit", "total_calls": 5000, "successful_calls": 2500, "total_cost_usd": "500.00",
+         "avg_duration_ms": "200.4", "circuit_breaker_trips": 7},
+    ]
+
+    stats = await repo.get_all_source_statistics(hours=24)
+
+    assert client.rpc.call_args.args[0] == "enrichment_source_statistics"
+    assert client.rpc.call_args.args[1]["p_source_name"] is None
+    client.table.assert_not_called()
+    assert [s["source_name"] for s in stats] == ["clearbit", "metadata"]
+    assert stats[0] == {
+        "source_name": "clearbit",
+        "total_calls": 5000,
+        "successful_calls": 2500,
+        "failed_calls": 2500,
+        "success_rate": 50.0,
+        "total_cost_usd": 500.0,
+        "avg_duration_ms": 200,
+        "circuit_breaker_trips": 7,
+    }
+
+    client.rpc.return_value.execute.return_value.data = []
+    idle = await repo.get_source_statistics("apollo", hours=24)
+    assert client.rpc.call_args.args[1]["p_source_name"] == "apollo"
+    assert (idle["source_name"], idle["total_calls"], idle["success_rate"]) == ("apollo", 0, 0.0)
@@ -0,0 +1,139 @@
+"""
+Unit tests for the task queue over the in-memory backend
+Tests priority ordering, batch claims, blocking dequeue, leases and retries
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.task_queue import TaskQueue, TaskPriority, TaskStatus
+from app.core.task_queue_backends import InMemoryQueueBackend, RedisQueueBackend
+
+
+async def sample_task(value):
+    return value * 2
+
+
+@pytest.mark.unit
+class TestTaskQueue:
+    """Test suite for TaskQueue"""
+
+    @pytest.fixture
+    def backend(self):
+        return InMemoryQueueBackend()
+
+    @pytest.fixture
+    def queue(self, backend):
+        return TaskQueue(backend=backend, lease_seconds=30)
+
+    @pytest.mark.asyncio
+    async def test_priority_then_fifo_order(self, queue):
+        """Higher priority is claimed first, older first within a priority"""
+        first = await queue.enqueue(sample_task, args=(1,))
+        urgent = await queue.enqueue(sample_task, args=(2,), priority=TaskPriority.HIGH)
+        second = await queue.enqueue(sample_task, args=(3,))
+
+        claimed = await queue.dequeue_batch(max_tasks=3)
+
+        assert [task.id for task in claimed] == [urgent, first, second]
+        assert all(task.status == TaskStatus.RUNNING for task in claimed)
+
+    @pytest.mark.asyncio
+    async def test_batch_claim_respects_limit(self, queue):
+        """A batch claim never returns more than max_tasks"""
+        for i in range(5):
+            await queue.enqueue(sample_task, args=(i,))
+
+        assert len(await queue.dequeue_batch(max_tasks=2)) == 2
+        assert (await queue.get_queue_stats())["pending"] == 3
+        assert (await queue.get_queue_stats())["running"] == 2
+
+    @pytest.mark.asyncio
+    async def test_blocking_dequeue_wakes_on_enqueue(self, queue):
+        """A waiting dequeue returns as soon as a task is enqueued"""
+        waiter = asyncio.create_task(queue.dequeue(timeout=5))
+        await asyncio.sleep(0.01)
+
+        start = time.monotonic()
+        task_id = await queue.enqueue(sample_task, args=(1,))
+        task = await waiter
+
+        assert task.id == task_id
+        assert time.monotonic() - start < 0.5
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed(self, backend):
+        """Tasks of a dead worker return to pending once the lease expires"""
+        queue = TaskQueue(backend=backend, lease_seconds=0.01)
+        task_id = await queue.enqueue(sample_task, args=(1,))
+        await queue.dequeue()
+
+        await asyncio.sleep(0.02)
+
+        assert await queue.reclaim_expired() == 1
+        assert await queue.get_task_status(task_id) == TaskStatus.PENDING
+        assert (await queue.dequeue()).id == task_id
+
+    @pytest.mark.asyncio
+    async def test_lease_renewed_while_running(self, backend):
+        """A long-running task keeps its lease and is not reclaimed"""
+        queue = TaskQueue(backend=backend, lease_seconds=0.06)
+
+        async def slow_task():
+            await asyncio.sleep(0.15)
+            return "done"
+
+        await queue.enqueue(slow_task)
+        task = await queue.dequeue()
+        running = asyncio.create_task(queue.execute_task(task))
+
+        await asyncio.sleep(0.1)
+        assert await queue.reclaim_expired() == 0
+        assert await running == "done"
+
+    @pytest.mark.asyncio
+    async def test_completed_task_result(self, queue):
+        """Completed tasks release their lease and expose their result"""
+        await queue.enqueue(sample_task, args=(21,))
+        task = await queue.dequeue()
+
+        await queue.mark_completed(task, await queue.execute_task(task))
+
+        assert await queue.get_task_result(task.id) == 42
+        stats = await queue.get_queue_stats()
+        assert stats["running"] == 0
+        assert stats["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_retries_exhaust_into_dlq(self, queue, monkeypatch):
+        """Retry count survives requeues and ends in the dead letter queue"""
+        async def no_sleep(_):
+            return None
+
+        monkeypatch.setattr("app.core.task_queue.asyncio.sleep", no_sleep)
+        await queue.enqueue(sample_task, args=(1,), max_retries=2)
+
+        task = await queue.dequeue()
+        await queue.mark_failed(task, RuntimeError("first"))
+        task = await queue.dequeue()
+        assert task.retries == 1
+        await queue.mark_failed(task, RuntimeError("second"))
+
+        assert await queue.get_task_status(task.id) == TaskStatus.FAILED
+        assert (await queue.get_queue_stats())["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_only_stops_blocking_when_command_is_rejected():
+    redis = MagicMock()
+    redis.execute = AsyncMock(side_effect=ConnectionError("connection reset"))
+    backend = RedisQueueBackend(redis)
+
+    await backend.wait_for_work(timeout=0.01)
+    assert backend._blocking_supported is True
+
+    redis.execute.side_effect = Exception("ERR Command is not available: 'BLPOP'")
+    await backend.wait_for_work(timeout=0.01)
+    assert backend._blocking_supported is False
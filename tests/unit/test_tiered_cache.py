@@ -0,0 +1,186 @@
+"""
+Unit tests for the tiered cache library
+Tests memory bounds and admission, TTLs, tier promotion, stampede protection and stats
+"""
+
+import asyncio
+import json
+import time
+import pytest
+
+from app.core.tiered_cache import MemoryTier, PersistentTier, TieredCache, get_all_cache_stats
+
+
+class FakeTable(PersistentTier):
+    """Persistent tier over a dict, counting reads and writes"""
+
+    def __init__(self, rows=None, delay=0.0):
+        self.rows = dict(rows or {})
+        self.delay = delay
+        self.loads = 0
+        self.stores = []
+
+    async def load(self, key):
+        self.loads += 1
+        await asyncio.sleep(self.delay)
+        if key not in self.rows:
+            return None
+        return self.rows[key], None
+
+    async def store(self, key, value, ttl_seconds, metadata):
+        self.stores.append((key, metadata))
+        self.rows[key] = value
+        return True
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+
+def test_memory_tier_is_bounded_by_entries_and_bytes():
+    by_count = MemoryTier(max_entries=10, max_bytes=10_000)
+    by_bytes = MemoryTier(max_entries=1_000, max_bytes=100)
+
+    for i in range(50):
+        by_count.set(f"k{i}", "x" * 10, 60)
+        by_bytes.set(f"k{i}", "x" * 10, 60)
+
+    assert len(by_count) == 10
+    assert by_bytes.bytes <= 100
+    assert by_count.evictions + by_count.rejections == 40
+
+
+def test_memory_tier_rejects_values_larger_than_budget():
+    tier = MemoryTier(max_entries=10, max_bytes=5)
+
+    assert tier.set("big", b"x" * 6, 60) is False
+    assert len(tier) == 0
+
+
+def test_frequent_keys_survive_a_scan():
+    tier = MemoryTier(max_entries=100, max_bytes=1_000_000)
+    hot = [f"hot{i}" for i in range(50)]
+    for _ in range(5):
+        for key in hot:
+            if not tier.get(key)[0]:
+                tier.set(key, key, 60)
+
+    # One-off keys (a crawl, a report export) must not flush the hot set
+    for i in range(1_000):
+        tier.set(f"scan{i}", i, 60)
+
+    assert sum(tier.get(key)[0] for key in hot) >= 45
+
+
+def test_expired_entries_are_misses():
+    tier = MemoryTier(max_entries=10, max_bytes=1_000)
+    tier.set("k", "v", -1)
+
+    assert tier.get("k") == (False, None)
+    assert len(tier) == 0
+
+
+@pytest.mark.asyncio
+async def test_persistent_hit_is_promoted_to_memory():
+    table = FakeTable({"a": {"n": 1}})
+    cache = TieredCache("test_promote", ttl_seconds=60, persistence=table)
+
+    assert await cache.get("a") == {"n": 1}
+    assert await cache.get("a") == {"n": 1}
+
+    assert table.loads == 1
+    stats = cache.get_stats()
+    assert (stats["persistent_hits"], stats["memory_hits"]) == (1, 1)
+    assert stats["hit_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_lookup_and_one_load():
+    table = FakeTable(delay=0.01)
+    cache = TieredCache("test_stampede", ttl_seconds=60, persistence=table)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    results = await asyncio.gather(*(cache.get_or_load("k", compute) for _ in range(10)))
+
+    assert results == [{"value": 42}] * 10
+    assert (table.loads, calls) == (1, 1)
+    assert cache.get_stats()["coalesced"] == 9
+    assert table.stores[0][0] == "k"
+
+
+@pytest.mark.asyncio
+async def test_loader_errors_are_not_cached():
+    cache = TieredCache("test_errors", ttl_seconds=60)
+
+    async def failing():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load("k", failing)
+
+    assert "k" not in cache
+    assert await cache.get_or_load("k", lambda: asyncio.sleep(0, result="ok")) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_refused_store_is_not_cached():
+    class RefusingTable(FakeTable):
+        async def store(self, key, value, ttl_seconds, metadata):
+            return False
+
+    cache = TieredCache("test_refused", ttl_seconds=60, persistence=RefusingTable())
+
+    assert await cache.set("k", "v") is False
+    assert "k" not in cache
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_shared_between_processes():
+    redis = FakeRedis()
+    api = TieredCache("test_redis_api", ttl_seconds=60, redis=True)
+    worker = TieredCache("test_redis_worker", ttl_seconds=60, redis=True)
+    api.configure_redis(redis)
+    worker.configure_redis(redis)
+    # Same namespace in two processes -> same Redis keys
+    worker.namespace = api.namespace
+
+    await api.set("k", {"n": 1}, ttl_seconds=30)
+    payload = json.loads(redis.values["cache:test_redis_api:k"])
+
+    assert await worker.get("k") == {"n": 1}
+    assert worker.get_stats()["redis_hits"] == 1
+    assert 0 < payload["e"] - time.time() <= 30
+
+
+@pytest.mark.asyncio
+async def test_tier_errors_count_as_misses():
+    class BrokenTable(FakeTable):
+        async def load(self, key):
+            raise RuntimeError("db down")
+
+    cache = TieredCache("test_broken", ttl_seconds=60, persistence=BrokenTable())
+
+    assert await cache.get("k") is None
+    assert cache.get_stats()["errors"] == 1
+
+
+def test_namespaces_report_stats():
+    TieredCache("test_registry", ttl_seconds=60, max_entries=7)
+
+    assert get_all_cache_stats()["test_registry"]["max_entries"] == 7
@@ -7,9 +7,23 @@ import asyncio
 import logging
 import signal
 import sys
-from typing import Optional
-
-from app.core.task_queue import task_queue, TaskStatus
+from typing import Set
+
+from app.core.task_queue import task_queue, Task, TaskQueue
+from app.core.constants import TASK_QUEUE_BLOCK_TIMEOUT, TASK_QUEUE_RECLAIM_INTERVAL
+from app.core.config import get_settings
+from app.core.http_client import init_http_clients, close_http_clients
+from app.core.progress_bus import init_progress_bus, close_progress_bus
+from app.core.hit_counter import close_cache_hit_counter
+from app.services.enrichment.cost_tracker import close_cost_tracker
+from app.services.enrichment.audit_writer import close_audit_writer
+from app.core.circuit_breaker import init_circuit_breakers
+from app.core.tiered_cache import init_tiered_caches
+from app.core.single_flight import init_single_flight
+from app.core.challenge_index import init_challenge_index
+from app.core.offload import init_offload_executor, close_offload_executor
+from app.services.intelligence.snapshots import run_dashboard_snapshot_schedule
+from app.services.enrichment.rollups import run_enrichment_rollup_schedule
 from app.middleware import get_logger
 
 logger = get_logger(__name__)
@@ -23,84 +37,115 @@ class Worker:
     - Graceful shutdown handling
     - Automatic task retry
     - Health monitoring
-    - Concurrent task processing
+    - Concurrent task processing with batch claims
+    - Reclaim of tasks abandoned by dead workers
 
     Usage:
         python worker.py
     """
 
-    def __init__(self, concurrency: int = 4):
+    def __init__(self, concurrency: int = 4, queue: TaskQueue = None):
         """
         Initialize worker
 
         Args:
             concurrency: Number of concurrent tasks to process
+            queue: Task queue to consume (defaults to the global queue)
         """
         self.concurrency = concurrency
+        self.queue = queue or task_queue
         self.running = False
         self.tasks = []
+        self.active: Set[asyncio.Task] = set()
 
-    async def process_task_loop(self, worker_id: int):
+    async def run_task(self, task: Task):
         """
-        Main task processing loop for a worker
+        Execute one claimed task and record its outcome
 
         Args:
-            worker_id: Worker ID for logging
+            task: Claimed task (leased to this worker)
         """
-        logger.info(f"[WORKER {worker_id}] Started task processing loop")
+        logger.info(f"[WORKER] Processing task: {task.id} ({task.name})")
 
-        while self.running:
-            try:
-                # Dequeue next task
-                task = await task_queue.dequeue()
+        try:
+            # Execute task (lease is renewed while it runs)
+            result = await self.queue.execute_task(task)
 
-                if task is None:
-                    # No tasks available, wait before checking again
-                    await asyncio.sleep(1)
-                    continue
+            # Mark as completed
+            await self.queue.mark_completed(task, result)
 
-                logger.info(
-                    f"[WORKER {worker_id}] Processing task: {task.id} ({task.name})"
-                )
+            logger.info(
+                f"[WORKER] Task completed: {task.id}",
+                extra={"task_id": task.id, "task_name": task.name}
+            )
 
-                try:
-                    # Execute task
-                    result = await task_queue.execute_task(task)
+        except Exception as e:
+            # Mark as failed (will retry if retries remaining)
+            await self.queue.mark_failed(task, e)
 
-                    # Mark as completed
-                    await task_queue.mark_completed(task, result)
+            logger.error(
+                f"[WORKER] Task failed: {task.id} - {e}",
+                extra={"task_id": task.id, "task_name": task.name, "error": str(e)},
+                exc_info=True
+            )
 
-                    logger.info(
-                        f"[WORKER {worker_id}] Task completed: {task.id}",
-                        extra={"task_id": task.id, "task_name": task.name}
-                    )
+    async def process_task_loop(self):
+        """
+        Claim tasks for every free slot in one round trip and run them concurrently
 
-                except Exception as e:
-                    # Mark as failed (will retry if retries remaining)
-                    await task_queue.mark_failed(task, e)
+        Blocks on the queue while idle instead of polling, so new work is
+        picked up as soon as it is enqueued.
+        """
+        logger.info("[WORKER] Started task processing loop")
+        slot_freed = asyncio.Event()
 
-                    logger.error(
-                        f"[WORKER {worker_id}] Task failed: {task.id} - {e}",
-                        extra={"task_id": task.id, "task_name": task.name, "error": str(e)},
-                        exc_info=True
-                    )
+        def on_done(task: asyncio.Task):
+            self.active.discard(task)
+            slot_freed.set()
+
+        while self.running:
+            try:
+                free_slots = self.concurrency - len(self.active)
+                if free_slots <= 0:
+                    slot_freed.clear()
+                    await slot_freed.wait()
+                    continue
+
+                claimed = await self.queue.dequeue_batch(
+                    max_tasks=free_slots,
+                    timeout=TASK_QUEUE_BLOCK_TIMEOUT
+                )
 
+                for task in claimed:
+                    runner = asyncio.create_task(self.run_task(task))
+                    self.active.add(runner)
+                    runner.add_done_callback(on_done)
+
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                logger.error(f"[WORKER {worker_id}] Error in processing loop: {e}", exc_info=True)
+                logger.error(f"[WORKER] Error in processing loop: {e}", exc_info=True)
                 await asyncio.sleep(5)  # Wait before retrying
 
-        logger.info(f"[WORKER {worker_id}] Stopped task processing loop")
+        logger.info("[WORKER] Stopped task processing loop")
+
+    async def reclaim_loop(self):
+        """Periodically requeue tasks whose worker died without finishing them"""
+        while self.running:
+            await asyncio.sleep(TASK_QUEUE_RECLAIM_INTERVAL)
+            reclaimed = await self.queue.reclaim_expired()
+            if reclaimed:
+                logger.warning(f"[WORKER] Reclaimed {reclaimed} abandoned tasks")
 
     async def start(self):
         """Start the worker"""
         self.running = True
 
-        logger.info(f"[WORKER] Starting {self.concurrency} worker processes")
+        logger.info(f"[WORKER] Starting worker with concurrency {self.concurrency}")
 
-        # Start concurrent worker tasks
         self.tasks = [
-            asyncio.create_task(self.process_task_loop(i))
-            for i in range(self.concurrency)
+            asyncio.create_task(self.process_task_loop()),
+            asyncio.create_task(self.reclaim_loop())
         ]
 
         # Wait for all tasks
@@ -114,12 +159,12 @@ class Worker:
 
         self.running = False
 
-        # Cancel all worker tasks
-        for task in self.tasks:
+        # Cancel the claim loops and in-flight tasks (their leases expire and get reclaimed)
+        for task in [*self.tasks, *self.active]:
             task.cancel()
 
         # Wait for cancellations
-        await asyncio.gather(*self.tasks, return_exceptions=True)
+        await asyncio.gather(*self.tasks, *self.active, return_exceptions=True)
 
         logger.info("[WORKER] Worker stopped")
 
@@ -149,6 +194,27 @@ async def main():
     # Register with task queue
     task_queue.register_task("process_submission", process_submission_background)
 
+    # Shared outbound HTTP connection pools (LLM, research, enrichment)
+    init_http_clients(http2=get_settings().http2_enabled)
+
+    # Publish progress to Redis streams so API processes can serve the SSE streams
+    init_progress_bus(redis_enabled=get_settings().progress_redis_enabled)
+
+    # Trip provider breakers together with the API processes
+    init_circuit_breakers(redis_enabled=get_settings().circuit_breaker_redis_enabled)
+
+    # Same cache namespaces (and Redis tier) as the API processes
+    init_tiered_caches(redis_enabled=get_settings().cache_redis_enabled)
+
+    # Duplicate submissions picked up by different workers share one pipeline run
+    init_single_flight(redis_enabled=get_settings().cache_redis_enabled)
+
+    # Reworded duplicate submissions reuse cached analyses and extractions
+    await init_challenge_index(threshold=get_settings().challenge_similarity_threshold)
+
+    # Warm worker processes for CPU-heavy parsing during analyses
+    await init_offload_executor(workers=get_settings().offload_workers)
+
     logger.info("[WORKER] Registered tasks:")
     for task_name in task_queue.tasks.keys():
         logger.info(f"  - {task_name}")
@@ -161,6 +227,14 @@ async def main():
     logger.info(f"  - Completed: {stats['completed']}")
     logger.info(f"  - Failed: {stats['failed']}")
 
+    # Scheduled jobs: admin dashboard intelligence is regenerated here, never on
+    # the request path, and enrichment analytics are rolled up incrementally
+    schedules = []
+    if get_settings().dashboard_intelligence_schedule_enabled:
+        schedules.append(asyncio.create_task(run_dashboard_snapshot_schedule()))
+    if get_settings().enrichment_rollup_schedule_enabled:
+        schedules.append(asyncio.create_task(run_enrichment_rollup_schedule()))
+
     # Create worker
     worker = Worker(concurrency=4)
 
@@ -180,8 +254,25 @@ async def main():
     except Exception as e:
         logger.error(f"[WORKER] Fatal error: {e}", exc_info=True)
         await worker.stop()
+        for schedule in schedules:
+            schedule.cancel()
+        await close_progress_bus()
+        await close_cache_hit_counter()
+        await close_cost_tracker()
+        await close_audit_writer()
+        await close_offload_executor()
+        await close_http_clients()
         sys.exit(1)
 
+    for schedule in schedules:
+        schedule.cancel()
+    await asyncio.gather(*schedules, return_exceptions=True)
+    await close_progress_bus()
+    await close_cache_hit_counter()
+    await close_cost_tracker()
+    await close_audit_writer()
+    await close_offload_executor()
+    await close_http_clients()
     logger.info("[WORKER] Worker shutdown complete")
 
 